@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+Benchmark the single-pass chunker against the legacy encode/decode chunker.
+
+The legacy implementation encodes the whole document, re-encodes every
+`split_by_character` piece and decodes every token window back to text. The
+current `chunking_by_token_size` encodes each piece once and cuts token windows from
+the UTF-8 bytes of the original text using token byte offsets.
+
+Usage:
+    python benchmarks/benchmark_chunking.py --sizes 1 5 20 --model gpt-4o-mini
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.operate import chunking_by_token_size  # noqa: E402
+from lightrag.utils import TiktokenTokenizer, Tokenizer  # noqa: E402
+
+
+def legacy_chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> list[dict[str, Any]]:
+    """Reference copy of the previous chunking implementation"""
+    tokens = tokenizer.encode(content)
+    results: list[dict[str, Any]] = []
+    if split_by_character:
+        raw_chunks = content.split(split_by_character)
+        new_chunks = []
+        if split_by_character_only:
+            for chunk in raw_chunks:
+                _tokens = tokenizer.encode(chunk)
+                new_chunks.append((len(_tokens), chunk))
+        else:
+            for chunk in raw_chunks:
+                _tokens = tokenizer.encode(chunk)
+                if len(_tokens) > max_token_size:
+                    for start in range(
+                        0, len(_tokens), max_token_size - overlap_token_size
+                    ):
+                        chunk_content = tokenizer.decode(
+                            _tokens[start : start + max_token_size]
+                        )
+                        new_chunks.append(
+                            (min(max_token_size, len(_tokens) - start), chunk_content)
+                        )
+                else:
+                    new_chunks.append((len(_tokens), chunk))
+        for index, (_len, chunk) in enumerate(new_chunks):
+            results.append(
+                {
+                    "tokens": _len,
+                    "content": chunk.strip(),
+                    "chunk_order_index": index,
+                }
+            )
+    else:
+        for index, start in enumerate(
+            range(0, len(tokens), max_token_size - overlap_token_size)
+        ):
+            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
+            results.append(
+                {
+                    "tokens": min(max_token_size, len(tokens) - start),
+                    "content": chunk_content.strip(),
+                    "chunk_order_index": index,
+                }
+            )
+    return results
+
+
+def make_document(size_mb: float, seed: int = 42) -> str:
+    """Build a synthetic document of roughly `size_mb` megabytes"""
+    rng = random.Random(seed)
+    words = [
+        "regulation",
+        "article",
+        "compliance",
+        "the",
+        "of",
+        "and",
+        "authority",
+        "member",
+        "state",
+        "directive",
+        "provision",
+        "shall",
+        "apply",
+        "data",
+        "processing",
+        "controller",
+    ]
+    target = int(size_mb * 1024 * 1024)
+    paragraphs = []
+    length = 0
+    while length < target:
+        sentence_count = rng.randint(3, 12)
+        paragraph = " ".join(
+            " ".join(rng.choices(words, k=rng.randint(8, 25))).capitalize() + "."
+            for _ in range(sentence_count)
+        )
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+def time_call(func, *args) -> tuple[float, list[dict[str, Any]]]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=float, nargs="+", default=[1, 5, 20], help="Sizes in MB"
+    )
+    parser.add_argument("--model", default="gpt-4o-mini", help="tiktoken model")
+    parser.add_argument("--chunk-size", type=int, default=1200)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument(
+        "--split-by-character",
+        default=None,
+        help="Optional split character, e.g. '\\n\\n'",
+    )
+    args = parser.parse_args()
+
+    split_by_character = (
+        args.split_by_character.encode().decode("unicode_escape")
+        if args.split_by_character
+        else None
+    )
+    tokenizer = TiktokenTokenizer(args.model)
+
+    print(f"{'size(MB)':>9} {'chunks':>8} {'legacy(s)':>10} {'single-pass(s)':>15}")
+    for size in args.sizes:
+        content = make_document(size)
+        legacy_time, legacy_chunks = time_call(
+            legacy_chunking_by_token_size,
+            tokenizer,
+            content,
+            split_by_character,
+            False,
+            args.overlap,
+            args.chunk_size,
+        )
+        new_time, new_chunks = time_call(
+            chunking_by_token_size,
+            tokenizer,
+            content,
+            split_by_character,
+            False,
+            args.overlap,
+            args.chunk_size,
+        )
+        if len(legacy_chunks) != len(new_chunks):
+            print(
+                f"WARNING: chunk count differs ({len(legacy_chunks)} vs {len(new_chunks)})"
+            )
+        print(
+            f"{size:>9.1f} {len(new_chunks):>8} {legacy_time:>10.3f} {new_time:>15.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Benchmark recall and latency of the Faiss ANN index modes against the flat index.
+
+A synthetic clustered corpus is inserted into FaissVectorDBStorage once per
+index type (flat, hnsw, ivf_flat, ivf_pq). Every query is then searched
+through the storage API, and recall@k is measured against the exact flat
+results.
+
+Usage:
+    python benchmarks/benchmark_faiss_ann.py --num-vectors 200000 --dim 768 --top-k 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg.faiss_impl import FaissVectorDBStorage  # noqa: E402
+from lightrag.kg.shared_storage import initialize_share_data  # noqa: E402
+from lightrag.utils import EmbeddingFunc  # noqa: E402
+
+
+def make_corpus(
+    num_vectors: int, num_queries: int, dim: int, seed: int = 42
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build clustered unit vectors, queries are drawn from the same clusters"""
+    rng = np.random.default_rng(seed)
+    num_clusters = max(16, int(np.sqrt(num_vectors)))
+    centers = rng.standard_normal((num_clusters, dim)).astype(np.float32)
+
+    def sample(n: int) -> np.ndarray:
+        labels = rng.integers(num_clusters, size=n)
+        points = centers[labels] + 0.5 * rng.standard_normal((n, dim)).astype(
+            np.float32
+        )
+        return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+    return sample(num_vectors), sample(num_queries)
+
+
+def make_storage(
+    working_dir: str, corpus: np.ndarray, index_kwargs: dict
+) -> FaissVectorDBStorage:
+    # Content strings are row numbers, the embedding function looks the rows up
+    async def embed(texts: list[str], **kwargs) -> np.ndarray:
+        return corpus[[int(t) for t in texts]]
+
+    return FaissVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": 4096,
+            "vector_db_storage_cls_kwargs": {
+                "cosine_better_than_threshold": -1.0,
+                **index_kwargs,
+            },
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=corpus.shape[1], func=embed),
+        meta_fields=set(),
+    )
+
+
+async def run_index(
+    name: str,
+    index_kwargs: dict,
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    top_k: int,
+) -> tuple[float, list[float], list[list[str]]]:
+    with tempfile.TemporaryDirectory() as working_dir:
+        storage = make_storage(working_dir, corpus, index_kwargs)
+        await storage.initialize()
+
+        start = time.perf_counter()
+        batch = 50000
+        for offset in range(0, len(corpus), batch):
+            rows = range(offset, min(offset + batch, len(corpus)))
+            await storage.upsert({f"v{i}": {"content": str(i)} for i in rows})
+        # Training (IVF) happens when the index is persisted
+        await storage.index_done_callback()
+        build_time = time.perf_counter() - start
+
+        latencies = []
+        results = []
+        for query in queries:
+            start = time.perf_counter()
+            hits = await storage.query("", top_k, query_embedding=query.tolist())
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append([hit["id"] for hit in hits])
+    return build_time, latencies, results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--num-vectors", type=int, default=100000)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--ef-search", type=int, default=64)
+    args = parser.parse_args()
+
+    initialize_share_data()
+    corpus, queries = make_corpus(args.num_vectors, args.num_queries, args.dim)
+
+    index_configs = {
+        "flat": {"index_type": "flat"},
+        "hnsw": {"index_type": "hnsw", "hnsw_ef_search": args.ef_search},
+        "ivf_flat": {
+            "index_type": "ivf_flat",
+            "ivf_nprobe": args.nprobe,
+            "train_min_vectors": min(10000, args.num_vectors),
+        },
+        "ivf_pq": {
+            "index_type": "ivf_pq",
+            "ivf_nprobe": args.nprobe,
+            "train_min_vectors": min(10000, args.num_vectors),
+        },
+    }
+
+    exact = None
+    print(
+        f"{'index':>9} {'build(s)':>9} {'recall@' + str(args.top_k):>10} "
+        f"{'p50(ms)':>8} {'p95(ms)':>8}"
+    )
+    for name, index_kwargs in index_configs.items():
+        build_time, latencies, results = await run_index(
+            name, index_kwargs, corpus, queries, args.top_k
+        )
+        if exact is None:
+            exact = results
+        recall = np.mean(
+            [
+                len(set(found) & set(truth)) / max(1, len(truth))
+                for found, truth in zip(results, exact)
+            ]
+        )
+        print(
+            f"{name:>9} {build_time:>9.2f} {recall:>10.3f} "
+            f"{np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 95):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""
+Benchmark graph write throughput: per-item upserts against upsert_nodes_batch / upsert_edges_batch.
+
+The same random nodes and edges are written to a fresh graph twice: once through
+the BaseGraphStorage defaults, which await one upsert_node / upsert_edge per item,
+and once through the backend's native batch upserts. Backends:
+
+- networkx: the in-process NetworkXStorage
+- sqlite: the embedded SQLiteGraphStorage (one transaction per batch instead of per item)
+- remote: a local stand-in for a networked graph database, NetworkXStorage with
+  --latency-ms of simulated round-trip time per write call
+
+Usage:
+    python benchmarks/benchmark_graph_upsert_batch.py --num-nodes 20000 --num-edges 40000 --latency-ms 1
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.base import BaseGraphStorage  # noqa: E402
+from lightrag.kg.networkx_impl import NetworkXStorage  # noqa: E402
+from lightrag.kg.shared_storage import initialize_share_data  # noqa: E402
+from lightrag.kg.sqlite_impl import SQLiteGraphStorage  # noqa: E402
+
+
+class SimulatedRemoteStorage(NetworkXStorage):
+    """NetworkXStorage paying one round trip per write call, batched or not"""
+
+    latency: float = 0.0
+
+    async def upsert_node(self, node_id, node_data):
+        await asyncio.sleep(self.latency)
+        await super().upsert_node(node_id, node_data)
+
+    async def upsert_edge(self, source_node_id, target_node_id, edge_data):
+        await asyncio.sleep(self.latency)
+        await super().upsert_edge(source_node_id, target_node_id, edge_data)
+
+    async def upsert_nodes_batch(self, nodes):
+        await asyncio.sleep(self.latency)
+        await super().upsert_nodes_batch(nodes)
+
+    async def upsert_edges_batch(self, edges):
+        await asyncio.sleep(self.latency)
+        await super().upsert_edges_batch(edges)
+
+
+def make_items(num_nodes: int, num_edges: int, seed: int = 42):
+    rng = random.Random(seed)
+    nodes = [
+        (
+            f"node-{i}",
+            {
+                "entity_id": f"node-{i}",
+                "entity_type": "Concept",
+                "description": f"description of node {i}",
+                "source_id": f"chunk-{i % 1000}",
+                "file_path": "document.txt",
+            },
+        )
+        for i in range(num_nodes)
+    ]
+    pairs = set()
+    while len(pairs) < num_edges:
+        src, tgt = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        if src != tgt and (tgt, src) not in pairs:
+            pairs.add((src, tgt))
+    edges = [
+        (
+            f"node-{src}",
+            f"node-{tgt}",
+            {
+                "weight": 1.0,
+                "description": "related",
+                "keywords": "benchmark",
+                "source_id": f"chunk-{src % 1000}",
+                "file_path": "document.txt",
+            },
+        )
+        for src, tgt in pairs
+    ]
+    return nodes, edges
+
+
+async def make_storage(backend: str, working_dir: str, latency: float):
+    storage_cls = {
+        "networkx": NetworkXStorage,
+        "sqlite": SQLiteGraphStorage,
+        "remote": SimulatedRemoteStorage,
+    }[backend]
+    storage = storage_cls(
+        namespace=f"bench_{backend}_{time.monotonic_ns()}",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    storage.latency = latency
+    await storage.initialize()
+    return storage
+
+
+async def write(storage, nodes, edges, batched: bool, batch_size: int) -> float:
+    upsert_nodes = (
+        storage.upsert_nodes_batch
+        if batched
+        else lambda items: BaseGraphStorage.upsert_nodes_batch(storage, items)
+    )
+    upsert_edges = (
+        storage.upsert_edges_batch
+        if batched
+        else lambda items: BaseGraphStorage.upsert_edges_batch(storage, items)
+    )
+    start = time.perf_counter()
+    # Merge stage shape: all nodes of a batch, then its edges
+    for i in range(0, len(nodes), batch_size):
+        await upsert_nodes(nodes[i : i + batch_size])
+    for i in range(0, len(edges), batch_size):
+        await upsert_edges(edges[i : i + batch_size])
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--num-nodes", type=int, default=20000)
+    parser.add_argument("--num-edges", type=int, default=40000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument(
+        "--backends", nargs="+", default=["networkx", "sqlite", "remote"]
+    )
+    args = parser.parse_args()
+
+    initialize_share_data()
+    nodes, edges = make_items(args.num_nodes, args.num_edges)
+    total = len(nodes) + len(edges)
+    print(f"Writing {len(nodes)} nodes and {len(edges)} edges per run")
+    print(
+        f"{'backend':>9} {'per-item(s)':>12} {'batch(s)':>9} {'items/s':>10} {'speedup':>8}"
+    )
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        for backend in args.backends:
+            latency = args.latency_ms / 1000 if backend == "remote" else 0.0
+            timings = {}
+            for batched in (False, True):
+                storage = await make_storage(backend, working_dir, latency)
+                timings[batched] = await write(
+                    storage, nodes, edges, batched, args.batch_size
+                )
+                assert len(await storage.get_all_nodes()) == len(nodes)
+                assert len(await storage.get_all_edges()) == len(edges)
+                await storage.finalize()
+            print(
+                f"{backend:>9} {timings[False]:>12.2f} {timings[True]:>9.2f} "
+                f"{total / timings[True]:>10.0f} "
+                f"{timings[False] / max(timings[True], 1e-9):>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
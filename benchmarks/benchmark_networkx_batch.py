@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Benchmark NetworkXStorage batch reads against the BaseGraphStorage per-item defaults.
+
+A random graph is loaded into NetworkXStorage. Each query-time batch read
+(get_nodes_batch, node_degrees_batch, edge_degrees_batch, get_edges_batch,
+get_nodes_edges_batch) is then timed twice: once through the storage's
+native implementation, and once through the BaseGraphStorage default, which
+awaits one lookup (and one storage lock acquisition) per id.
+
+Usage:
+    python benchmarks/benchmark_networkx_batch.py --num-nodes 200000 --num-edges 1000000 --batch-size 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import networkx as nx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.base import BaseGraphStorage  # noqa: E402
+from lightrag.kg.networkx_impl import NetworkXStorage  # noqa: E402
+from lightrag.kg.shared_storage import initialize_share_data  # noqa: E402
+
+
+def make_graph(num_nodes: int, num_edges: int, seed: int = 42) -> nx.Graph:
+    rng = random.Random(seed)
+    graph = nx.Graph()
+    for i in range(num_nodes):
+        graph.add_node(
+            f"node-{i}",
+            entity_id=f"node-{i}",
+            entity_type="Concept",
+            description=f"description of node {i}",
+            source_id=f"chunk-{i % 1000}",
+        )
+    edges = set()
+    while len(edges) < num_edges:
+        src = rng.randrange(num_nodes)
+        tgt = rng.randrange(num_nodes)
+        if src != tgt and (tgt, src) not in edges:
+            edges.add((src, tgt))
+    for src, tgt in edges:
+        graph.add_edge(
+            f"node-{src}",
+            f"node-{tgt}",
+            weight=1.0,
+            description="related",
+            keywords="benchmark",
+            source_id=f"chunk-{src % 1000}",
+        )
+    return graph
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return (time.perf_counter() - start) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--num-nodes", type=int, default=200000)
+    parser.add_argument("--num-edges", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    initialize_share_data()
+    print(f"Building graph: {args.num_nodes} nodes, {args.num_edges} edges ...")
+    graph = make_graph(args.num_nodes, args.num_edges)
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        storage = NetworkXStorage(
+            namespace="chunk_entity_relation",
+            workspace="",
+            global_config={"working_dir": working_dir},
+            embedding_func=None,
+        )
+        await storage.initialize()
+        storage._graph = graph
+
+        rng = random.Random(7)
+        node_ids = [
+            f"node-{rng.randrange(args.num_nodes)}" for _ in range(args.batch_size)
+        ]
+        edge_pairs = rng.sample(list(graph.edges()), args.batch_size)
+        edge_dicts = [{"src": src, "tgt": tgt} for src, tgt in edge_pairs]
+
+        cases = [
+            ("get_nodes_batch", node_ids),
+            ("node_degrees_batch", node_ids),
+            ("edge_degrees_batch", edge_pairs),
+            ("get_edges_batch", edge_dicts),
+            ("get_nodes_edges_batch", node_ids),
+        ]
+
+        print(f"{'method':>22} {'default(ms)':>12} {'native(ms)':>11} {'speedup':>8}")
+        for name, batch in cases:
+            native = getattr(storage, name)
+            default = getattr(BaseGraphStorage, name)
+            # Results must match before timing
+            assert await native(batch) == await default(storage, batch), name
+            default_ms = min(
+                [await timed(default(storage, batch)) for _ in range(args.repeat)]
+            )
+            native_ms = min([await timed(native(batch)) for _ in range(args.repeat)])
+            print(
+                f"{name:>22} {default_ms:>12.2f} {native_ms:>11.2f} "
+                f"{default_ms / max(native_ms, 1e-6):>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Benchmark NetworkXStorage persistence: GraphML against the binary snapshot.
+
+A random graph with LightRAG-like node and edge attributes is saved and
+loaded with networkx GraphML and with the binary snapshot format. A small
+batch of upserts is then persisted through NetworkXStorage.index_done_callback,
+which appends it to the delta log instead of rewriting the snapshot.
+
+Usage:
+    python benchmarks/benchmark_networkx_persistence.py --num-nodes 200000 --num-edges 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import networkx as nx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg.networkx_impl import NetworkXStorage  # noqa: E402
+from lightrag.kg.networkx_snapshot import (  # noqa: E402
+    GraphChunkIndex,
+    load_graph_snapshot,
+    save_graph_snapshot,
+)
+from lightrag.kg.shared_storage import initialize_share_data  # noqa: E402
+
+
+def make_graph(num_nodes: int, num_edges: int, seed: int = 42) -> nx.Graph:
+    rng = random.Random(seed)
+    graph = nx.Graph()
+    for i in range(num_nodes):
+        graph.add_node(
+            f"node-{i}",
+            entity_id=f"node-{i}",
+            entity_type="Concept",
+            description=f"description of node {i} " * 4,
+            source_id=f"chunk-{i % 1000}",
+            file_path="document.txt",
+            created_at=1700000000 + i,
+        )
+    edges = set()
+    while len(edges) < num_edges:
+        src = rng.randrange(num_nodes)
+        tgt = rng.randrange(num_nodes)
+        if src != tgt and (tgt, src) not in edges:
+            edges.add((src, tgt))
+    for src, tgt in edges:
+        graph.add_edge(
+            f"node-{src}",
+            f"node-{tgt}",
+            weight=1.0,
+            description="related entities in the benchmark corpus",
+            keywords="benchmark",
+            source_id=f"chunk-{src % 1000}",
+            file_path="document.txt",
+            created_at=1700000000 + src,
+        )
+    return graph
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+async def time_delta_commit(working_dir: str, graph: nx.Graph, batch_size: int):
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    storage._graph = graph
+    storage._chunk_index = GraphChunkIndex.from_graph(graph)
+    # First commit writes the full snapshot
+    await storage.index_done_callback()
+
+    for i in range(batch_size):
+        await storage.upsert_node(f"node-{i}", {"description": f"updated {i}"})
+    start = time.perf_counter()
+    await storage.index_done_callback()
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--num-nodes", type=int, default=200000)
+    parser.add_argument("--num-edges", type=int, default=1000000)
+    parser.add_argument("--delta-batch", type=int, default=1000)
+    parser.add_argument("--skip-graphml", action="store_true")
+    args = parser.parse_args()
+
+    initialize_share_data()
+    print(f"Building graph: {args.num_nodes} nodes, {args.num_edges} edges ...")
+    graph = make_graph(args.num_nodes, args.num_edges)
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        print(f"{'format':>8} {'save(s)':>8} {'load(s)':>8} {'size(MB)':>9}")
+        formats = [("binary", save_graph_snapshot, load_graph_snapshot, "g.npz")]
+        if not args.skip_graphml:
+            formats.insert(
+                0, ("graphml", nx.write_graphml, nx.read_graphml, "g.graphml")
+            )
+        for name, save, load, file_name in formats:
+            path = os.path.join(working_dir, file_name)
+            save_time, _ = timed(save, graph, path)
+            load_time, loaded = timed(load, path)
+            assert loaded.number_of_nodes() == graph.number_of_nodes()
+            assert loaded.number_of_edges() == graph.number_of_edges()
+            print(
+                f"{name:>8} {save_time:>8.2f} {load_time:>8.2f} "
+                f"{os.path.getsize(path) / 2**20:>9.1f}"
+            )
+
+        delta_time = await time_delta_commit(working_dir, graph, args.delta_batch)
+        print(
+            f"delta commit of {args.delta_batch} node updates: {delta_time * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+Benchmark vector-similarity chunk re-ranking: per-chunk Python loop against one matrix product.
+
+A corpus of random chunk vectors is inserted into each vector storage once. For
+every candidate count, the chunks of the first N rows are re-ranked against a
+query embedding twice: with the previous algorithm (get_vectors_by_ids, one
+cosine_similarity call per chunk, full sort) and with pick_by_vector_similarity
+(get_vectors_matrix, one normalized matrix-vector product, argpartition top-k).
+Both must select the same chunks.
+
+Usage:
+    python benchmarks/benchmark_pick_by_vector_similarity.py --candidates 1000 10000 100000 --dim 1024
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg.faiss_impl import FaissVectorDBStorage  # noqa: E402
+from lightrag.kg.mmap_vector_db_impl import MmapVectorDBStorage  # noqa: E402
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage  # noqa: E402
+from lightrag.kg.shared_storage import initialize_share_data  # noqa: E402
+from lightrag.utils import (  # noqa: E402
+    EmbeddingFunc,
+    cosine_similarity,
+    pick_by_vector_similarity,
+)
+
+STORAGES = {
+    "nano": NanoVectorDBStorage,
+    "mmap": MmapVectorDBStorage,
+    "faiss": FaissVectorDBStorage,
+}
+
+
+async def legacy_pick(query_embedding, chunks_vdb, num_of_chunks, chunk_ids):
+    """The previous per-chunk selection loop"""
+    chunk_vectors = await chunks_vdb.get_vectors_by_ids(chunk_ids)
+    similarities = [
+        (chunk_id, cosine_similarity(query_embedding, chunk_vectors[chunk_id]))
+        for chunk_id in chunk_ids
+        if chunk_id in chunk_vectors
+    ]
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+
+
+async def make_storage(backend: str, working_dir: str, corpus: np.ndarray):
+    # Content strings are row numbers, the embedding function looks the rows up
+    async def embed(texts: list[str], **kwargs) -> np.ndarray:
+        return corpus[[int(t) for t in texts]]
+
+    storage = STORAGES[backend](
+        namespace=f"chunks_{backend}",
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": 4096,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=corpus.shape[1], func=embed),
+        meta_fields=set(),
+    )
+    await storage.initialize()
+    batch = 50000
+    for offset in range(0, len(corpus), batch):
+        rows = range(offset, min(offset + batch, len(corpus)))
+        await storage.upsert({f"chunk-{i}": {"content": str(i)} for i in rows})
+    await storage.index_done_callback()
+    return storage
+
+
+async def timed(func, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--candidates", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--backends", nargs="+", default=list(STORAGES))
+    args = parser.parse_args()
+
+    initialize_share_data()
+    rng = np.random.default_rng(42)
+    corpus = rng.standard_normal((max(args.candidates), args.dim)).astype(np.float32)
+    query_embedding = rng.standard_normal(args.dim).astype(np.float32).tolist()
+
+    print(
+        f"{'backend':>7} {'candidates':>10} {'loop(ms)':>9} {'matrix(ms)':>10} {'speedup':>8}"
+    )
+    with tempfile.TemporaryDirectory() as working_dir:
+        for backend in args.backends:
+            storage = await make_storage(backend, working_dir, corpus)
+            for num in args.candidates:
+                chunk_ids = [f"chunk-{i}" for i in range(num)]
+                entity_info = [{"sorted_chunks": chunk_ids}]
+                legacy_ms, legacy = await timed(
+                    lambda: legacy_pick(
+                        query_embedding, storage, args.top_k, chunk_ids
+                    ),
+                    args.repeats,
+                )
+                matrix_ms, picked = await timed(
+                    lambda: pick_by_vector_similarity(
+                        query="",
+                        text_chunks_storage=None,
+                        chunks_vdb=storage,
+                        num_of_chunks=args.top_k,
+                        entity_info=entity_info,
+                        embedding_func=None,
+                        query_embedding=query_embedding,
+                    ),
+                    args.repeats,
+                )
+                assert set(picked) == set(legacy), "selections differ"
+                print(
+                    f"{backend:>7} {num:>10} {legacy_ms:>9.1f} {matrix_ms:>10.1f} "
+                    f"{legacy_ms / max(matrix_ms, 1e-9):>7.1f}x"
+                )
+            await storage.finalize()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
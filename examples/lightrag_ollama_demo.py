@@ -120,6 +120,8 @@ async def main():
         # Clear old data files
         files_to_delete = [
             "graph_chunk_entity_relation.graphml",
+            "graph_chunk_entity_relation.npz",
+            "graph_chunk_entity_relation.delta.jsonl",
             "kv_store_doc_status.json",
             "kv_store_full_docs.json",
             "kv_store_text_chunks.json",
@@ -39,6 +39,10 @@ from lightrag.constants import (
     DEFAULT_OLLAMA_MODEL_TAG,
     DEFAULT_RERANK_BINDING,
     DEFAULT_ENTITY_TYPES,
+    DEFAULT_FILE_EXTRACTION_WORKERS,
+    DEFAULT_FILE_EXTRACTION_TIMEOUT,
+    DEFAULT_FILE_EXTRACTION_MAX_MEMORY_MB,
+    DEFAULT_STREAMING_INGEST_THRESHOLD_MB,
 )
 
 # use the .env that is inside the current folder
@@ -342,6 +346,21 @@ def parse_args() -> argparse.Namespace:
     # Select Document loading tool (DOCLING, DEFAULT)
     args.document_loading_engine = get_env_value("DOCUMENT_LOADING_ENGINE", "DEFAULT")
 
+    # File extraction process pool (also bounds how many files are enqueued at once)
+    args.file_extraction_workers = get_env_value(
+        "FILE_EXTRACTION_WORKERS", DEFAULT_FILE_EXTRACTION_WORKERS, int
+    )
+    args.file_extraction_timeout = get_env_value(
+        "FILE_EXTRACTION_TIMEOUT", DEFAULT_FILE_EXTRACTION_TIMEOUT, float
+    )
+    args.file_extraction_max_memory_mb = get_env_value(
+        "FILE_EXTRACTION_MAX_MEMORY_MB", DEFAULT_FILE_EXTRACTION_MAX_MEMORY_MB, int
+    )
+    # Files at least this large are extracted and stored page by page (0 disables)
+    args.streaming_ingest_threshold_mb = get_env_value(
+        "STREAMING_INGEST_THRESHOLD_MB", DEFAULT_STREAMING_INGEST_THRESHOLD_MB, float
+    )
+
     # Add environment variables that were previously read directly
     args.cors_origins = get_env_value("CORS_ORIGINS", "*")
     args.summary_language = get_env_value("SUMMARY_LANGUAGE", DEFAULT_SUMMARY_LANGUAGE)
@@ -0,0 +1,329 @@
+"""
+Text extraction of binary documents (PDF, DOCX, PPTX, XLSX) off the event loop.
+
+Parsing a large document is CPU-bound and can take minutes, which would freeze
+the API worker (queries and /health included) if it ran in the request handler.
+Extraction runs in a small set of dedicated worker processes instead. Each file
+has a timeout and every worker can be given an address-space cap; a worker that
+times out, crashes or runs out of memory is replaced without affecting the files
+being extracted by the other workers.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+import pipmaster as pm
+
+from lightrag.utils import logger
+
+# Extensions parsed by the extraction workers, plain text files are decoded inline
+POOL_EXTRACTED_EXTENSIONS = {".pdf", ".docx", ".pptx", ".xlsx"}
+
+
+class FileExtractionError(Exception):
+    """Raised when an extraction worker fails to extract a file"""
+
+
+class FileExtractionTimeoutError(FileExtractionError):
+    """Raised when a file is not extracted within the per-file timeout"""
+
+
+def ensure_extractor_installed(ext: str, engine: str) -> None:
+    """Install the parser package of a file type if it is missing"""
+    if engine == "DOCLING":
+        if not pm.is_installed("docling"):  # type: ignore
+            pm.install("docling")
+    elif ext == ".pdf":
+        if not pm.is_installed("pypdf2"):  # type: ignore
+            pm.install("pypdf2")
+    elif ext == ".docx":
+        if not pm.is_installed("python-docx"):  # type: ignore
+            try:
+                pm.install("python-docx")
+            except Exception:
+                pm.install("docx")
+    elif ext == ".pptx":
+        if not pm.is_installed("python-pptx"):  # type: ignore
+            pm.install("pptx")
+    elif ext == ".xlsx":
+        if not pm.is_installed("openpyxl"):  # type: ignore
+            pm.install("openpyxl")
+
+
+def iter_file_segments(file_path: str, ext: str, engine: str) -> Iterator[str]:
+    """Yield the text of a binary document page by page (slide or sheet for PPTX/XLSX)
+
+    Runs in an extraction worker process. Joining the segments gives the full text.
+    """
+    if engine == "DOCLING":
+        from docling.document_converter import DocumentConverter  # type: ignore
+
+        converter = DocumentConverter()
+        result = converter.convert(file_path)
+        yield result.document.export_to_markdown()
+        return
+
+    match ext:
+        case ".pdf":
+            from PyPDF2 import PdfReader  # type: ignore
+
+            reader = PdfReader(file_path)
+            for page in reader.pages:
+                yield page.extract_text() + "\n"
+
+        case ".docx":
+            from docx import Document  # type: ignore
+
+            doc = Document(file_path)
+            yield "\n".join([paragraph.text for paragraph in doc.paragraphs])
+
+        case ".pptx":
+            from pptx import Presentation  # type: ignore
+
+            prs = Presentation(file_path)
+            for slide in prs.slides:
+                yield "".join(
+                    shape.text + "\n"
+                    for shape in slide.shapes
+                    if hasattr(shape, "text")
+                )
+
+        case ".xlsx":
+            from openpyxl import load_workbook  # type: ignore
+
+            wb = load_workbook(file_path)
+            for sheet in wb:
+                content = f"Sheet: {sheet.title}\n"
+                for row in sheet.iter_rows(values_only=True):
+                    content += (
+                        "\t".join(str(cell) if cell is not None else "" for cell in row)
+                        + "\n"
+                    )
+                yield content + "\n"
+
+        case _:
+            raise ValueError(f"File extension {ext} is not extracted in the pool")
+
+
+def extract_file_text(file_path: str, ext: str, engine: str) -> str:
+    """Extract the text of a binary document, runs in an extraction worker process"""
+    return "".join(iter_file_segments(file_path, ext, engine))
+
+
+def _limit_worker_memory(max_memory_mb: int) -> None:
+    if max_memory_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return
+    limit = max_memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _extraction_worker_main(conn, max_memory_mb: int) -> None:
+    """Serve extraction requests until the parent closes the pipe
+
+    A request is (mode, file_path, ext, engine). In "text" mode the full text is
+    sent back, in "segments" mode every segment is sent as ("segment", text) as
+    soon as it is extracted, followed by the final response.
+    """
+    _limit_worker_memory(max_memory_mb)
+    while True:
+        try:
+            mode, *request = conn.recv()
+        except EOFError:
+            return
+        try:
+            if mode == "segments":
+                for segment in iter_file_segments(*request):
+                    conn.send(("segment", segment))
+                response = (True, None)
+            else:
+                response = (True, extract_file_text(*request))
+        except MemoryError:
+            response = (False, "MemoryError", "extraction worker memory cap exceeded")
+        except Exception as e:
+            # Parser exceptions are not always picklable, send their text
+            response = (False, type(e).__name__, str(e))
+        conn.send(response)
+
+
+class _ExtractionWorker:
+    """One extraction process and the pipe to it, started on first use"""
+
+    def __init__(self, max_memory_mb: int):
+        self.max_memory_mb = max_memory_mb
+        self.process = None
+        self.conn = None
+
+    def run(self, request: tuple, timeout: float | None) -> tuple:
+        """Send a request and wait for its response, called from a worker thread"""
+        self.send(request)
+        return self.receive(timeout)
+
+    def send(self, request: tuple) -> None:
+        if self.process is None:
+            # spawn avoids forking a process that holds event loop threads and locks
+            ctx = multiprocessing.get_context("spawn")
+            self.conn, child_conn = ctx.Pipe()
+            self.process = ctx.Process(
+                target=_extraction_worker_main,
+                args=(child_conn, self.max_memory_mb),
+                name="lightrag-file-extraction",
+            )
+            self.process.start()
+            child_conn.close()
+        self.conn.send(request)
+
+    def receive(self, timeout: float | None) -> tuple:
+        if not self.conn.poll(timeout):
+            raise FileExtractionTimeoutError(
+                f"Extraction did not finish within {timeout}s"
+            )
+        try:
+            return self.conn.recv()
+        except EOFError:
+            self.process.join(1)
+            raise FileExtractionError(
+                f"Extraction worker exited unexpectedly (exit code {self.process.exitcode})"
+            )
+
+    def stop(self) -> None:
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(1)
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+
+class FileExtractionPool:
+    """Runs extract_file_text in up to max_workers reusable worker processes
+
+    Args:
+        max_workers: Number of extraction worker processes
+        timeout: Seconds a file may take before its worker is killed (0 disables)
+        max_memory_mb: Address-space cap of each worker process in MB (0 disables)
+    """
+
+    def __init__(self, max_workers: int, timeout: float, max_memory_mb: int):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._idle_workers: list[_ExtractionWorker] = []
+        self._busy_workers: set[_ExtractionWorker] = set()
+
+    async def extract(self, file_path: Path, ext: str, engine: str) -> str:
+        await asyncio.to_thread(ensure_extractor_installed, ext, engine)
+
+        async with self._slots:
+            worker = self._take_worker()
+            try:
+                response = await asyncio.to_thread(
+                    worker.run,
+                    ("text", str(file_path), ext, engine),
+                    self.timeout or None,
+                )
+            except BaseException:
+                # Timed out, crashed or cancelled: the worker state is unknown
+                worker.stop()
+                raise
+            finally:
+                self._busy_workers.discard(worker)
+            return self._finish(worker, response)
+
+    async def extract_segments(
+        self, file_path: Path, ext: str, engine: str
+    ) -> AsyncIterator[str]:
+        """Yield the text of a document page by page while the worker extracts it
+
+        The timeout covers the whole file, including the time the caller spends
+        between segments. Close the generator (contextlib.aclosing) when not
+        consuming it to the end so its worker is released.
+        """
+        await asyncio.to_thread(ensure_extractor_installed, ext, engine)
+
+        async with self._slots:
+            worker = self._take_worker()
+            deadline = time.monotonic() + self.timeout if self.timeout else None
+            finished = False
+            try:
+                await asyncio.to_thread(
+                    worker.send, ("segments", str(file_path), ext, engine)
+                )
+                while True:
+                    remaining = (
+                        None
+                        if deadline is None
+                        else max(0, deadline - time.monotonic())
+                    )
+                    try:
+                        response = await asyncio.to_thread(worker.receive, remaining)
+                    except FileExtractionTimeoutError:
+                        raise FileExtractionTimeoutError(
+                            f"Extraction did not finish within {self.timeout}s"
+                        ) from None
+                    if response[0] != "segment":
+                        break
+                    yield response[1]
+                finished = True
+            finally:
+                self._busy_workers.discard(worker)
+                if not finished:
+                    # Timed out, crashed or abandoned midway: the worker state is unknown
+                    worker.stop()
+            self._finish(worker, response)
+
+    def _take_worker(self) -> _ExtractionWorker:
+        worker = (
+            self._idle_workers.pop()
+            if self._idle_workers
+            else _ExtractionWorker(self.max_memory_mb)
+        )
+        self._busy_workers.add(worker)
+        return worker
+
+    def _finish(self, worker: _ExtractionWorker, response: tuple):
+        """Return a worker to the idle list and unpack its final response"""
+        if response[0]:
+            self._idle_workers.append(worker)
+            return response[1]
+
+        _, error_type, message = response
+        if error_type == "MemoryError":
+            worker.stop()
+            raise MemoryError(message)
+        self._idle_workers.append(worker)
+        raise FileExtractionError(f"{error_type}: {message}")
+
+    def shutdown(self) -> None:
+        for worker in self._idle_workers + list(self._busy_workers):
+            worker.stop()
+        self._idle_workers.clear()
+        self._busy_workers.clear()
+        logger.debug("File extraction workers stopped")
+
+
+_extraction_pool: FileExtractionPool | None = None
+
+
+def get_file_extraction_pool(
+    max_workers: int, timeout: float, max_memory_mb: int
+) -> FileExtractionPool:
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = FileExtractionPool(max_workers, timeout, max_memory_mb)
+    return _extraction_pool
+
+
+def shutdown_file_extraction_pool() -> None:
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown()
+        _extraction_pool = None
@@ -47,6 +47,7 @@ from lightrag.api.routers.document_routes import (
     DocumentManager,
     create_document_routes,
 )
+from lightrag.api.file_extraction import shutdown_file_extraction_pool
 from lightrag.api.routers.query_routes import create_query_routes
 from lightrag.api.routers.graph_routes import create_graph_routes
 from lightrag.api.routers.ollama_api import OllamaAPI
@@ -216,6 +217,9 @@ def create_app(args):
             yield
 
         finally:
+            # Stop the file extraction worker processes
+            shutdown_file_extraction_pool()
+
             # Clean up database connections
             await rag.finalize_storages()
 
@@ -525,6 +529,7 @@ def create_app(args):
             dimensions=args.embedding_dim,
             args=args,  # Pass args object for fallback option generation
         ),
+        model_name=args.embedding_model,
     )
 
     # Configure rerank function based on args.rerank_bindingparameter
@@ -772,6 +777,8 @@ def create_app(args):
                 "auth_mode": auth_mode,
                 "pipeline_busy": pipeline_status.get("busy", False),
                 "keyed_locks": keyed_lock_info,
+                "token_count_cache": rag.tokenizer.token_cache_info(),
+                "rate_limiters": rag.get_rate_limiter_stats(),
                 "core_version": core_version,
                 "api_version": __api_version__,
                 "webui_title": webui_title,
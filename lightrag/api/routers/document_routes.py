@@ -3,14 +3,16 @@ This module contains all document-related routes for the LightRAG API.
 """
 
 import asyncio
+import codecs
+import time
 from lightrag.utils import logger, get_pinyin_sort_key
 import aiofiles
 import shutil
 import traceback
-import pipmaster as pm
+from contextlib import aclosing
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Literal
+from typing import AsyncIterator, Dict, List, Optional, Any, Literal
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -25,8 +27,50 @@ from lightrag import LightRAG
 from lightrag.base import DeletionResult, DocProcessingStatus, DocStatus
 from lightrag.utils import generate_track_id
 from lightrag.api.utils_api import get_combined_auth_dependency
+from lightrag.api.file_extraction import (
+    POOL_EXTRACTED_EXTENSIONS,
+    FileExtractionTimeoutError,
+    get_file_extraction_pool,
+)
 from ..config import global_args
 
+# Plain text files, decoded as UTF-8
+TEXT_FILE_EXTENSIONS = {
+    ".txt",
+    ".md",
+    ".html",
+    ".htm",
+    ".tex",
+    ".json",
+    ".xml",
+    ".yaml",
+    ".yml",
+    ".rtf",
+    ".odt",
+    ".epub",
+    ".csv",
+    ".log",
+    ".conf",
+    ".ini",
+    ".properties",
+    ".sql",
+    ".bat",
+    ".sh",
+    ".c",
+    ".cpp",
+    ".py",
+    ".java",
+    ".js",
+    ".ts",
+    ".swift",
+    ".go",
+    ".rb",
+    ".php",
+    ".css",
+    ".scss",
+    ".less",
+}
+
 
 # Function to format datetime to ISO format string with timezone information
 def format_datetime(dt: Any) -> Optional[str]:
@@ -643,6 +687,8 @@ class PipelineStatusResponse(BaseModel):
         latest_message: Latest message from pipeline processing
         history_messages: List of history messages
         update_status: Status of update flags for all namespaces
+        summary_stats: Merge-phase description summary telemetry of the current job
+        file_extraction: File extraction counters (running, completed, failed)
     """
 
     autoscanned: bool = False
@@ -656,6 +702,8 @@ class PipelineStatusResponse(BaseModel):
     latest_message: str = ""
     history_messages: Optional[List[str]] = None
     update_status: Optional[dict] = None
+    summary_stats: Optional[dict] = None
+    file_extraction: Optional[dict] = None
 
     @field_validator("job_start", mode="before")
     @classmethod
@@ -832,8 +880,169 @@ def get_unique_filename_in_enqueued(target_dir: Path, original_name: str) -> str
     return f"{base_name}_{timestamp}{extension}"
 
 
+async def _report_extraction_progress(message: str, **counters: int) -> None:
+    """Add file extraction progress to pipeline_status
+
+    Args:
+        message: Progress message for latest_message and history_messages
+        **counters: Increments of the file_extraction counters (running, completed, failed)
+    """
+    from lightrag.kg.shared_storage import (
+        get_namespace_data,
+        get_pipeline_status_lock,
+    )
+
+    logger.info(f"[File Extraction]{message}")
+    pipeline_status = await get_namespace_data("pipeline_status")
+    async with get_pipeline_status_lock():
+        # Replace the nested dict so the update reaches a shared Manager dict
+        file_extraction = dict(pipeline_status.get("file_extraction") or {})
+        for name, increment in counters.items():
+            file_extraction[name] = file_extraction.get(name, 0) + increment
+        pipeline_status["file_extraction"] = file_extraction
+        pipeline_status["latest_message"] = message
+        pipeline_status["history_messages"].append(message)
+
+
+def _move_to_enqueued_dir(file_path: Path) -> None:
+    """Move an enqueued file to the __enqueued__ directory next to it"""
+    try:
+        enqueued_dir = file_path.parent / "__enqueued__"
+        enqueued_dir.mkdir(exist_ok=True)
+
+        # Generate unique filename to avoid conflicts
+        unique_filename = get_unique_filename_in_enqueued(enqueued_dir, file_path.name)
+        target_path = enqueued_dir / unique_filename
+
+        # Move the file
+        file_path.rename(target_path)
+        logger.debug(
+            f"Moved file to enqueued directory: {file_path.name} -> {unique_filename}"
+        )
+
+    except Exception as move_error:
+        logger.error(
+            f"Failed to move file {file_path.name} to __enqueued__ directory: {move_error}"
+        )
+        # Don't affect the main function's success status
+
+
+async def _iter_text_file_sections(
+    file_path: Path, section_size: int = 4 * 1024 * 1024
+) -> AsyncIterator[str]:
+    """Decode a UTF-8 text file in sections of about section_size bytes ending at line breaks"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async with aiofiles.open(file_path, "rb") as f:
+        while block := await f.read(section_size):
+            pending += decoder.decode(block)
+            cut = pending.rfind("\n") + 1
+            if not cut and len(pending) >= 2 * section_size:
+                cut = len(pending)  # No line break in sight, cut anywhere
+            if cut:
+                yield pending[:cut]
+                pending = pending[cut:]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def pipeline_enqueue_file_streaming(
+    rag: LightRAG,
+    file_path: Path,
+    track_id: str = None,
+    enqueue_after: Optional[asyncio.Event] = None,
+) -> tuple[bool, str]:
+    """Add a large file to the queue page by page without loading it into memory
+
+    Text files are decoded in sections and binary documents are extracted page by
+    page in the extraction pool. Sections are stored as segments of the document
+    in full_docs while the file is still being read.
+
+    Args:
+        rag: LightRAG instance
+        file_path: Path to the saved file
+        track_id: Optional tracking ID, if not provided will be generated
+        enqueue_after: Optional event to wait for before the document is enqueued
+    Returns:
+        tuple: (success: bool, track_id: str)
+    """
+    if track_id is None:
+        track_id = generate_track_id("unknown")
+
+    ext = file_path.suffix.lower()
+    file_type = ext[1:].upper()
+    try:
+        file_size = file_path.stat().st_size
+    except Exception:
+        file_size = 0
+
+    if ext in POOL_EXTRACTED_EXTENSIONS:
+        segments = get_file_extraction_pool(
+            global_args.file_extraction_workers,
+            global_args.file_extraction_timeout,
+            global_args.file_extraction_max_memory_mb,
+        ).extract_segments(file_path, ext, global_args.document_loading_engine)
+    else:
+        segments = _iter_text_file_sections(file_path)
+
+    await _report_extraction_progress(
+        f"Extracting {file_path.name} page by page ({file_size / 1024 / 1024:.1f} MB)",
+        running=1,
+    )
+    start_time = time.perf_counter()
+    try:
+        if enqueue_after is not None:
+            # Segments are enqueued while they are extracted, so wait for the turn first
+            await enqueue_after.wait()
+        async with aclosing(segments):
+            enqueued = await rag.apipeline_enqueue_document_stream(
+                segments, file_path=file_path.name, track_id=track_id
+            )
+    except Exception as e:
+        if isinstance(e, FileExtractionTimeoutError):
+            error_description = "[File Extraction]Extraction timeout"
+        elif isinstance(e, MemoryError):
+            error_description = "[File Extraction]Extraction memory limit exceeded"
+        elif isinstance(e, UnicodeDecodeError):
+            error_description = "[File Extraction]UTF-8 encoding error, please convert it to UTF-8 before processing"
+        else:
+            error_description = f"[File Extraction]{file_type} processing error"
+        await _report_extraction_progress(
+            f"Failed to extract {file_path.name}: {error_description}",
+            running=-1,
+            failed=1,
+        )
+        error_files = [
+            {
+                "file_path": str(file_path.name),
+                "error_description": error_description,
+                "original_error": f"Failed to stream text from {file_type}: {str(e)}",
+                "file_size": file_size,
+            }
+        ]
+        await rag.apipeline_enqueue_error_documents(error_files, track_id)
+        logger.error(
+            f"[File Extraction]Error streaming {file_type} {file_path.name}: {str(e)}"
+        )
+        return False, track_id
+
+    await _report_extraction_progress(
+        f"Extracted {file_path.name} page by page in {time.perf_counter() - start_time:.1f}s",
+        running=-1,
+        completed=1,
+    )
+    if enqueued:
+        logger.info(f"Successfully extracted and enqueued file: {file_path.name}")
+    _move_to_enqueued_dir(file_path)
+    return True, track_id
+
+
 async def pipeline_enqueue_file(
-    rag: LightRAG, file_path: Path, track_id: str = None
+    rag: LightRAG,
+    file_path: Path,
+    track_id: str = None,
+    enqueue_after: Optional[asyncio.Event] = None,
 ) -> tuple[bool, str]:
     """Add a file to the queue for processing
 
@@ -841,6 +1050,8 @@ async def pipeline_enqueue_file(
         rag: LightRAG instance
         file_path: Path to the saved file
         track_id: Optional tracking ID, if not provided will be generated
+        enqueue_after: Optional event to wait for between extraction and enqueueing,
+            used to enqueue concurrently extracted files in order
     Returns:
         tuple: (success: bool, track_id: str)
     """
@@ -860,10 +1071,23 @@ async def pipeline_enqueue_file(
         except Exception:
             file_size = 0
 
+        # Very large files are stored and chunked page by page
+        threshold_mb = global_args.streaming_ingest_threshold_mb
+        if (
+            threshold_mb > 0
+            and file_size >= threshold_mb * 1024 * 1024
+            and (ext in TEXT_FILE_EXTENSIONS or ext in POOL_EXTRACTED_EXTENSIONS)
+        ):
+            return await pipeline_enqueue_file_streaming(
+                rag, file_path, track_id, enqueue_after
+            )
+
         file = None
         try:
             async with aiofiles.open(file_path, "rb") as f:
-                file = await f.read()
+                # Binary documents are read by the extraction worker itself
+                if ext not in POOL_EXTRACTED_EXTENSIONS:
+                    file = await f.read()
         except PermissionError as e:
             error_files = [
                 {
@@ -908,41 +1132,7 @@ async def pipeline_enqueue_file(
         # Process based on file type
         try:
             match ext:
-                case (
-                    ".txt"
-                    | ".md"
-                    | ".html"
-                    | ".htm"
-                    | ".tex"
-                    | ".json"
-                    | ".xml"
-                    | ".yaml"
-                    | ".yml"
-                    | ".rtf"
-                    | ".odt"
-                    | ".epub"
-                    | ".csv"
-                    | ".log"
-                    | ".conf"
-                    | ".ini"
-                    | ".properties"
-                    | ".sql"
-                    | ".bat"
-                    | ".sh"
-                    | ".c"
-                    | ".cpp"
-                    | ".py"
-                    | ".java"
-                    | ".js"
-                    | ".ts"
-                    | ".swift"
-                    | ".go"
-                    | ".rb"
-                    | ".php"
-                    | ".css"
-                    | ".scss"
-                    | ".less"
-                ):
+                case _ if ext in TEXT_FILE_EXTENSIONS:
                     try:
                         # Try to decode as UTF-8
                         content = file.decode("utf-8")
@@ -1000,112 +1190,39 @@ async def pipeline_enqueue_file(
                         )
                         return False, track_id
 
-                case ".pdf":
+                case ".pdf" | ".docx" | ".pptx" | ".xlsx":
+                    file_type = ext[1:].upper()
+                    await _report_extraction_progress(
+                        f"Extracting {file_path.name}", running=1
+                    )
+                    start_time = time.perf_counter()
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("pypdf2"):  # type: ignore
-                                pm.install("pypdf2")
-                            from PyPDF2 import PdfReader  # type: ignore
-                            from io import BytesIO
-
-                            pdf_file = BytesIO(file)
-                            reader = PdfReader(pdf_file)
-                            for page in reader.pages:
-                                content += page.extract_text() + "\n"
+                        content = await get_file_extraction_pool(
+                            global_args.file_extraction_workers,
+                            global_args.file_extraction_timeout,
+                            global_args.file_extraction_max_memory_mb,
+                        ).extract(file_path, ext, global_args.document_loading_engine)
                     except Exception as e:
-                        error_files = [
-                            {
-                                "file_path": str(file_path.name),
-                                "error_description": "[File Extraction]PDF processing error",
-                                "original_error": f"Failed to extract text from PDF: {str(e)}",
-                                "file_size": file_size,
-                            }
-                        ]
-                        await rag.apipeline_enqueue_error_documents(
-                            error_files, track_id
-                        )
-                        logger.error(
-                            f"[File Extraction]Error processing PDF {file_path.name}: {str(e)}"
-                        )
-                        return False, track_id
-
-                case ".docx":
-                    try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
+                        if isinstance(e, FileExtractionTimeoutError):
+                            error_description = "[File Extraction]Extraction timeout"
+                        elif isinstance(e, MemoryError):
+                            error_description = (
+                                "[File Extraction]Extraction memory limit exceeded"
+                            )
                         else:
-                            if not pm.is_installed("python-docx"):  # type: ignore
-                                try:
-                                    pm.install("python-docx")
-                                except Exception:
-                                    pm.install("docx")
-                            from docx import Document  # type: ignore
-                            from io import BytesIO
-
-                            docx_file = BytesIO(file)
-                            doc = Document(docx_file)
-                            content = "\n".join(
-                                [paragraph.text for paragraph in doc.paragraphs]
+                            error_description = (
+                                f"[File Extraction]{file_type} processing error"
                             )
-                    except Exception as e:
-                        error_files = [
-                            {
-                                "file_path": str(file_path.name),
-                                "error_description": "[File Extraction]DOCX processing error",
-                                "original_error": f"Failed to extract text from DOCX: {str(e)}",
-                                "file_size": file_size,
-                            }
-                        ]
-                        await rag.apipeline_enqueue_error_documents(
-                            error_files, track_id
+                        await _report_extraction_progress(
+                            f"Failed to extract {file_path.name}: {error_description}",
+                            running=-1,
+                            failed=1,
                         )
-                        logger.error(
-                            f"[File Extraction]Error processing DOCX {file_path.name}: {str(e)}"
-                        )
-                        return False, track_id
-
-                case ".pptx":
-                    try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("python-pptx"):  # type: ignore
-                                pm.install("pptx")
-                            from pptx import Presentation  # type: ignore
-                            from io import BytesIO
-
-                            pptx_file = BytesIO(file)
-                            prs = Presentation(pptx_file)
-                            for slide in prs.slides:
-                                for shape in slide.shapes:
-                                    if hasattr(shape, "text"):
-                                        content += shape.text + "\n"
-                    except Exception as e:
                         error_files = [
                             {
                                 "file_path": str(file_path.name),
-                                "error_description": "[File Extraction]PPTX processing error",
-                                "original_error": f"Failed to extract text from PPTX: {str(e)}",
+                                "error_description": error_description,
+                                "original_error": f"Failed to extract text from {file_type}: {str(e)}",
                                 "file_size": file_size,
                             }
                         ]
@@ -1113,55 +1230,15 @@ async def pipeline_enqueue_file(
                             error_files, track_id
                         )
                         logger.error(
-                            f"[File Extraction]Error processing PPTX {file_path.name}: {str(e)}"
+                            f"[File Extraction]Error processing {file_type} {file_path.name}: {str(e)}"
                         )
                         return False, track_id
 
-                case ".xlsx":
-                    try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("openpyxl"):  # type: ignore
-                                pm.install("openpyxl")
-                            from openpyxl import load_workbook  # type: ignore
-                            from io import BytesIO
-
-                            xlsx_file = BytesIO(file)
-                            wb = load_workbook(xlsx_file)
-                            for sheet in wb:
-                                content += f"Sheet: {sheet.title}\n"
-                                for row in sheet.iter_rows(values_only=True):
-                                    content += (
-                                        "\t".join(
-                                            str(cell) if cell is not None else ""
-                                            for cell in row
-                                        )
-                                        + "\n"
-                                    )
-                                content += "\n"
-                    except Exception as e:
-                        error_files = [
-                            {
-                                "file_path": str(file_path.name),
-                                "error_description": "[File Extraction]XLSX processing error",
-                                "original_error": f"Failed to extract text from XLSX: {str(e)}",
-                                "file_size": file_size,
-                            }
-                        ]
-                        await rag.apipeline_enqueue_error_documents(
-                            error_files, track_id
-                        )
-                        logger.error(
-                            f"[File Extraction]Error processing XLSX {file_path.name}: {str(e)}"
-                        )
-                        return False, track_id
+                    await _report_extraction_progress(
+                        f"Extracted {file_path.name}: {len(content)} characters in {time.perf_counter() - start_time:.1f}s",
+                        running=-1,
+                        completed=1,
+                    )
 
                 case _:
                     error_files = [
@@ -1212,6 +1289,8 @@ async def pipeline_enqueue_file(
                 return False, track_id
 
             try:
+                if enqueue_after is not None:
+                    await enqueue_after.wait()
                 await rag.apipeline_enqueue_documents(
                     content, file_paths=file_path.name, track_id=track_id
                 )
@@ -1221,27 +1300,7 @@ async def pipeline_enqueue_file(
                 )
 
                 # Move file to __enqueued__ directory after enqueuing
-                try:
-                    enqueued_dir = file_path.parent / "__enqueued__"
-                    enqueued_dir.mkdir(exist_ok=True)
-
-                    # Generate unique filename to avoid conflicts
-                    unique_filename = get_unique_filename_in_enqueued(
-                        enqueued_dir, file_path.name
-                    )
-                    target_path = enqueued_dir / unique_filename
-
-                    # Move the file
-                    file_path.rename(target_path)
-                    logger.debug(
-                        f"Moved file to enqueued directory: {file_path.name} -> {unique_filename}"
-                    )
-
-                except Exception as move_error:
-                    logger.error(
-                        f"Failed to move file {file_path.name} to __enqueued__ directory: {move_error}"
-                    )
-                    # Don't affect the main function's success status
+                _move_to_enqueued_dir(file_path)
 
                 return True, track_id
 
@@ -1320,7 +1379,7 @@ async def pipeline_index_file(rag: LightRAG, file_path: Path, track_id: str = No
 async def pipeline_index_files(
     rag: LightRAG, file_paths: List[Path], track_id: str = None
 ):
-    """Index multiple files sequentially to avoid high CPU load
+    """Index multiple files, extracting at most file_extraction_workers of them at once
 
     Args:
         rag: LightRAG instance
@@ -1330,18 +1389,38 @@ async def pipeline_index_files(
     if not file_paths:
         return
     try:
-        enqueued = False
-
         # Use get_pinyin_sort_key for Chinese pinyin sorting
         sorted_file_paths = sorted(
             file_paths, key=lambda p: get_pinyin_sort_key(str(p))
         )
 
-        # Process files sequentially with track_id
-        for file_path in sorted_file_paths:
-            success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
-            if success:
-                enqueued = True
+        # Extract files concurrently, bounded like the extraction pool, but enqueue
+        # them one at a time in sorted order: identical files cannot race past the
+        # duplicate check and documents keep the pinyin order
+        semaphore = asyncio.Semaphore(max(1, global_args.file_extraction_workers))
+        done_events = [asyncio.Event() for _ in sorted_file_paths]
+
+        async def enqueue_file(position: int, file_path: Path) -> bool:
+            previous = done_events[position - 1] if position else None
+            try:
+                async with semaphore:
+                    success, _ = await pipeline_enqueue_file(
+                        rag, file_path, track_id, enqueue_after=previous
+                    )
+                    return success
+            finally:
+                # A file that failed before its turn must still pass the turn on in order
+                if previous is not None:
+                    await previous.wait()
+                done_events[position].set()
+
+        results = await asyncio.gather(
+            *(
+                enqueue_file(position, file_path)
+                for position, file_path in enumerate(sorted_file_paths)
+            )
+        )
+        enqueued = any(results)
 
         # Process the queue only if at least one file was successfully enqueued
         if enqueued:
@@ -1959,6 +2038,8 @@ def create_document_routes(
                 rag.full_docs,
                 rag.full_entities,
                 rag.full_relations,
+                rag.entity_chunks,
+                rag.relation_chunks,
                 rag.entities_vdb,
                 rag.relationships_vdb,
                 rag.chunks_vdb,
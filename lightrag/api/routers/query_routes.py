@@ -73,6 +73,12 @@ class QueryRequest(BaseModel):
         ge=1,
     )
 
+    retrieval_branch_timeout: Optional[float] = Field(
+        default=None,
+        description="Deadline in seconds for each concurrent retrieval branch (local, global, vector). A branch missing the deadline contributes no results.",
+        gt=0,
+    )
+
     conversation_history: Optional[List[Dict[str, Any]]] = Field(
         default=None,
         description="Stores past conversation history to maintain context. Format: [{'role': 'user/assistant', 'content': 'message'}].",
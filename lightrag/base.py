@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from enum import Enum
 import os
+import numpy as np
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
 from typing import (
@@ -25,6 +27,7 @@ from .constants import (
     DEFAULT_MAX_ENTITY_TOKENS,
     DEFAULT_MAX_RELATION_TOKENS,
     DEFAULT_MAX_TOTAL_TOKENS,
+    DEFAULT_RETRIEVAL_BRANCH_TIMEOUT,
     DEFAULT_HISTORY_TURNS,
     DEFAULT_OLLAMA_MODEL_NAME,
     DEFAULT_OLLAMA_MODEL_TAG,
@@ -130,6 +133,16 @@ class QueryParam:
     )
     """Maximum total tokens budget for the entire query context (entities + relations + chunks + system prompt)."""
 
+    retrieval_branch_timeout: float | None = (
+        float(
+            os.getenv("RETRIEVAL_BRANCH_TIMEOUT", str(DEFAULT_RETRIEVAL_BRANCH_TIMEOUT))
+        )
+        or None
+    )
+    """Deadline in seconds for each concurrent retrieval branch (local, global, vector).
+    A branch that misses the deadline contributes no results instead of delaying the query. None disables the deadline.
+    """
+
     hl_keywords: list[str] = field(default_factory=list)
     """List of high-level keywords to prioritize in retrieval."""
 
@@ -233,6 +246,61 @@ class BaseVectorStorage(StorageNameSpace, ABC):
                            If provided, skips embedding computation for better performance.
         """
 
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Query the vector storage with several queries at once.
+
+        All queries without a pre-computed embedding are embedded in a single
+        embedding_func call. The default implementation then runs one query()
+        per embedding; backends that can search many vectors in one matrix
+        operation or one round-trip should override this method.
+
+        Args:
+            queries: The query strings to search for
+            top_k: Number of top results to return for each query
+            embeddings: Optional pre-computed embeddings aligned with queries
+
+        Returns:
+            One result list per query, in the same order as queries
+        """
+        if not queries:
+            return []
+        embeddings = await self._embed_queries(queries, embeddings)
+        return list(
+            await asyncio.gather(
+                *[
+                    self.query(query, top_k=top_k, query_embedding=embedding)
+                    for query, embedding in zip(queries, embeddings)
+                ]
+            )
+        )
+
+    async def _embed_queries(
+        self,
+        queries: list[str],
+        embeddings: list[list[float]] | None = None,
+    ) -> list[Any]:
+        """Fill in missing query embeddings with one embedding_func call"""
+        if embeddings is None:
+            embeddings = [None] * len(queries)
+        elif len(embeddings) != len(queries):
+            raise ValueError(
+                f"embeddings is not 1-1 with queries, {len(embeddings)} != {len(queries)}"
+            )
+        missing = [i for i, e in enumerate(embeddings) if e is None]
+        if missing:
+            computed = await self.embedding_func(
+                [queries[i] for i in missing], _priority=5
+            )  # higher priority for query
+            embeddings = list(embeddings)
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+        return embeddings
+
     @abstractmethod
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """Insert or update vectors in the storage.
@@ -313,6 +381,26 @@ class BaseVectorStorage(StorageNameSpace, ABC):
         """
         pass
 
+    async def get_vectors_matrix(self, ids: list[str]) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as one contiguous float32 matrix
+
+        IDs without a stored vector are skipped. The default implementation
+        converts the result of get_vectors_by_ids; in-process backends override
+        it to fill the matrix without building Python lists.
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Tuple of (found IDs, float32 array of shape (len(found IDs), embedding_dim)),
+            row i holding the vector of found IDs[i]
+        """
+        vectors = await self.get_vectors_by_ids(ids)
+        found_ids = [i for i in ids if i in vectors]
+        if not found_ids:
+            return [], np.empty((0, self.embedding_func.embedding_dim), np.float32)
+        return found_ids, np.array([vectors[i] for i in found_ids], dtype=np.float32)
+
 
 @dataclass
 class BaseKVStorage(StorageNameSpace, ABC):
@@ -600,6 +688,35 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Insert or update multiple nodes as a batch using UNWIND
+
+        Default implementation upserts nodes one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        for node_id, node_data in nodes:
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges as a batch using UNWIND
+
+        Both endpoints of every edge must exist (or be part of a preceding
+        upsert_nodes_batch call). Default implementation upserts edges one by one.
+        Override this method for better performance in storage backends
+        that support batch operations.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
@@ -10,6 +10,26 @@ consistency and makes maintenance easier.
 DEFAULT_WOKERS = 2
 DEFAULT_MAX_GRAPH_NODES = 1000
 
+# Documents longer than this many characters are chunked off the event loop (0 disables)
+DEFAULT_CHUNKING_OFFLOAD_THRESHOLD = 1_000_000
+# Number of worker processes used to chunk very large documents (when enabled)
+DEFAULT_CHUNKING_PROCESS_POOL_SIZE = 2
+# Characters per full_docs segment record of a streamed document
+DEFAULT_DOCUMENT_SEGMENT_SIZE = 1_000_000
+# Chunks of a streamed document stored and extracted together
+DEFAULT_STREAM_CHUNK_BATCH_SIZE = 256
+# full_docs record listing the segment prefixes of document streams still being written
+PENDING_SEGMENTS_KEY = "docseg-pending"
+# Segments of a stream unfinished after this many seconds are treated as orphans
+DEFAULT_ORPHAN_SEGMENT_MAX_AGE = 24 * 3600
+
+# Texts shorter than this many characters are tokenized inline on the event loop
+DEFAULT_TOKENIZER_OFFLOAD_MIN_CHARS = 20000
+# Number of worker threads shared by all tokenizers for off-loop tokenization
+DEFAULT_TOKENIZER_MAX_WORKERS = 4
+# Maximum number of memoized token counts per tokenizer (0 disables the cache)
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 100_000
+
 # Default values for extraction settings
 DEFAULT_SUMMARY_LANGUAGE = "English"  # Default language for document processing
 DEFAULT_MAX_GLEANING = 1
@@ -22,6 +42,21 @@ DEFAULT_SUMMARY_MAX_TOKENS = 1200
 DEFAULT_SUMMARY_LENGTH_RECOMMENDED = 600
 # Maximum token size sent to LLM for summary
 DEFAULT_SUMMARY_CONTEXT_SIZE = 12000
+# Maximum description groups of one entity/relation summarized concurrently
+DEFAULT_SUMMARY_MAX_PARALLEL = 4
+
+# Maximum chunk ids kept in the source_id of an entity / relation (0 = unlimited),
+# the full list is kept in the entity_chunks / relation_chunks KV storages
+DEFAULT_MAX_SOURCE_IDS_PER_ENTITY = 300
+DEFAULT_MAX_SOURCE_IDS_PER_RELATION = 300
+# Which chunk ids the capped source_id keeps:
+#   FIFO: the most recent ones (oldest are evicted first)
+#   KEEP: the first ones (new chunk ids only go to the full list once the cap is reached)
+#   FREQUENT: the ones most often mentioning the entity / relation (ties favour recent)
+SOURCE_IDS_LIMIT_METHOD_FIFO = "FIFO"
+SOURCE_IDS_LIMIT_METHOD_KEEP = "KEEP"
+SOURCE_IDS_LIMIT_METHOD_FREQUENT = "FREQUENT"
+DEFAULT_SOURCE_IDS_LIMIT_METHOD = SOURCE_IDS_LIMIT_METHOD_FIFO
 # Default entities to extract if ENTITY_TYPES is not specified in .env
 DEFAULT_ENTITY_TYPES = [
     "Person",
@@ -49,6 +84,8 @@ DEFAULT_MAX_TOTAL_TOKENS = 30000
 DEFAULT_COSINE_THRESHOLD = 0.2
 DEFAULT_RELATED_CHUNK_NUMBER = 5
 DEFAULT_KG_CHUNK_PICK_METHOD = "VECTOR"
+# Per-branch deadline (seconds) for local/global/vector retrieval, 0 disables it
+DEFAULT_RETRIEVAL_BRANCH_TIMEOUT = 0
 
 # TODO: Deprated. All conversation_history messages is send to LLM.
 DEFAULT_HISTORY_TURNS = 0
@@ -57,6 +94,26 @@ DEFAULT_HISTORY_TURNS = 0
 DEFAULT_MIN_RERANK_SCORE = 0.0
 DEFAULT_RERANK_BINDING = "null"
 
+# JsonKVStorage journal compaction: rewrite the snapshot once the append-only journal
+# exceeds this fraction of the snapshot size (and the minimum size below)
+DEFAULT_KV_JOURNAL_COMPACT_RATIO = 0.5
+DEFAULT_KV_JOURNAL_MIN_COMPACT_BYTES = 16 * 1024 * 1024
+
+# NetworkXStorage binary snapshots: append changes to a delta log and rewrite the
+# snapshot once the log exceeds this fraction of the snapshot size (0 disables deltas)
+DEFAULT_NETWORKX_DELTA_COMPACT_RATIO = 0.25
+# Also write graph_<namespace>.graphml on every full snapshot (for external tools)
+DEFAULT_NETWORKX_GRAPHML_EXPORT = False
+
+# Pooled HTTP clients of the LLM/embedding bindings (openai, azure_openai, ollama, jina)
+DEFAULT_LLM_HTTP_MAX_CONNECTIONS = 100
+DEFAULT_LLM_HTTP_MAX_KEEPALIVE = 100
+DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_LLM_HTTP2 = True
+
+# SQLite storages: milliseconds a writer waits for another process holding the write lock
+DEFAULT_SQLITE_BUSY_TIMEOUT = 30000
+
 # File path configuration for vector and graph database(Should not be changed, used in Milvus Schema)
 DEFAULT_MAX_FILE_PATH_LENGTH = 32768
 
@@ -66,10 +123,26 @@ DEFAULT_TEMPERATURE = 1.0
 # Async configuration defaults
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
+# Documents whose extraction results are merged together (0 or 1 = merge each document alone)
+DEFAULT_MERGE_BATCH_DOCS = 0
+# Seconds a partially filled merge batch waits for more documents
+DEFAULT_MERGE_BATCH_TIMEOUT = 30
+
+# File extraction (API server) defaults
+DEFAULT_FILE_EXTRACTION_WORKERS = 2  # Worker processes parsing PDF/DOCX/PPTX/XLSX files
+DEFAULT_FILE_EXTRACTION_TIMEOUT = 600  # Seconds one file may take to extract
+DEFAULT_FILE_EXTRACTION_MAX_MEMORY_MB = (
+    0  # Address-space cap per worker (0 = unlimited)
+)
+DEFAULT_STREAMING_INGEST_THRESHOLD_MB = 64  # Larger files are ingested page by page
 
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
+# Seconds a partially filled vector upsert batch waits for more items during merging
+DEFAULT_VDB_UPSERT_FLUSH_INTERVAL = 0.05
+# Max size in MB of the persistent embedding result cache (vectors keyed by model and text)
+DEFAULT_EMBEDDING_RESULT_CACHE_MAX_MB = 256
 
 # Gunicorn worker timeout
 DEFAULT_TIMEOUT = 300
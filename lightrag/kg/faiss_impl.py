@@ -18,6 +18,27 @@ from .shared_storage import (
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
 import faiss  # type: ignore
 
+# Metadata file layout: {"version", "next_fid", "meta": {fid: meta}, ...}, vectors live in the index only
+META_FORMAT_VERSION = 2
+
+# Supported index types, configured with vector_db_storage_cls_kwargs["index_type"]
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+
+# Defaults for the ANN index parameters, each overridable in vector_db_storage_cls_kwargs
+DEFAULT_ANN_PARAMS = {
+    "hnsw_m": 32,  # HNSW graph degree
+    "hnsw_ef_construction": 200,  # HNSW build-time candidate list size
+    "hnsw_ef_search": 64,  # HNSW query-time candidate list size
+    "ivf_nlist": None,  # IVF cells, None picks 4 * sqrt(n) at training time
+    "ivf_nprobe": 16,  # IVF cells visited per query
+    "ivf_pq_m": 16,  # PQ sub-quantizers, lowered to a divisor of the dimension
+    "ivf_pq_nbits": 8,  # bits per PQ code
+    "train_min_vectors": 10000,  # IVF indexes stay exact (flat) below this size
+    "train_size": 100000,  # IVF training uses the first N vectors
+    "retrain_growth": 4.0,  # retrain ivf_flat once the corpus grows by this factor
+    "tombstone_compact_ratio": 0.2,  # rebuild HNSW once this fraction is deleted
+}
+
 
 @final
 @dataclass
@@ -25,6 +46,16 @@ class FaissVectorDBStorage(BaseVectorStorage):
     """
     A Faiss-based Vector DB Storage for LightRAG.
     Uses cosine similarity by storing normalized vectors in a Faiss index with inner product search.
+
+    The index type is set with vector_db_storage_cls_kwargs["index_type"]:
+    - flat (default): exact IndexFlatIP search
+    - hnsw: IndexHNSWFlat graph, deletes are tombstoned and compacted on save
+    - ivf_flat / ivf_pq: inverted file index (with product quantization for ivf_pq),
+      trained on the first `train_size` vectors once `train_min_vectors` exist.
+      ivf_flat is retrained when the corpus grows by `retrain_growth`. ivf_pq is
+      trained once: it only keeps PQ codes, and retraining on their decoded
+      vectors would compound the quantization error with every cycle.
+    See DEFAULT_ANN_PARAMS for the tunable parameters.
     """
 
     def __post_init__(self):
@@ -60,14 +91,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
-        # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
-        # Keep a local store for metadata, IDs, etc.
-        # Maps <int faiss_id> → metadata (including your original ID).
-        self._id_to_meta = {}
+        # Index type and ANN parameters
+        self._index_type = str(kwargs.get("index_type", "flat")).lower()
+        if self._index_type not in INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported Faiss index_type '{self._index_type}', "
+                f"expected one of: {', '.join(INDEX_TYPES)}"
+            )
+        self._ann_params = {
+            name: kwargs.get(name, default)
+            for name, default in DEFAULT_ANN_PARAMS.items()
+        }
 
+        self._reset_index()
         self._load_faiss_index()
 
     async def initialize(self):
@@ -87,12 +123,176 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
             return self._index
 
+    def _create_index(self):
+        """
+        Create an empty Faiss index for inner product (cosine similarity on normalized vectors).
+        IndexIDMap2 keeps explicit int64 ids, so vectors can be removed and reconstructed by id.
+        IVF indexes start out flat and are trained once enough vectors exist.
+        """
+        if self._index_type == "hnsw":
+            hnsw = faiss.IndexHNSWFlat(
+                self._dim, int(self._ann_params["hnsw_m"]), faiss.METRIC_INNER_PRODUCT
+            )
+            hnsw.hnsw.efConstruction = int(self._ann_params["hnsw_ef_construction"])
+            return faiss.IndexIDMap2(hnsw)
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+
+    def _reset_index(self):
+        self._index = self._create_index()
+        # Keep a local store for metadata, IDs, etc.
+        # Maps <int faiss_id> → metadata (including your original ID), without the vector.
+        self._id_to_meta: dict[int, dict[str, Any]] = {}
+        # Maps <custom id> → <int faiss_id>
+        self._custom_id_to_fid: dict[str, int] = {}
+        # Next faiss id to hand out, ids are never reused for new custom ids
+        self._next_fid = 0
+        # Deleted faiss ids still present in indexes without remove support (HNSW)
+        self._tombstones: set[int] = set()
+        # Number of vectors the IVF index was trained with, 0 while untrained
+        self._trained_size = 0
+
+    def _is_hnsw_index(self) -> bool:
+        return isinstance(self._index, faiss.IndexIDMap2) and isinstance(
+            faiss.downcast_index(self._index.index), faiss.IndexHNSWFlat
+        )
+
+    def _index_matches_config(self) -> bool:
+        """Check whether the loaded index has the layout of the configured index_type"""
+        is_flat = isinstance(self._index, faiss.IndexIDMap2) and isinstance(
+            faiss.downcast_index(self._index.index), faiss.IndexFlat
+        )
+        if self._index_type == "hnsw":
+            return self._is_hnsw_index()
+        if self._index_type == "ivf_flat":
+            return isinstance(self._index, faiss.IndexIVFFlat) or (
+                is_flat and not self._trained_size
+            )
+        if self._index_type == "ivf_pq":
+            return isinstance(self._index, faiss.IndexIVFPQ) or (
+                is_flat and not self._trained_size
+            )
+        return is_flat
+
+    def _ivf_train_threshold(self) -> int:
+        # PQ codebooks need at least 2^nbits training points
+        threshold = int(self._ann_params["train_min_vectors"])
+        if self._index_type == "ivf_pq":
+            threshold = max(threshold, 2 ** int(self._ann_params["ivf_pq_nbits"]))
+        return threshold
+
+    def _needs_rebuild(self) -> bool:
+        """Decide whether the index should be (re)trained or compacted"""
+        live = len(self._id_to_meta)
+        if not self._index_matches_config():
+            return True
+        if self._index_type in ("ivf_flat", "ivf_pq"):
+            if not self._trained_size:
+                return live >= self._ivf_train_threshold()
+            if self._index_type == "ivf_pq":
+                # Original vectors are gone once encoded, see the class docstring
+                return False
+            return (
+                live >= float(self._ann_params["retrain_growth"]) * self._trained_size
+            )
+        if self._index_type == "hnsw" and self._index.ntotal:
+            ratio = len(self._tombstones) / self._index.ntotal
+            return ratio > float(self._ann_params["tombstone_compact_ratio"])
+        return False
+
+    def _live_ids_and_vectors(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return live faiss ids (in insertion order) and their stored vectors"""
+        ids = np.array(sorted(self._id_to_meta), dtype=np.int64)
+        if not len(ids):
+            return ids, np.zeros((0, self._dim), dtype=np.float32)
+        vectors = self._index.reconstruct_batch(ids)
+        return ids, np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def _build_ivf_index(self, ids: np.ndarray, vectors: np.ndarray):
+        n = len(ids)
+        nlist = self._ann_params["ivf_nlist"]
+        if nlist is None:
+            # ~39 training points per centroid is the minimum faiss recommends
+            nlist = min(int(4 * np.sqrt(n)), max(1, n // 39))
+        nlist = max(1, int(nlist))
+
+        quantizer = faiss.IndexFlatIP(self._dim)
+        if self._index_type == "ivf_pq":
+            pq_m = int(self._ann_params["ivf_pq_m"])
+            # The vector dimension must be a multiple of the number of sub-quantizers
+            while self._dim % pq_m:
+                pq_m -= 1
+            index = faiss.IndexIVFPQ(
+                quantizer,
+                self._dim,
+                nlist,
+                pq_m,
+                int(self._ann_params["ivf_pq_nbits"]),
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        else:
+            index = faiss.IndexIVFFlat(
+                quantizer, self._dim, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+        index.train(vectors[: int(self._ann_params["train_size"])])
+        # Hashtable direct map allows remove_ids and reconstruct by faiss id
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        index.add_with_ids(vectors, ids)
+        index.nprobe = int(self._ann_params["ivf_nprobe"])
+        return index
+
+    def _rebuild_index(self):
+        """
+        Rebuild the index from the live vectors: trains or retrains IVF indexes,
+        drops HNSW tombstones and converts an index loaded with another index_type.
+        """
+        if isinstance(self._index, faiss.IndexIVFPQ):
+            logger.warning(
+                f"[{self.workspace}] Converting the ivf_pq index of {self.namespace} "
+                f"to {self._index_type} from PQ-decoded vectors; re-embed the documents "
+                f"for exact vectors"
+            )
+        ids, vectors = self._live_ids_and_vectors()
+        trained_size = 0
+        if (
+            self._index_type in ("ivf_flat", "ivf_pq")
+            and len(ids) >= self._ivf_train_threshold()
+        ):
+            index = self._build_ivf_index(ids, vectors)
+            trained_size = len(ids)
+        else:
+            index = self._create_index()
+            if len(ids):
+                index.add_with_ids(vectors, ids)
+        self._index = index
+        self._trained_size = trained_size
+        self._tombstones = set()
+        logger.info(
+            f"[{self.workspace}] Rebuilt Faiss {self._index_type} index for {self.namespace} with {len(ids)} vectors"
+        )
+
+    def _search_params(self):
+        """Query-time parameters: efSearch and tombstone filter for HNSW, nprobe for IVF"""
+        if self._is_hnsw_index():
+            params = faiss.SearchParametersHNSW(
+                efSearch=int(self._ann_params["hnsw_ef_search"])
+            )
+            if self._tombstones:
+                batch = faiss.IDSelectorBatch(
+                    np.array(list(self._tombstones), dtype=np.int64)
+                )
+                params.sel = faiss.IDSelectorNot(batch)
+                # Keep the wrapped selector alive as long as the parameters
+                params._selector_ref = batch
+            return params
+        if isinstance(self._index, faiss.IndexIVF):
+            return faiss.SearchParametersIVF(nprobe=int(self._ann_params["ivf_nprobe"]))
+        return None
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Insert or update vectors in the Faiss index.
@@ -150,29 +350,30 @@ class FaissVectorDBStorage(BaseVectorStorage):
         faiss.normalize_L2(embeddings)
 
         # Upsert logic:
-        # 1. Identify which vectors to remove if they exist
-        # 2. Remove them
-        # 3. Add the new vectors
+        # 1. Reuse the faiss id of custom ids that already exist, remove their old vectors
+        # 2. Add the new vectors with explicit ids
+        index = await self._get_index()
+        fids = []
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
-            faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
+        for meta in list_data:
+            faiss_internal_id = self._custom_id_to_fid.get(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
+            if faiss_internal_id is None or self._is_hnsw_index():
+                # HNSW keeps tombstoned vectors, so updates need a fresh id
+                faiss_internal_id = self._next_fid
+                self._next_fid += 1
+            fids.append(faiss_internal_id)
 
         if existing_ids_to_remove:
             await self._remove_faiss_ids(existing_ids_to_remove)
 
-        # Step 2: Add new vectors
-        index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
+        index.add_with_ids(embeddings, np.array(fids, dtype=np.int64))
 
-        # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+        # Store metadata for each new ID, the vector itself lives only in the index
+        for fid, meta in zip(fids, list_data):
+            self._id_to_meta[fid] = meta
+            self._custom_id_to_fid[meta["__id__"]] = fid
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -185,47 +386,56 @@ class FaissVectorDBStorage(BaseVectorStorage):
         """
         Search by a textual query; returns top_k results with their metadata + similarity distance.
         """
-        if query_embedding is not None:
-            embedding = np.array([query_embedding], dtype=np.float32)
-        else:
-            embedding = await self.embedding_func(
-                [query], _priority=5
-            )  # higher priority for query
-            # embedding is shape (1, dim)
-            embedding = np.array(embedding, dtype=np.float32)
+        results = await self.query_batch([query], top_k, [query_embedding])
+        return results[0]
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search several queries with a single Faiss search call.
+        """
+        if not queries:
+            return []
+        embeddings = await self._embed_queries(queries, embeddings)
+        # embedding matrix is shape (n_queries, dim)
+        embedding = np.array(embeddings, dtype=np.float32)
 
         faiss.normalize_L2(embedding)  # we do in-place normalization
 
         # Perform the similarity search
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
-
-        distances = distances[0]
-        indices = indices[0]
+        distances, indices = index.search(
+            embedding, top_k, params=self._search_params()
+        )
 
-        results = []
-        for dist, idx in zip(distances, indices):
-            if idx == -1:
-                # Faiss returns -1 if no neighbor
-                continue
-
-            # Cosine similarity threshold
-            if dist < self.cosine_better_than_threshold:
-                continue
-
-            meta = self._id_to_meta.get(idx, {})
-            # Filter out __vector__ from query results to avoid returning large vector data
-            filtered_meta = {k: v for k, v in meta.items() if k != "__vector__"}
-            results.append(
-                {
-                    **filtered_meta,
-                    "id": meta.get("__id__"),
-                    "distance": float(dist),
-                    "created_at": meta.get("__created_at__"),
-                }
-            )
+        all_results = []
+        for query_distances, query_indices in zip(distances, indices):
+            results = []
+            for dist, idx in zip(query_distances, query_indices):
+                if idx == -1:
+                    # Faiss returns -1 if no neighbor
+                    continue
+
+                # Cosine similarity threshold
+                if dist < self.cosine_better_than_threshold:
+                    continue
+
+                meta = self._id_to_meta.get(int(idx), {})
+                results.append(
+                    {
+                        **meta,
+                        "id": meta.get("__id__"),
+                        "distance": float(dist),
+                        "created_at": meta.get("__created_at__"),
+                    }
+                )
+            all_results.append(results)
 
-        return results
+        return all_results
 
     @property
     def client_storage(self):
@@ -244,11 +454,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
         logger.debug(
             f"[{self.workspace}] Deleting {len(ids)} vectors from {self.namespace}"
         )
-        to_remove = []
-        for cid in ids:
-            fid = self._find_faiss_id_by_custom_id(cid)
-            if fid is not None:
-                to_remove.append(fid)
+        to_remove = [
+            self._custom_id_to_fid[cid] for cid in ids if cid in self._custom_id_to_fid
+        ]
 
         if to_remove:
             await self._remove_faiss_ids(to_remove)
@@ -299,35 +507,26 @@ class FaissVectorDBStorage(BaseVectorStorage):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
 
     async def _remove_faiss_ids(self, fid_list):
         """
-        Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        Remove a list of internal Faiss IDs from the index in one batched call.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
-
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
-
+        fids = np.array(list(set(fid_list)), dtype=np.int64)
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
-
-            self._id_to_meta = new_id_to_meta
+            if self._is_hnsw_index():
+                # HNSW does not support removal, filter the ids at query time instead
+                self._tombstones.update(fids.tolist())
+            elif isinstance(self._index, faiss.IndexIVF):
+                # The IVF hashtable direct map only accepts an id array
+                self._index.remove_ids(faiss.IDSelectorArray(fids))
+            else:
+                self._index.remove_ids(faiss.IDSelectorBatch(fids))
+            for fid in fids.tolist():
+                meta = self._id_to_meta.pop(fid, None)
+                if meta is not None:
+                    self._custom_id_to_fid.pop(meta.get("__id__"), None)
 
     def _save_faiss_index(self):
         """
@@ -335,12 +534,16 @@ class FaissVectorDBStorage(BaseVectorStorage):
         """
         faiss.write_index(self._index, self._faiss_index_file)
 
-        # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
-        # We'll keep the int -> dict, but JSON requires string keys.
-        serializable_dict = {}
-        for fid, meta in self._id_to_meta.items():
-            serializable_dict[str(fid)] = meta
+        # Save metadata to JSON. JSON requires string keys, so faiss ids are stored as strings.
+        # Vectors are not duplicated here, they are reconstructed from the index on demand.
+        serializable_dict = {
+            "version": META_FORMAT_VERSION,
+            "index_type": self._index_type,
+            "next_fid": self._next_fid,
+            "trained_size": self._trained_size,
+            "tombstones": sorted(self._tombstones),
+            "meta": {str(fid): meta for fid, meta in self._id_to_meta.items()},
+        }
 
         with open(self._meta_file, "w", encoding="utf-8") as f:
             json.dump(serializable_dict, f)
@@ -358,16 +561,29 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         try:
             # Load the Faiss index
-            self._index = faiss.read_index(self._faiss_index_file)
+            index = faiss.read_index(self._faiss_index_file)
             # Load metadata
             with open(self._meta_file, "r", encoding="utf-8") as f:
                 stored_dict = json.load(f)
 
-            # Convert string keys back to int
-            self._id_to_meta = {}
-            for fid_str, meta in stored_dict.items():
-                fid = int(fid_str)
-                self._id_to_meta[fid] = meta
+            if stored_dict.get("version") == META_FORMAT_VERSION:
+                self._index = index
+                self._id_to_meta = {
+                    int(fid_str): meta for fid_str, meta in stored_dict["meta"].items()
+                }
+                self._next_fid = stored_dict["next_fid"]
+                self._trained_size = stored_dict.get("trained_size", 0)
+                self._tombstones = set(stored_dict.get("tombstones", []))
+            else:
+                self._migrate_legacy_index(index, stored_dict)
+
+            self._custom_id_to_fid = {
+                meta["__id__"]: fid for fid, meta in self._id_to_meta.items()
+            }
+
+            if not self._index_matches_config():
+                # index_type changed since the index was written
+                self._rebuild_index()
 
             logger.info(
                 f"[{self.workspace}] Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
@@ -377,8 +593,30 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 f"[{self.workspace}] Failed to load Faiss index or metadata: {e}"
             )
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset_index()
+
+    def _migrate_legacy_index(self, index, stored_dict: dict[str, Any]):
+        """
+        Convert the legacy layout (positional IndexFlatIP + metadata carrying
+        __vector__ lists) into an IndexIDMap2 with vector-free metadata.
+        """
+        self._index = self._create_index()
+        self._id_to_meta = {}
+        fids = sorted(int(fid_str) for fid_str in stored_dict)
+        if fids:
+            vectors = index.reconstruct_n(0, index.ntotal)
+            keep = [fid for fid in fids if fid < len(vectors)]
+            self._index.add_with_ids(
+                np.ascontiguousarray(vectors[keep]), np.array(keep, dtype=np.int64)
+            )
+            for fid in keep:
+                meta = stored_dict[str(fid)]
+                meta.pop("__vector__", None)
+                self._id_to_meta[fid] = meta
+        self._next_fid = fids[-1] + 1 if fids else 0
+        logger.info(
+            f"[{self.workspace}] Migrated legacy Faiss metadata for {self.namespace}"
+        )
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -388,8 +626,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
                 return False  # Return error
@@ -397,6 +634,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
+                if self._needs_rebuild():
+                    # Train, retrain or compact off the event loop
+                    await asyncio.to_thread(self._rebuild_index)
                 # Save data to disk
                 self._save_faiss_index()
                 # Notify other processes that data has been updated
@@ -430,10 +670,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not metadata:
             return None
 
-        # Filter out __vector__ from metadata to avoid returning large vector data
-        filtered_metadata = {k: v for k, v in metadata.items() if k != "__vector__"}
         return {
-            **filtered_metadata,
+            **metadata,
             "id": metadata.get("__id__"),
             "created_at": metadata.get("__created_at__"),
         }
@@ -456,13 +694,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if fid is not None:
                 metadata = self._id_to_meta.get(fid, {})
                 if metadata:
-                    # Filter out __vector__ from metadata to avoid returning large vector data
-                    filtered_metadata = {
-                        k: v for k, v in metadata.items() if k != "__vector__"
-                    }
                     results.append(
                         {
-                            **filtered_metadata,
+                            **metadata,
                             "id": metadata.get("__id__"),
                             "created_at": metadata.get("__created_at__"),
                         }
@@ -487,14 +721,24 @@ class FaissVectorDBStorage(BaseVectorStorage):
         for id in ids:
             # Find the Faiss internal ID for the custom ID
             fid = self._find_faiss_id_by_custom_id(id)
-            if fid is not None and fid in self._id_to_meta:
-                metadata = self._id_to_meta[fid]
-                # Get the stored vector from metadata
-                if "__vector__" in metadata:
-                    vectors_dict[id] = metadata["__vector__"]
+            if fid is not None:
+                # Reconstruct the stored (normalized) vector from the index
+                vectors_dict[id] = self._index.reconstruct(fid).tolist()
 
         return vectors_dict
 
+    async def get_vectors_matrix(self, ids: list[str]) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as one float32 matrix reconstructed from the index"""
+        found_ids, fids = [], []
+        for id in ids:
+            fid = self._find_faiss_id_by_custom_id(id)
+            if fid is not None:
+                found_ids.append(id)
+                fids.append(fid)
+        if not fids:
+            return [], np.empty((0, self._dim), np.float32)
+        return found_ids, self._index.reconstruct_batch(np.array(fids, dtype=np.int64))
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
@@ -514,8 +758,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
 
                 # Remove storage files if they exist
                 if os.path.exists(self._faiss_index_file):
@@ -523,7 +766,6 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 if os.path.exists(self._meta_file):
                     os.remove(self._meta_file)
 
-                self._id_to_meta = {}
                 self._load_faiss_index()
 
                 # Notify other processes
@@ -1,3 +1,4 @@
+import json
 import os
 from dataclasses import dataclass
 from typing import Any, final
@@ -6,9 +7,13 @@ from lightrag.base import (
     BaseKVStorage,
 )
 from lightrag.utils import (
+    get_env_value,
     load_json,
     logger,
-    write_json,
+)
+from lightrag.constants import (
+    DEFAULT_KV_JOURNAL_COMPACT_RATIO,
+    DEFAULT_KV_JOURNAL_MIN_COMPACT_BYTES,
 )
 from lightrag.exceptions import StorageNotInitializedError
 from .shared_storage import (
@@ -21,6 +26,61 @@ from .shared_storage import (
     try_initialize_namespace,
 )
 
+# Journal size (relative to the snapshot) that triggers a snapshot rewrite
+KV_JOURNAL_COMPACT_RATIO = get_env_value(
+    "KV_JOURNAL_COMPACT_RATIO", DEFAULT_KV_JOURNAL_COMPACT_RATIO, float
+)
+# Journals smaller than this are never compacted
+KV_JOURNAL_MIN_COMPACT_BYTES = get_env_value(
+    "KV_JOURNAL_MIN_COMPACT_BYTES", DEFAULT_KV_JOURNAL_MIN_COMPACT_BYTES, int
+)
+
+
+def _fsync_directory(path: str) -> None:
+    """Make a rename in `path` durable (not supported on Windows)"""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def replay_kv_journal(journal_file_name: str, data: dict[str, Any]) -> int:
+    """Apply the records of a JsonKVStorage journal to `data` in place
+
+    A torn last line left by an interrupted write is dropped and truncated away.
+
+    Returns:
+        Number of journal records applied
+    """
+    if not os.path.exists(journal_file_name):
+        return 0
+
+    count = 0
+    valid_size = 0
+    with open(journal_file_name, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(
+                    f"Dropping incomplete journal record in {journal_file_name}"
+                )
+                break
+            valid_size += len(line)
+            if "v" in record:
+                data[record["k"]] = record["v"]
+            else:
+                data.pop(record["k"], None)
+            count += 1
+
+    if valid_size < os.path.getsize(journal_file_name):
+        with open(journal_file_name, "r+b") as f:
+            f.truncate(valid_size)
+    return count
+
 
 @final
 @dataclass
@@ -39,8 +99,14 @@ class JsonKVStorage(BaseKVStorage):
 
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        # Append-only journal of upserts/deletes applied on top of the snapshot file
+        self._journal_file_name = os.path.join(
+            workspace_dir, f"kv_store_{self.namespace}.journal.jsonl"
+        )
 
         self._data = None
+        # Keys changed since the last commit, shared across processes like _data
+        self._dirty_keys = None
         self._storage_lock = None
         self.storage_updated = None
 
@@ -52,8 +118,16 @@ class JsonKVStorage(BaseKVStorage):
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.final_namespace)
             self._data = await get_namespace_data(self.final_namespace)
+            self._dirty_keys = await get_namespace_data(
+                f"{self.final_namespace}_dirty_keys"
+            )
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
+                journal_count = self._replay_journal(loaded_data)
+                if journal_count:
+                    logger.info(
+                        f"[{self.workspace}] Process {os.getpid()} KV replayed {journal_count} journal records for {self.namespace}"
+                    )
                 async with self._storage_lock:
                     # Migrate legacy cache structure if needed
                     if self.namespace.endswith("_cache"):
@@ -71,18 +145,84 @@ class JsonKVStorage(BaseKVStorage):
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
             if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
-                )
+                dirty_keys = list(self._dirty_keys.keys())
+                if self._needs_compaction():
+                    self._write_snapshot()
+                else:
+                    # Append only the records changed since the last commit
+                    self._append_journal(dirty_keys)
+                    if self._needs_compaction():
+                        self._write_snapshot()
+                for key in dirty_keys:
+                    self._dirty_keys.pop(key, None)
+                await clear_all_update_flags(self.final_namespace)
 
-                # Calculate data count - all data is now flattened
-                data_count = len(data_dict)
+    def _replay_journal(self, data: dict[str, Any]) -> int:
+        """Apply journal records on top of the loaded snapshot
 
-                logger.debug(
-                    f"[{self.workspace}] Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
-                )
-                write_json(data_dict, self._file_name)
-                await clear_all_update_flags(self.final_namespace)
+        Returns:
+            Number of journal records applied
+        """
+        return replay_kv_journal(self._journal_file_name, data)
+
+    def _append_journal(self, keys: list[str]) -> None:
+        """Write one journal record per changed key: upserts carry the value, deletes omit it"""
+        if not keys:
+            return
+        lines = []
+        for key in keys:
+            if key in self._data:
+                record = {"k": key, "v": self._data[key]}
+            else:
+                record = {"k": key}
+            lines.append(json.dumps(record, ensure_ascii=False))
+
+        logger.debug(
+            f"[{self.workspace}] Process {os.getpid()} KV journaling {len(lines)} records to {self.namespace}"
+        )
+        with open(self._journal_file_name, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _needs_compaction(self) -> bool:
+        if not os.path.exists(self._file_name):
+            # No snapshot yet, write the first one
+            return True
+        if not os.path.exists(self._journal_file_name):
+            return False
+        journal_size = os.path.getsize(self._journal_file_name)
+        if journal_size < KV_JOURNAL_MIN_COMPACT_BYTES:
+            return False
+        return journal_size > KV_JOURNAL_COMPACT_RATIO * os.path.getsize(
+            self._file_name
+        )
+
+    def _write_snapshot(self, data: dict[str, Any] | None = None) -> None:
+        """Rewrite the full snapshot atomically, then discard the journal
+
+        The journal is removed only once the new snapshot is durable: the file is
+        fsynced before it replaces the old one, and the directory after that.
+
+        Args:
+            data: Records to write, defaults to the storage's data
+        """
+        if data is None:
+            data = dict(self._data) if hasattr(self._data, "_getvalue") else self._data
+
+        logger.debug(
+            f"[{self.workspace}] Process {os.getpid()} KV writting {len(data)} records to {self.namespace}"
+        )
+        tmp_file_name = self._file_name + ".tmp"
+        with open(tmp_file_name, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file_name, self._file_name)
+        _fsync_directory(os.path.dirname(self._file_name))
+        # Journal records are already contained in the new snapshot
+        if os.path.exists(self._journal_file_name):
+            os.remove(self._journal_file_name)
 
     async def get_all(self) -> dict[str, Any]:
         """Get all data from storage
@@ -175,6 +315,7 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            self._dirty_keys.update(dict.fromkeys(data, True))
             await set_all_update_flags(self.final_namespace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -196,6 +337,7 @@ class JsonKVStorage(BaseKVStorage):
                 result = self._data.pop(doc_id, None)
                 if result is not None:
                     any_deleted = True
+                    self._dirty_keys[doc_id] = True
 
             if any_deleted:
                 await set_all_update_flags(self.final_namespace)
@@ -217,9 +359,11 @@ class JsonKVStorage(BaseKVStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
-                await set_all_update_flags(self.final_namespace)
+                self._dirty_keys.clear()
+                # Persist the empty state as a fresh snapshot
+                self._write_snapshot()
+                await clear_all_update_flags(self.final_namespace)
 
-            await self.index_done_callback()
             logger.info(
                 f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
             )
@@ -272,8 +416,8 @@ class JsonKVStorage(BaseKVStorage):
             logger.info(
                 f"[{self.workspace}] Migrated {migration_count} legacy cache entries to flattened structure"
             )
-            # Persist migrated data immediately
-            write_json(migrated_data, self._file_name)
+            # Persist migrated data immediately, the journal is folded into the snapshot
+            self._write_snapshot(migrated_data)
 
         return migrated_data
 
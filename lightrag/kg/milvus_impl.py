@@ -1049,23 +1049,31 @@ class MilvusVectorDBStorage(BaseVectorStorage):
     async def query(
         self, query: str, top_k: int, query_embedding: list[float] = None
     ) -> list[dict[str, Any]]:
+        results = await self.query_batch([query], top_k, [query_embedding])
+        return results[0]
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Search several queries in a single Milvus search request"""
+        if not queries:
+            return []
+
         # Ensure collection is loaded before querying
         self._ensure_collection_loaded()
 
-        # Use provided embedding or compute it
-        if query_embedding is not None:
-            embedding = [query_embedding]  # Milvus expects a list of embeddings
-        else:
-            embedding = await self.embedding_func(
-                [query], _priority=5
-            )  # higher priority for query
+        # Use provided embeddings or compute the missing ones in one call
+        embeddings = await self._embed_queries(queries, embeddings)
 
         # Include all meta_fields (created_at is now always included)
         output_fields = list(self.meta_fields)
 
         results = self._client.search(
             collection_name=self.final_namespace,
-            data=embedding,
+            data=[list(e) for e in embeddings],  # Milvus expects a list of embeddings
             limit=top_k,
             output_fields=output_fields,
             search_params={
@@ -1074,13 +1082,16 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             },
         )
         return [
-            {
-                **dp["entity"],
-                "id": dp["id"],
-                "distance": dp["distance"],
-                "created_at": dp.get("created_at"),
-            }
-            for dp in results[0]
+            [
+                {
+                    **dp["entity"],
+                    "id": dp["id"],
+                    "distance": dp["distance"],
+                    "created_at": dp.get("created_at"),
+                }
+                for dp in hits
+            ]
+            for hits in results
         ]
 
     async def index_done_callback(self) -> None:
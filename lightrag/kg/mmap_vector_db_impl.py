@@ -0,0 +1,904 @@
+import base64
+import glob
+import json
+import os
+import time
+import asyncio
+from dataclasses import dataclass
+from typing import Any, final
+
+import numpy as np
+
+from lightrag.utils import logger, compute_mdhash_id
+from lightrag.base import BaseVectorStorage
+
+from .shared_storage import (
+    get_storage_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+# On-disk element types for the vector matrix. int8 stores unit vectors scaled by 127.
+SUPPORTED_VECTOR_DTYPES = {
+    "float32": np.float32,
+    "float16": np.float16,
+    "int8": np.int8,
+}
+INT8_SCALE = 127.0
+
+# Rows scored per matrix block, bounds the float32 copy made for float16/int8 files
+QUERY_BLOCK_ROWS = 65536
+# Minimum number of rows reserved in the .npy file
+MIN_CAPACITY = 1024
+
+
+@final
+@dataclass
+class MmapVectorDBStorage(BaseVectorStorage):
+    """
+    A local vector storage backed by a memory-mapped .npy matrix.
+
+    Files per namespace (inside the workspace directory):
+    - vdb_<namespace>.g<generation>.c<capacity>.npy: unit-normalized vectors,
+      float32/float16/int8, rows are append-only
+    - vdb_<namespace>.g<generation>.meta.json: columnar metadata snapshot written on compaction
+    - vdb_<namespace>.g<generation>.meta.log: JSON-lines journal of puts/deletes since the snapshot
+    - vdb_<namespace>.manifest.json: names of the live files above, committed row count,
+      capacity, log size and generation
+
+    Growing or compacting the matrix writes new files next to the live ones and
+    publishes them by atomically replacing the manifest; superseded files are
+    deleted afterwards. A crash at any point leaves the manifest pointing at a
+    complete, consistent set of files.
+
+    Worker processes map the same .npy file, so vector pages are shared through
+    the OS page cache instead of being copied per process. A process notified of
+    an update by another worker only replays the journal tail it has not seen,
+    so reloads cost O(changed rows). Updates and deletes tombstone the old row;
+    the matrix is compacted once the tombstoned fraction exceeds `compact_ratio`.
+
+    Config through vector_db_storage_cls_kwargs:
+    - cosine_better_than_threshold (required)
+    - vector_dtype: float32 (default), float16 or int8, env MMAP_VECTOR_DTYPE
+    - compact_ratio: tombstone fraction that triggers compaction (default 0.25)
+    """
+
+    def __post_init__(self):
+        # Initialize basic attributes
+        self._storage_lock = None
+        self.storage_updated = None
+
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        self._vector_dtype = kwargs.get(
+            "vector_dtype", os.getenv("MMAP_VECTOR_DTYPE", "float32")
+        ).lower()
+        if self._vector_dtype not in SUPPORTED_VECTOR_DTYPES:
+            raise ValueError(
+                f"Unsupported vector_dtype '{self._vector_dtype}', "
+                f"expected one of: {', '.join(SUPPORTED_VECTOR_DTYPES)}"
+            )
+        self._compact_ratio = float(kwargs.get("compact_ratio", 0.25))
+
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+            self.final_namespace = f"{self.workspace}_{self.namespace}"
+        else:
+            # Default behavior when workspace is empty
+            self.final_namespace = self.namespace
+            self.workspace = "_"
+            workspace_dir = working_dir
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        base_name = os.path.join(workspace_dir, f"vdb_{self.namespace}")
+        self._base_name = base_name
+        self._manifest_file = base_name + ".manifest.json"
+        # Legacy NanoVectorDB file, migrated on first load
+        self._legacy_file = base_name + ".json"
+
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        self._load()
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(self.final_namespace)
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_storage_lock(enable_logging=False)
+
+    # ------------------------------------------------------------------
+    # In-memory state
+    # ------------------------------------------------------------------
+
+    def _reset_state(self):
+        self._matrix = None  # np.memmap of shape (capacity, dim)
+        self._capacity = 0
+        self._rows = 0  # rows committed to the .npy file
+        self._generation = 0
+        self._log_size = 0  # bytes of the journal already applied
+        # Live files, as published in the manifest
+        self._matrix_file = self._generation_file(0, ".npy")
+        self._snapshot_file = self._generation_file(0, ".meta.json")
+        self._log_file = self._generation_file(0, ".meta.log")
+        # Files superseded by an unpublished growth, deleted after the manifest write
+        self._stale_files: list[str] = []
+        # Row-aligned columnar metadata, for committed and pending rows
+        self._ids: list[str | None] = []
+        self._created_at: list[int] = []
+        self._columns: dict[str, list[Any]] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._id_to_row: dict[str, int] = {}
+        # Rows appended since the last commit
+        self._pending_vectors: list[np.ndarray] = []
+        self._pending_log: list[dict[str, Any]] = []
+
+    def _has_pending_changes(self) -> bool:
+        return bool(self._pending_log)
+
+    def _generation_file(self, generation: int, suffix: str) -> str:
+        return f"{self._base_name}.g{generation}{suffix}"
+
+    def _open_matrix(self, capacity: int):
+        self._matrix = np.load(self._matrix_file, mmap_mode="r+")
+        if self._matrix.shape != (capacity, self._dim):
+            raise ValueError(
+                f"Vector file shape {self._matrix.shape} does not match manifest "
+                f"({capacity}, {self._dim}): {self._matrix_file}"
+            )
+        self._capacity = capacity
+
+    def _append_row(self, row_id: str, created_at: int, meta: dict[str, Any]) -> int:
+        row = len(self._ids)
+        self._ids.append(row_id)
+        self._created_at.append(created_at)
+        for column in self._columns.values():
+            column.append(None)
+        for key, value in meta.items():
+            column = self._columns.get(key)
+            if column is None:
+                column = [None] * (row + 1)
+                self._columns[key] = column
+            column[row] = value
+        if row >= len(self._alive):
+            grown = np.zeros(max(MIN_CAPACITY, 2 * len(self._alive)), dtype=bool)
+            grown[: len(self._alive)] = self._alive
+            self._alive = grown
+        self._alive[row] = True
+        self._id_to_row[row_id] = row
+        return row
+
+    def _tombstone_rows(self, rows: list[int]):
+        for row in rows:
+            row_id = self._ids[row]
+            if row_id is not None and self._id_to_row.get(row_id) == row:
+                del self._id_to_row[row_id]
+            self._ids[row] = None
+            self._alive[row] = False
+
+    def _apply_log_entry(self, entry: dict[str, Any]):
+        if entry["op"] == "put":
+            row = self._append_row(entry["id"], entry["created_at"], entry["meta"])
+            if row != entry["row"]:
+                raise ValueError(
+                    f"Journal row mismatch for {self.namespace}: {row} != {entry['row']}"
+                )
+        elif entry["op"] == "del":
+            self._tombstone_rows(entry["rows"])
+
+    def _row_meta(self, row: int) -> dict[str, Any]:
+        meta = {
+            key: column[row]
+            for key, column in self._columns.items()
+            if column[row] is not None
+        }
+        meta["__id__"] = self._ids[row]
+        meta["__created_at__"] = self._created_at[row]
+        return meta
+
+    def _row_result(self, row: int) -> dict[str, Any]:
+        meta = self._row_meta(row)
+        return {
+            **meta,
+            "id": meta["__id__"],
+            "created_at": meta["__created_at__"],
+        }
+
+    def _row_vector(self, row: int) -> np.ndarray:
+        """Return the unit-normalized float32 vector of a row"""
+        if row >= self._rows:
+            return self._pending_vectors[row - self._rows]
+        return self._dequantize(self._matrix[row])
+
+    # ------------------------------------------------------------------
+    # Encoding helpers
+    # ------------------------------------------------------------------
+
+    def _quantize(self, vectors: np.ndarray) -> np.ndarray:
+        if self._vector_dtype == "int8":
+            return np.clip(np.rint(vectors * INT8_SCALE), -127, 127).astype(np.int8)
+        return vectors.astype(SUPPORTED_VECTOR_DTYPES[self._vector_dtype])
+
+    def _dequantize(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self._vector_dtype == "int8":
+            vectors = vectors / INT8_SCALE
+        return vectors
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    # ------------------------------------------------------------------
+    # Loading and persistence
+    # ------------------------------------------------------------------
+
+    def _read_manifest(self) -> dict[str, Any] | None:
+        if not os.path.exists(self._manifest_file):
+            return None
+        with open(self._manifest_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        manifest = {
+            "dim": self._dim,
+            "dtype": self._vector_dtype,
+            "capacity": self._capacity,
+            "rows": self._rows,
+            "log_size": self._log_size,
+            "generation": self._generation,
+            "matrix_file": os.path.basename(self._matrix_file),
+            "snapshot_file": os.path.basename(self._snapshot_file),
+            "log_file": os.path.basename(self._log_file),
+        }
+        tmp_file = self._manifest_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self._manifest_file)
+
+    def _use_manifest_files(self, manifest: dict[str, Any]):
+        # Manifests written before generation-suffixed files name no files
+        directory = os.path.dirname(self._manifest_file)
+        for attr, key, legacy_suffix in (
+            ("_matrix_file", "matrix_file", ".npy"),
+            ("_snapshot_file", "snapshot_file", ".meta.json"),
+            ("_log_file", "log_file", ".meta.log"),
+        ):
+            name = manifest.get(key)
+            path = (
+                os.path.join(directory, name)
+                if name
+                else self._base_name + legacy_suffix
+            )
+            setattr(self, attr, path)
+
+    def _remove_files(self, files: list[str]):
+        """Best-effort removal of superseded files; other processes may still map them"""
+        for file_name in files:
+            try:
+                os.remove(file_name)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(
+                    f"[{self.workspace}] Could not remove superseded file {file_name}: {e}"
+                )
+
+    def _unreferenced_files(self) -> list[str]:
+        """Data files of this namespace that the current manifest does not name"""
+        live = {self._matrix_file, self._snapshot_file, self._log_file}
+        candidates = glob.glob(glob.escape(self._base_name) + ".g*")
+        candidates += [
+            self._base_name + suffix for suffix in (".npy", ".meta.json", ".meta.log")
+        ]
+        return [
+            file_name
+            for file_name in candidates
+            if file_name not in live and os.path.exists(file_name)
+        ]
+
+    def _replay_log(self, start: int, end: int):
+        if end <= start or not os.path.exists(self._log_file):
+            return
+        with open(self._log_file, "rb") as f:
+            f.seek(start)
+            payload = f.read(end - start)
+        for line in payload.splitlines():
+            if line:
+                self._apply_log_entry(json.loads(line))
+        self._log_size = end
+
+    def _load(self):
+        """Load the storage from disk, migrating a legacy NanoVectorDB file if needed"""
+        self._reset_state()
+        manifest = self._read_manifest()
+        if manifest is None:
+            if os.path.exists(self._legacy_file):
+                self._migrate_legacy_file()
+            return
+
+        if manifest["dim"] != self._dim:
+            raise ValueError(
+                f"Embedding dim mismatch, expected: {self._dim}, but loaded: {manifest['dim']}"
+            )
+        if manifest["dtype"] != self._vector_dtype:
+            logger.warning(
+                f"[{self.workspace}] {self.namespace} vectors are stored as {manifest['dtype']}, "
+                f"ignoring configured vector_dtype {self._vector_dtype}"
+            )
+            self._vector_dtype = manifest["dtype"]
+
+        self._generation = manifest["generation"]
+        self._rows = manifest["rows"]
+        self._use_manifest_files(manifest)
+        self._open_matrix(manifest["capacity"])
+
+        if os.path.exists(self._snapshot_file):
+            with open(self._snapshot_file, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self._ids = snapshot["ids"]
+            self._created_at = snapshot["created_at"]
+            self._columns = snapshot["columns"]
+            self._alive = np.zeros(max(MIN_CAPACITY, len(self._ids)), dtype=bool)
+            for row, row_id in enumerate(self._ids):
+                if row_id is not None:
+                    self._alive[row] = True
+                    self._id_to_row[row_id] = row
+
+        self._replay_log(0, manifest["log_size"])
+        if len(self._ids) != self._rows:
+            raise ValueError(
+                f"Metadata rows ({len(self._ids)}) do not match vector rows ({self._rows}) "
+                f"for {self.namespace}"
+            )
+        logger.info(
+            f"[{self.workspace}] Load {self.namespace}: {len(self._id_to_row)} vectors "
+            f"({self._vector_dtype}, {self._rows} rows)"
+        )
+
+    def _reload_incremental(self):
+        """Catch up with changes committed by another process"""
+        manifest = self._read_manifest()
+        if (
+            manifest is None
+            or manifest["generation"] != self._generation
+            or self._has_pending_changes()
+            or manifest["rows"] < self._rows
+        ):
+            # Compaction, drop or local uncommitted changes: reload everything
+            self._load()
+            return
+
+        if manifest["capacity"] != self._capacity:
+            # File was grown (replaced) by another process, remap it
+            self._use_manifest_files(manifest)
+            self._open_matrix(manifest["capacity"])
+        self._replay_log(self._log_size, manifest["log_size"])
+        self._rows = manifest["rows"]
+        logger.debug(
+            f"[{self.workspace}] {self.namespace} caught up to {self._rows} rows"
+        )
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._capacity:
+            return
+        new_capacity = max(rows, 2 * self._capacity, MIN_CAPACITY)
+        new_file = self._generation_file(self._generation, f".c{new_capacity}.npy")
+        new_matrix = np.lib.format.open_memmap(
+            new_file,
+            mode="w+",
+            dtype=SUPPORTED_VECTOR_DTYPES[self._vector_dtype],
+            shape=(new_capacity, self._dim),
+        )
+        if self._matrix is not None and self._rows:
+            new_matrix[: self._rows] = self._matrix[: self._rows]
+        new_matrix.flush()
+        del new_matrix
+        # The old file stays live until the manifest naming the new one is written;
+        # other processes keep reading it until they are notified and remap.
+        if self._matrix is not None:
+            self._stale_files.append(self._matrix_file)
+        self._matrix = None
+        self._matrix_file = new_file
+        self._open_matrix(new_capacity)
+
+    def _persist(self):
+        """Write pending rows to the matrix and the journal, then publish the manifest"""
+        if not self._has_pending_changes():
+            return
+
+        total_rows = len(self._ids)
+        self._ensure_capacity(total_rows)
+        if self._pending_vectors:
+            self._matrix[self._rows : total_rows] = self._quantize(
+                np.vstack(self._pending_vectors)
+            )
+        self._matrix.flush()
+
+        payload = "".join(
+            json.dumps(entry, ensure_ascii=False) + "\n" for entry in self._pending_log
+        ).encode("utf-8")
+        with open(self._log_file, "ab") as f:
+            # Drop a torn tail left by an interrupted commit
+            f.truncate(self._log_size)
+            f.seek(self._log_size)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_size += len(payload)
+        self._rows = total_rows
+        self._pending_vectors = []
+        self._pending_log = []
+
+        dead_rows = self._rows - len(self._id_to_row)
+        if self._rows and dead_rows / self._rows > self._compact_ratio:
+            self._compact()
+        else:
+            self._write_manifest()
+            self._remove_files(self._stale_files)
+            self._stale_files = []
+
+    def _compact(self):
+        """Rewrite the matrix and metadata snapshot without tombstoned rows
+
+        The compacted matrix, snapshot and an empty journal are written under the
+        next generation's file names, then published by replacing the manifest.
+        Files of the previous generation are deleted only after that.
+        """
+        alive_rows = np.flatnonzero(self._alive[: self._rows])
+        capacity = max(MIN_CAPACITY, 2 * len(alive_rows))
+        generation = self._generation + 1
+        matrix_file = self._generation_file(generation, f".c{capacity}.npy")
+        snapshot_file = self._generation_file(generation, ".meta.json")
+        log_file = self._generation_file(generation, ".meta.log")
+        new_matrix = np.lib.format.open_memmap(
+            matrix_file,
+            mode="w+",
+            dtype=SUPPORTED_VECTOR_DTYPES[self._vector_dtype],
+            shape=(capacity, self._dim),
+        )
+        for start in range(0, len(alive_rows), QUERY_BLOCK_ROWS):
+            block = alive_rows[start : start + QUERY_BLOCK_ROWS]
+            new_matrix[start : start + len(block)] = self._matrix[block]
+        new_matrix.flush()
+        del new_matrix
+
+        snapshot = {
+            "ids": [self._ids[row] for row in alive_rows],
+            "created_at": [self._created_at[row] for row in alive_rows],
+            "columns": {
+                key: [column[row] for row in alive_rows]
+                for key, column in self._columns.items()
+            },
+        }
+        with open(snapshot_file, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        with open(log_file, "wb"):
+            pass
+
+        removed = self._rows - len(alive_rows)
+        self._matrix = None
+        self._load_compacted(snapshot, capacity, generation)
+        self._matrix_file = matrix_file
+        self._snapshot_file = snapshot_file
+        self._log_file = log_file
+        self._open_matrix(capacity)
+        self._write_manifest()
+        # Also sweeps files left behind by a compaction that crashed before publishing
+        self._remove_files(self._unreferenced_files())
+        logger.info(
+            f"[{self.workspace}] Compacted {self.namespace}: removed {removed} tombstoned rows"
+        )
+
+    def _load_compacted(self, snapshot: dict[str, Any], capacity: int, generation):
+        self._reset_state()
+        self._generation = generation
+        self._ids = snapshot["ids"]
+        self._created_at = snapshot["created_at"]
+        self._columns = snapshot["columns"]
+        self._rows = len(self._ids)
+        self._alive = np.zeros(max(MIN_CAPACITY, self._rows), dtype=bool)
+        self._alive[: self._rows] = True
+        self._id_to_row = {row_id: row for row, row_id in enumerate(self._ids)}
+
+    def _migrate_legacy_file(self):
+        """Import a NanoVectorDB vdb_<namespace>.json file into the mmap layout"""
+        with open(self._legacy_file, encoding="utf-8") as f:
+            legacy = json.load(f)
+        if legacy["embedding_dim"] != self._dim:
+            raise ValueError(
+                f"Embedding dim mismatch, expected: {self._dim}, but loaded: {legacy['embedding_dim']}"
+            )
+        matrix = np.frombuffer(
+            base64.b64decode(legacy["matrix"]), dtype=np.float32
+        ).reshape(-1, self._dim)
+        for dp, vector in zip(legacy["data"], matrix):
+            meta = {
+                k: v
+                for k, v in dp.items()
+                if k not in ("__id__", "__created_at__", "vector")
+            }
+            self._put(
+                dp["__id__"],
+                dp.get("__created_at__", int(time.time())),
+                meta,
+                self._normalize(vector),
+            )
+        self._persist()
+        logger.info(
+            f"[{self.workspace}] Migrated {len(legacy['data'])} vectors of {self.namespace} "
+            f"from {self._legacy_file}"
+        )
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def _put(
+        self, row_id: str, created_at: int, meta: dict[str, Any], vector: np.ndarray
+    ):
+        old_row = self._id_to_row.get(row_id)
+        if old_row is not None:
+            self._delete_rows([old_row])
+        row = self._append_row(row_id, created_at, meta)
+        self._pending_vectors.append(vector)
+        self._pending_log.append(
+            {
+                "op": "put",
+                "row": row,
+                "id": row_id,
+                "created_at": created_at,
+                "meta": meta,
+            }
+        )
+
+    def _delete_rows(self, rows: list[int]):
+        if not rows:
+            return
+        self._tombstone_rows(rows)
+        self._pending_log.append({"op": "del", "rows": rows})
+
+    async def _sync_storage(self):
+        """Check if the storage should be reloaded"""
+        # Acquire lock to prevent concurrent read and write
+        async with self._storage_lock:
+            if self.storage_updated.value:
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+                )
+                self._reload_incremental()
+                # Reset update flag
+                self.storage_updated.value = False
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
+        if not data:
+            return
+
+        current_time = int(time.time())
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+        embeddings = np.concatenate(embeddings_list)
+        if len(embeddings) != len(data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"[{self.workspace}] embedding is not 1-1 with data, {len(embeddings)} != {len(data)}"
+            )
+            return
+
+        embeddings = self._normalize(embeddings)
+        await self._sync_storage()
+        for (row_id, value), vector in zip(data.items(), embeddings):
+            meta = {k: v for k, v in value.items() if k in self.meta_fields}
+            self._put(row_id, current_time, meta, vector)
+
+    def _score_rows(self, query_matrix: np.ndarray) -> np.ndarray:
+        """Return cosine scores of shape (n_queries, n_rows), tombstones set to -inf"""
+        n_rows = len(self._ids)
+        scores = np.empty((len(query_matrix), n_rows), dtype=np.float32)
+        for start in range(0, self._rows, QUERY_BLOCK_ROWS):
+            end = min(start + QUERY_BLOCK_ROWS, self._rows)
+            block = self._dequantize(self._matrix[start:end])
+            scores[:, start:end] = query_matrix @ block.T
+        if self._pending_vectors:
+            scores[:, self._rows :] = query_matrix @ np.vstack(self._pending_vectors).T
+        scores[:, ~self._alive[:n_rows]] = -np.inf
+        return scores
+
+    async def query(
+        self, query: str, top_k: int, query_embedding: list[float] = None
+    ) -> list[dict[str, Any]]:
+        results = await self.query_batch([query], top_k, [query_embedding])
+        return results[0]
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Score all queries against the mapped matrix in one blocked matrix product"""
+        if not queries:
+            return []
+        # Execute embedding outside of lock to avoid improve cocurrent
+        embeddings = await self._embed_queries(queries, embeddings)
+        query_matrix = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        await self._sync_storage()
+        n_top = min(top_k, len(self._id_to_row))
+        if n_top <= 0:
+            return [[] for _ in queries]
+
+        scores = self._score_rows(query_matrix)
+        top_index = np.argpartition(-scores, n_top - 1, axis=1)[:, :n_top]
+
+        all_results = []
+        for row_scores, candidates in zip(scores, top_index):
+            candidates = candidates[np.argsort(-row_scores[candidates])]
+            results = []
+            for row in candidates:
+                score = float(row_scores[row])
+                if score < self.cosine_better_than_threshold:
+                    break
+                results.append({**self._row_result(row), "distance": score})
+            all_results.append(results)
+        return all_results
+
+    @property
+    async def client_storage(self):
+        await self._sync_storage()
+        return {"data": [self._row_meta(row) for row in self._id_to_row.values()]}
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        try:
+            await self._sync_storage()
+            rows = [self._id_to_row[i] for i in ids if i in self._id_to_row]
+            self._delete_rows(rows)
+            logger.debug(
+                f"[{self.workspace}] Successfully deleted {len(rows)} vectors from {self.namespace}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error while deleting vectors from {self.namespace}: {e}"
+            )
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        try:
+            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+            logger.debug(
+                f"[{self.workspace}] Attempting to delete entity {entity_name} with ID {entity_id}"
+            )
+            await self._sync_storage()
+            row = self._id_to_row.get(entity_id)
+            if row is not None:
+                self._delete_rows([row])
+                logger.debug(
+                    f"[{self.workspace}] Successfully deleted entity {entity_name}"
+                )
+            else:
+                logger.debug(
+                    f"[{self.workspace}] Entity {entity_name} not found in storage"
+                )
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error deleting entity {entity_name}: {e}")
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        try:
+            await self._sync_storage()
+            src_ids = self._columns.get("src_id", [])
+            tgt_ids = self._columns.get("tgt_id", [])
+            rows = [
+                row
+                for row in self._id_to_row.values()
+                if src_ids[row] == entity_name or tgt_ids[row] == entity_name
+            ]
+            logger.debug(
+                f"[{self.workspace}] Found {len(rows)} relations for entity {entity_name}"
+            )
+            if rows:
+                self._delete_rows(rows)
+                logger.debug(
+                    f"[{self.workspace}] Deleted {len(rows)} relations for {entity_name}"
+                )
+            else:
+                logger.debug(
+                    f"[{self.workspace}] No relations found for entity {entity_name}"
+                )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error deleting relations for {entity_name}: {e}"
+            )
+
+    async def index_done_callback(self) -> bool:
+        """Save data to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                if not self._has_pending_changes():
+                    return True
+                self._persist()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error saving data for {self.namespace}: {e}"
+                )
+                return False  # Return error
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        await self._sync_storage()
+        row = self._id_to_row.get(id)
+        if row is None:
+            return None
+        return self._row_result(row)
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+
+        await self._sync_storage()
+        return [
+            self._row_result(self._id_to_row[i]) for i in ids if i in self._id_to_row
+        ]
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        """Get vectors by their IDs, returning only ID and vector data for efficiency
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Dictionary mapping IDs to their vector embeddings
+            Format: {id: [vector_values], ...}
+        """
+        if not ids:
+            return {}
+
+        await self._sync_storage()
+        return {
+            i: self._row_vector(self._id_to_row[i]).tolist()
+            for i in ids
+            if i in self._id_to_row
+        }
+
+    async def get_vectors_matrix(self, ids: list[str]) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as one float32 matrix gathered from the mapped file"""
+        await self._sync_storage()
+        found_ids = [i for i in ids if i in self._id_to_row]
+        rows = np.fromiter(
+            (self._id_to_row[i] for i in found_ids),
+            dtype=np.int64,
+            count=len(found_ids),
+        )
+        matrix = np.empty((len(rows), self._dim), dtype=np.float32)
+        persisted = rows < self._rows
+        if persisted.any():
+            matrix[persisted] = self._dequantize(self._matrix[rows[persisted]])
+        for pos in np.flatnonzero(~persisted):
+            matrix[pos] = self._row_vector(rows[pos])
+        return found_ids, matrix
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove the matrix, metadata, journal and manifest files
+        2. Reset the in-memory state
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                # The legacy NanoVectorDB file would be migrated again on next load
+                files = [
+                    self._manifest_file,
+                    self._legacy_file,
+                    self._matrix_file,
+                    self._snapshot_file,
+                    self._log_file,
+                    *self._unreferenced_files(),
+                ]
+                self._reset_state()
+                for file_name in files:
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}(file:{self._matrix_file})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
@@ -1098,6 +1098,73 @@ class MongoGraphStorage(BaseGraphStorage):
             upsert=True,
         )
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Insert or update multiple node documents with a single bulk_write.
+        """
+        if not nodes:
+            return
+        operations = []
+        for node_id, node_data in nodes:
+            update_doc = {"$set": {**node_data}}
+            if node_data.get("source_id", ""):
+                update_doc["$set"]["source_ids"] = node_data["source_id"].split(
+                    GRAPH_FIELD_SEP
+                )
+            operations.append(UpdateOne({"_id": node_id}, update_doc, upsert=True))
+
+        await self.collection.bulk_write(operations)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges with a single bulk_write, matching edges in either direction.
+        """
+        if not edges:
+            return
+        # Ensure source nodes exist
+        await self.upsert_nodes_batch(
+            [
+                (source_node_id, {})
+                for source_node_id in dict.fromkeys(e[0] for e in edges)
+            ]
+        )
+
+        operations = []
+        for source_node_id, target_node_id, edge_data in edges:
+            update_doc = {
+                "$set": {
+                    **edge_data,
+                    "source_node_id": source_node_id,
+                    "target_node_id": target_node_id,
+                }
+            }
+            if edge_data.get("source_id", ""):
+                update_doc["$set"]["source_ids"] = edge_data["source_id"].split(
+                    GRAPH_FIELD_SEP
+                )
+            operations.append(
+                UpdateOne(
+                    {
+                        "$or": [
+                            {
+                                "source_node_id": source_node_id,
+                                "target_node_id": target_node_id,
+                            },
+                            {
+                                "source_node_id": target_node_id,
+                                "target_node_id": source_node_id,
+                            },
+                        ]
+                    },
+                    update_doc,
+                    upsert=True,
+                )
+            )
+
+        await self.edge_collection.bulk_write(operations)
+
     #
     # -------------------------------------------------------------------------
     # DELETION
@@ -166,6 +166,57 @@ class NanoVectorDBStorage(BaseVectorStorage):
         ]
         return results
 
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Score every query against the stored matrix in one matrix product"""
+        if not queries:
+            return []
+        # Execute embedding outside of lock to avoid improve cocurrent
+        embeddings = await self._embed_queries(queries, embeddings)
+
+        storage = await self.client_storage
+        matrix = storage["matrix"]
+        datas = storage["data"]
+        if len(datas) == 0:
+            return [[] for _ in queries]
+
+        query_matrix = np.asarray(embeddings, dtype=np.float32)
+        query_matrix = query_matrix / np.linalg.norm(
+            query_matrix, axis=-1, keepdims=True
+        )
+        # (n_queries, n_vectors) cosine scores, matrix rows are already normalized
+        scores = query_matrix @ matrix.T
+
+        n_top = min(top_k, scores.shape[1])
+        if n_top <= 0:
+            return [[] for _ in queries]
+        top_index = np.argpartition(-scores, n_top - 1, axis=1)[:, :n_top]
+
+        all_results = []
+        for row, candidates in zip(scores, top_index):
+            candidates = candidates[np.argsort(-row[candidates])]
+            results = []
+            for i in candidates:
+                score = row[i]
+                if score < self.cosine_better_than_threshold:
+                    break
+                dp = datas[i]
+                results.append(
+                    {
+                        **{k: v for k, v in dp.items() if k != "vector"},
+                        "__metrics__": score,
+                        "id": dp["__id__"],
+                        "distance": score,
+                        "created_at": dp.get("__created_at__"),
+                    }
+                )
+            all_results.append(results)
+        return all_results
+
     @property
     async def client_storage(self):
         client = await self._get_client()
@@ -349,7 +400,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
             return {}
 
         client = await self._get_client()
-        results = client.get(ids)
+        # NanoVectorDB.get scans all rows and tests membership in ids
+        results = client.get(set(ids))
 
         vectors_dict = {}
         for result in results:
@@ -363,6 +415,26 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         return vectors_dict
 
+    async def get_vectors_matrix(self, ids: list[str]) -> tuple[list[str], np.ndarray]:
+        """Get vectors by their IDs as one float32 matrix, decoded without Python lists"""
+        if not ids:
+            return [], np.empty((0, self.embedding_func.embedding_dim), np.float32)
+
+        client = await self._get_client()
+        results = [
+            result
+            for result in client.get(set(ids))
+            if result and "vector" in result and "__id__" in result
+        ]
+        matrix = np.empty(
+            (len(results), self.embedding_func.embedding_dim), dtype=np.float32
+        )
+        for row, result in enumerate(results):
+            # Decompress vector data (Base64 + zlib + Float16 compressed)
+            decompressed = zlib.decompress(base64.b64decode(result["vector"]))
+            matrix[row] = np.frombuffer(decompressed, dtype=np.float16)
+        return [result["__id__"] for result in results], matrix
+
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
 
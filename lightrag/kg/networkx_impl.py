@@ -3,10 +3,23 @@ from dataclasses import dataclass
 from typing import final
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
-from lightrag.utils import logger
+from lightrag.utils import get_env_value, logger
 from lightrag.base import BaseGraphStorage
-from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.constants import (
+    DEFAULT_NETWORKX_DELTA_COMPACT_RATIO,
+    DEFAULT_NETWORKX_GRAPHML_EXPORT,
+)
 import networkx as nx
+from .networkx_snapshot import (
+    GraphChunkIndex,
+    append_graph_delta,
+    edge_key,
+    graph_delta_records,
+    load_graph_snapshot,
+    read_graph_snapshot,
+    replay_graph_delta,
+    save_graph_snapshot,
+)
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
@@ -26,16 +39,23 @@ load_dotenv(dotenv_path=".env", override=False)
 class NetworkXStorage(BaseGraphStorage):
     @staticmethod
     def load_nx_graph(file_name) -> nx.Graph:
-        if os.path.exists(file_name):
+        """Load a graph from a binary snapshot, or from GraphML for *.graphml files"""
+        if not os.path.exists(file_name):
+            return None
+        if file_name.endswith(".graphml"):
             return nx.read_graphml(file_name)
-        return None
+        return load_graph_snapshot(file_name)
 
     @staticmethod
     def write_nx_graph(graph: nx.Graph, file_name, workspace="_"):
+        """Write a graph as a binary snapshot, or as GraphML for *.graphml files"""
         logger.info(
             f"[{workspace}] Writing graph with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
         )
-        nx.write_graphml(graph, file_name)
+        if file_name.endswith(".graphml"):
+            nx.write_graphml(graph, file_name)
+        else:
+            save_graph_snapshot(graph, file_name)
 
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
@@ -50,25 +70,134 @@ class NetworkXStorage(BaseGraphStorage):
             self.workspace = "_"
 
         os.makedirs(workspace_dir, exist_ok=True)
+        self._snapshot_file = os.path.join(workspace_dir, f"graph_{self.namespace}.npz")
+        self._delta_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.delta.jsonl"
+        )
+        # GraphML is only read for migration and written as an explicit export
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        self._delta_compact_ratio = get_env_value(
+            "NETWORKX_DELTA_COMPACT_RATIO", DEFAULT_NETWORKX_DELTA_COMPACT_RATIO, float
+        )
+        self._graphml_export = get_env_value(
+            "NETWORKX_GRAPHML_EXPORT", DEFAULT_NETWORKX_GRAPHML_EXPORT, bool
+        )
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        # Nodes and (sorted) edge keys changed since the last persist, written as deltas
+        self._dirty_nodes: set[str] = set()
+        self._dirty_edges: set[tuple[str, str]] = set()
+        # chunk id -> node ids / edge keys, maintained by every graph mutation
+        self._chunk_index = GraphChunkIndex()
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        preloaded_graph = self._load_graph()
         if preloaded_graph is not None:
             logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+                f"[{self.workspace}] Loaded graph from {self._snapshot_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
             )
         else:
             logger.info(
-                f"[{self.workspace}] Created new empty graph fiel: {self._graphml_xml_file}"
+                f"[{self.workspace}] Created new empty graph file: {self._snapshot_file}"
             )
         self._graph = preloaded_graph or nx.Graph()
 
+    def _load_graph(self) -> nx.Graph | None:
+        """Load the snapshot plus its delta log, migrating a legacy GraphML file
+
+        Also replaces the chunk index with the one of the loaded graph.
+        """
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
+        self._chunk_index = GraphChunkIndex()
+        if os.path.exists(self._snapshot_file):
+            graph, chunk_index = read_graph_snapshot(self._snapshot_file)
+            # Snapshots written before the chunk index was persisted
+            self._chunk_index = chunk_index or GraphChunkIndex.from_graph(graph)
+            replayed = replay_graph_delta(graph, self._delta_file, self._chunk_index)
+            if replayed:
+                logger.debug(
+                    f"[{self.workspace}] Replayed {replayed} graph delta records from {self._delta_file}"
+                )
+            return graph
+
+        if not os.path.exists(self._graphml_xml_file):
+            return None
+
+        graph = nx.read_graphml(self._graphml_xml_file)
+        self._chunk_index = GraphChunkIndex.from_graph(graph)
+        save_graph_snapshot(graph, self._snapshot_file, self._chunk_index)
+        try:
+            os.replace(self._graphml_xml_file, f"{self._graphml_xml_file}.bak")
+        except FileNotFoundError:
+            # Another process migrated the same file concurrently
+            pass
+        logger.info(
+            f"[{self.workspace}] Migrated {self._graphml_xml_file} to binary snapshot {self._snapshot_file} (original kept as .graphml.bak)"
+        )
+        return graph
+
+    def _persist_graph(self) -> None:
+        """Append changes to the delta log, or rewrite the snapshot when it grew too large"""
+        if (
+            self._delta_compact_ratio > 0
+            and os.path.exists(self._snapshot_file)
+            and (self._dirty_nodes or self._dirty_edges)
+        ):
+            append_graph_delta(
+                self._delta_file,
+                graph_delta_records(
+                    self._graph, sorted(self._dirty_nodes), sorted(self._dirty_edges)
+                ),
+            )
+            self._dirty_nodes.clear()
+            self._dirty_edges.clear()
+            if os.path.getsize(
+                self._delta_file
+            ) <= self._delta_compact_ratio * os.path.getsize(self._snapshot_file):
+                return
+
+        logger.info(
+            f"[{self.workspace}] Writing graph with {self._graph.number_of_nodes()} nodes, {self._graph.number_of_edges()} edges"
+        )
+        save_graph_snapshot(self._graph, self._snapshot_file, self._chunk_index)
+        if os.path.exists(self._delta_file):
+            os.remove(self._delta_file)
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
+        if self._graphml_export:
+            nx.write_graphml(self._graph, self._graphml_xml_file)
+
+    def _mark_node_dirty(self, graph: nx.Graph, node_id: str) -> None:
+        self._dirty_nodes.add(node_id)
+        # Removing a node drops its edges, they must be recorded as well
+        for neighbor in graph.adj.get(node_id, ()):
+            self._mark_edge_dirty(node_id, neighbor)
+
+    def _mark_edge_dirty(self, source_node_id: str, target_node_id: str) -> None:
+        self._dirty_edges.add(edge_key(source_node_id, target_node_id))
+
+    async def export_graphml(self, file_name: str | None = None) -> str:
+        """Export the current graph as GraphML
+
+        Args:
+            file_name: Output path, defaults to graph_<namespace>.graphml in the workspace
+
+        Returns:
+            The path of the written file
+        """
+        file_name = file_name or self._graphml_xml_file
+        graph = await self._get_graph()
+        async with self._storage_lock:
+            logger.info(
+                f"[{self.workspace}] Exporting graph with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges to {file_name}"
+            )
+            nx.write_graphml(graph, file_name)
+        return file_name
+
     async def initialize(self):
         """Initialize storage data"""
         # Get the update flag for cross-process update notification
@@ -83,12 +212,10 @@ class NetworkXStorage(BaseGraphStorage):
             # Check if data needs to be reloaded
             if self.storage_updated.value:
                 logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
+                    f"[{self.workspace}] Process {os.getpid()} reloading graph {self._snapshot_file} due to modifications by another process"
                 )
                 # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._graph = self._load_graph() or nx.Graph()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -128,6 +255,60 @@ class NetworkXStorage(BaseGraphStorage):
             return list(graph.edges(source_node_id))
         return None
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        """Get multiple nodes with a single graph lookup"""
+        graph = await self._get_graph()
+        nodes = graph.nodes
+        return {node_id: nodes[node_id] for node_id in node_ids if node_id in nodes}
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        """Get degrees of multiple nodes with a single graph lookup, 0 for missing nodes"""
+        graph = await self._get_graph()
+        # graph.degree counts a self-loop twice, matching node_degree
+        present = [node_id for node_id in node_ids if node_id in graph]
+        degrees = dict(graph.degree(present))
+        return {node_id: degrees.get(node_id, 0) for node_id in node_ids}
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Get edge degrees (sum of both endpoint degrees) with a single graph lookup"""
+        node_degrees = await self.node_degrees_batch(
+            list({node_id for pair in edge_pairs for node_id in pair})
+        )
+        return {
+            (src_id, tgt_id): node_degrees[src_id] + node_degrees[tgt_id]
+            for src_id, tgt_id in edge_pairs
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        """Get multiple edges with a single graph lookup"""
+        graph = await self._get_graph()
+        adj = graph.adj
+        result = {}
+        for pair in pairs:
+            src_id = pair["src"]
+            tgt_id = pair["tgt"]
+            neighbors = adj.get(src_id)
+            if neighbors is not None and tgt_id in neighbors:
+                result[(src_id, tgt_id)] = neighbors[tgt_id]
+        return result
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Get edges of multiple nodes with a single graph lookup"""
+        graph = await self._get_graph()
+        adj = graph.adj
+        return {
+            node_id: [(node_id, neighbor) for neighbor in adj[node_id]]
+            if node_id in adj
+            else []
+            for node_id in node_ids
+        }
+
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """
         Importance notes:
@@ -136,7 +317,11 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        if node_id in graph:
+            self._chunk_index.remove_node(node_id, graph.nodes[node_id])
         graph.add_node(node_id, **node_data)
+        self._chunk_index.add_node(node_id, graph.nodes[node_id])
+        self._dirty_nodes.add(node_id)
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -148,7 +333,35 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        key = edge_key(source_node_id, target_node_id)
+        if graph.has_edge(source_node_id, target_node_id):
+            self._chunk_index.remove_edge(key, graph.edges[key])
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._chunk_index.add_edge(key, graph.edges[key])
+        self._dirty_edges.add(key)
+
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Upsert multiple nodes with a single graph lookup"""
+        graph = await self._get_graph()
+        for node_id, node_data in nodes:
+            if node_id in graph:
+                self._chunk_index.remove_node(node_id, graph.nodes[node_id])
+            graph.add_node(node_id, **node_data)
+            self._chunk_index.add_node(node_id, graph.nodes[node_id])
+            self._dirty_nodes.add(node_id)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Upsert multiple edges with a single graph lookup"""
+        graph = await self._get_graph()
+        for source_node_id, target_node_id, edge_data in edges:
+            key = edge_key(source_node_id, target_node_id)
+            if graph.has_edge(source_node_id, target_node_id):
+                self._chunk_index.remove_edge(key, graph.edges[key])
+            graph.add_edge(source_node_id, target_node_id, **edge_data)
+            self._chunk_index.add_edge(key, graph.edges[key])
+            self._dirty_edges.add(key)
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -159,6 +372,8 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
+            self._mark_node_dirty(graph, node_id)
+            self._chunk_index.remove_node_with_edges(graph, node_id)
             graph.remove_node(node_id)
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
@@ -180,6 +395,8 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for node in nodes:
             if graph.has_node(node):
+                self._mark_node_dirty(graph, node)
+                self._chunk_index.remove_node_with_edges(graph, node)
                 graph.remove_node(node)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
@@ -196,6 +413,9 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for source, target in edges:
             if graph.has_edge(source, target):
+                key = edge_key(source, target)
+                self._dirty_edges.add(key)
+                self._chunk_index.remove_edge(key, graph.edges[key])
                 graph.remove_edge(source, target)
 
     async def get_all_labels(self) -> list[str]:
@@ -471,30 +691,24 @@ class NetworkXStorage(BaseGraphStorage):
         return result
 
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
-        chunk_ids_set = set(chunk_ids)
+        """Get nodes whose source_id references any of chunk_ids, via the chunk index"""
         graph = await self._get_graph()
         matching_nodes = []
-        for node_id, node_data in graph.nodes(data=True):
-            if "source_id" in node_data:
-                node_source_ids = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
-                if not node_source_ids.isdisjoint(chunk_ids_set):
-                    node_data_with_id = node_data.copy()
-                    node_data_with_id["id"] = node_id
-                    matching_nodes.append(node_data_with_id)
+        for node_id in self._chunk_index.node_ids(chunk_ids):
+            node_data_with_id = graph.nodes[node_id].copy()
+            node_data_with_id["id"] = node_id
+            matching_nodes.append(node_data_with_id)
         return matching_nodes
 
     async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
-        chunk_ids_set = set(chunk_ids)
+        """Get edges whose source_id references any of chunk_ids, via the chunk index"""
         graph = await self._get_graph()
         matching_edges = []
-        for u, v, edge_data in graph.edges(data=True):
-            if "source_id" in edge_data:
-                edge_source_ids = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
-                if not edge_source_ids.isdisjoint(chunk_ids_set):
-                    edge_data_with_nodes = edge_data.copy()
-                    edge_data_with_nodes["source"] = u
-                    edge_data_with_nodes["target"] = v
-                    matching_edges.append(edge_data_with_nodes)
+        for u, v in self._chunk_index.edge_keys(chunk_ids):
+            edge_data_with_nodes = graph.adj[u][v].copy()
+            edge_data_with_nodes["source"] = u
+            edge_data_with_nodes["target"] = v
+            matching_edges.append(edge_data_with_nodes)
         return matching_edges
 
     async def get_all_nodes(self) -> list[dict]:
@@ -535,9 +749,7 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"[{self.workspace}] Graph was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._graph = self._load_graph() or nx.Graph()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -545,10 +757,8 @@ class NetworkXStorage(BaseGraphStorage):
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
-                # Save data to disk
-                NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
-                )
+                # Save data to disk (delta log or full snapshot)
+                self._persist_graph()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
@@ -564,7 +774,7 @@ class NetworkXStorage(BaseGraphStorage):
         """Drop all graph data from storage and clean up resources
 
         This method will:
-        1. Remove the graph storage file if it exists
+        1. Remove the graph snapshot, delta log and GraphML export if they exist
         2. Reset the graph to an empty state
         3. Update flags to notify other processes
         4. Changes is persisted to disk immediately
@@ -576,20 +786,27 @@ class NetworkXStorage(BaseGraphStorage):
         """
         try:
             async with self._storage_lock:
-                # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
+                for file_name in (
+                    self._snapshot_file,
+                    self._delta_file,
+                    self._graphml_xml_file,
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
                 self._graph = nx.Graph()
+                self._chunk_index = GraphChunkIndex()
+                self._dirty_nodes.clear()
+                self._dirty_edges.clear()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
                 self.storage_updated.value = False
                 logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._graphml_xml_file}"
+                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._snapshot_file}"
                 )
             return {"status": "success", "message": "data dropped"}
         except Exception as e:
             logger.error(
-                f"[{self.workspace}] Error dropping graph file:{self._graphml_xml_file}: {e}"
+                f"[{self.workspace}] Error dropping graph file:{self._snapshot_file}: {e}"
             )
             return {"status": "error", "message": str(e)}
@@ -0,0 +1,444 @@
+"""
+Binary snapshot and delta log format for NetworkXStorage.
+
+A snapshot is an uncompressed .npz archive (loaded with allow_pickle=False):
+
+- header: UTF-8 JSON with the format version and the column descriptors
+- node ids and every node/edge attribute are stored as columns. String columns
+  are one UTF-8 blob plus character offsets; int/float/bool columns are numpy
+  arrays; anything else is stored as JSON strings. Sparse columns carry a
+  presence mask.
+- edges are two index arrays (edge_src, edge_tgt) into the node id column
+
+The snapshot also stores the chunk reverse index (chunk id -> node / edge rows,
+see GraphChunkIndex) in CSR form, so it does not have to be rebuilt by
+splitting every source_id on load.
+
+A delta log is a JSON-lines file of node/edge upserts and deletions applied on
+top of the snapshot, so small commits do not rewrite the whole graph.
+"""
+
+import json
+import os
+from typing import Any, Iterable
+
+import networkx as nx
+import numpy as np
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.utils import logger
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class _Missing:
+    """Marks an attribute that is absent from a row (None is a legal attribute value)"""
+
+
+_MISSING = _Missing()
+
+_KIND_BY_TYPE = {bool: "bool", int: "int", float: "float", str: "str"}
+_INT64_MIN = np.iinfo(np.int64).min
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def _column_kind(values: list) -> str:
+    kinds = {
+        _KIND_BY_TYPE.get(value_type, "json")
+        for value_type in set(map(type, values))
+        if value_type is not _Missing
+    }
+    if not kinds:
+        return "str"
+    if len(kinds) > 1:
+        # Mixed types keep their exact values through JSON
+        return "json"
+    kind = kinds.pop()
+    if kind == "int":
+        ints = [value for value in values if type(value) is int]
+        if min(ints) < _INT64_MIN or max(ints) > _INT64_MAX:
+            return "json"
+    return kind
+
+
+def _encode_strings(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    text = "".join(strings)
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in strings], out=offsets[1:])
+    return np.frombuffer(text.encode("utf-8"), dtype=np.uint8), offsets
+
+
+def _decode_strings(data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    text = data.tobytes().decode("utf-8")
+    bounds = offsets.tolist()
+    return [text[bounds[i] : bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _encode_column(
+    prefix: str, values: list, arrays: dict[str, np.ndarray]
+) -> dict[str, Any]:
+    """Store one column in arrays under prefix and return its descriptor"""
+    kind = _column_kind(values)
+    present = [value for value in values if value is not _MISSING]
+    descriptor = {"kind": kind, "masked": len(present) != len(values)}
+    if descriptor["masked"]:
+        arrays[f"{prefix}_mask"] = np.array(
+            [value is not _MISSING for value in values], dtype=bool
+        )
+
+    if kind == "str":
+        arrays[f"{prefix}_text"], arrays[f"{prefix}_offsets"] = _encode_strings(present)
+    elif kind == "json":
+        arrays[f"{prefix}_text"], arrays[f"{prefix}_offsets"] = _encode_strings(
+            [json.dumps(value, ensure_ascii=False) for value in present]
+        )
+    else:
+        dtype = {"int": np.int64, "float": np.float64, "bool": bool}[kind]
+        arrays[f"{prefix}_values"] = np.array(present, dtype=dtype)
+    return descriptor
+
+
+def _decode_column(prefix: str, descriptor: dict, archive) -> tuple[list, list | None]:
+    """Return (present values, row positions or None when every row is present)"""
+    kind = descriptor["kind"]
+    if kind == "str":
+        values = _decode_strings(
+            archive[f"{prefix}_text"], archive[f"{prefix}_offsets"]
+        )
+    elif kind == "json":
+        values = [
+            json.loads(value)
+            for value in _decode_strings(
+                archive[f"{prefix}_text"], archive[f"{prefix}_offsets"]
+            )
+        ]
+    else:
+        values = archive[f"{prefix}_values"].tolist()
+
+    positions = None
+    if descriptor["masked"]:
+        positions = np.flatnonzero(archive[f"{prefix}_mask"]).tolist()
+    return values, positions
+
+
+def _encode_rows(
+    prefix: str, rows: list[dict], arrays: dict[str, np.ndarray]
+) -> list[dict[str, Any]]:
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    columns = []
+    for index, name in enumerate(names):
+        descriptor = _encode_column(
+            f"{prefix}{index}", [row.get(name, _MISSING) for row in rows], arrays
+        )
+        descriptor["name"] = name
+        columns.append(descriptor)
+    return columns
+
+
+def _decode_rows(prefix: str, columns: list[dict], count: int, archive) -> list[dict]:
+    rows = [{} for _ in range(count)]
+    for index, descriptor in enumerate(columns):
+        name = descriptor["name"]
+        values, positions = _decode_column(f"{prefix}{index}", descriptor, archive)
+        if positions is None:
+            for row, value in zip(rows, values):
+                row[name] = value
+        else:
+            for position, value in zip(positions, values):
+                rows[position][name] = value
+    return rows
+
+
+def edge_key(source_node_id: str, target_node_id: str) -> tuple[str, str]:
+    """Orientation independent key of an undirected edge"""
+    if source_node_id > target_node_id:
+        return target_node_id, source_node_id
+    return source_node_id, target_node_id
+
+
+def _source_chunk_ids(data: dict) -> list[str]:
+    source_id = data.get("source_id")
+    return source_id.split(GRAPH_FIELD_SEP) if source_id else []
+
+
+class GraphChunkIndex:
+    """Reverse index chunk id -> node ids / edge keys whose source_id contains it
+
+    Callers must pass the attributes an element had when it was indexed to the
+    remove_* methods, i.e. update the index before mutating the graph.
+    """
+
+    def __init__(self):
+        self.nodes: dict[str, set[str]] = {}
+        self.edges: dict[str, set[tuple[str, str]]] = {}
+
+    @classmethod
+    def from_graph(cls, graph: nx.Graph) -> "GraphChunkIndex":
+        index = cls()
+        for node_id, data in graph.nodes.items():
+            index.add_node(node_id, data)
+        for src, tgt, data in graph.edges(data=True):
+            index.add_edge(edge_key(src, tgt), data)
+        return index
+
+    def add_node(self, node_id: str, data: dict) -> None:
+        for chunk_id in _source_chunk_ids(data):
+            self.nodes.setdefault(chunk_id, set()).add(node_id)
+
+    def remove_node(self, node_id: str, data: dict) -> None:
+        for chunk_id in _source_chunk_ids(data):
+            members = self.nodes.get(chunk_id)
+            if members is not None:
+                members.discard(node_id)
+                if not members:
+                    del self.nodes[chunk_id]
+
+    def add_edge(self, key: tuple[str, str], data: dict) -> None:
+        for chunk_id in _source_chunk_ids(data):
+            self.edges.setdefault(chunk_id, set()).add(key)
+
+    def remove_edge(self, key: tuple[str, str], data: dict) -> None:
+        for chunk_id in _source_chunk_ids(data):
+            members = self.edges.get(chunk_id)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self.edges[chunk_id]
+
+    def remove_node_with_edges(self, graph: nx.Graph, node_id: str) -> None:
+        """Unindex a node and its incident edges before it is removed from graph"""
+        for neighbor, data in graph.adj[node_id].items():
+            self.remove_edge(edge_key(node_id, neighbor), data)
+        self.remove_node(node_id, graph.nodes[node_id])
+
+    def node_ids(self, chunk_ids: Iterable[str]) -> set[str]:
+        result = set()
+        for chunk_id in chunk_ids:
+            result.update(self.nodes.get(chunk_id, ()))
+        return result
+
+    def edge_keys(self, chunk_ids: Iterable[str]) -> set[tuple[str, str]]:
+        result = set()
+        for chunk_id in chunk_ids:
+            result.update(self.edges.get(chunk_id, ()))
+        return result
+
+
+def _encode_chunk_index(
+    prefix: str,
+    members_by_chunk: dict[str, set],
+    row_of: dict,
+    arrays: dict[str, np.ndarray],
+) -> None:
+    chunk_ids = list(members_by_chunk)
+    rows = [
+        row_of[member]
+        for chunk_id in chunk_ids
+        for member in members_by_chunk[chunk_id]
+    ]
+    arrays[f"{prefix}_chunks_text"], arrays[f"{prefix}_chunks_offsets"] = (
+        _encode_strings(chunk_ids)
+    )
+    offsets = np.zeros(len(chunk_ids) + 1, dtype=np.int64)
+    np.cumsum(
+        [len(members_by_chunk[chunk_id]) for chunk_id in chunk_ids], out=offsets[1:]
+    )
+    arrays[f"{prefix}_offsets"] = offsets
+    arrays[f"{prefix}_rows"] = np.array(rows, dtype=np.int64)
+
+
+def _decode_chunk_index(prefix: str, members: list, archive) -> dict[str, set]:
+    chunk_ids = _decode_strings(
+        archive[f"{prefix}_chunks_text"], archive[f"{prefix}_chunks_offsets"]
+    )
+    bounds = archive[f"{prefix}_offsets"].tolist()
+    rows = archive[f"{prefix}_rows"].tolist()
+    return {
+        chunk_id: {members[row] for row in rows[bounds[i] : bounds[i + 1]]}
+        for i, chunk_id in enumerate(chunk_ids)
+    }
+
+
+def save_graph_snapshot(
+    graph: nx.Graph, file_name: str, chunk_index: GraphChunkIndex | None = None
+) -> None:
+    """Write graph (and its chunk index) to file_name atomically (temporary file + rename)"""
+    node_ids = list(graph.nodes)
+    node_index = {node_id: index for index, node_id in enumerate(node_ids)}
+
+    # Walk the adjacency directly (much faster than graph.edges(data=True)),
+    # keeping each undirected edge once, from its lower-indexed endpoint
+    edge_src: list[int] = []
+    edge_tgt: list[int] = []
+    edge_rows: list[dict] = []
+    for src_index, neighbors in enumerate(graph.adj.values()):
+        for neighbor, data in neighbors.items():
+            tgt_index = node_index[neighbor]
+            if tgt_index >= src_index:
+                edge_src.append(src_index)
+                edge_tgt.append(tgt_index)
+                edge_rows.append(data)
+
+    arrays: dict[str, np.ndarray] = {}
+    header = {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "num_nodes": len(node_ids),
+        "num_edges": len(edge_rows),
+        "node_id": _encode_column("node_id", node_ids, arrays),
+        "node_columns": _encode_rows("node_col", list(graph.nodes.values()), arrays),
+        "edge_columns": _encode_rows("edge_col", edge_rows, arrays),
+    }
+    arrays["edge_src"] = np.array(edge_src, dtype=np.int64)
+    arrays["edge_tgt"] = np.array(edge_tgt, dtype=np.int64)
+    if chunk_index is not None:
+        edge_row = {
+            edge_key(node_ids[src], node_ids[tgt]): row
+            for row, (src, tgt) in enumerate(zip(edge_src, edge_tgt))
+        }
+        _encode_chunk_index("node_chunk", chunk_index.nodes, node_index, arrays)
+        _encode_chunk_index("edge_chunk", chunk_index.edges, edge_row, arrays)
+        header["chunk_index"] = True
+    arrays["header"] = np.frombuffer(
+        json.dumps(header, ensure_ascii=False).encode("utf-8"), dtype=np.uint8
+    )
+
+    tmp_file_name = f"{file_name}.tmp"
+    with open(tmp_file_name, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_file_name, file_name)
+
+
+def load_graph_snapshot(file_name: str) -> nx.Graph:
+    """Read a graph written by save_graph_snapshot"""
+    return read_graph_snapshot(file_name)[0]
+
+
+def read_graph_snapshot(file_name: str) -> tuple[nx.Graph, GraphChunkIndex | None]:
+    """Read a graph and its chunk index (None if the snapshot has none)"""
+    with np.load(file_name, allow_pickle=False) as archive:
+        header = json.loads(archive["header"].tobytes().decode("utf-8"))
+        if header["version"] > SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Graph snapshot {file_name} has unsupported format version {header['version']}"
+            )
+        node_ids, _ = _decode_column("node_id", header["node_id"], archive)
+        node_rows = _decode_rows(
+            "node_col", header["node_columns"], header["num_nodes"], archive
+        )
+        edge_rows = _decode_rows(
+            "edge_col", header["edge_columns"], header["num_edges"], archive
+        )
+        edge_src = archive["edge_src"].tolist()
+        edge_tgt = archive["edge_tgt"].tolist()
+
+        chunk_index = None
+        if header.get("chunk_index"):
+            edge_keys = [
+                edge_key(node_ids[src], node_ids[tgt])
+                for src, tgt in zip(edge_src, edge_tgt)
+            ]
+            chunk_index = GraphChunkIndex()
+            chunk_index.nodes = _decode_chunk_index("node_chunk", node_ids, archive)
+            chunk_index.edges = _decode_chunk_index("edge_chunk", edge_keys, archive)
+
+    graph = nx.Graph()
+    graph.add_nodes_from(zip(node_ids, node_rows))
+    graph.add_edges_from(
+        (node_ids[src], node_ids[tgt], data)
+        for src, tgt, data in zip(edge_src, edge_tgt, edge_rows)
+    )
+    return graph, chunk_index
+
+
+def graph_delta_records(
+    graph: nx.Graph,
+    node_ids: Iterable[str],
+    edge_keys: Iterable[tuple[str, str]],
+) -> list[dict[str, Any]]:
+    """Describe the current state of changed nodes and edges as delta records
+
+    Nodes come first, so re-created nodes exist before their edges are replayed.
+    """
+    records = []
+    for node_id in node_ids:
+        if graph.has_node(node_id):
+            records.append({"op": "node", "id": node_id, "data": graph.nodes[node_id]})
+        else:
+            records.append({"op": "del_node", "id": node_id})
+    for src, tgt in edge_keys:
+        if graph.has_edge(src, tgt):
+            records.append(
+                {"op": "edge", "src": src, "tgt": tgt, "data": graph.edges[src, tgt]}
+            )
+        else:
+            records.append({"op": "del_edge", "src": src, "tgt": tgt})
+    return records
+
+
+def append_graph_delta(file_name: str, records: list[dict[str, Any]]) -> None:
+    if not records:
+        return
+    lines = [json.dumps(record, ensure_ascii=False, default=str) for record in records]
+    with open(file_name, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def replay_graph_delta(
+    graph: nx.Graph, file_name: str, chunk_index: GraphChunkIndex | None = None
+) -> int:
+    """Apply a delta log to graph (and chunk_index), returns the number of records applied
+
+    A torn last line left by an interrupted write is dropped and truncated away.
+    """
+    if not os.path.exists(file_name):
+        return 0
+
+    count = 0
+    valid_size = 0
+    with open(file_name, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Dropping incomplete graph delta record in {file_name}")
+                break
+            valid_size += len(line)
+            op = record["op"]
+            if op in ("node", "del_node"):
+                node_id = record["id"]
+                if graph.has_node(node_id):
+                    if op == "del_node":
+                        if chunk_index is not None:
+                            chunk_index.remove_node_with_edges(graph, node_id)
+                        graph.remove_node(node_id)
+                    else:
+                        # Records carry the full attribute set, replacing the old one
+                        if chunk_index is not None:
+                            chunk_index.remove_node(node_id, graph.nodes[node_id])
+                        graph.nodes[node_id].clear()
+                if op == "node":
+                    graph.add_node(node_id, **record["data"])
+                    if chunk_index is not None:
+                        chunk_index.add_node(node_id, record["data"])
+            else:
+                src, tgt = record["src"], record["tgt"]
+                key = edge_key(src, tgt)
+                if graph.has_edge(src, tgt):
+                    if chunk_index is not None:
+                        chunk_index.remove_edge(key, graph.edges[src, tgt])
+                    if op == "del_edge":
+                        graph.remove_edge(src, tgt)
+                    else:
+                        graph.edges[src, tgt].clear()
+                if op == "edge":
+                    graph.add_edge(src, tgt, **record["data"])
+                    if chunk_index is not None:
+                        chunk_index.add_edge(key, record["data"])
+            count += 1
+
+    if valid_size < os.path.getsize(file_name):
+        with open(file_name, "r+b") as f:
+            f.truncate(valid_size)
+    return count
@@ -48,6 +48,9 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+# Graph upsert statements sent in one round trip by the batch upserts
+PG_GRAPH_BATCH_SIZE = 200
+
 
 class PostgreSQLDB:
     def __init__(self, config: dict[str, Any], **kwargs: Any):
@@ -1023,6 +1026,16 @@ class PostgreSQLDB:
                 "ddl": TABLES["LIGHTRAG_FULL_RELATIONS"]["ddl"],
                 "description": "Full relations storage table",
             },
+            {
+                "name": "LIGHTRAG_ENTITY_CHUNKS",
+                "ddl": TABLES["LIGHTRAG_ENTITY_CHUNKS"]["ddl"],
+                "description": "Entity chunk provenance table",
+            },
+            {
+                "name": "LIGHTRAG_RELATION_CHUNKS",
+                "ddl": TABLES["LIGHTRAG_RELATION_CHUNKS"]["ddl"],
+                "description": "Relation chunk provenance table",
+            },
         ]
 
         for table_info in tables_to_check:
@@ -1288,6 +1301,27 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL database,\nsql:{sql},\ndata:{data},\nerror:{e}")
             raise
 
+    async def execute_script(
+        self,
+        statements: list[str],
+        with_age: bool = False,
+        graph_name: str | None = None,
+    ) -> None:
+        """Run parameterless statements in one round trip and one transaction
+
+        Unlike execute, every error is raised: the whole script is rolled back.
+        """
+        if not statements:
+            return
+        async with self.pool.acquire() as connection:  # type: ignore
+            if with_age and graph_name:
+                await self.configure_age(connection, graph_name)
+            elif with_age and not graph_name:
+                raise ValueError("Graph name is required when with_age is True")
+            # Without arguments asyncpg uses the simple query protocol, which
+            # accepts several statements and runs them in an implicit transaction
+            await connection.execute(";\n".join(statements))
+
 
 class ClientManager:
     _instances: dict[str, Any] = {"db": None, "ref_count": 0}
@@ -1397,6 +1431,34 @@ class ClientManager:
                     await db.pool.close()
 
 
+def _parse_chunk_provenance_row(row: dict[str, Any]) -> None:
+    """Parse the JSONB chunk lists of an entity/relation chunk provenance row in place"""
+    for column in ("chunk_ids", "chunk_counts"):
+        value = row.get(column) or []
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                value = []
+        row[column] = value
+    create_time = row.get("create_time", 0)
+    update_time = row.get("update_time", 0)
+    row["create_time"] = create_time
+    row["update_time"] = create_time if update_time == 0 else update_time
+
+
+def _parse_full_doc_row(row: dict[str, Any]) -> None:
+    """Move the segment list of a streamed document out of the meta JSONB column, in place"""
+    meta = row.pop("meta", None)
+    if isinstance(meta, str):
+        try:
+            meta = json.loads(meta)
+        except json.JSONDecodeError:
+            meta = None
+    if isinstance(meta, dict) and meta.get("segments"):
+        row["segments"] = meta["segments"]
+
+
 @final
 @dataclass
 class PGKVStorage(BaseKVStorage):
@@ -1527,6 +1589,21 @@ class PGKVStorage(BaseKVStorage):
                     processed_results[row["id"]] = row
                 return processed_results
 
+            # For ENTITY_CHUNKS/RELATION_CHUNKS namespaces, parse chunk lists
+            if is_namespace(
+                self.namespace, NameSpace.KV_STORE_ENTITY_CHUNKS
+            ) or is_namespace(self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS):
+                processed_results = {}
+                for row in results:
+                    _parse_chunk_provenance_row(row)
+                    processed_results[row["id"]] = row
+                return processed_results
+
+            # For FULL_DOCS namespace, restore the segment list of streamed documents
+            if is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
+                for row in results:
+                    _parse_full_doc_row(row)
+
             # For other namespaces, return as-is
             return {row["id"]: row for row in results}
         except Exception as e:
@@ -1610,6 +1687,16 @@ class PGKVStorage(BaseKVStorage):
             response["create_time"] = create_time
             response["update_time"] = create_time if update_time == 0 else update_time
 
+        # Special handling for ENTITY_CHUNKS/RELATION_CHUNKS namespaces
+        if response and (
+            is_namespace(self.namespace, NameSpace.KV_STORE_ENTITY_CHUNKS)
+            or is_namespace(self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS)
+        ):
+            _parse_chunk_provenance_row(response)
+
+        if response and is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
+            _parse_full_doc_row(response)
+
         return response if response else None
 
     # Query by id
@@ -1697,6 +1784,18 @@ class PGKVStorage(BaseKVStorage):
                 result["create_time"] = create_time
                 result["update_time"] = create_time if update_time == 0 else update_time
 
+        # Special handling for ENTITY_CHUNKS/RELATION_CHUNKS namespaces
+        if results and (
+            is_namespace(self.namespace, NameSpace.KV_STORE_ENTITY_CHUNKS)
+            or is_namespace(self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS)
+        ):
+            for result in results:
+                _parse_chunk_provenance_row(result)
+
+        if results and is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
+            for result in results:
+                _parse_full_doc_row(result)
+
         return results if results else []
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
@@ -1750,6 +1849,10 @@ class PGKVStorage(BaseKVStorage):
                 _data = {
                     "id": k,
                     "content": v["content"],
+                    # Segment ids of a document enqueued with apipeline_enqueue_document_stream
+                    "meta": json.dumps({"segments": v["segments"]})
+                    if v.get("segments")
+                    else None,
                     "workspace": self.workspace,
                 }
                 await self.db.execute(upsert_sql, _data)
@@ -1799,6 +1902,23 @@ class PGKVStorage(BaseKVStorage):
                     "update_time": current_time,
                 }
                 await self.db.execute(upsert_sql, _data)
+        elif is_namespace(
+            self.namespace, NameSpace.KV_STORE_ENTITY_CHUNKS
+        ) or is_namespace(self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS):
+            # Get current UTC time and convert to naive datetime for database storage
+            current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_" + self.namespace]
+            for k, v in data.items():
+                _data = {
+                    "workspace": self.workspace,
+                    "id": k,
+                    "chunk_ids": json.dumps(v["chunk_ids"]),
+                    "chunk_counts": json.dumps(v.get("chunk_counts", [])),
+                    "count": v["count"],
+                    "create_time": current_time,
+                    "update_time": current_time,
+                }
+                await self.db.execute(upsert_sql, _data)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -2025,6 +2145,51 @@ class PGVectorStorage(BaseVectorStorage):
         results = await self.db.query(sql, params=list(params.values()), multirows=True)
         return results
 
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Search several queries in a single SQL round-trip
+
+        Each query runs as its own ORDER BY/LIMIT sub-select of the namespace
+        template; the sub-selects are combined with UNION ALL and tagged with
+        the query position and in-query rank so results can be split back out.
+        The rank is taken from the templates' distance column, since the order
+        of a sub-select is not guaranteed to survive into the outer query.
+        """
+        if not queries:
+            return []
+        embeddings = await self._embed_queries(queries, embeddings)
+
+        template = SQL_TEMPLATES[self.namespace].strip().rstrip(";")
+        sub_queries = []
+        for query_index, embedding in enumerate(embeddings):
+            embedding_string = ",".join(map(str, embedding))
+            sub_queries.append(
+                f"SELECT {query_index} AS __query_index__, "
+                f"row_number() OVER (ORDER BY q.distance) AS __query_rank__, q.* "
+                f"FROM ({template.format(embedding_string=embedding_string)}) q"
+            )
+        sql = (
+            " UNION ALL ".join(sub_queries)
+            + " ORDER BY __query_index__, __query_rank__"
+        )
+        params = {
+            "workspace": self.workspace,
+            "closer_than_threshold": 1 - self.cosine_better_than_threshold,
+            "top_k": top_k,
+        }
+        rows = await self.db.query(sql, params=list(params.values()), multirows=True)
+
+        results: list[list[dict[str, Any]]] = [[] for _ in queries]
+        for row in rows or []:
+            query_index = row.pop("__query_index__")
+            row.pop("__query_rank__", None)
+            results[query_index].append(row)
+        return results
+
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
         pass
@@ -3267,19 +3432,7 @@ class PGGraphStorage(BaseGraphStorage):
 
         return edges
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((PGGraphQueryException,)),
-    )
-    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
-        """
-        Upsert a node in the Neo4j database.
-
-        Args:
-            node_id: The unique identifier for the node (used as label)
-            node_data: Dictionary of node properties
-        """
+    def _upsert_node_query(self, node_id: str, node_data: dict[str, str]) -> str:
         if "entity_id" not in node_data:
             raise ValueError(
                 "PostgreSQL: node properties must contain an 'entity_id' field"
@@ -3288,7 +3441,7 @@ class PGGraphStorage(BaseGraphStorage):
         label = self._normalize_node_id(node_id)
         properties = self._format_properties(node_data)
 
-        query = """SELECT * FROM cypher('%s', $$
+        return """SELECT * FROM cypher('%s', $$
                      MERGE (n:base {entity_id: "%s"})
                      SET n += %s
                      RETURN n
@@ -3298,6 +3451,107 @@ class PGGraphStorage(BaseGraphStorage):
             properties,
         )
 
+    def _upsert_edge_query(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> str:
+        src_label = self._normalize_node_id(source_node_id)
+        tgt_label = self._normalize_node_id(target_node_id)
+        edge_properties = self._format_properties(edge_data)
+
+        return """SELECT * FROM cypher('%s', $$
+                     MATCH (source:base {entity_id: "%s"})
+                     WITH source
+                     MATCH (target:base {entity_id: "%s"})
+                     MERGE (source)-[r:DIRECTED]-(target)
+                     SET r += %s
+                     SET r += %s
+                     RETURN r
+                   $$) AS (r agtype)""" % (
+            self.graph_name,
+            src_label,
+            tgt_label,
+            edge_properties,
+            edge_properties,  # https://github.com/HKUDS/LightRAG/issues/1438#issuecomment-2826000195
+        )
+
+    async def _execute_upsert_script(self, queries: list[str]) -> None:
+        """Run upsert queries in round trips of PG_GRAPH_BATCH_SIZE statements"""
+        for i in range(0, len(queries), PG_GRAPH_BATCH_SIZE):
+            script = queries[i : i + PG_GRAPH_BATCH_SIZE]
+            try:
+                await self.db.execute_script(
+                    script, with_age=True, graph_name=self.graph_name
+                )
+            except Exception as e:
+                raise PGGraphQueryException(
+                    {
+                        "message": f"Error executing {len(script)} graph upserts",
+                        "wrapped": script[0],
+                        "detail": str(e),
+                    }
+                ) from e
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Upsert multiple nodes, many MERGE statements per round trip.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        try:
+            await self._execute_upsert_script(
+                [self._upsert_node_query(node_id, data) for node_id, data in nodes]
+            )
+        except Exception:
+            logger.error(
+                f"[{self.workspace}] POSTGRES, upsert_nodes_batch error on {len(nodes)} nodes"
+            )
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """
+        Upsert multiple edges, many MERGE statements per round trip.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        try:
+            await self._execute_upsert_script(
+                [self._upsert_edge_query(src, tgt, data) for src, tgt, data in edges]
+            )
+        except Exception:
+            logger.error(
+                f"[{self.workspace}] POSTGRES, upsert_edges_batch error on {len(edges)} edges"
+            )
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((PGGraphQueryException,)),
+    )
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        """
+        Upsert a node in the Neo4j database.
+
+        Args:
+            node_id: The unique identifier for the node (used as label)
+            node_data: Dictionary of node properties
+        """
+        query = self._upsert_node_query(node_id, node_data)
+
         try:
             await self._query(query, readonly=False, upsert=True)
 
@@ -3323,25 +3577,7 @@ class PGGraphStorage(BaseGraphStorage):
             target_node_id (str): Label of the target node (used as identifier)
             edge_data (dict): dictionary of properties to set on the edge
         """
-        src_label = self._normalize_node_id(source_node_id)
-        tgt_label = self._normalize_node_id(target_node_id)
-        edge_properties = self._format_properties(edge_data)
-
-        query = """SELECT * FROM cypher('%s', $$
-                     MATCH (source:base {entity_id: "%s"})
-                     WITH source
-                     MATCH (target:base {entity_id: "%s"})
-                     MERGE (source)-[r:DIRECTED]-(target)
-                     SET r += %s
-                     SET r += %s
-                     RETURN r
-                   $$) AS (r agtype)""" % (
-            self.graph_name,
-            src_label,
-            tgt_label,
-            edge_properties,
-            edge_properties,  # https://github.com/HKUDS/LightRAG/issues/1438#issuecomment-2826000195
-        )
+        query = self._upsert_edge_query(source_node_id, target_node_id, edge_data)
 
         try:
             await self._query(query, readonly=False, upsert=True)
@@ -4443,6 +4679,8 @@ NAMESPACE_TABLE_MAP = {
     NameSpace.KV_STORE_TEXT_CHUNKS: "LIGHTRAG_DOC_CHUNKS",
     NameSpace.KV_STORE_FULL_ENTITIES: "LIGHTRAG_FULL_ENTITIES",
     NameSpace.KV_STORE_FULL_RELATIONS: "LIGHTRAG_FULL_RELATIONS",
+    NameSpace.KV_STORE_ENTITY_CHUNKS: "LIGHTRAG_ENTITY_CHUNKS",
+    NameSpace.KV_STORE_RELATION_CHUNKS: "LIGHTRAG_RELATION_CHUNKS",
     NameSpace.KV_STORE_LLM_RESPONSE_CACHE: "LIGHTRAG_LLM_CACHE",
     NameSpace.VECTOR_STORE_CHUNKS: "LIGHTRAG_VDB_CHUNKS",
     NameSpace.VECTOR_STORE_ENTITIES: "LIGHTRAG_VDB_ENTITY",
@@ -4583,12 +4821,36 @@ TABLES = {
                     CONSTRAINT LIGHTRAG_FULL_RELATIONS_PK PRIMARY KEY (workspace, id)
                     )"""
     },
+    "LIGHTRAG_ENTITY_CHUNKS": {
+        "ddl": """CREATE TABLE LIGHTRAG_ENTITY_CHUNKS (
+                    id VARCHAR(512),
+                    workspace VARCHAR(255),
+                    chunk_ids JSONB,
+                    chunk_counts JSONB,
+                    count INTEGER,
+                    create_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    update_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT LIGHTRAG_ENTITY_CHUNKS_PK PRIMARY KEY (workspace, id)
+                    )"""
+    },
+    "LIGHTRAG_RELATION_CHUNKS": {
+        "ddl": """CREATE TABLE LIGHTRAG_RELATION_CHUNKS (
+                    id VARCHAR(1024),
+                    workspace VARCHAR(255),
+                    chunk_ids JSONB,
+                    chunk_counts JSONB,
+                    count INTEGER,
+                    create_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    update_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT LIGHTRAG_RELATION_CHUNKS_PK PRIMARY KEY (workspace, id)
+                    )"""
+    },
 }
 
 
 SQL_TEMPLATES = {
     # SQL for KVStorage
-    "get_by_id_full_docs": """SELECT id, COALESCE(content, '') as content
+    "get_by_id_full_docs": """SELECT id, COALESCE(content, '') as content, meta
                                 FROM LIGHTRAG_DOC_FULL WHERE workspace=$1 AND id=$2
                             """,
     "get_by_id_text_chunks": """SELECT id, tokens, COALESCE(content, '') as content,
@@ -4603,7 +4865,7 @@ SQL_TEMPLATES = {
                                 EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
                                 FROM LIGHTRAG_LLM_CACHE WHERE workspace=$1 AND id=$2
                                """,
-    "get_by_ids_full_docs": """SELECT id, COALESCE(content, '') as content
+    "get_by_ids_full_docs": """SELECT id, COALESCE(content, '') as content, meta
                                  FROM LIGHTRAG_DOC_FULL WHERE workspace=$1 AND id IN ({ids})
                             """,
     "get_by_ids_text_chunks": """SELECT id, tokens, COALESCE(content, '') as content,
@@ -4638,11 +4900,31 @@ SQL_TEMPLATES = {
                                  EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
                                  FROM LIGHTRAG_FULL_RELATIONS WHERE workspace=$1 AND id IN ({ids})
                                 """,
+    "get_by_id_entity_chunks": """SELECT id, chunk_ids, chunk_counts, count,
+                                EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                FROM LIGHTRAG_ENTITY_CHUNKS WHERE workspace=$1 AND id=$2
+                               """,
+    "get_by_ids_entity_chunks": """SELECT id, chunk_ids, chunk_counts, count,
+                                 EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                 EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                 FROM LIGHTRAG_ENTITY_CHUNKS WHERE workspace=$1 AND id IN ({ids})
+                                """,
+    "get_by_id_relation_chunks": """SELECT id, chunk_ids, chunk_counts, count,
+                                EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                FROM LIGHTRAG_RELATION_CHUNKS WHERE workspace=$1 AND id=$2
+                               """,
+    "get_by_ids_relation_chunks": """SELECT id, chunk_ids, chunk_counts, count,
+                                 EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                 EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                 FROM LIGHTRAG_RELATION_CHUNKS WHERE workspace=$1 AND id IN ({ids})
+                                """,
     "filter_keys": "SELECT id FROM {table_name} WHERE workspace=$1 AND id IN ({ids})",
-    "upsert_doc_full": """INSERT INTO LIGHTRAG_DOC_FULL (id, content, workspace)
-                        VALUES ($1, $2, $3)
+    "upsert_doc_full": """INSERT INTO LIGHTRAG_DOC_FULL (id, content, meta, workspace)
+                        VALUES ($1, $2, $3, $4)
                         ON CONFLICT (workspace,id) DO UPDATE
-                           SET content = $2, update_time = CURRENT_TIMESTAMP
+                           SET content = $2, meta = $3, update_time = CURRENT_TIMESTAMP
                        """,
     "upsert_llm_response_cache": """INSERT INTO LIGHTRAG_LLM_CACHE(workspace,id,original_prompt,return_value,chunk_id,cache_type,queryparam)
                                       VALUES ($1, $2, $3, $4, $5, $6, $7)
@@ -4683,6 +4965,24 @@ SQL_TEMPLATES = {
                       count=EXCLUDED.count,
                       update_time = EXCLUDED.update_time
                      """,
+    "upsert_entity_chunks": """INSERT INTO LIGHTRAG_ENTITY_CHUNKS (workspace, id, chunk_ids, chunk_counts,
+                      count, create_time, update_time)
+                      VALUES ($1, $2, $3, $4, $5, $6, $7)
+                      ON CONFLICT (workspace,id) DO UPDATE
+                      SET chunk_ids=EXCLUDED.chunk_ids,
+                      chunk_counts=EXCLUDED.chunk_counts,
+                      count=EXCLUDED.count,
+                      update_time = EXCLUDED.update_time
+                     """,
+    "upsert_relation_chunks": """INSERT INTO LIGHTRAG_RELATION_CHUNKS (workspace, id, chunk_ids, chunk_counts,
+                      count, create_time, update_time)
+                      VALUES ($1, $2, $3, $4, $5, $6, $7)
+                      ON CONFLICT (workspace,id) DO UPDATE
+                      SET chunk_ids=EXCLUDED.chunk_ids,
+                      chunk_counts=EXCLUDED.chunk_counts,
+                      count=EXCLUDED.count,
+                      update_time = EXCLUDED.update_time
+                     """,
     # SQL for VectorStorage
     "upsert_chunk": """INSERT INTO LIGHTRAG_VDB_CHUNKS (workspace, id, tokens,
                       chunk_order_index, full_doc_id, content, content_vector, file_path,
@@ -4723,31 +5023,34 @@ SQL_TEMPLATES = {
     "relationships": """
                      SELECT r.source_id AS src_id,
                             r.target_id AS tgt_id,
+                            r.content_vector <=> '[{embedding_string}]'::vector AS distance,
                             EXTRACT(EPOCH FROM r.create_time)::BIGINT AS created_at
                      FROM LIGHTRAG_VDB_RELATION r
                      WHERE r.workspace = $1
                        AND r.content_vector <=> '[{embedding_string}]'::vector < $2
-                     ORDER BY r.content_vector <=> '[{embedding_string}]'::vector
+                     ORDER BY distance
                      LIMIT $3;
                      """,
     "entities": """
                 SELECT e.entity_name,
+                       e.content_vector <=> '[{embedding_string}]'::vector AS distance,
                        EXTRACT(EPOCH FROM e.create_time)::BIGINT AS created_at
                 FROM LIGHTRAG_VDB_ENTITY e
                 WHERE e.workspace = $1
                   AND e.content_vector <=> '[{embedding_string}]'::vector < $2
-                ORDER BY e.content_vector <=> '[{embedding_string}]'::vector
+                ORDER BY distance
                 LIMIT $3;
                 """,
     "chunks": """
               SELECT c.id,
                      c.content,
                      c.file_path,
+                     c.content_vector <=> '[{embedding_string}]'::vector AS distance,
                      EXTRACT(EPOCH FROM c.create_time)::BIGINT AS created_at
               FROM LIGHTRAG_VDB_CHUNKS c
               WHERE c.workspace = $1
                 AND c.content_vector <=> '[{embedding_string}]'::vector < $2
-              ORDER BY c.content_vector <=> '[{embedding_string}]'::vector
+              ORDER BY distance
               LIMIT $3;
               """,
     # DROP tables
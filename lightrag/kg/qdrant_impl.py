@@ -232,15 +232,44 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
         # logger.debug(f"[{self.workspace}] query result: {results}")
 
+        return [self._format_search_result(dp) for dp in results]
+
+    async def query_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        embeddings: list[list[float]] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Search several queries in a single Qdrant search_batch round-trip"""
+        if not queries:
+            return []
+        embeddings = await self._embed_queries(queries, embeddings)
+
+        requests = [
+            models.SearchRequest(
+                vector=list(map(float, embedding)),
+                limit=top_k,
+                with_payload=True,
+                score_threshold=self.cosine_better_than_threshold,
+            )
+            for embedding in embeddings
+        ]
+        batch_results = self._client.search_batch(
+            collection_name=self.final_namespace, requests=requests
+        )
         return [
-            {
-                **dp.payload,
-                "distance": dp.score,
-                "created_at": dp.payload.get("created_at"),
-            }
-            for dp in results
+            [self._format_search_result(dp) for dp in results]
+            for results in batch_results
         ]
 
+    @staticmethod
+    def _format_search_result(dp) -> dict[str, Any]:
+        return {
+            **dp.payload,
+            "distance": dp.score,
+            "created_at": dp.payload.get("created_at"),
+        }
+
     async def index_done_callback(self) -> None:
         # Qdrant handles persistence automatically
         pass
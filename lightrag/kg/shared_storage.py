@@ -1080,6 +1080,8 @@ async def initialize_pipeline_status():
                 "request_pending": False,  # Flag for pending request for processing
                 "latest_message": "",  # Latest message from pipeline processing
                 "history_messages": history_messages,  # 使用共享列表对象
+                "summary_stats": {},  # Merge-phase description summary telemetry
+                "file_extraction": {},  # API file extraction counters (running/completed/failed)
             }
         )
         direct_log(f"Process {os.getpid()} Pipeline namespace initialized")
@@ -0,0 +1,1416 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Union, final
+
+import networkx as nx
+
+from lightrag.base import (
+    BaseGraphStorage,
+    BaseKVStorage,
+    DocProcessingStatus,
+    DocStatus,
+    DocStatusStorage,
+)
+from lightrag.constants import DEFAULT_SQLITE_BUSY_TIMEOUT, GRAPH_FIELD_SEP
+from lightrag.exceptions import StorageNotInitializedError
+from lightrag.types import KnowledgeGraph, KnowledgeGraphEdge, KnowledgeGraphNode
+from lightrag.utils import get_env_value, load_json, logger
+from .json_kv_impl import replay_kv_journal
+from .networkx_snapshot import load_graph_snapshot, replay_graph_delta
+
+from dotenv import load_dotenv
+
+# use the .env that is inside the current folder
+# allows to use different .env file for each lightrag instance
+# the OS environment variables take precedence over the .env file
+load_dotenv(dotenv_path=".env", override=False)
+
+# Keep IN (...) lists below SQLite's host parameter limit
+SQLITE_MAX_PARAMS = 900
+
+
+def _chunked(items: list, size: int = SQLITE_MAX_PARAMS):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _placeholders(count: int) -> str:
+    return ",".join("?" * count)
+
+
+class SQLiteConnection:
+    """A SQLite connection owned by a dedicated worker thread
+
+    Every statement runs on the same thread, so calls from the event loop are
+    serialized without holding the loop. Each worker process opens its own
+    connection; WAL mode lets readers proceed while another process writes,
+    and writers wait on busy_timeout instead of failing.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="lightrag-sqlite"
+        )
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> None:
+        busy_timeout = get_env_value(
+            "SQLITE_BUSY_TIMEOUT", DEFAULT_SQLITE_BUSY_TIMEOUT, int
+        )
+        # isolation_level=None: transactions are opened explicitly in run()
+        self._conn = sqlite3.connect(
+            self.db_file, timeout=busy_timeout / 1000, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={busy_timeout}")
+
+    async def open(self, schema: str) -> None:
+        def _open():
+            self._connect()
+            self._conn.executescript(schema)
+
+        await asyncio.get_running_loop().run_in_executor(self._executor, _open)
+
+    async def run(self, fn: Callable[[sqlite3.Connection], Any], write: bool = False):
+        """Run fn(conn) on the connection thread
+
+        Write calls are wrapped in a BEGIN IMMEDIATE transaction, so the write
+        lock is taken up front and the whole call commits or rolls back as one.
+        """
+
+        def _run():
+            if not write:
+                return fn(self._conn)
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, _run)
+
+    async def close(self) -> None:
+        def _close():
+            if self._conn is not None:
+                # Fold the WAL back into the main database file
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.close()
+                self._conn = None
+
+        await asyncio.get_running_loop().run_in_executor(self._executor, _close)
+        self._executor.shutdown(wait=True)
+
+
+def _workspace_dir(storage) -> str:
+    """Resolve the workspace directory and set final_namespace like the file-based storages"""
+    working_dir = storage.global_config["working_dir"]
+    if storage.workspace:
+        # Include workspace in the file path for data isolation
+        workspace_dir = os.path.join(working_dir, storage.workspace)
+        storage.final_namespace = f"{storage.workspace}_{storage.namespace}"
+    else:
+        # Default behavior when workspace is empty
+        storage.final_namespace = storage.namespace
+        storage.workspace = "_"
+        workspace_dir = working_dir
+    os.makedirs(workspace_dir, exist_ok=True)
+    return workspace_dir
+
+
+KV_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    create_time INTEGER NOT NULL DEFAULT 0,
+    update_time INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+@final
+@dataclass
+class SQLiteKVStorage(BaseKVStorage):
+    """Key-value storage in an embedded SQLite database (one file per namespace)"""
+
+    def __post_init__(self):
+        workspace_dir = _workspace_dir(self)
+        self._db_file = os.path.join(workspace_dir, f"kv_store_{self.namespace}.sqlite")
+        # JsonKVStorage snapshot and journal of the same namespace, imported on first start
+        self._json_file = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        self._json_journal_file = os.path.join(
+            workspace_dir, f"kv_store_{self.namespace}.journal.jsonl"
+        )
+        self._db: SQLiteConnection | None = None
+
+    async def initialize(self):
+        """Open the database and import existing JSON data into an empty table"""
+        if self._db is not None:
+            return
+        self._db = SQLiteConnection(self._db_file)
+        await self._db.open(KV_SCHEMA)
+
+        count = await self._db.run(
+            lambda conn: conn.execute("SELECT COUNT(*) FROM kv").fetchone()[0]
+        )
+        if count == 0 and (
+            os.path.exists(self._json_file) or os.path.exists(self._json_journal_file)
+        ):
+            legacy_data = load_json(self._json_file) or {}
+            replay_kv_journal(self._json_journal_file, legacy_data)
+            if legacy_data:
+                await self._db.run(
+                    lambda conn: self._write_records(
+                        conn, legacy_data, keep_times=True
+                    ),
+                    write=True,
+                )
+                logger.info(
+                    f"[{self.workspace}] Imported {len(legacy_data)} records from {self._json_file} into {self._db_file}"
+                )
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} SQLite KV opened {self.namespace} ({self._db_file})"
+        )
+
+    async def finalize(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    def _require_db(self) -> SQLiteConnection:
+        if self._db is None:
+            raise StorageNotInitializedError("SQLiteKVStorage")
+        return self._db
+
+    @staticmethod
+    def _row_to_record(row: tuple) -> dict[str, Any]:
+        id, data, create_time, update_time = row
+        record = json.loads(data)
+        record["create_time"] = create_time
+        record["update_time"] = update_time
+        # Ensure _id field contains the clean ID
+        record["_id"] = id
+        return record
+
+    @staticmethod
+    def _write_records(
+        conn: sqlite3.Connection,
+        data: dict[str, dict[str, Any]],
+        keep_times: bool = False,
+    ) -> None:
+        current_time = int(time.time())
+        rows = []
+        for k, v in data.items():
+            value = dict(v)
+            create_time = value.pop("create_time", 0) if keep_times else current_time
+            update_time = value.pop("update_time", 0) if keep_times else current_time
+            value.pop("create_time", None)
+            value.pop("update_time", None)
+            value.pop("_id", None)
+            rows.append(
+                (k, json.dumps(value, ensure_ascii=False), create_time, update_time)
+            )
+        # create_time is only set for new keys, existing keys keep theirs
+        conn.executemany(
+            """INSERT INTO kv (id, data, create_time, update_time) VALUES (?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                 data=excluded.data, update_time=excluded.update_time""",
+            rows,
+        )
+
+    async def get_all(self) -> dict[str, Any]:
+        """Get all data from storage
+
+        Returns:
+            Dictionary containing all stored data
+        """
+
+        def _get_all(conn):
+            rows = conn.execute(
+                "SELECT id, data, create_time, update_time FROM kv"
+            ).fetchall()
+            return {row[0]: self._row_to_record(row) for row in rows}
+
+        return await self._require_db().run(_get_all)
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        def _get(conn):
+            row = conn.execute(
+                "SELECT id, data, create_time, update_time FROM kv WHERE id=?", (id,)
+            ).fetchone()
+            return self._row_to_record(row) if row else None
+
+        return await self._require_db().run(_get)
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        def _get(conn):
+            found = {}
+            for batch in _chunked(list(ids)):
+                rows = conn.execute(
+                    "SELECT id, data, create_time, update_time FROM kv"
+                    f" WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ).fetchall()
+                for row in rows:
+                    found[row[0]] = self._row_to_record(row)
+            # Preserve request order, missing keys map to None
+            return [found.get(id) for id in ids]
+
+        return await self._require_db().run(_get)
+
+    async def filter_keys(self, keys: set[str]) -> set[str]:
+        def _filter(conn):
+            key_list = list(keys)
+            existing = set()
+            for batch in _chunked(key_list):
+                rows = conn.execute(
+                    f"SELECT id FROM kv WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ).fetchall()
+                existing.update(row[0] for row in rows)
+            return set(key_list) - existing
+
+        return await self._require_db().run(_filter)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """Insert or update records, committed immediately"""
+        if not data:
+            return
+        logger.debug(
+            f"[{self.workspace}] Inserting {len(data)} records to {self.namespace}"
+        )
+        # For text_chunks namespace, ensure llm_cache_list field exists
+        if self.namespace.endswith("text_chunks"):
+            for v in data.values():
+                if "llm_cache_list" not in v:
+                    v["llm_cache_list"] = []
+
+        await self._require_db().run(
+            lambda conn: self._write_records(conn, data), write=True
+        )
+
+    async def delete(self, ids: list[str]) -> None:
+        """Delete specific records from storage by their IDs
+
+        Args:
+            ids (list[str]): List of document IDs to be deleted from storage
+
+        Returns:
+            None
+        """
+        if not ids:
+            return
+
+        def _delete(conn):
+            for batch in _chunked(list(ids)):
+                conn.execute(
+                    f"DELETE FROM kv WHERE id IN ({_placeholders(len(batch))})", batch
+                )
+
+        await self._require_db().run(_delete, write=True)
+
+    async def index_done_callback(self) -> None:
+        # Every write is committed as it happens
+        pass
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all data from storage
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            await self._require_db().run(
+                lambda conn: conn.execute("DELETE FROM kv"), write=True
+            )
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
+            )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
+
+
+DOC_STATUS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS doc_status (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    file_path TEXT,
+    track_id TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_doc_status_status_updated ON doc_status (status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_doc_status_status_created ON doc_status (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_doc_status_updated ON doc_status (updated_at);
+CREATE INDEX IF NOT EXISTS idx_doc_status_created ON doc_status (created_at);
+CREATE INDEX IF NOT EXISTS idx_doc_status_file_path ON doc_status (file_path);
+CREATE INDEX IF NOT EXISTS idx_doc_status_track_id ON doc_status (track_id);
+"""
+
+
+@final
+@dataclass
+class SQLiteDocStatusStorage(DocStatusStorage):
+    """Document status storage in an embedded SQLite database with indexed status, path and time columns"""
+
+    def __post_init__(self):
+        workspace_dir = _workspace_dir(self)
+        self._db_file = os.path.join(workspace_dir, f"kv_store_{self.namespace}.sqlite")
+        # JsonDocStatusStorage file of the same namespace, imported on first start
+        self._json_file = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        self._db: SQLiteConnection | None = None
+
+    async def initialize(self):
+        """Open the database and import existing JSON data into an empty table"""
+        if self._db is not None:
+            return
+        self._db = SQLiteConnection(self._db_file)
+        await self._db.open(DOC_STATUS_SCHEMA)
+
+        count = await self._db.run(
+            lambda conn: conn.execute("SELECT COUNT(*) FROM doc_status").fetchone()[0]
+        )
+        if count == 0 and os.path.exists(self._json_file):
+            legacy_data = load_json(self._json_file) or {}
+            if legacy_data:
+                await self._db.run(
+                    lambda conn: self._write_records(conn, legacy_data), write=True
+                )
+                logger.info(
+                    f"[{self.workspace}] Imported {len(legacy_data)} records from {self._json_file} into {self._db_file}"
+                )
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} SQLite doc status opened {self.namespace} ({self._db_file})"
+        )
+
+    async def finalize(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    def _require_db(self) -> SQLiteConnection:
+        if self._db is None:
+            raise StorageNotInitializedError("SQLiteDocStatusStorage")
+        return self._db
+
+    @staticmethod
+    def _write_records(
+        conn: sqlite3.Connection, data: dict[str, dict[str, Any]]
+    ) -> None:
+        rows = []
+        for doc_id, doc_data in data.items():
+            status = doc_data.get("status")
+            # DocStatus members are stored by value
+            status = getattr(status, "value", status)
+            rows.append(
+                (
+                    doc_id,
+                    status,
+                    doc_data.get("file_path"),
+                    doc_data.get("track_id"),
+                    doc_data.get("created_at"),
+                    doc_data.get("updated_at"),
+                    json.dumps(doc_data, ensure_ascii=False, default=str),
+                )
+            )
+        conn.executemany(
+            """INSERT OR REPLACE INTO doc_status
+               (id, status, file_path, track_id, created_at, updated_at, data)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+
+    def _to_doc_status(self, doc_id: str, data: str) -> DocProcessingStatus | None:
+        doc = json.loads(data)
+        # Remove deprecated content field if it exists
+        doc.pop("content", None)
+        # If file_path is not in data, use document id as file path
+        if "file_path" not in doc:
+            doc["file_path"] = "no-file-path"
+        # Ensure new fields exist with default values
+        if "metadata" not in doc:
+            doc["metadata"] = {}
+        if "error_msg" not in doc:
+            doc["error_msg"] = None
+        try:
+            return DocProcessingStatus(**doc)
+        except (KeyError, TypeError) as e:
+            logger.error(
+                f"[{self.workspace}] Missing required field for document {doc_id}: {e}"
+            )
+            return None
+
+    async def _query_doc_status(
+        self, where: str, params: tuple
+    ) -> dict[str, DocProcessingStatus]:
+        rows = await self._require_db().run(
+            lambda conn: conn.execute(
+                f"SELECT id, data FROM doc_status WHERE {where}", params
+            ).fetchall()
+        )
+        result = {}
+        for doc_id, data in rows:
+            doc_status = self._to_doc_status(doc_id, data)
+            if doc_status is not None:
+                result[doc_id] = doc_status
+        return result
+
+    async def filter_keys(self, keys: set[str]) -> set[str]:
+        """Return keys that should be processed (not in storage or not successfully processed)"""
+
+        def _filter(conn):
+            key_list = list(keys)
+            existing = set()
+            for batch in _chunked(key_list):
+                rows = conn.execute(
+                    f"SELECT id FROM doc_status WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ).fetchall()
+                existing.update(row[0] for row in rows)
+            return set(key_list) - existing
+
+        return await self._require_db().run(_filter)
+
+    async def get_by_id(self, id: str) -> Union[dict[str, Any], None]:
+        row = await self._require_db().run(
+            lambda conn: conn.execute(
+                "SELECT data FROM doc_status WHERE id=?", (id,)
+            ).fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        def _get(conn):
+            found = {}
+            for batch in _chunked(list(ids)):
+                rows = conn.execute(
+                    f"SELECT id, data FROM doc_status WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ).fetchall()
+                found.update((doc_id, json.loads(data)) for doc_id, data in rows)
+            # Missing documents are skipped, like JsonDocStatusStorage
+            return [found[id] for id in ids if id in found]
+
+        return await self._require_db().run(_get)
+
+    async def get_status_counts(self) -> dict[str, int]:
+        """Get counts of documents in each status"""
+        rows = await self._require_db().run(
+            lambda conn: conn.execute(
+                "SELECT status, COUNT(*) FROM doc_status GROUP BY status"
+            ).fetchall()
+        )
+        counts = {status.value: 0 for status in DocStatus}
+        for status, count in rows:
+            counts[status] = count
+        return counts
+
+    async def get_all_status_counts(self) -> dict[str, int]:
+        """Get counts of documents in each status for all documents
+
+        Returns:
+            Dictionary mapping status names to counts, including 'all' field
+        """
+        counts = await self.get_status_counts()
+        counts["all"] = sum(counts.values())
+        return counts
+
+    async def get_docs_by_status(
+        self, status: DocStatus
+    ) -> dict[str, DocProcessingStatus]:
+        """Get all documents with a specific status"""
+        return await self._query_doc_status("status=?", (status.value,))
+
+    async def get_docs_by_track_id(
+        self, track_id: str
+    ) -> dict[str, DocProcessingStatus]:
+        """Get all documents with a specific track_id"""
+        return await self._query_doc_status("track_id=?", (track_id,))
+
+    async def get_docs_paginated(
+        self,
+        status_filter: DocStatus | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        sort_field: str = "updated_at",
+        sort_direction: str = "desc",
+    ) -> tuple[list[tuple[str, DocProcessingStatus]], int]:
+        """Get documents with pagination support
+
+        Args:
+            status_filter: Filter by document status, None for all statuses
+            page: Page number (1-based)
+            page_size: Number of documents per page (10-200)
+            sort_field: Field to sort by ('created_at', 'updated_at', 'id')
+            sort_direction: Sort direction ('asc' or 'desc')
+
+        Returns:
+            Tuple of (list of (doc_id, DocProcessingStatus) tuples, total_count)
+        """
+        # Validate parameters
+        if page < 1:
+            page = 1
+        if page_size < 10:
+            page_size = 10
+        elif page_size > 200:
+            page_size = 200
+
+        if sort_field not in ["created_at", "updated_at", "id", "file_path"]:
+            sort_field = "updated_at"
+
+        if sort_direction.lower() not in ["asc", "desc"]:
+            sort_direction = "desc"
+
+        where_clause = ""
+        params: tuple = ()
+        if status_filter is not None:
+            where_clause = "WHERE status=?"
+            params = (status_filter.value,)
+
+        # Sorting and paging are served by the status/time indexes
+        def _page(conn):
+            total_count = conn.execute(
+                f"SELECT COUNT(*) FROM doc_status {where_clause}", params
+            ).fetchone()[0]
+            rows = conn.execute(
+                f"""SELECT id, data FROM doc_status {where_clause}
+                    ORDER BY {sort_field} {sort_direction.upper()}, id
+                    LIMIT ? OFFSET ?""",
+                params + (page_size, (page - 1) * page_size),
+            ).fetchall()
+            return rows, total_count
+
+        rows, total_count = await self._require_db().run(_page)
+
+        documents = []
+        for doc_id, data in rows:
+            doc_status = self._to_doc_status(doc_id, data)
+            if doc_status is not None:
+                documents.append((doc_id, doc_status))
+        return documents, total_count
+
+    async def get_doc_by_file_path(self, file_path: str) -> Union[dict[str, Any], None]:
+        """Get document by file path
+
+        Args:
+            file_path: The file path to search for
+
+        Returns:
+            Union[dict[str, Any], None]: Document data if found, None otherwise
+            Returns the same format as get_by_ids method
+        """
+        row = await self._require_db().run(
+            lambda conn: conn.execute(
+                "SELECT data FROM doc_status WHERE file_path=? LIMIT 1", (file_path,)
+            ).fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """Insert or update document status records, committed immediately"""
+        if not data:
+            return
+        logger.debug(
+            f"[{self.workspace}] Inserting {len(data)} records to {self.namespace}"
+        )
+        # Ensure chunks_list field exists for new documents
+        for doc_data in data.values():
+            if "chunks_list" not in doc_data:
+                doc_data["chunks_list"] = []
+
+        await self._require_db().run(
+            lambda conn: self._write_records(conn, data), write=True
+        )
+
+    async def delete(self, doc_ids: list[str]) -> None:
+        """Delete specific records from storage by their IDs
+
+        Args:
+            ids (list[str]): List of document IDs to be deleted from storage
+
+        Returns:
+            None
+        """
+        if not doc_ids:
+            return
+
+        def _delete(conn):
+            for batch in _chunked(list(doc_ids)):
+                conn.execute(
+                    f"DELETE FROM doc_status WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                )
+
+        await self._require_db().run(_delete, write=True)
+
+    async def index_done_callback(self) -> None:
+        # Every write is committed as it happens
+        pass
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all document status data from storage
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            await self._require_db().run(
+                lambda conn: conn.execute("DELETE FROM doc_status"), write=True
+            )
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
+            )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
+
+
+GRAPH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS edges (
+    src TEXT NOT NULL,
+    tgt TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (src, tgt)
+);
+CREATE INDEX IF NOT EXISTS idx_edges_tgt ON edges (tgt);
+CREATE TABLE IF NOT EXISTS node_chunks (
+    chunk_id TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    PRIMARY KEY (chunk_id, node_id)
+);
+CREATE INDEX IF NOT EXISTS idx_node_chunks_node ON node_chunks (node_id);
+CREATE TABLE IF NOT EXISTS edge_chunks (
+    chunk_id TEXT NOT NULL,
+    src TEXT NOT NULL,
+    tgt TEXT NOT NULL,
+    PRIMARY KEY (chunk_id, src, tgt)
+);
+CREATE INDEX IF NOT EXISTS idx_edge_chunks_edge ON edge_chunks (src, tgt);
+"""
+
+# Degree of every node: each edge counts once for both endpoints, so a
+# self-loop counts twice, like _degrees and NetworkX's graph.degree
+DEGREE_SQL = """
+SELECT id, COUNT(*) AS degree FROM (
+    SELECT src AS id FROM edges UNION ALL SELECT tgt AS id FROM edges
+) GROUP BY id
+"""
+
+
+@final
+@dataclass
+class SQLiteGraphStorage(BaseGraphStorage):
+    """Undirected property graph in an embedded SQLite database
+
+    Edges are stored once with ordered endpoints (src <= tgt). The node_chunks
+    and edge_chunks tables index the chunk ids in source_id, so chunk lookups
+    do not scan the graph.
+    """
+
+    def __post_init__(self):
+        workspace_dir = _workspace_dir(self)
+        self._db_file = os.path.join(workspace_dir, f"graph_{self.namespace}.sqlite")
+        # NetworkXStorage files of the same namespace, imported on first start
+        self._snapshot_file = os.path.join(workspace_dir, f"graph_{self.namespace}.npz")
+        self._delta_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.delta.jsonl"
+        )
+        self._graphml_xml_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.graphml"
+        )
+        self._db: SQLiteConnection | None = None
+
+    async def initialize(self):
+        """Open the database and import an existing NetworkX graph into an empty graph"""
+        if self._db is not None:
+            return
+        self._db = SQLiteConnection(self._db_file)
+        await self._db.open(GRAPH_SCHEMA)
+
+        count = await self._db.run(
+            lambda conn: conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+        )
+        source_file = next(
+            (
+                file_name
+                for file_name in (self._snapshot_file, self._graphml_xml_file)
+                if os.path.exists(file_name)
+            ),
+            None,
+        )
+        if count == 0 and source_file is not None:
+            if source_file == self._snapshot_file:
+                graph = load_graph_snapshot(self._snapshot_file)
+                replay_graph_delta(graph, self._delta_file)
+            else:
+                graph = nx.read_graphml(self._graphml_xml_file)
+
+            def _import(conn):
+                for node_id, node_data in graph.nodes(data=True):
+                    self._write_node(conn, str(node_id), node_data)
+                for src, tgt, edge_data in graph.edges(data=True):
+                    self._write_edge(conn, str(src), str(tgt), edge_data)
+
+            await self._db.run(_import, write=True)
+            logger.info(
+                f"[{self.workspace}] Imported graph from {source_file} with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+            )
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} SQLite graph opened {self.namespace} ({self._db_file})"
+        )
+
+    async def finalize(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    def _require_db(self) -> SQLiteConnection:
+        if self._db is None:
+            raise StorageNotInitializedError("SQLiteGraphStorage")
+        return self._db
+
+    @staticmethod
+    def _edge_key(source_node_id: str, target_node_id: str) -> tuple[str, str]:
+        if source_node_id <= target_node_id:
+            return source_node_id, target_node_id
+        return target_node_id, source_node_id
+
+    @staticmethod
+    def _chunk_ids(data: dict) -> set[str]:
+        source_id = data.get("source_id")
+        if not source_id:
+            return set()
+        return {chunk_id for chunk_id in source_id.split(GRAPH_FIELD_SEP) if chunk_id}
+
+    @staticmethod
+    def _write_node(conn: sqlite3.Connection, node_id: str, node_data: dict) -> None:
+        row = conn.execute("SELECT data FROM nodes WHERE id=?", (node_id,)).fetchone()
+        # Attributes are merged into an existing node, as networkx add_node does
+        data = json.loads(row[0]) if row else {}
+        data.update(node_data)
+        conn.execute(
+            "INSERT OR REPLACE INTO nodes (id, data) VALUES (?, ?)",
+            (node_id, json.dumps(data, ensure_ascii=False)),
+        )
+        if "source_id" in node_data:
+            conn.execute("DELETE FROM node_chunks WHERE node_id=?", (node_id,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO node_chunks (chunk_id, node_id) VALUES (?, ?)",
+                [
+                    (chunk_id, node_id)
+                    for chunk_id in SQLiteGraphStorage._chunk_ids(data)
+                ],
+            )
+
+    @staticmethod
+    def _write_edge(
+        conn: sqlite3.Connection,
+        source_node_id: str,
+        target_node_id: str,
+        edge_data: dict,
+    ) -> None:
+        src, tgt = SQLiteGraphStorage._edge_key(source_node_id, target_node_id)
+        # Missing endpoints are created empty, as networkx add_edge does
+        conn.executemany(
+            "INSERT OR IGNORE INTO nodes (id, data) VALUES (?, '{}')",
+            [(src,), (tgt,)],
+        )
+        row = conn.execute(
+            "SELECT data FROM edges WHERE src=? AND tgt=?", (src, tgt)
+        ).fetchone()
+        data = json.loads(row[0]) if row else {}
+        data.update(edge_data)
+        conn.execute(
+            "INSERT OR REPLACE INTO edges (src, tgt, data) VALUES (?, ?, ?)",
+            (src, tgt, json.dumps(data, ensure_ascii=False)),
+        )
+        if "source_id" in edge_data:
+            conn.execute("DELETE FROM edge_chunks WHERE src=? AND tgt=?", (src, tgt))
+            conn.executemany(
+                "INSERT OR IGNORE INTO edge_chunks (chunk_id, src, tgt) VALUES (?, ?, ?)",
+                [
+                    (chunk_id, src, tgt)
+                    for chunk_id in SQLiteGraphStorage._chunk_ids(data)
+                ],
+            )
+
+    @staticmethod
+    def _delete_nodes(conn: sqlite3.Connection, node_ids: list[str]) -> None:
+        for batch in _chunked(node_ids, SQLITE_MAX_PARAMS // 2):
+            marks = _placeholders(len(batch))
+            conn.execute(
+                f"DELETE FROM edge_chunks WHERE src IN ({marks}) OR tgt IN ({marks})",
+                batch + batch,
+            )
+            conn.execute(
+                f"DELETE FROM edges WHERE src IN ({marks}) OR tgt IN ({marks})",
+                batch + batch,
+            )
+            conn.execute(f"DELETE FROM node_chunks WHERE node_id IN ({marks})", batch)
+            conn.execute(f"DELETE FROM nodes WHERE id IN ({marks})", batch)
+
+    @staticmethod
+    def _degrees(conn: sqlite3.Connection, node_ids: list[str]) -> dict[str, int]:
+        degrees = dict.fromkeys(node_ids, 0)
+        for batch in _chunked(node_ids, SQLITE_MAX_PARAMS // 2):
+            marks = _placeholders(len(batch))
+            # A self-loop is counted from both ends, like NetworkX's graph.degree
+            rows = conn.execute(
+                f"""SELECT id, COUNT(*) FROM (
+                        SELECT src AS id FROM edges WHERE src IN ({marks})
+                        UNION ALL
+                        SELECT tgt AS id FROM edges WHERE tgt IN ({marks})
+                    ) GROUP BY id""",
+                batch + batch,
+            ).fetchall()
+            degrees.update(rows)
+        return degrees
+
+    @staticmethod
+    def _neighbors(
+        conn: sqlite3.Connection, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        edges: dict[str, list[tuple[str, str]]] = {node_id: [] for node_id in node_ids}
+        for batch in _chunked(node_ids, SQLITE_MAX_PARAMS // 2):
+            marks = _placeholders(len(batch))
+            rows = conn.execute(
+                f"SELECT src, tgt FROM edges WHERE src IN ({marks}) OR tgt IN ({marks})",
+                batch + batch,
+            ).fetchall()
+            for src, tgt in rows:
+                # Edges are reported from the queried node's side
+                if src in edges:
+                    edges[src].append((src, tgt))
+                if tgt in edges and tgt != src:
+                    edges[tgt].append((tgt, src))
+        return edges
+
+    async def has_node(self, node_id: str) -> bool:
+        row = await self._require_db().run(
+            lambda conn: conn.execute(
+                "SELECT 1 FROM nodes WHERE id=?", (node_id,)
+            ).fetchone()
+        )
+        return row is not None
+
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        key = self._edge_key(source_node_id, target_node_id)
+        row = await self._require_db().run(
+            lambda conn: conn.execute(
+                "SELECT 1 FROM edges WHERE src=? AND tgt=?", key
+            ).fetchone()
+        )
+        return row is not None
+
+    async def get_node(self, node_id: str) -> dict[str, str] | None:
+        row = await self._require_db().run(
+            lambda conn: conn.execute(
+                "SELECT data FROM nodes WHERE id=?", (node_id,)
+            ).fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    async def node_degree(self, node_id: str) -> int:
+        degrees = await self._require_db().run(
+            lambda conn: self._degrees(conn, [node_id])
+        )
+        return degrees[node_id]
+
+    async def edge_degree(self, src_id: str, tgt_id: str) -> int:
+        degrees = await self._require_db().run(
+            lambda conn: self._degrees(conn, list({src_id, tgt_id}))
+        )
+        return degrees[src_id] + degrees[tgt_id]
+
+    async def get_edge(
+        self, source_node_id: str, target_node_id: str
+    ) -> dict[str, str] | None:
+        key = self._edge_key(source_node_id, target_node_id)
+        row = await self._require_db().run(
+            lambda conn: conn.execute(
+                "SELECT data FROM edges WHERE src=? AND tgt=?", key
+            ).fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    async def get_node_edges(self, source_node_id: str) -> list[tuple[str, str]] | None:
+        def _get(conn):
+            if (
+                conn.execute(
+                    "SELECT 1 FROM nodes WHERE id=?", (source_node_id,)
+                ).fetchone()
+                is None
+            ):
+                return None
+            return self._neighbors(conn, [source_node_id])[source_node_id]
+
+        return await self._require_db().run(_get)
+
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        def _get(conn):
+            result = {}
+            for batch in _chunked(list(node_ids)):
+                rows = conn.execute(
+                    f"SELECT id, data FROM nodes WHERE id IN ({_placeholders(len(batch))})",
+                    batch,
+                ).fetchall()
+                result.update((node_id, json.loads(data)) for node_id, data in rows)
+            return result
+
+        return await self._require_db().run(_get)
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        return await self._require_db().run(
+            lambda conn: self._degrees(conn, list(dict.fromkeys(node_ids)))
+        )
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        node_ids = list(dict.fromkeys(node for pair in edge_pairs for node in pair))
+        degrees = await self.node_degrees_batch(node_ids)
+        return {
+            (src_id, tgt_id): degrees[src_id] + degrees[tgt_id]
+            for src_id, tgt_id in edge_pairs
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        def _get(conn):
+            result = {}
+            for pair in pairs:
+                key = self._edge_key(pair["src"], pair["tgt"])
+                row = conn.execute(
+                    "SELECT data FROM edges WHERE src=? AND tgt=?", key
+                ).fetchone()
+                if row is not None:
+                    result[(pair["src"], pair["tgt"])] = json.loads(row[0])
+            return result
+
+        return await self._require_db().run(_get)
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        return await self._require_db().run(
+            lambda conn: self._neighbors(conn, list(dict.fromkeys(node_ids)))
+        )
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        """Insert or update a node, committed immediately"""
+        await self._require_db().run(
+            lambda conn: self._write_node(conn, node_id, node_data), write=True
+        )
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        """Insert or update an edge, committed immediately"""
+        await self._require_db().run(
+            lambda conn: self._write_edge(
+                conn, source_node_id, target_node_id, edge_data
+            ),
+            write=True,
+        )
+
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Insert or update multiple nodes in one transaction"""
+
+        def _write(conn):
+            for node_id, node_data in nodes:
+                self._write_node(conn, node_id, node_data)
+
+        await self._require_db().run(_write, write=True)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update multiple edges in one transaction"""
+
+        def _write(conn):
+            for source_node_id, target_node_id, edge_data in edges:
+                self._write_edge(conn, source_node_id, target_node_id, edge_data)
+
+        await self._require_db().run(_write, write=True)
+
+    async def delete_node(self, node_id: str) -> None:
+        """Delete a node and its edges"""
+
+        def _delete(conn):
+            exists = conn.execute(
+                "SELECT 1 FROM nodes WHERE id=?", (node_id,)
+            ).fetchone()
+            if exists:
+                self._delete_nodes(conn, [node_id])
+            return exists is not None
+
+        if await self._require_db().run(_delete, write=True):
+            logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
+        else:
+            logger.warning(
+                f"[{self.workspace}] Node {node_id} not found in the graph for deletion"
+            )
+
+    async def remove_nodes(self, nodes: list[str]):
+        """Delete multiple nodes
+
+        Args:
+            nodes: List of node IDs to be deleted
+        """
+        if not nodes:
+            return
+        await self._require_db().run(
+            lambda conn: self._delete_nodes(conn, list(nodes)), write=True
+        )
+
+    async def remove_edges(self, edges: list[tuple[str, str]]):
+        """Delete multiple edges
+
+        Args:
+            edges: List of edges to be deleted, each edge is a (source, target) tuple
+        """
+        if not edges:
+            return
+        keys = [self._edge_key(source, target) for source, target in edges]
+
+        def _delete(conn):
+            conn.executemany("DELETE FROM edge_chunks WHERE src=? AND tgt=?", keys)
+            conn.executemany("DELETE FROM edges WHERE src=? AND tgt=?", keys)
+
+        await self._require_db().run(_delete, write=True)
+
+    async def get_all_labels(self) -> list[str]:
+        """
+        Get all node labels in the graph
+        Returns:
+            [label1, label2, ...]  # Alphabetically sorted label list
+        """
+        rows = await self._require_db().run(
+            lambda conn: conn.execute("SELECT id FROM nodes ORDER BY id").fetchall()
+        )
+        return [row[0] for row in rows]
+
+    async def get_popular_labels(self, limit: int = 300) -> list[str]:
+        """
+        Get popular labels by node degree (most connected entities)
+
+        Args:
+            limit: Maximum number of labels to return
+
+        Returns:
+            List of labels sorted by degree (highest first)
+        """
+        rows = await self._require_db().run(
+            lambda conn: conn.execute(
+                f"""SELECT nodes.id FROM nodes
+                    LEFT JOIN ({DEGREE_SQL}) AS d ON d.id = nodes.id
+                    ORDER BY COALESCE(d.degree, 0) DESC, nodes.id
+                    LIMIT ?""",
+                (limit,),
+            ).fetchall()
+        )
+        popular_labels = [row[0] for row in rows]
+        logger.debug(
+            f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
+        )
+        return popular_labels
+
+    async def search_labels(self, query: str, limit: int = 50) -> list[str]:
+        """
+        Search labels with fuzzy matching
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return
+
+        Returns:
+            List of matching labels sorted by relevance
+        """
+        query_lower = query.lower().strip()
+        if not query_lower:
+            return []
+
+        rows = await self._require_db().run(
+            lambda conn: conn.execute(
+                "SELECT id FROM nodes WHERE instr(lower(id), ?) > 0", (query_lower,)
+            ).fetchall()
+        )
+
+        # Same relevance scoring as NetworkXStorage
+        matches = []
+        for (node_str,) in rows:
+            node_lower = node_str.lower()
+            if query_lower not in node_lower:
+                continue
+            if node_lower == query_lower:
+                score = 1000
+            elif node_lower.startswith(query_lower):
+                score = 500
+            else:
+                score = 100 - len(node_str)
+                if f" {query_lower}" in node_lower or f"_{query_lower}" in node_lower:
+                    score += 50
+            matches.append((node_str, score))
+
+        matches.sort(key=lambda x: (-x[1], x[0]))
+        search_results = [match[0] for match in matches[:limit]]
+        logger.debug(
+            f"[{self.workspace}] Search query '{query}' returned {len(search_results)} results (limit: {limit})"
+        )
+        return search_results
+
+    async def get_knowledge_graph(
+        self,
+        node_label: str,
+        max_depth: int = 3,
+        max_nodes: int = None,
+    ) -> KnowledgeGraph:
+        """
+        Retrieve a connected subgraph of nodes where the label includes the specified `node_label`.
+
+        Args:
+            node_label: Label of the starting node，* means all nodes
+            max_depth: Maximum depth of the subgraph, Defaults to 3
+            max_nodes: Maxiumu nodes to return by BFS, Defaults to 1000
+
+        Returns:
+            KnowledgeGraph object containing nodes and edges, with an is_truncated flag
+            indicating whether the graph was truncated due to max_nodes limit
+        """
+        # Get max_nodes from global_config if not provided
+        if max_nodes is None:
+            max_nodes = self.global_config.get("max_graph_nodes", 1000)
+        else:
+            # Limit max_nodes to not exceed global_config max_graph_nodes
+            max_nodes = min(max_nodes, self.global_config.get("max_graph_nodes", 1000))
+
+        result = KnowledgeGraph()
+
+        if node_label == "*":
+            total_nodes = await self._require_db().run(
+                lambda conn: conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+            )
+            if total_nodes > max_nodes:
+                result.is_truncated = True
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: {total_nodes} nodes found, limited to {max_nodes}"
+                )
+            selected_nodes = await self.get_popular_labels(max_nodes)
+        else:
+            if not await self.has_node(node_label):
+                logger.warning(
+                    f"[{self.workspace}] Node {node_label} not found in the graph"
+                )
+                return KnowledgeGraph()  # Return empty graph
+
+            # BFS one level at a time, highest-degree nodes first within a level
+            selected_nodes = []
+            visited = set()
+            current_level = [node_label]
+            depth = 0
+            has_unexplored_neighbors = False
+            while current_level and len(selected_nodes) < max_nodes:
+                degrees = await self.node_degrees_batch(current_level)
+                current_level.sort(key=lambda n: degrees[n], reverse=True)
+                level_nodes = []
+                for node in current_level:
+                    if node in visited:
+                        continue
+                    if len(selected_nodes) >= max_nodes:
+                        break
+                    visited.add(node)
+                    selected_nodes.append(node)
+                    level_nodes.append(node)
+
+                node_edges = await self.get_nodes_edges_batch(level_nodes)
+                next_level = list(
+                    dict.fromkeys(
+                        neighbor
+                        for node in level_nodes
+                        for _, neighbor in node_edges[node]
+                        if neighbor not in visited
+                    )
+                )
+                if depth >= max_depth:
+                    has_unexplored_neighbors = bool(next_level)
+                    break
+                current_level = next_level
+                depth += 1
+
+            if len(selected_nodes) >= max_nodes and current_level:
+                result.is_truncated = True
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: max_nodes limit {max_nodes} reached"
+                )
+            elif has_unexplored_neighbors:
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: found {len(selected_nodes)} nodes within max_depth {max_depth}"
+                )
+
+        def _subgraph(conn):
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS kg_nodes (id TEXT PRIMARY KEY)"
+            )
+            conn.execute("DELETE FROM kg_nodes")
+            conn.executemany(
+                "INSERT OR IGNORE INTO kg_nodes (id) VALUES (?)",
+                [(node,) for node in selected_nodes],
+            )
+            nodes = conn.execute(
+                "SELECT nodes.id, nodes.data FROM nodes JOIN kg_nodes ON kg_nodes.id = nodes.id"
+            ).fetchall()
+            edges = conn.execute(
+                """SELECT src, tgt, data FROM edges
+                   WHERE src IN (SELECT id FROM kg_nodes) AND tgt IN (SELECT id FROM kg_nodes)"""
+            ).fetchall()
+            conn.execute("DELETE FROM kg_nodes")
+            return nodes, edges
+
+        nodes, edges = await self._require_db().run(_subgraph)
+        node_rows = dict(nodes)
+        for node_id in selected_nodes:
+            if node_id not in node_rows:
+                continue
+            result.nodes.append(
+                KnowledgeGraphNode(
+                    id=node_id,
+                    labels=[node_id],
+                    properties=json.loads(node_rows[node_id]),
+                )
+            )
+        for src, tgt, data in edges:
+            result.edges.append(
+                KnowledgeGraphEdge(
+                    id=f"{src}-{tgt}",
+                    type="DIRECTED",
+                    source=src,
+                    target=tgt,
+                    properties=json.loads(data),
+                )
+            )
+
+        logger.info(
+            f"[{self.workspace}] Subgraph query successful | Node count: {len(result.nodes)} | Edge count: {len(result.edges)}"
+        )
+        return result
+
+    async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        def _get(conn):
+            matching_nodes = {}
+            for batch in _chunked(list(set(chunk_ids))):
+                rows = conn.execute(
+                    f"""SELECT DISTINCT nodes.id, nodes.data FROM node_chunks
+                        JOIN nodes ON nodes.id = node_chunks.node_id
+                        WHERE node_chunks.chunk_id IN ({_placeholders(len(batch))})""",
+                    batch,
+                ).fetchall()
+                for node_id, data in rows:
+                    node_data = json.loads(data)
+                    node_data["id"] = node_id
+                    matching_nodes[node_id] = node_data
+            return list(matching_nodes.values())
+
+        return await self._require_db().run(_get)
+
+    async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        def _get(conn):
+            matching_edges = {}
+            for batch in _chunked(list(set(chunk_ids))):
+                rows = conn.execute(
+                    f"""SELECT DISTINCT edges.src, edges.tgt, edges.data FROM edge_chunks
+                        JOIN edges ON edges.src = edge_chunks.src AND edges.tgt = edge_chunks.tgt
+                        WHERE edge_chunks.chunk_id IN ({_placeholders(len(batch))})""",
+                    batch,
+                ).fetchall()
+                for src, tgt, data in rows:
+                    edge_data = json.loads(data)
+                    edge_data["source"] = src
+                    edge_data["target"] = tgt
+                    matching_edges[(src, tgt)] = edge_data
+            return list(matching_edges.values())
+
+        return await self._require_db().run(_get)
+
+    async def get_all_nodes(self) -> list[dict]:
+        """Get all nodes in the graph.
+
+        Returns:
+            A list of all nodes, where each node is a dictionary of its properties
+        """
+        rows = await self._require_db().run(
+            lambda conn: conn.execute("SELECT id, data FROM nodes").fetchall()
+        )
+        all_nodes = []
+        for node_id, data in rows:
+            node_data = json.loads(data)
+            node_data["id"] = node_id
+            all_nodes.append(node_data)
+        return all_nodes
+
+    async def get_all_edges(self) -> list[dict]:
+        """Get all edges in the graph.
+
+        Returns:
+            A list of all edges, where each edge is a dictionary of its properties
+        """
+        rows = await self._require_db().run(
+            lambda conn: conn.execute("SELECT src, tgt, data FROM edges").fetchall()
+        )
+        all_edges = []
+        for src, tgt, data in rows:
+            edge_data = json.loads(data)
+            edge_data["source"] = src
+            edge_data["target"] = tgt
+            all_edges.append(edge_data)
+        return all_edges
+
+    async def index_done_callback(self) -> None:
+        # Every write is committed as it happens
+        pass
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all graph data from storage
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+
+        def _drop(conn):
+            for table in ("edge_chunks", "node_chunks", "edges", "nodes"):
+                conn.execute(f"DELETE FROM {table}")
+
+        try:
+            await self._require_db().run(_drop, write=True)
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} drop graph {self._db_file}"
+            )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error dropping graph {self._db_file}: {e}"
+            )
+            return {"status": "error", "message": str(e)}
@@ -9,6 +9,7 @@ import warnings
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from functools import partial
+from hashlib import md5
 from typing import (
     Any,
     AsyncIterator,
@@ -32,17 +33,31 @@ from lightrag.constants import (
     DEFAULT_COSINE_THRESHOLD,
     DEFAULT_RELATED_CHUNK_NUMBER,
     DEFAULT_KG_CHUNK_PICK_METHOD,
+    DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
+    DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
+    DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     DEFAULT_MIN_RERANK_SCORE,
     DEFAULT_SUMMARY_MAX_TOKENS,
     DEFAULT_SUMMARY_CONTEXT_SIZE,
+    DEFAULT_SUMMARY_MAX_PARALLEL,
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_MERGE_BATCH_DOCS,
+    DEFAULT_MERGE_BATCH_TIMEOUT,
+    DEFAULT_VDB_UPSERT_FLUSH_INTERVAL,
+    DEFAULT_EMBEDDING_RESULT_CACHE_MAX_MB,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
     DEFAULT_LLM_TIMEOUT,
     DEFAULT_EMBEDDING_TIMEOUT,
+    DEFAULT_CHUNKING_OFFLOAD_THRESHOLD,
+    DEFAULT_CHUNKING_PROCESS_POOL_SIZE,
+    DEFAULT_DOCUMENT_SEGMENT_SIZE,
+    DEFAULT_STREAM_CHUNK_BATCH_SIZE,
+    DEFAULT_ORPHAN_SEGMENT_MAX_AGE,
+    PENDING_SEGMENTS_KEY,
 )
 from lightrag.utils import get_env_value
 
@@ -57,6 +72,7 @@ from lightrag.kg.shared_storage import (
     get_pipeline_status_lock,
     get_graph_db_lock,
     get_data_init_lock,
+    get_storage_keyed_lock,
 )
 
 from lightrag.base import (
@@ -75,9 +91,12 @@ from lightrag.base import (
 )
 from lightrag.namespace import NameSpace
 from lightrag.operate import (
+    achunk_document,
+    shutdown_chunking_executor,
     chunking_by_token_size,
     extract_entities,
     merge_nodes_and_edges,
+    merge_nodes_and_edges_batch,
     kg_query,
     naive_query,
     _rebuild_knowledge_from_chunks,
@@ -87,7 +106,10 @@ from lightrag.utils import (
     Tokenizer,
     TiktokenTokenizer,
     EmbeddingFunc,
+    EmbeddingCache,
+    FairTaskScheduler,
     always_get_an_event_loop,
+    chunk_context_json,
     compute_mdhash_id,
     lazy_external_import,
     priority_limit_async_func_call,
@@ -97,6 +119,7 @@ from lightrag.utils import (
     generate_track_id,
     convert_to_user_format,
     logger,
+    make_relation_chunk_key,
 )
 from lightrag.types import KnowledgeGraph
 from dotenv import load_dotenv
@@ -203,6 +226,27 @@ class LightRAG:
         )
     )
 
+    max_source_ids_per_entity: int = field(
+        default=get_env_value(
+            "MAX_SOURCE_IDS_PER_ENTITY", DEFAULT_MAX_SOURCE_IDS_PER_ENTITY, int
+        )
+    )
+    """Maximum chunk ids kept in an entity's source_id (0 = unlimited), the full list is kept in entity_chunks."""
+
+    max_source_ids_per_relation: int = field(
+        default=get_env_value(
+            "MAX_SOURCE_IDS_PER_RELATION", DEFAULT_MAX_SOURCE_IDS_PER_RELATION, int
+        )
+    )
+    """Maximum chunk ids kept in a relation's source_id (0 = unlimited), the full list is kept in relation_chunks."""
+
+    source_ids_limit_method: str = field(
+        default=get_env_value(
+            "SOURCE_IDS_LIMIT_METHOD", DEFAULT_SOURCE_IDS_LIMIT_METHOD, str
+        )
+    )
+    """Chunk ids kept once the source_id limit is reached: 'FIFO' (most recent), 'KEEP' (first) or 'FREQUENT' (most mentions)."""
+
     # Text chunking
     # ---
 
@@ -254,6 +298,43 @@ class LightRAG:
     Defaults to `chunking_by_token_size` if not specified.
     """
 
+    chunking_offload_threshold: int = field(
+        default=get_env_value(
+            "CHUNKING_OFFLOAD_THRESHOLD", DEFAULT_CHUNKING_OFFLOAD_THRESHOLD, int
+        )
+    )
+    """Documents longer than this many characters are chunked off the event loop. 0 disables offloading."""
+
+    chunking_use_process_pool: bool = field(
+        default=get_env_value("CHUNKING_USE_PROCESS_POOL", False, bool)
+    )
+    """Chunk very large documents in a process pool instead of a worker thread. The entry script must be guarded by `if __name__ == "__main__":`."""
+
+    chunking_process_pool_size: int = field(
+        default=get_env_value(
+            "CHUNKING_PROCESS_POOL_SIZE", DEFAULT_CHUNKING_PROCESS_POOL_SIZE, int
+        )
+    )
+    """Number of worker processes used when `chunking_use_process_pool` is enabled."""
+
+    document_segment_size: int = field(
+        default=get_env_value(
+            "DOCUMENT_SEGMENT_SIZE", DEFAULT_DOCUMENT_SEGMENT_SIZE, int
+        )
+    )
+    """
+    Characters per full_docs segment record of a document enqueued with `apipeline_enqueue_document_stream`.
+    Each segment is chunked on its own, so chunks never span a segment boundary and
+    get no `chunk_overlap_token_size` overlap across it.
+    """
+
+    stream_chunk_batch_size: int = field(
+        default=get_env_value(
+            "STREAM_CHUNK_BATCH_SIZE", DEFAULT_STREAM_CHUNK_BATCH_SIZE, int
+        )
+    )
+    """Chunks of a segmented document that are stored and extracted together; only this many chunk texts are held in memory at once, while the extraction results of all chunks are kept until the document is merged."""
+
     # Embedding
     # ---
 
@@ -268,6 +349,13 @@ class LightRAG:
     )
     """Maximum number of concurrent embedding function calls."""
 
+    vdb_upsert_flush_interval: float = field(
+        default=get_env_value(
+            "VDB_UPSERT_FLUSH_INTERVAL", DEFAULT_VDB_UPSERT_FLUSH_INTERVAL, float
+        )
+    )
+    """Seconds an entity/relation vector upsert waits during merging to be embedded together with others (batches hold up to embedding_batch_num items)."""
+
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
             "enabled": False,
@@ -281,6 +369,18 @@ class LightRAG:
     - use_llm_check: If True, validates cached embeddings using an LLM.
     """
 
+    enable_embedding_result_cache: bool = field(
+        default=get_env_value("ENABLE_EMBEDDING_RESULT_CACHE", False, bool)
+    )
+    """Cache embedding results by model, dimension and text so unchanged content is not embedded again. Requires `EmbeddingFunc.model_name`. The cache is kept in embedding_cache.npz in the working directory."""
+
+    embedding_result_cache_max_mb: int = field(
+        default=get_env_value(
+            "EMBEDDING_RESULT_CACHE_MAX_MB", DEFAULT_EMBEDDING_RESULT_CACHE_MAX_MB, int
+        )
+    )
+    """Max size in MB of the embedding result cache, least recently used vectors are evicted beyond it."""
+
     default_embedding_timeout: int = field(
         default=int(os.getenv("EMBEDDING_TIMEOUT", DEFAULT_EMBEDDING_TIMEOUT))
     )
@@ -311,11 +411,27 @@ class LightRAG:
     )
     """Recommended length of LLM summary output."""
 
+    summary_max_parallel: int = field(
+        default=get_env_value("SUMMARY_MAX_PARALLEL", DEFAULT_SUMMARY_MAX_PARALLEL, int)
+    )
+    """Maximum number of description groups of one entity/relation summarized concurrently."""
+
     llm_model_max_async: int = field(
         default=int(os.getenv("MAX_ASYNC", DEFAULT_MAX_ASYNC))
     )
     """Maximum number of concurrent LLM calls."""
 
+    adaptive_llm_concurrency: bool = field(
+        default=get_env_value("ADAPTIVE_LLM_CONCURRENCY", True, bool)
+    )
+    """Lower the number of concurrent LLM calls when the LLM returns rate-limit errors (HTTP 429) or times out, and raise it back up to `llm_model_max_async` while latency stays normal."""
+
+    llm_model_max_rpm: int = field(default=get_env_value("LLM_MAX_RPM", 0, int))
+    """Maximum number of LLM calls started per minute (0 for no limit)."""
+
+    llm_model_max_tpm: int = field(default=get_env_value("LLM_MAX_TPM", 0, int))
+    """Maximum number of prompt tokens sent to the LLM per minute, estimated at 4 characters per token (0 for no limit)."""
+
     llm_model_kwargs: dict[str, Any] = field(default_factory=dict)
     """Additional keyword arguments passed to the LLM model function."""
 
@@ -354,6 +470,16 @@ class LightRAG:
     )
     """Maximum number of parallel insert operations."""
 
+    merge_batch_docs: int = field(
+        default=get_env_value("MERGE_BATCH_DOCS", DEFAULT_MERGE_BATCH_DOCS, int)
+    )
+    """Number of documents whose extraction results are merged together (0 or 1 merges each document on its own)."""
+
+    merge_batch_timeout: float = field(
+        default=get_env_value("MERGE_BATCH_TIMEOUT", DEFAULT_MERGE_BATCH_TIMEOUT, float)
+    )
+    """Seconds a partially filled merge batch waits for more documents before it is merged."""
+
     max_graph_nodes: int = field(
         default=get_env_value("MAX_GRAPH_NODES", DEFAULT_MAX_GRAPH_NODES, int)
     )
@@ -473,6 +599,33 @@ class LightRAG:
             llm_timeout=self.default_embedding_timeout,
             queue_name="Embedding func",
         )(self.embedding_func)
+        # Queue name -> stats function of this instance's rate-limited queues
+        self._rate_limiter_stats: dict[str, Callable[[], dict[str, Any]]] = {
+            "Embedding func": self.embedding_func.get_stats
+        }
+
+        self.embedding_result_cache: EmbeddingCache | None = None
+        embedding_model_name = getattr(self.embedding_func, "model_name", None)
+        if self.enable_embedding_result_cache and not embedding_model_name:
+            # A function name such as "<lambda>" would let two models share cached vectors
+            logger.warning(
+                "Embedding result cache disabled: set EmbeddingFunc.model_name to "
+                "identify the embedding model in the cache key"
+            )
+        elif self.enable_embedding_result_cache:
+            cache_dir = (
+                os.path.join(self.working_dir, self.workspace)
+                if self.workspace
+                else self.working_dir
+            )
+            self.embedding_result_cache = EmbeddingCache(
+                self.embedding_func,
+                model_name=embedding_model_name,
+                max_size_mb=self.embedding_result_cache_max_mb,
+                file_path=os.path.join(cache_dir, "embedding_cache.npz"),
+            )
+            # Cache hits skip the embedding queue entirely
+            self.embedding_func = self.embedding_result_cache
 
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
@@ -528,6 +681,18 @@ class LightRAG:
             embedding_func=self.embedding_func,
         )
 
+        self.entity_chunks: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
+            namespace=NameSpace.KV_STORE_ENTITY_CHUNKS,
+            workspace=self.workspace,
+            embedding_func=self.embedding_func,
+        )
+
+        self.relation_chunks: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
+            namespace=NameSpace.KV_STORE_RELATION_CHUNKS,
+            workspace=self.workspace,
+            embedding_func=self.embedding_func,
+        )
+
         self.chunk_entity_relation_graph: BaseGraphStorage = self.graph_storage_cls(  # type: ignore
             namespace=NameSpace.GRAPH_STORE_CHUNK_ENTITY_RELATION,
             workspace=self.workspace,
@@ -569,6 +734,9 @@ class LightRAG:
             self.llm_model_max_async,
             llm_timeout=self.default_llm_timeout,
             queue_name="LLM func",
+            adaptive=self.adaptive_llm_concurrency,
+            max_requests_per_minute=self.llm_model_max_rpm,
+            max_tokens_per_minute=self.llm_model_max_tpm,
         )(
             partial(
                 self.llm_model_func,  # type: ignore
@@ -576,6 +744,18 @@ class LightRAG:
                 **self.llm_model_kwargs,
             )
         )
+        self._rate_limiter_stats["LLM func"] = self.llm_model_func.get_stats
+
+        # Chunk extraction and graph merge tasks of all documents in the pipeline
+        # share these limits, and are served round-robin across documents.
+        # Only the LLM queue adapts to rate limits: a second adaptive limit here
+        # would halve on the same 429 and compound the back-off.
+        self.extraction_scheduler = FairTaskScheduler(
+            self.llm_model_max_async, name="Extraction scheduler"
+        )
+        self.merge_scheduler = FairTaskScheduler(
+            self.llm_model_max_async * 2, name="Merge scheduler"
+        )
 
         self._storages_status = StoragesStatus.CREATED
 
@@ -587,6 +767,8 @@ class LightRAG:
                 self.text_chunks,
                 self.full_entities,
                 self.full_relations,
+                self.entity_chunks,
+                self.relation_chunks,
                 self.entities_vdb,
                 self.relationships_vdb,
                 self.chunks_vdb,
@@ -598,6 +780,14 @@ class LightRAG:
                     # logger.debug(f"Initializing storage: {storage}")
                     await storage.initialize()
 
+            if self.embedding_result_cache is not None:
+                await asyncio.to_thread(self.embedding_result_cache.load)
+
+            # Keep the LLM/embedding bindings' pooled clients open until finalize_storages
+            from lightrag.llm.client_pool import acquire_pooled_clients
+
+            acquire_pooled_clients()
+
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("All storage types initialized")
 
@@ -609,6 +799,8 @@ class LightRAG:
                 ("text_chunks", self.text_chunks),
                 ("full_entities", self.full_entities),
                 ("full_relations", self.full_relations),
+                ("entity_chunks", self.entity_chunks),
+                ("relation_chunks", self.relation_chunks),
                 ("entities_vdb", self.entities_vdb),
                 ("relationships_vdb", self.relationships_vdb),
                 ("chunks_vdb", self.chunks_vdb),
@@ -632,6 +824,15 @@ class LightRAG:
                         logger.error(error_msg)
                         failed_finalizations.append(storage_name)
 
+            if self.embedding_result_cache is not None:
+                try:
+                    await self.embedding_result_cache.save()
+                    logger.info(
+                        f"Embedding result cache: {self.embedding_result_cache.get_stats()}"
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to save embedding result cache: {e}")
+
             # Log summary of finalization results
             if successful_finalizations:
                 logger.info(
@@ -645,6 +846,20 @@ class LightRAG:
             else:
                 logger.debug("All storages finalized successfully")
 
+            try:
+                await shutdown_chunking_executor()
+            except Exception as e:
+                logger.error(f"Failed to shut down chunking process pool: {e}")
+
+            # Close the persistent HTTP clients opened by the LLM/embedding bindings,
+            # unless other instances on this loop still use them
+            try:
+                from lightrag.llm.client_pool import release_pooled_clients
+
+                await release_pooled_clients()
+            except Exception as e:
+                logger.error(f"Failed to close pooled LLM clients: {e}")
+
             self._storages_status = StoragesStatus.FINALIZED
 
     async def check_and_migrate_data(self):
@@ -838,6 +1053,12 @@ class LightRAG:
             node_label, max_depth, max_nodes
         )
 
+    def get_rate_limiter_stats(self) -> dict[str, dict[str, Any]]:
+        """Current limit, queue depth and wait/execution percentiles of the LLM and embedding queues"""
+        return {
+            name: get_stats() for name, get_stats in self._rate_limiter_stats.items()
+        }
+
     def _get_storage_class(self, storage_name: str) -> Callable[..., Any]:
         # Direct imports for default storage implementations
         if storage_name == "JsonKVStorage":
@@ -1152,6 +1373,196 @@ class LightRAG:
 
         return track_id
 
+    async def apipeline_enqueue_document_stream(
+        self,
+        segments: AsyncIterator[str],
+        file_path: str | None = None,
+        track_id: str | None = None,
+    ) -> str | None:
+        """
+        Enqueue one document from an async iterator of its pages or sections
+
+        The document is never held in memory as a whole: sections are joined into
+        segments of about `document_segment_size` characters that are written to
+        full_docs as they fill up, and the document is later chunked and extracted
+        segment by segment. The document ID is the MD5 hash of the sections joined
+        by newlines, as `apipeline_enqueue_documents` would compute for that text.
+
+        Args:
+            segments: Async iterator of page or section texts, in document order
+            file_path: File path of the document, used for citation
+            track_id: tracking ID for monitoring processing status, if not provided, will be generated with "enqueue" prefix
+
+        Returns:
+            str | None: tracking ID, or None if the document already exists
+
+        Raises:
+            ValueError: If the stream contains no content
+        """
+        if track_id is None or track_id.strip() == "":
+            track_id = generate_track_id("enqueue")
+        file_path = file_path or "unknown_source"
+
+        # Segments are written before the document ID is known, so they get their own key.
+        # The prefix carries its creation time and is registered until the document record
+        # is written, so segments left behind by a crash can be swept later.
+        segment_prefix = compute_mdhash_id(
+            f"{file_path}:{track_id}:{time.time_ns()}",
+            prefix=f"docseg-{int(time.time())}-",
+        )
+        await self._update_pending_segments(add=segment_prefix)
+        segment_ids: list[str] = []
+        hasher = md5()
+        content_summary = ""
+        content_length = 0
+        buffer: list[str] = []
+        buffered_length = 0
+
+        async def flush_segment() -> None:
+            nonlocal buffer, buffered_length
+            segment_id = f"{segment_prefix}-{len(segment_ids)}"
+            await self.full_docs.upsert({segment_id: {"content": "\n".join(buffer)}})
+            segment_ids.append(segment_id)
+            buffer, buffered_length = [], 0
+
+        try:
+            async for section in segments:
+                section = sanitize_text_for_encoding(section)
+                if not section:
+                    continue
+                if content_length:
+                    hasher.update(b"\n")
+                    content_length += 1
+                hasher.update(section.encode("utf-8", errors="replace"))
+                content_length += len(section)
+                if not content_summary:
+                    content_summary = get_content_summary(section)
+                buffer.append(section)
+                buffered_length += len(section)
+                if buffered_length >= self.document_segment_size:
+                    await flush_segment()
+            if buffer:
+                await flush_segment()
+            if not segment_ids:
+                raise ValueError("Document stream contains no content")
+
+            doc_id = "doc-" + hasher.hexdigest()
+            if not await self.doc_status.filter_keys({doc_id}):
+                logger.warning(
+                    f"Ignoring document ID (already exists): {doc_id} ({file_path})"
+                )
+                await self.full_docs.delete(segment_ids)
+                await self._update_pending_segments(remove=[segment_prefix])
+                return None
+
+            await self._update_pending_segments(
+                remove=[segment_prefix],
+                data={doc_id: {"content": "", "segments": segment_ids}},
+            )
+            await self.full_docs.index_done_callback()
+        except BaseException:
+            if segment_ids:
+                await self.full_docs.delete(segment_ids)
+            await self._update_pending_segments(remove=[segment_prefix])
+            raise
+
+        await self.doc_status.upsert(
+            {
+                doc_id: {
+                    "status": DocStatus.PENDING,
+                    "content_summary": content_summary,
+                    "content_length": content_length,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                    "file_path": file_path,
+                    "track_id": track_id,
+                }
+            }
+        )
+        logger.debug(
+            f"Stored streamed document {doc_id} in {len(segment_ids)} segments ({content_length} characters)"
+        )
+        return track_id
+
+    async def _update_pending_segments(
+        self,
+        add: str | None = None,
+        remove: list[str] | None = None,
+        data: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        """Register or unregister segment prefixes of document streams being written
+
+        The prefixes are kept as the segment list of the `PENDING_SEGMENTS_KEY`
+        record in full_docs, which every KV backend persists. `data` is upserted
+        in the same write, so a document record and the removal of its prefix
+        are stored together.
+        """
+        namespace = f"{self.workspace}:full_docs" if self.workspace else "full_docs"
+        async with get_storage_keyed_lock([PENDING_SEGMENTS_KEY], namespace=namespace):
+            record = await self.full_docs.get_by_id(PENDING_SEGMENTS_KEY) or {}
+            prefixes = [
+                prefix
+                for prefix in record.get("segments") or []
+                if prefix not in (remove or [])
+            ]
+            if add:
+                prefixes.append(add)
+            await self.full_docs.upsert(
+                {
+                    **(data or {}),
+                    PENDING_SEGMENTS_KEY: {"content": "", "segments": prefixes},
+                }
+            )
+
+    async def _sweep_orphan_segments(self) -> int:
+        """Delete segments of document streams that never finished, e.g. because the process crashed
+
+        Returns:
+            int: Number of segment records deleted
+        """
+        record = await self.full_docs.get_by_id(PENDING_SEGMENTS_KEY)
+        if not record or not record.get("segments"):
+            return 0
+
+        now = int(time.time())
+        stale_prefixes = []
+        for prefix in record["segments"]:
+            try:
+                created_at = int(prefix.split("-")[1])
+            except (IndexError, ValueError):
+                created_at = 0
+            if now - created_at >= DEFAULT_ORPHAN_SEGMENT_MAX_AGE:
+                stale_prefixes.append(prefix)
+        if not stale_prefixes:
+            return 0
+
+        deleted = 0
+        for prefix in stale_prefixes:
+            # Segments are numbered from 0 without gaps, probe them in pages
+            start = 0
+            while True:
+                probe = {f"{prefix}-{i}" for i in range(start, start + 256)}
+                existing = probe - await self.full_docs.filter_keys(probe)
+                if not existing:
+                    break
+                await self.full_docs.delete(list(existing))
+                deleted += len(existing)
+                start += 256
+        await self._update_pending_segments(remove=stale_prefixes)
+        await self.full_docs.index_done_callback()
+        logger.info(
+            f"Swept {deleted} orphan segments of {len(stale_prefixes)} unfinished document streams"
+        )
+        return deleted
+
+    async def _delete_full_docs(self, doc_ids: list[str]) -> None:
+        """Delete documents from full_docs together with the segments of streamed documents"""
+        segment_ids = []
+        for content_data in await self.full_docs.get_by_ids(doc_ids):
+            if content_data:
+                segment_ids.extend(content_data.get("segments") or [])
+        await self.full_docs.delete(doc_ids + segment_ids)
+
     async def apipeline_enqueue_error_documents(
         self,
         error_files: list[dict[str, Any]],
@@ -1400,6 +1811,7 @@ class LightRAG:
                         "cur_batch": 0,  # Number of files already processed
                         "request_pending": False,  # Clear any previous request
                         "latest_message": "",
+                        "summary_stats": {},  # Merge-phase summary telemetry
                     }
                 )
                 # Cleaning history_messages without breaking it as a shared list object
@@ -1413,6 +1825,8 @@ class LightRAG:
                 return
 
         try:
+            await self._sweep_orphan_segments()
+
             # Process documents until no more documents or requests
             while True:
                 if not to_process_docs:
@@ -1467,6 +1881,51 @@ class LightRAG:
                 # Create a semaphore to limit the number of concurrent file processing
                 semaphore = asyncio.Semaphore(self.max_parallel_insert)
 
+                # Batched merge mode: extracted documents are buffered and merged
+                # together once the batch is full or has waited merge_batch_timeout
+                merge_batch_size = self.merge_batch_docs
+                merge_buffer: list[dict[str, Any]] = []
+                merge_buffer_opened = 0.0
+                merge_tasks: list[asyncio.Task] = []
+                merge_batch_lock = asyncio.Lock()
+
+                async def merge_buffered_documents() -> None:
+                    """Merge every buffered document as one batch"""
+                    nonlocal merge_buffer
+                    # One batch at a time, documents extracted meanwhile join the next batch
+                    async with merge_batch_lock:
+                        batch, merge_buffer = merge_buffer, []
+                        if batch:
+                            await self._merge_document_batch(
+                                batch, pipeline_status, pipeline_status_lock
+                            )
+
+                def buffer_document_for_merge(item: dict[str, Any]) -> None:
+                    nonlocal merge_buffer_opened
+                    if not merge_buffer:
+                        merge_buffer_opened = time.monotonic()
+                    merge_buffer.append(item)
+                    if len(merge_buffer) >= merge_batch_size:
+                        merge_tasks.append(
+                            asyncio.create_task(merge_buffered_documents())
+                        )
+
+                async def merge_buffer_timer() -> None:
+                    """Flush a partially filled batch that has waited too long"""
+                    while True:
+                        await asyncio.sleep(
+                            min(1.0, max(0.1, self.merge_batch_timeout))
+                        )
+                        if (
+                            merge_buffer
+                            and not merge_batch_lock.locked()
+                            and time.monotonic() - merge_buffer_opened
+                            >= self.merge_batch_timeout
+                        ):
+                            merge_tasks.append(
+                                asyncio.create_task(merge_buffered_documents())
+                            )
+
                 async def process_document(
                     doc_id: str,
                     status_doc: DocProcessingStatus,
@@ -1521,83 +1980,124 @@ class LightRAG:
                                 raise Exception(
                                     f"Document content not found in full_docs for doc_id: {doc_id}"
                                 )
-                            content = content_data["content"]
-
-                            # Generate chunks from document
-                            chunks: dict[str, Any] = {
-                                compute_mdhash_id(dp["content"], prefix="chunk-"): {
-                                    **dp,
-                                    "full_doc_id": doc_id,
-                                    "file_path": file_path,  # Add file path to each chunk
-                                    "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
-                                }
-                                for dp in self.chunking_func(
+                            segment_ids = content_data.get("segments")
+                            if segment_ids:
+                                # Streamed document: chunked, stored and extracted batch by batch
+                                processing_start_time = int(time.time())
+                                (
+                                    chunks_list,
+                                    chunk_results,
+                                ) = await self._process_segmented_document(
+                                    doc_id,
+                                    segment_ids,
+                                    status_doc,
+                                    split_by_character,
+                                    split_by_character_only,
+                                    processing_start_time,
+                                    pipeline_status,
+                                    pipeline_status_lock,
+                                )
+                            else:
+                                content = content_data["content"]
+
+                                # Generate chunks from document (off the event loop for very large documents)
+                                chunking_result = await achunk_document(
+                                    self.chunking_func,
                                     self.tokenizer,
                                     content,
                                     split_by_character,
                                     split_by_character_only,
                                     self.chunk_overlap_token_size,
                                     self.chunk_token_size,
+                                    offload_threshold=self.chunking_offload_threshold,
+                                    use_process_pool=self.chunking_use_process_pool,
+                                    process_pool_size=self.chunking_process_pool_size,
                                 )
-                            }
-
-                            if not chunks:
-                                logger.warning("No document chunks to process")
-
-                            # Record processing start time
-                            processing_start_time = int(time.time())
+                                chunks: dict[str, Any] = {
+                                    compute_mdhash_id(dp["content"], prefix="chunk-"): {
+                                        **dp,
+                                        "full_doc_id": doc_id,
+                                        "file_path": file_path,  # Add file path to each chunk
+                                        "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
+                                    }
+                                    for dp in chunking_result
+                                }
 
-                            # Process document in two stages
-                            # Stage 1: Process text chunks and docs (parallel execution)
-                            doc_status_task = asyncio.create_task(
-                                self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSING,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(
-                                                chunks.keys()
-                                            ),  # Save chunks list
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time
-                                            },
+                                # Store the token count used by query-time truncation
+                                context_token_counts = (
+                                    await self.tokenizer.acount_tokens_batch(
+                                        [
+                                            chunk_context_json(
+                                                chunk["content"], file_path, chunk_id
+                                            )
+                                            for chunk_id, chunk in chunks.items()
+                                        ]
+                                    )
+                                )
+                                for chunk, context_tokens in zip(
+                                    chunks.values(), context_token_counts
+                                ):
+                                    chunk["context_tokens"] = context_tokens
+
+                                if not chunks:
+                                    logger.warning("No document chunks to process")
+
+                                # Record processing start time
+                                processing_start_time = int(time.time())
+
+                                # Process document in two stages
+                                # Stage 1: Process text chunks and docs (parallel execution)
+                                doc_status_task = asyncio.create_task(
+                                    self.doc_status.upsert(
+                                        {
+                                            doc_id: {
+                                                "status": DocStatus.PROCESSING,
+                                                "chunks_count": len(chunks),
+                                                "chunks_list": list(
+                                                    chunks.keys()
+                                                ),  # Save chunks list
+                                                "content_summary": status_doc.content_summary,
+                                                "content_length": status_doc.content_length,
+                                                "created_at": status_doc.created_at,
+                                                "updated_at": datetime.now(
+                                                    timezone.utc
+                                                ).isoformat(),
+                                                "file_path": file_path,
+                                                "track_id": status_doc.track_id,  # Preserve existing track_id
+                                                "metadata": {
+                                                    "processing_start_time": processing_start_time
+                                                },
+                                            }
                                         }
-                                    }
+                                    )
+                                )
+                                chunks_vdb_task = asyncio.create_task(
+                                    self.chunks_vdb.upsert(chunks)
+                                )
+                                text_chunks_task = asyncio.create_task(
+                                    self.text_chunks.upsert(chunks)
                                 )
-                            )
-                            chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
-                            )
-                            text_chunks_task = asyncio.create_task(
-                                self.text_chunks.upsert(chunks)
-                            )
 
-                            # First stage tasks (parallel execution)
-                            first_stage_tasks = [
-                                doc_status_task,
-                                chunks_vdb_task,
-                                text_chunks_task,
-                            ]
-                            entity_relation_task = None
+                                # First stage tasks (parallel execution)
+                                first_stage_tasks = [
+                                    doc_status_task,
+                                    chunks_vdb_task,
+                                    text_chunks_task,
+                                ]
+                                entity_relation_task = None
 
-                            # Execute first stage tasks
-                            await asyncio.gather(*first_stage_tasks)
+                                # Execute first stage tasks
+                                await asyncio.gather(*first_stage_tasks)
 
-                            # Stage 2: Process entity relation graph (after text_chunks are saved)
-                            entity_relation_task = asyncio.create_task(
-                                self._process_extract_entities(
-                                    chunks, pipeline_status, pipeline_status_lock
+                                # Stage 2: Process entity relation graph (after text_chunks are saved)
+                                entity_relation_task = asyncio.create_task(
+                                    self._process_extract_entities(
+                                        chunks, pipeline_status, pipeline_status_lock
+                                    )
                                 )
-                            )
-                            await entity_relation_task
+                                await entity_relation_task
+                                chunks_list = list(chunks.keys())
+                                chunk_results = entity_relation_task.result()
                             file_extraction_stage_ok = True
 
                         except Exception as e:
@@ -1649,13 +2149,26 @@ class LightRAG:
                                 }
                             )
 
+                        if file_extraction_stage_ok and merge_batch_size > 1:
+                            # Merged and committed later together with its batch
+                            buffer_document_for_merge(
+                                {
+                                    "doc_id": doc_id,
+                                    "status_doc": status_doc,
+                                    "chunk_results": chunk_results,
+                                    "chunks_list": chunks_list,
+                                    "file_path": file_path,
+                                    "current_file_number": current_file_number,
+                                    "total_files": total_files,
+                                    "processing_start_time": processing_start_time,
+                                }
+                            )
+
                         # Concurrency is controlled by keyed lock for individual entities and relationships
-                        if file_extraction_stage_ok:
+                        elif file_extraction_stage_ok:
                             try:
-                                # Get chunk_results from entity_relation_task
-                                chunk_results = await entity_relation_task
                                 await merge_nodes_and_edges(
-                                    chunk_results=chunk_results,  # result collected from entity_relation_task
+                                    chunk_results=chunk_results,
                                     knowledge_graph_inst=self.chunk_entity_relation_graph,
                                     entity_vdb=self.entities_vdb,
                                     relationships_vdb=self.relationships_vdb,
@@ -1666,9 +2179,12 @@ class LightRAG:
                                     pipeline_status=pipeline_status,
                                     pipeline_status_lock=pipeline_status_lock,
                                     llm_response_cache=self.llm_response_cache,
+                                    entity_chunks_storage=self.entity_chunks,
+                                    relation_chunks_storage=self.relation_chunks,
                                     current_file_number=current_file_number,
                                     total_files=total_files,
                                     file_path=file_path,
+                                    task_scheduler=self.merge_scheduler,
                                 )
 
                                 # Record processing end time
@@ -1678,8 +2194,8 @@ class LightRAG:
                                     {
                                         doc_id: {
                                             "status": DocStatus.PROCESSED,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(chunks.keys()),
+                                            "chunks_count": len(chunks_list),
+                                            "chunks_list": chunks_list,
                                             "content_summary": status_doc.content_summary,
                                             "content_length": status_doc.content_length,
                                             "created_at": status_doc.created_at,
@@ -1764,7 +2280,20 @@ class LightRAG:
                     )
 
                 # Wait for all document processing to complete
-                await asyncio.gather(*doc_tasks)
+                timer_task = (
+                    asyncio.create_task(merge_buffer_timer())
+                    if merge_batch_size > 1
+                    else None
+                )
+                try:
+                    await asyncio.gather(*doc_tasks)
+                finally:
+                    if timer_task:
+                        timer_task.cancel()
+                # Merge the last partial batch and wait for all batch merges
+                if merge_batch_size > 1:
+                    merge_tasks.append(asyncio.create_task(merge_buffered_documents()))
+                    await asyncio.gather(*merge_tasks)
 
                 # Check if there's a pending request to process more documents (with lock)
                 has_pending_request = False
@@ -1803,6 +2332,213 @@ class LightRAG:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
 
+    async def _merge_document_batch(
+        self,
+        batch: list[dict[str, Any]],
+        pipeline_status: dict,
+        pipeline_status_lock: asyncio.Lock,
+    ) -> None:
+        """Merge the extraction results of several documents and commit their statuses together
+
+        Args:
+            batch: Buffered documents of apipeline_process_enqueue_documents, each with
+                doc_id, status_doc, chunk_results, chunks_list, file_path,
+                current_file_number, total_files and processing_start_time
+        """
+        error = None
+        try:
+            await merge_nodes_and_edges_batch(
+                doc_chunk_results={
+                    item["doc_id"]: item["chunk_results"] for item in batch
+                },
+                knowledge_graph_inst=self.chunk_entity_relation_graph,
+                entity_vdb=self.entities_vdb,
+                relationships_vdb=self.relationships_vdb,
+                global_config=asdict(self),
+                full_entities_storage=self.full_entities,
+                full_relations_storage=self.full_relations,
+                pipeline_status=pipeline_status,
+                pipeline_status_lock=pipeline_status_lock,
+                llm_response_cache=self.llm_response_cache,
+                entity_chunks_storage=self.entity_chunks,
+                relation_chunks_storage=self.relation_chunks,
+                task_scheduler=self.merge_scheduler,
+            )
+        except Exception as e:
+            error = e
+            # Log error and update pipeline status
+            logger.error(traceback.format_exc())
+            error_msg = f"Merging stage failed for a batch of {len(batch)} documents"
+            logger.error(error_msg)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = error_msg
+                pipeline_status["history_messages"].append(traceback.format_exc())
+                pipeline_status["history_messages"].append(error_msg)
+
+            # Persistent llm cache
+            if self.llm_response_cache:
+                await self.llm_response_cache.index_done_callback()
+
+        # Commit the statuses of the whole batch at once
+        processing_end_time = int(time.time())
+        updated_at = datetime.now(timezone.utc).isoformat()
+        doc_statuses = {}
+        for item in batch:
+            status_doc = item["status_doc"]
+            record = {
+                "status": DocStatus.FAILED if error else DocStatus.PROCESSED,
+                "content_summary": status_doc.content_summary,
+                "content_length": status_doc.content_length,
+                "created_at": status_doc.created_at,
+                "updated_at": updated_at,
+                "file_path": item["file_path"],
+                "track_id": status_doc.track_id,  # Preserve existing track_id
+                "metadata": {
+                    "processing_start_time": item["processing_start_time"],
+                    "processing_end_time": processing_end_time,
+                },
+            }
+            if error:
+                record["error_msg"] = str(error)
+            else:
+                record["chunks_count"] = len(item["chunks_list"])
+                record["chunks_list"] = item["chunks_list"]
+            doc_statuses[item["doc_id"]] = record
+        await self.doc_status.upsert(doc_statuses)
+
+        if error:
+            return
+
+        # Call _insert_done once per merged batch
+        await self._insert_done()
+
+        async with pipeline_status_lock:
+            for item in batch:
+                log_message = f"Completed processing file {item['current_file_number']}/{item['total_files']}: {item['file_path']}"
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+    async def _process_segmented_document(
+        self,
+        doc_id: str,
+        segment_ids: list[str],
+        status_doc: DocProcessingStatus,
+        split_by_character: str | None,
+        split_by_character_only: bool,
+        processing_start_time: int,
+        pipeline_status: dict,
+        pipeline_status_lock: asyncio.Lock,
+    ) -> tuple[list[str], list]:
+        """Chunk, store and extract a streamed document one batch of chunks at a time
+
+        Only one segment and the texts of `stream_chunk_batch_size` chunks are held
+        in memory; the extraction results of every batch are returned together and
+        merged once the whole document is extracted. Each batch is written to
+        text_chunks and chunks_vdb and recorded in the document's chunks_list
+        before its entities are extracted, so a document that fails midway can
+        still be deleted cleanly. Segments are chunked separately: no chunk spans
+        a segment boundary or overlaps across it.
+
+        Returns:
+            tuple: (chunk IDs in document order, extraction results of all chunks)
+        """
+        file_path = getattr(status_doc, "file_path", "unknown_source")
+        chunk_ids: list[str] = []
+        seen_chunk_ids: set[str] = set()
+        chunk_results: list = []
+        batch: dict[str, Any] = {}
+        chunk_order_index = 0
+
+        async def flush_batch() -> None:
+            nonlocal batch
+            context_token_counts = await self.tokenizer.acount_tokens_batch(
+                [
+                    chunk_context_json(chunk["content"], file_path, chunk_id)
+                    for chunk_id, chunk in batch.items()
+                ]
+            )
+            for chunk, context_tokens in zip(batch.values(), context_token_counts):
+                chunk["context_tokens"] = context_tokens
+            chunk_ids.extend(batch.keys())
+
+            await asyncio.gather(
+                self.doc_status.upsert(
+                    {
+                        doc_id: {
+                            "status": DocStatus.PROCESSING,
+                            "chunks_count": len(chunk_ids),
+                            "chunks_list": list(chunk_ids),
+                            "content_summary": status_doc.content_summary,
+                            "content_length": status_doc.content_length,
+                            "created_at": status_doc.created_at,
+                            "updated_at": datetime.now(timezone.utc).isoformat(),
+                            "file_path": file_path,
+                            "track_id": status_doc.track_id,
+                            "metadata": {
+                                "processing_start_time": processing_start_time
+                            },
+                        }
+                    }
+                ),
+                self.chunks_vdb.upsert(batch),
+                self.text_chunks.upsert(batch),
+            )
+            chunk_results.extend(
+                await self._process_extract_entities(
+                    batch, pipeline_status, pipeline_status_lock
+                )
+            )
+            batch = {}
+
+        for segment_number, segment_id in enumerate(segment_ids, start=1):
+            segment = await self.full_docs.get_by_id(segment_id)
+            if not segment:
+                raise Exception(
+                    f"Document segment {segment_id} not found in full_docs for doc_id: {doc_id}"
+                )
+            chunking_result = await achunk_document(
+                self.chunking_func,
+                self.tokenizer,
+                segment["content"],
+                split_by_character,
+                split_by_character_only,
+                self.chunk_overlap_token_size,
+                self.chunk_token_size,
+                offload_threshold=self.chunking_offload_threshold,
+                use_process_pool=self.chunking_use_process_pool,
+                process_pool_size=self.chunking_process_pool_size,
+            )
+            del segment
+
+            for dp in chunking_result:
+                chunk_id = compute_mdhash_id(dp["content"], prefix="chunk-")
+                if chunk_id in seen_chunk_ids:
+                    continue
+                seen_chunk_ids.add(chunk_id)
+                batch[chunk_id] = {
+                    **dp,
+                    "chunk_order_index": chunk_order_index,
+                    "full_doc_id": doc_id,
+                    "file_path": file_path,
+                    "llm_cache_list": [],
+                }
+                chunk_order_index += 1
+                if len(batch) >= self.stream_chunk_batch_size:
+                    await flush_batch()
+
+            async with pipeline_status_lock:
+                log_message = f"Chunked segment {segment_number}/{len(segment_ids)} of {doc_id}: {chunk_order_index} chunks so far"
+                logger.info(log_message)
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+        if batch:
+            await flush_batch()
+        if not chunk_ids:
+            logger.warning("No document chunks to process")
+        return chunk_ids, chunk_results
+
     async def _process_extract_entities(
         self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
     ) -> list:
@@ -1814,6 +2550,7 @@ class LightRAG:
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
                 text_chunks_storage=self.text_chunks,
+                task_scheduler=self.extraction_scheduler,
             )
             return chunk_results
         except Exception as e:
@@ -1835,6 +2572,8 @@ class LightRAG:
                 self.text_chunks,
                 self.full_entities,
                 self.full_relations,
+                self.entity_chunks,
+                self.relation_chunks,
                 self.llm_response_cache,
                 self.entities_vdb,
                 self.relationships_vdb,
@@ -1843,6 +2582,8 @@ class LightRAG:
             ]
             if storage_inst is not None
         ]
+        if self.embedding_result_cache is not None:
+            tasks.append(self.embedding_result_cache.save())
         await asyncio.gather(*tasks)
 
         log_message = "In memory DB persist to disk"
@@ -2642,7 +3383,7 @@ class LightRAG:
                 deletion_operations_started = True
                 try:
                     # Still need to delete the doc status and full doc
-                    await self.full_docs.delete([doc_id])
+                    await self._delete_full_docs([doc_id])
                     await self.doc_status.delete([doc_id])
                 except Exception as e:
                     logger.error(
@@ -2721,16 +3462,64 @@ class LightRAG:
                                 edge_data["target"] = tgt
                             affected_edges.append(edge_data)
 
+                # Documents without full_entities/full_relations records (e.g. missed
+                # by the migration) are resolved through the graph's chunk lookups
+                if not doc_entities_data:
+                    affected_nodes = (
+                        await self.chunk_entity_relation_graph.get_nodes_by_chunk_ids(
+                            list(chunk_ids)
+                        )
+                    )
+                    for node_data in affected_nodes:
+                        node_data.setdefault("entity_id", node_data["id"])
+                if not doc_relations_data:
+                    affected_edges = (
+                        await self.chunk_entity_relation_graph.get_edges_by_chunk_ids(
+                            list(chunk_ids)
+                        )
+                    )
+
             except Exception as e:
                 logger.error(f"Failed to analyze affected graph elements: {e}")
                 raise Exception(f"Failed to analyze graph dependencies: {e}") from e
 
             try:
+                # source_id is capped, the full chunk lists are in the side tables.
+                # Fetched per key: batch get_by_ids results are not aligned with
+                # the requested ids on every backend.
+                async def _get_chunk_records(storage, keys) -> dict:
+                    keys = list(dict.fromkeys(key for key in keys if key))
+                    records = await asyncio.gather(
+                        *(storage.get_by_id(key) for key in keys)
+                    )
+                    return dict(zip(keys, records))
+
+                entity_chunk_records = await _get_chunk_records(
+                    self.entity_chunks,
+                    [node.get("entity_id") for node in affected_nodes],
+                )
+                relation_chunk_records = await _get_chunk_records(
+                    self.relation_chunks,
+                    [
+                        make_relation_chunk_key(edge.get("source"), edge.get("target"))
+                        for edge in affected_edges
+                        if edge.get("source") and edge.get("target")
+                    ],
+                )
+
+                def _full_sources(data: dict, record: dict | None) -> set[str]:
+                    sources = set(data["source_id"].split(GRAPH_FIELD_SEP))
+                    if record and record.get("chunk_ids"):
+                        sources.update(record["chunk_ids"])
+                    return sources
+
                 # Process entities
                 for node_data in affected_nodes:
                     node_label = node_data.get("entity_id")
                     if node_label and "source_id" in node_data:
-                        sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
+                        sources = _full_sources(
+                            node_data, entity_chunk_records.get(node_label)
+                        )
                         remaining_sources = sources - chunk_ids
 
                         if not remaining_sources:
@@ -2757,7 +3546,12 @@ class LightRAG:
                         ):
                             continue
 
-                        sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
+                        sources = _full_sources(
+                            edge_data,
+                            relation_chunk_records.get(
+                                make_relation_chunk_key(src, tgt)
+                            ),
+                        )
                         remaining_sources = sources - chunk_ids
 
                         if not remaining_sources:
@@ -2806,10 +3600,26 @@ class LightRAG:
                         ]
                         await self.entities_vdb.delete(entity_vdb_ids)
 
+                        # remove_nodes also drops every edge of these entities,
+                        # so their relation_chunks records go with them
+                        node_edges = await self.chunk_entity_relation_graph.get_nodes_edges_batch(
+                            list(entities_to_delete)
+                        )
+                        implicit_relation_keys = {
+                            make_relation_chunk_key(src, tgt)
+                            for edges in node_edges.values()
+                            for src, tgt in edges
+                        }
+
                         # Delete from graph
                         await self.chunk_entity_relation_graph.remove_nodes(
                             list(entities_to_delete)
                         )
+                        await self.entity_chunks.delete(list(entities_to_delete))
+                        if implicit_relation_keys:
+                            await self.relation_chunks.delete(
+                                list(implicit_relation_keys)
+                            )
 
                         async with pipeline_status_lock:
                             log_message = f"Successfully deleted {len(entities_to_delete)} entities"
@@ -2839,6 +3649,12 @@ class LightRAG:
                         await self.chunk_entity_relation_graph.remove_edges(
                             list(relationships_to_delete)
                         )
+                        await self.relation_chunks.delete(
+                            [
+                                make_relation_chunk_key(src, tgt)
+                                for src, tgt in relationships_to_delete
+                            ]
+                        )
 
                         async with pipeline_status_lock:
                             log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
@@ -2867,6 +3683,8 @@ class LightRAG:
                         global_config=asdict(self),
                         pipeline_status=pipeline_status,
                         pipeline_status_lock=pipeline_status_lock,
+                        entity_chunks_storage=self.entity_chunks,
+                        relation_chunks_storage=self.relation_chunks,
                     )
 
                 except Exception as e:
@@ -2885,7 +3703,7 @@ class LightRAG:
 
             # 10. Delete original document and status
             try:
-                await self.full_docs.delete([doc_id])
+                await self._delete_full_docs([doc_id])
                 await self.doc_status.delete([doc_id])
             except Exception as e:
                 logger.error(f"Failed to delete document and status: {e}")
@@ -2954,6 +3772,8 @@ class LightRAG:
             self.entities_vdb,
             self.relationships_vdb,
             entity_name,
+            entity_chunks_storage=self.entity_chunks,
+            relation_chunks_storage=self.relation_chunks,
         )
 
     def delete_by_entity(self, entity_name: str) -> DeletionResult:
@@ -2987,6 +3807,7 @@ class LightRAG:
             self.relationships_vdb,
             source_entity,
             target_entity,
+            relation_chunks_storage=self.relation_chunks,
         )
 
     def delete_by_relation(
@@ -3078,6 +3899,8 @@ class LightRAG:
             entity_name,
             updated_data,
             allow_rename,
+            entity_chunks_storage=self.entity_chunks,
+            relation_chunks_storage=self.relation_chunks,
         )
 
     def edit_entity(
@@ -3223,6 +4046,8 @@ class LightRAG:
             target_entity,
             merge_strategy,
             target_entity_data,
+            entity_chunks_storage=self.entity_chunks,
+            relation_chunks_storage=self.relation_chunks,
         )
 
     def merge_entities(
@@ -26,10 +26,38 @@ from lightrag.utils import (
     safe_unicode_decode,
     logger,
 )
+from lightrag.llm.client_pool import (
+    create_pooled_httpx_client,
+    get_pooled_client,
+    make_client_key,
+)
 
 import numpy as np
 
 
+def get_azure_openai_async_client(
+    base_url: str | None,
+    deployment: str | None,
+    api_key: str | None,
+    api_version: str | None,
+    timeout: float | None = None,
+) -> AsyncAzureOpenAI:
+    """Return the persistent AsyncAzureOpenAI client for this endpoint and deployment."""
+    return get_pooled_client(
+        "azure_openai",
+        make_client_key(base_url, deployment, api_key, api_version, timeout),
+        lambda: AsyncAzureOpenAI(
+            azure_endpoint=base_url,
+            azure_deployment=deployment,
+            api_key=api_key,
+            api_version=api_version,
+            timeout=timeout,
+            http_client=create_pooled_httpx_client(),
+        ),
+        lambda client: client.close(),
+    )
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -69,12 +97,8 @@ async def azure_openai_complete_if_cache(
     kwargs.pop("keyword_extraction", None)
     timeout = kwargs.pop("timeout", None)
 
-    openai_async_client = AsyncAzureOpenAI(
-        azure_endpoint=base_url,
-        azure_deployment=deployment,
-        api_key=api_key,
-        api_version=api_version,
-        timeout=timeout,
+    openai_async_client = get_azure_openai_async_client(
+        base_url, deployment, api_key, api_version, timeout
     )
     messages = []
     if system_prompt:
@@ -164,11 +188,8 @@ async def azure_openai_embed(
         or os.getenv("OPENAI_API_VERSION")
     )
 
-    openai_async_client = AsyncAzureOpenAI(
-        azure_endpoint=base_url,
-        azure_deployment=deployment,
-        api_key=api_key,
-        api_version=api_version,
+    openai_async_client = get_azure_openai_async_client(
+        base_url, deployment, api_key, api_version
     )
 
     response = await openai_async_client.embeddings.create(
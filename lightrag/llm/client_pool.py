@@ -0,0 +1,142 @@
+"""
+Process-wide registry of persistent HTTP clients for the LLM and embedding bindings.
+
+Clients are cached per event loop under a key derived from their connection
+settings (base_url, api_key, client configs, ...), so extraction, summary and
+embedding requests reuse keep-alive connections instead of opening a new pool
+per call. Each LightRAG instance holds a reference on its loop's clients from
+initialize_storages() to finalize_storages(); the clients are closed when the
+last instance on the loop releases them.
+"""
+
+import asyncio
+import importlib.util
+import inspect
+import json
+import weakref
+from typing import Any, Awaitable, Callable
+
+from lightrag.constants import (
+    DEFAULT_LLM_HTTP2,
+    DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY,
+    DEFAULT_LLM_HTTP_MAX_CONNECTIONS,
+    DEFAULT_LLM_HTTP_MAX_KEEPALIVE,
+)
+from lightrag.utils import get_env_value, logger
+
+# Clients hold connections bound to the loop that opened them, so each loop has
+# its own registry: {(kind, key): (client, closer)}
+_client_registry: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop,
+    dict[tuple[str, str], tuple[Any, Callable[[Any], Awaitable[None] | None]]],
+] = weakref.WeakKeyDictionary()
+
+# Number of LightRAG instances using the pooled clients of each loop
+_client_users: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int] = (
+    weakref.WeakKeyDictionary()
+)
+
+_http2_warning_logged = False
+
+
+def make_client_key(*parts: Any) -> str:
+    """Build a stable registry key from connection settings (dicts included)"""
+    return json.dumps(parts, sort_keys=True, default=repr)
+
+
+def get_pooled_client(
+    kind: str,
+    key: str,
+    factory: Callable[[], Any],
+    closer: Callable[[Any], Awaitable[None] | None],
+) -> Any:
+    """Return the cached client for (kind, key) on the running loop, creating it on first use
+
+    Args:
+        kind: Binding name, e.g. "openai" or "ollama"
+        key: Connection settings key, see make_client_key()
+        factory: Creates a new client
+        closer: Releases a client's connections, called by close_pooled_clients()
+    """
+    loop = asyncio.get_running_loop()
+    clients = _client_registry.setdefault(loop, {})
+    entry = clients.get((kind, key))
+    if entry is None:
+        entry = (factory(), closer)
+        clients[(kind, key)] = entry
+        logger.debug(f"Created pooled {kind} client ({len(clients)} clients on loop)")
+    return entry[0]
+
+
+def acquire_pooled_clients() -> None:
+    """Register a user of the running loop's pooled clients, see release_pooled_clients()"""
+    loop = asyncio.get_running_loop()
+    _client_users[loop] = _client_users.get(loop, 0) + 1
+
+
+async def release_pooled_clients() -> None:
+    """Drop a user of the running loop's pooled clients, closing them after the last one"""
+    loop = asyncio.get_running_loop()
+    users = _client_users.get(loop, 0) - 1
+    if users > 0:
+        _client_users[loop] = users
+        return
+    _client_users.pop(loop, None)
+    await close_pooled_clients()
+
+
+async def close_pooled_clients() -> None:
+    """Close every pooled client created on the running loop"""
+    loop = asyncio.get_running_loop()
+    clients = _client_registry.pop(loop, {})
+    for (kind, _), (client, closer) in clients.items():
+        try:
+            result = closer(client)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Failed to close pooled {kind} client: {e}")
+    if clients:
+        logger.info(f"Closed {len(clients)} pooled LLM/embedding clients")
+
+
+def http_pool_settings() -> dict[str, Any]:
+    """Connection pool settings shared by all bindings"""
+    return {
+        "max_connections": get_env_value(
+            "LLM_HTTP_MAX_CONNECTIONS", DEFAULT_LLM_HTTP_MAX_CONNECTIONS, int
+        ),
+        "max_keepalive_connections": get_env_value(
+            "LLM_HTTP_MAX_KEEPALIVE", DEFAULT_LLM_HTTP_MAX_KEEPALIVE, int
+        ),
+        "keepalive_expiry": get_env_value(
+            "LLM_HTTP_KEEPALIVE_EXPIRY", DEFAULT_LLM_HTTP_KEEPALIVE_EXPIRY, float
+        ),
+    }
+
+
+def httpx_client_kwargs() -> dict[str, Any]:
+    """Keyword arguments for httpx.AsyncClient: pool limits and HTTP/2 when available"""
+    import httpx
+
+    global _http2_warning_logged
+
+    settings = http_pool_settings()
+    http2 = get_env_value("LLM_HTTP2", DEFAULT_LLM_HTTP2, bool)
+    if http2 and importlib.util.find_spec("h2") is None:
+        # HTTP/2 needs the optional h2 package, keep-alive HTTP/1.1 is used otherwise
+        if not _http2_warning_logged:
+            logger.info("h2 package not installed, LLM clients use HTTP/1.1 keep-alive")
+            _http2_warning_logged = True
+        http2 = False
+    return {
+        "limits": httpx.Limits(**settings),
+        "http2": http2,
+    }
+
+
+def create_pooled_httpx_client(**kwargs: Any):
+    """Create an httpx.AsyncClient configured with the shared pool settings"""
+    import httpx
+
+    return httpx.AsyncClient(**{**httpx_client_kwargs(), **kwargs})
@@ -33,9 +33,15 @@ from tenacity import (
 )
 
 from lightrag.api import __api_version__
+from lightrag.llm.client_pool import (
+    create_pooled_httpx_client,
+    get_pooled_client,
+    make_client_key,
+)
 from lightrag.types import GPTKeywordExtractionFormat
 from lightrag.utils import (
     logger,
+    report_rate_limit_error,
     safe_unicode_decode,
     wrap_embedding_func_with_attrs,
 )
@@ -95,17 +101,37 @@ def create_openai_async_client(
         )
 
     # Disable SSL verification for RunPod and similar endpoints
-    import httpx
-
     if (
         "runpod.net" in merged_configs.get("base_url", "")
         or os.environ.get("DISABLE_SSL_VERIFY", "false").lower() == "true"
     ):
-        merged_configs["http_client"] = httpx.AsyncClient(verify=False)
+        merged_configs["http_client"] = create_pooled_httpx_client(verify=False)
+    elif "http_client" not in merged_configs:
+        merged_configs["http_client"] = create_pooled_httpx_client()
 
     return AsyncOpenAI(**merged_configs)
 
 
+def get_openai_async_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    client_configs: dict[str, Any] = None,
+) -> AsyncOpenAI:
+    """Return the persistent AsyncOpenAI client for this configuration.
+
+    Clients are shared by all calls with the same (base_url, api_key, client_configs)
+    on the running event loop and are closed by LightRAG.finalize_storages().
+    """
+    return get_pooled_client(
+        "openai",
+        make_client_key(base_url, api_key, client_configs),
+        lambda: create_openai_async_client(
+            api_key=api_key, base_url=base_url, client_configs=client_configs
+        ),
+        lambda client: client.close(),
+    )
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -186,8 +212,8 @@ async def openai_complete_if_cache(
     # Extract client configuration options
     client_configs = kwargs.pop("openai_client_configs", {})
 
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Reuse the pooled OpenAI client (connections stay open between calls)
+    openai_async_client = get_openai_async_client(
         api_key=api_key,
         base_url=base_url,
         client_configs=client_configs,
@@ -223,21 +249,19 @@ async def openai_complete_if_cache(
             )
     except APIConnectionError as e:
         logger.error(f"OpenAI API Connection Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except RateLimitError as e:
         logger.error(f"OpenAI API Rate Limit Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
+        # Pause and back off the whole LLM queue before this call is retried
+        report_rate_limit_error(e)
         raise
     except APITimeoutError as e:
         logger.error(f"OpenAI API Timeout Error: {e}")
-        await openai_async_client.close()  # Ensure client is closed
         raise
     except Exception as e:
         logger.error(
             f"OpenAI API Call Failed,\nModel: {model},\nParams: {kwargs}, Got: {e}"
         )
-        await openai_async_client.close()  # Ensure client is closed
         raise
 
     if hasattr(response, "__aiter__"):
@@ -371,8 +395,6 @@ async def openai_complete_if_cache(
                         logger.warning(
                             f"Failed to close stream response: {close_error}"
                         )
-                # Ensure client is closed in case of exception
-                await openai_async_client.close()
                 raise
             finally:
                 # Final safety check for unclosed COT tags
@@ -399,93 +421,72 @@ async def openai_complete_if_cache(
                             f"Failed to close stream response in finally block: {close_error}"
                         )
 
-                # This prevents resource leaks since the caller doesn't handle closing
-                try:
-                    await openai_async_client.close()
-                    logger.debug(
-                        "Successfully closed OpenAI client for streaming response"
-                    )
-                except Exception as client_close_error:
-                    logger.warning(
-                        f"Failed to close OpenAI client in streaming finally block: {client_close_error}"
-                    )
-
         return inner()
 
     else:
-        try:
-            if (
-                not response
-                or not response.choices
-                or not hasattr(response.choices[0], "message")
-            ):
-                logger.error("Invalid response from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Invalid response from OpenAI API")
-
-            message = response.choices[0].message
-            content = getattr(message, "content", None)
-            reasoning_content = getattr(message, "reasoning_content", None)
-
-            # Handle COT logic for non-streaming responses (only if enabled)
-            final_content = ""
-
-            if enable_cot:
-                # Check if we should include reasoning content
-                should_include_reasoning = False
-                if reasoning_content and reasoning_content.strip():
-                    if not content or content.strip() == "":
-                        # Case 1: Only reasoning content, should include COT
-                        should_include_reasoning = True
-                        final_content = (
-                            content or ""
-                        )  # Use empty string if content is None
-                    else:
-                        # Case 3: Both content and reasoning_content present, ignore reasoning
-                        should_include_reasoning = False
-                        final_content = content
+        if (
+            not response
+            or not response.choices
+            or not hasattr(response.choices[0], "message")
+        ):
+            logger.error("Invalid response from OpenAI API")
+            raise InvalidResponseError("Invalid response from OpenAI API")
+
+        message = response.choices[0].message
+        content = getattr(message, "content", None)
+        reasoning_content = getattr(message, "reasoning_content", None)
+
+        # Handle COT logic for non-streaming responses (only if enabled)
+        final_content = ""
+
+        if enable_cot:
+            # Check if we should include reasoning content
+            should_include_reasoning = False
+            if reasoning_content and reasoning_content.strip():
+                if not content or content.strip() == "":
+                    # Case 1: Only reasoning content, should include COT
+                    should_include_reasoning = True
+                    final_content = content or ""  # Use empty string if content is None
                 else:
-                    # No reasoning content, use regular content
-                    final_content = content or ""
-
-                # Apply COT wrapping if needed
-                if should_include_reasoning:
-                    if r"\u" in reasoning_content:
-                        reasoning_content = safe_unicode_decode(
-                            reasoning_content.encode("utf-8")
-                        )
-                    final_content = f"<think>{reasoning_content}</think>{final_content}"
+                    # Case 3: Both content and reasoning_content present, ignore reasoning
+                    should_include_reasoning = False
+                    final_content = content
             else:
-                # COT disabled, only use regular content
+                # No reasoning content, use regular content
                 final_content = content or ""
 
-            # Validate final content
-            if not final_content or final_content.strip() == "":
-                logger.error("Received empty content from OpenAI API")
-                await openai_async_client.close()  # Ensure client is closed
-                raise InvalidResponseError("Received empty content from OpenAI API")
+            # Apply COT wrapping if needed
+            if should_include_reasoning:
+                if r"\u" in reasoning_content:
+                    reasoning_content = safe_unicode_decode(
+                        reasoning_content.encode("utf-8")
+                    )
+                final_content = f"<think>{reasoning_content}</think>{final_content}"
+        else:
+            # COT disabled, only use regular content
+            final_content = content or ""
+
+        # Validate final content
+        if not final_content or final_content.strip() == "":
+            logger.error("Received empty content from OpenAI API")
+            raise InvalidResponseError("Received empty content from OpenAI API")
 
-            # Apply Unicode decoding to final content if needed
-            if r"\u" in final_content:
-                final_content = safe_unicode_decode(final_content.encode("utf-8"))
+        # Apply Unicode decoding to final content if needed
+        if r"\u" in final_content:
+            final_content = safe_unicode_decode(final_content.encode("utf-8"))
 
-            if token_tracker and hasattr(response, "usage"):
-                token_counts = {
-                    "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(
-                        response.usage, "completion_tokens", 0
-                    ),
-                    "total_tokens": getattr(response.usage, "total_tokens", 0),
-                }
-                token_tracker.add_usage(token_counts)
+        if token_tracker and hasattr(response, "usage"):
+            token_counts = {
+                "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+                "completion_tokens": getattr(response.usage, "completion_tokens", 0),
+                "total_tokens": getattr(response.usage, "total_tokens", 0),
+            }
+            token_tracker.add_usage(token_counts)
 
-            logger.debug(f"Response content len: {len(final_content)}")
-            verbose_debug(f"Response: {response}")
+        logger.debug(f"Response content len: {len(final_content)}")
+        verbose_debug(f"Response: {response}")
 
-            return final_content
-        finally:
-            # Ensure client is closed in all cases for non-streaming responses
-            await openai_async_client.close()
+        return final_content
 
 
 async def openai_complete(
@@ -615,20 +616,23 @@ async def openai_embed(
         RateLimitError: If the OpenAI API rate limit is exceeded.
         APITimeoutError: If the OpenAI API request times out.
     """
-    # Create the OpenAI client
-    openai_async_client = create_openai_async_client(
+    # Reuse the pooled OpenAI client (connections stay open between batches)
+    openai_async_client = get_openai_async_client(
         api_key=api_key, base_url=base_url, client_configs=client_configs
     )
 
-    async with openai_async_client:
+    try:
         response = await openai_async_client.embeddings.create(
             model=model, input=texts, encoding_format="base64"
         )
-        return np.array(
-            [
-                np.array(dp.embedding, dtype=np.float32)
-                if isinstance(dp.embedding, list)
-                else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
-                for dp in response.data
-            ]
-        )
+    except RateLimitError as e:
+        report_rate_limit_error(e)
+        raise
+    return np.array(
+        [
+            np.array(dp.embedding, dtype=np.float32)
+            if isinstance(dp.embedding, list)
+            else np.frombuffer(base64.b64decode(dp.embedding), dtype=np.float32)
+            for dp in response.data
+        ]
+    )
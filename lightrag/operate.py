@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
+import multiprocessing
+import pickle
 import time
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from functools import partial
-from typing import Any, AsyncIterator, Literal, overload
+from typing import Any, AsyncIterator, Callable, Iterator, Literal, overload
 
 import json_repair
 from dotenv import load_dotenv
@@ -20,20 +25,30 @@ from .base import (
     TextChunkSchema,
 )
 from .constants import (
+    DEFAULT_CHUNKING_PROCESS_POOL_SIZE,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_KG_CHUNK_PICK_METHOD,
     DEFAULT_MAX_ENTITY_TOKENS,
     DEFAULT_MAX_RELATION_TOKENS,
+    DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
+    DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
     DEFAULT_MAX_TOTAL_TOKENS,
     DEFAULT_RELATED_CHUNK_NUMBER,
+    DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     DEFAULT_SUMMARY_LANGUAGE,
+    DEFAULT_SUMMARY_MAX_PARALLEL,
+    DEFAULT_EMBEDDING_BATCH_NUM,
+    DEFAULT_VDB_UPSERT_FLUSH_INTERVAL,
     GRAPH_FIELD_SEP,
 )
 from .kg.shared_storage import get_storage_keyed_lock
 from .prompt import PROMPTS
 from .utils import (
     CacheData,
+    FairTaskScheduler,
     Tokenizer,
+    apply_source_ids_limit,
+    atruncate_list_by_token_size,
     build_file_path,
     compute_args_hash,
     compute_mdhash_id,
@@ -44,16 +59,19 @@ from .utils import (
     handle_cache,
     is_float_regex,
     logger,
+    make_chunk_provenance_record,
+    make_relation_chunk_key,
+    merge_chunk_provenance,
     pack_user_ass_to_openai_messages,
     pick_by_vector_similarity,
     pick_by_weighted_polling,
     process_chunks_unified,
     remove_think_tags,
     safe_vdb_operation_with_exception,
+    VectorUpsertBuffer,
     sanitize_and_normalize_extracted_text,
     save_to_cache,
     split_string_by_multi_markers,
-    truncate_list_by_token_size,
     update_chunk_cache_list,
     use_llm_func_with_cache,
 )
@@ -64,59 +82,190 @@ from .utils import (
 load_dotenv(dotenv_path=".env", override=False)
 
 
-def chunking_by_token_size(
+def _iter_token_windows(
+    tokenizer: Tokenizer,
+    content: str,
+    overlap_token_size: int,
+    max_token_size: int,
+    keep_whole_if_fits: bool = False,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token_count, text) windows of `max_token_size` tokens over content.
+
+    The content is encoded once. When the tokenizer can report token byte offsets,
+    each window is cut from the UTF-8 bytes of the original string instead of being
+    decoded through the tokenizer.
+    """
+    tokens = tokenizer.encode(content)
+    total = len(tokens)
+    if keep_whole_if_fits and total <= max_token_size:
+        yield total, content
+        return
+    data = None
+    offsets = tokenizer.token_byte_offsets(tokens)
+    if offsets is not None:
+        data = content.encode("utf-8", errors="surrogatepass")
+        if int(offsets[-1]) != len(data):
+            data = None  # content does not round-trip through the tokenizer
+    for start in range(0, total, max_token_size - overlap_token_size):
+        end = min(start + max_token_size, total)
+        if data is not None:
+            # Same result as tokenizer.decode: partial characters become U+FFFD
+            window = data[offsets[start] : offsets[end]].decode(
+                "utf-8", errors="replace"
+            )
+        else:
+            window = tokenizer.decode(tokens[start:end])
+        yield end - start, window
+
+
+def iter_chunks_by_token_size(
     tokenizer: Tokenizer,
     content: str,
     split_by_character: str | None = None,
     split_by_character_only: bool = False,
     overlap_token_size: int = 128,
     max_token_size: int = 1024,
-) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
+) -> Iterator[dict[str, Any]]:
+    """Single-pass generator version of `chunking_by_token_size`.
+
+    Chunks are yielded as soon as they are produced, so callers can start consuming
+    them before the whole document has been walked.
+    """
+    index = 0
     if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > max_token_size:
-                    for start in range(
-                        0, len(_tokens), max_token_size - overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
-                        new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
+        for piece in content.split(split_by_character):
+            if split_by_character_only:
+                windows = [(len(tokenizer.encode(piece)), piece)]
+            else:
+                windows = _iter_token_windows(
+                    tokenizer,
+                    piece,
+                    overlap_token_size,
+                    max_token_size,
+                    keep_whole_if_fits=True,
+                )
+            for _len, chunk in windows:
+                yield {
                     "tokens": _len,
                     "content": chunk.strip(),
                     "chunk_order_index": index,
                 }
-            )
+                index += 1
     else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
+        for _len, chunk in _iter_token_windows(
+            tokenizer, content, overlap_token_size, max_token_size
         ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
-            results.append(
-                {
-                    "tokens": min(max_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
+            yield {
+                "tokens": _len,
+                "content": chunk.strip(),
+                "chunk_order_index": index,
+            }
+            index += 1
+
+
+def chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> list[dict[str, Any]]:
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            overlap_token_size,
+            max_token_size,
+        )
+    )
+
+
+_chunking_executor: ProcessPoolExecutor | None = None
+_chunking_executor_size = 0
+
+
+def _get_chunking_executor(
+    max_workers: int = DEFAULT_CHUNKING_PROCESS_POOL_SIZE,
+) -> ProcessPoolExecutor:
+    global _chunking_executor, _chunking_executor_size
+    max_workers = max(1, max_workers)
+    if _chunking_executor is not None and _chunking_executor_size != max_workers:
+        # Resized by another configuration: let running jobs finish in the old pool
+        _chunking_executor.shutdown(wait=False)
+        _chunking_executor = None
+    if _chunking_executor is None:
+        # spawn avoids forking a process that holds event loop threads and locks
+        _chunking_executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _chunking_executor_size = max_workers
+    return _chunking_executor
+
+
+async def shutdown_chunking_executor() -> None:
+    """Shut down the chunking process pool, if one was started.
+
+    The pool is created again on the next off-loop chunking call, so this is safe to
+    call while other LightRAG instances are still running.
+    """
+    global _chunking_executor
+    executor, _chunking_executor = _chunking_executor, None
+    if executor is not None:
+        await asyncio.to_thread(executor.shutdown, True)
+
+
+async def achunk_document(
+    chunking_func: Callable[..., Any],
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None,
+    split_by_character_only: bool,
+    overlap_token_size: int,
+    max_token_size: int,
+    offload_threshold: int = 0,
+    use_process_pool: bool = False,
+    process_pool_size: int = DEFAULT_CHUNKING_PROCESS_POOL_SIZE,
+) -> list[dict[str, Any]]:
+    """Run `chunking_func` without blocking the event loop on very large documents.
+
+    Documents shorter than `offload_threshold` characters (or all documents if the
+    threshold is 0) are chunked inline. Larger documents are chunked in a worker
+    thread, or in a process pool of `process_pool_size` workers if
+    `use_process_pool` is set. The process pool falls back to a thread if the
+    chunking function or tokenizer cannot be sent to another process.
+    """
+    global _chunking_executor
+    call = partial(
+        chunking_func,
+        tokenizer,
+        content,
+        split_by_character,
+        split_by_character_only,
+        overlap_token_size,
+        max_token_size,
+    )
+    if offload_threshold <= 0 or len(content) < offload_threshold:
+        return list(call())
+
+    if use_process_pool:
+        loop = asyncio.get_running_loop()
+        try:
+            return list(
+                await loop.run_in_executor(
+                    _get_chunking_executor(process_pool_size), call
+                )
             )
-    return results
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            logger.debug(f"Chunking in process pool unavailable, using thread: {e}")
+        except BrokenProcessPool as e:
+            logger.warning(f"Chunking process pool broken, using thread: {e}")
+            _chunking_executor = None
+    # tiktoken releases the GIL while encoding, so a thread keeps the loop responsive
+    return list(await asyncio.to_thread(call))
 
 
 async def _handle_entity_relation_summary(
@@ -126,6 +275,7 @@ async def _handle_entity_relation_summary(
     seperator: str,
     global_config: dict,
     llm_response_cache: BaseKVStorage | None = None,
+    summary_stats: dict | None = None,
 ) -> tuple[str, bool]:
     """Handle entity relation description summary using map-reduce approach.
 
@@ -133,7 +283,7 @@ async def _handle_entity_relation_summary(
     1. If total tokens < summary_context_size and len(description_list) < force_llm_summary_on_merge, no need to summarize
     2. If total tokens < summary_max_tokens, summarize with LLM directly
     3. Otherwise, split descriptions into chunks that fit within token limits
-    4. Summarize each chunk, then recursively process the summaries
+    4. Summarize the chunks of a round concurrently (at most summary_max_parallel at a time), then recursively process the summaries
     5. Continue until we get a final summary within token limits or num of descriptions is less than force_llm_summary_on_merge
 
     Args:
@@ -141,6 +291,8 @@ async def _handle_entity_relation_summary(
         description_list: List of description strings to summarize
         global_config: Global configuration containing tokenizer and limits
         llm_response_cache: Optional cache for LLM responses
+        summary_stats: Optional dict filled with the LLM telemetry of this summary
+            (rounds, groups, tokens, llm_seconds)
 
     Returns:
         Tuple of (final_summarized_description_string, llm_was_used_boolean)
@@ -158,14 +310,37 @@ async def _handle_entity_relation_summary(
     summary_context_size = global_config["summary_context_size"]
     summary_max_tokens = global_config["summary_max_tokens"]
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
+    max_parallel = max(
+        1, global_config.get("summary_max_parallel", DEFAULT_SUMMARY_MAX_PARALLEL)
+    )
 
     current_list = description_list[:]  # Copy the list to avoid modifying original
     llm_was_used = False  # Track whether LLM was used during the entire process
 
+    stats = summary_stats if summary_stats is not None else {}
+    stats.update(rounds=0, groups=0, tokens=0, llm_seconds=0.0)
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def _summarize_group(group: list[str], group_tokens: int) -> str:
+        async with semaphore:
+            start = time.perf_counter()
+            summary = await _summarize_descriptions(
+                description_type,
+                entity_or_relation_name,
+                group,
+                global_config,
+                llm_response_cache,
+            )
+            stats["groups"] += 1
+            stats["tokens"] += group_tokens
+            stats["llm_seconds"] += time.perf_counter() - start
+            return summary
+
     # Iterative map-reduce process
     while True:
-        # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        # Calculate tokens of each description once per round (off the event loop)
+        desc_token_counts = await tokenizer.acount_tokens_batch(current_list)
+        total_tokens = sum(desc_token_counts)
 
         # If total length is within limits, perform final summarization
         if total_tokens <= summary_context_size or len(current_list) <= 2:
@@ -182,25 +357,19 @@ async def _handle_entity_relation_summary(
                         f"Summarizing {entity_or_relation_name}: Oversize descpriton found"
                     )
                 # Final summarization of remaining descriptions - LLM will be used
-                final_summary = await _summarize_descriptions(
-                    description_type,
-                    entity_or_relation_name,
-                    current_list,
-                    global_config,
-                    llm_response_cache,
-                )
+                stats["rounds"] += 1
+                final_summary = await _summarize_group(current_list, total_tokens)
                 return final_summary, True  # LLM was used for final summarization
 
         # Need to split into chunks - Map phase
         # Ensure each chunk has minimum 2 descriptions to guarantee progress
         chunks = []
+        chunk_tokens = []
         current_chunk = []
         current_tokens = 0
 
         # Currently least 3 descriptions in current_list
-        for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
-
+        for desc, desc_tokens in zip(current_list, desc_token_counts):
             # If adding current description would exceed limit, finalize current chunk
             if current_tokens + desc_tokens > summary_context_size and current_chunk:
                 # Ensure we have at least 2 descriptions in the chunk (when possible)
@@ -208,6 +377,7 @@ async def _handle_entity_relation_summary(
                     # Force add one more description to ensure minimum 2 per chunk
                     current_chunk.append(desc)
                     chunks.append(current_chunk)
+                    chunk_tokens.append(current_tokens + desc_tokens)
                     logger.warning(
                         f"Summarizing {entity_or_relation_name}: Oversize descpriton found"
                     )
@@ -215,6 +385,7 @@ async def _handle_entity_relation_summary(
                     current_tokens = 0
                 else:  # curren_chunk is ready for summary in reduce phase
                     chunks.append(current_chunk)
+                    chunk_tokens.append(current_tokens)
                     current_chunk = [desc]  # leave it for next group
                     current_tokens = desc_tokens
             else:
@@ -224,33 +395,73 @@ async def _handle_entity_relation_summary(
         # Add the last chunk if it exists
         if current_chunk:
             chunks.append(current_chunk)
+            chunk_tokens.append(current_tokens)
 
         logger.info(
             f"   Summarizing {entity_or_relation_name}: Map {len(current_list)} descriptions into {len(chunks)} groups"
         )
 
-        # Reduce phase: summarize each group from chunks
-        new_summaries = []
-        for chunk in chunks:
+        # Reduce phase: summarize the groups of this round concurrently, the shared
+        # LLM priority queue bounds the global concurrency
+        stats["rounds"] += 1
+        new_summaries = list(chunks)
+        tasks = {}
+        for i, (chunk, tokens) in enumerate(zip(chunks, chunk_tokens)):
             if len(chunk) == 1:
                 # Optimization: single description chunks don't need LLM summarization
-                new_summaries.append(chunk[0])
+                new_summaries[i] = chunk[0]
             else:
                 # Multiple descriptions need LLM summarization
-                summary = await _summarize_descriptions(
-                    description_type,
-                    entity_or_relation_name,
-                    chunk,
-                    global_config,
-                    llm_response_cache,
+                tasks[i] = asyncio.create_task(_summarize_group(chunk, tokens))
+
+        if tasks:
+            llm_was_used = True  # Mark that LLM was used in reduce phase
+            try:
+                done, _ = await asyncio.wait(
+                    tasks.values(), return_when=asyncio.FIRST_EXCEPTION
                 )
-                new_summaries.append(summary)
-                llm_was_used = True  # Mark that LLM was used in reduce phase
+            finally:
+                # On failure or cancellation, stop the rest of the round
+                for task in tasks.values():
+                    if not task.done():
+                        task.cancel()
+            errors = [task.exception() for task in done if task.exception()]
+            if errors:
+                raise errors[0]
+            for i, task in tasks.items():
+                new_summaries[i] = task.result()
 
         # Update current list with new summaries for next iteration
         current_list = new_summaries
 
 
+def _format_summary_stats(stats: dict) -> str:
+    """Status message suffix with the LLM telemetry of one description summary"""
+    return (
+        f" (rounds:{stats['rounds']} groups:{stats['groups']} "
+        f"tokens:{stats['tokens']} llm:{stats['llm_seconds']:.1f}s)"
+    )
+
+
+def _accumulate_summary_stats(pipeline_status: dict, stats: dict) -> None:
+    """Add the telemetry of one description summary to pipeline_status["summary_stats"]
+
+    Must be called with the pipeline status lock held. The dict is replaced, not
+    mutated, so the update reaches other processes through the shared namespace.
+    """
+    totals = dict(pipeline_status.get("summary_stats") or {})
+    totals["merges"] = totals.get("merges", 0) + 1
+    for key in ("rounds", "groups", "tokens"):
+        totals[key] = totals.get(key, 0) + stats[key]
+    totals["llm_seconds"] = round(
+        totals.get("llm_seconds", 0.0) + stats["llm_seconds"], 3
+    )
+    totals["max_llm_seconds"] = round(
+        max(totals.get("max_llm_seconds", 0.0), stats["llm_seconds"]), 3
+    )
+    pipeline_status["summary_stats"] = totals
+
+
 async def _summarize_descriptions(
     description_type: str,
     description_name: str,
@@ -286,8 +497,8 @@ async def _summarize_descriptions(
     # Create list of JSON objects with "Description" field
     json_descriptions = [{"Description": desc} for desc in description_list]
 
-    # Use truncate_list_by_token_size for length truncation
-    truncated_json_descriptions = truncate_list_by_token_size(
+    # Use atruncate_list_by_token_size for length truncation
+    truncated_json_descriptions = await atruncate_list_by_token_size(
         json_descriptions,
         key=lambda x: json.dumps(x, ensure_ascii=False),
         max_token_size=summary_context_size,
@@ -484,6 +695,8 @@ async def _rebuild_knowledge_from_chunks(
     global_config: dict[str, str],
     pipeline_status: dict | None = None,
     pipeline_status_lock=None,
+    entity_chunks_storage: BaseKVStorage | None = None,
+    relation_chunks_storage: BaseKVStorage | None = None,
 ) -> None:
     """Rebuild entity and relationship descriptions from cached extraction results with parallel processing
 
@@ -502,6 +715,8 @@ async def _rebuild_knowledge_from_chunks(
         global_config: Global configuration containing llm_model_max_async
         pipeline_status: Pipeline status dictionary
         pipeline_status_lock: Lock for pipeline status
+        entity_chunks_storage: Full chunk lists of entities, trimmed to the remaining chunks
+        relation_chunks_storage: Full chunk lists of relations, trimmed to the remaining chunks
     """
     if not entities_to_rebuild and not relationships_to_rebuild:
         return
@@ -641,6 +856,7 @@ async def _rebuild_knowledge_from_chunks(
                         chunk_entities=chunk_entities,
                         llm_response_cache=llm_response_cache,
                         global_config=global_config,
+                        entity_chunks_storage=entity_chunks_storage,
                     )
                     rebuilt_entities_count += 1
                     status_message = (
@@ -682,6 +898,7 @@ async def _rebuild_knowledge_from_chunks(
                         chunk_relationships=chunk_relationships,
                         llm_response_cache=llm_response_cache,
                         global_config=global_config,
+                        relation_chunks_storage=relation_chunks_storage,
                     )
                     rebuilt_relationships_count += 1
                     status_message = (
@@ -1006,6 +1223,7 @@ async def _rebuild_single_entity(
     chunk_entities: dict,
     llm_response_cache: BaseKVStorage,
     global_config: dict[str, str],
+    entity_chunks_storage: BaseKVStorage | None = None,
 ) -> None:
     """Rebuild a single entity from cached extraction results"""
 
@@ -1014,6 +1232,21 @@ async def _rebuild_single_entity(
     if not current_entity:
         return
 
+    if entity_chunks_storage is not None:
+        source_id, _ = await _update_chunk_provenance(
+            entity_chunks_storage,
+            entity_name,
+            GRAPH_FIELD_SEP.join(chunk_ids),
+            [],
+            global_config.get(
+                "max_source_ids_per_entity", DEFAULT_MAX_SOURCE_IDS_PER_ENTITY
+            ),
+            global_config,
+            keep_chunk_ids=set(chunk_ids),
+        )
+    else:
+        source_id = GRAPH_FIELD_SEP.join(chunk_ids)
+
     # Helper function to update entity in both graph and vector storage
     async def _update_entity_storage(
         final_description: str, entity_type: str, file_paths: set[str]
@@ -1024,7 +1257,7 @@ async def _rebuild_single_entity(
                 **current_entity,
                 "description": final_description,
                 "entity_type": entity_type,
-                "source_id": GRAPH_FIELD_SEP.join(chunk_ids),
+                "source_id": source_id,
                 "file_path": GRAPH_FIELD_SEP.join(file_paths)
                 if file_paths
                 else current_entity.get("file_path", "unknown_source"),
@@ -1161,6 +1394,7 @@ async def _rebuild_single_relationship(
     chunk_relationships: dict,
     llm_response_cache: BaseKVStorage,
     global_config: dict[str, str],
+    relation_chunks_storage: BaseKVStorage | None = None,
 ) -> None:
     """Rebuild a single relationship from cached extraction results
 
@@ -1230,6 +1464,21 @@ async def _rebuild_single_relationship(
         # fallback to keep current(unchanged)
         final_description = current_relationship.get("description", "")
 
+    if relation_chunks_storage is not None:
+        source_id, _ = await _update_chunk_provenance(
+            relation_chunks_storage,
+            make_relation_chunk_key(src, tgt),
+            GRAPH_FIELD_SEP.join(chunk_ids),
+            [],
+            global_config.get(
+                "max_source_ids_per_relation", DEFAULT_MAX_SOURCE_IDS_PER_RELATION
+            ),
+            global_config,
+            keep_chunk_ids=set(chunk_ids),
+        )
+    else:
+        source_id = GRAPH_FIELD_SEP.join(chunk_ids)
+
     # Update relationship in graph storage
     updated_relationship_data = {
         **current_relationship,
@@ -1238,7 +1487,7 @@ async def _rebuild_single_relationship(
         else current_relationship.get("description", ""),
         "keywords": combined_keywords,
         "weight": weight,
-        "source_id": GRAPH_FIELD_SEP.join(chunk_ids),
+        "source_id": source_id,
         "file_path": GRAPH_FIELD_SEP.join([fp for fp in file_paths if fp])
         if file_paths
         else current_relationship.get("file_path", "unknown_source"),
@@ -1288,6 +1537,34 @@ async def _rebuild_single_relationship(
         raise  # Re-raise exception
 
 
+async def _update_chunk_provenance(
+    chunks_storage: BaseKVStorage,
+    key: str,
+    fallback_source_id: str | None,
+    new_chunk_ids: list[str],
+    limit: int,
+    global_config: dict,
+    keep_chunk_ids: set[str] | None = None,
+) -> tuple[str, list[str]]:
+    """Update the full chunk list of an entity or relation in its side table
+
+    Returns:
+        The capped source_id to store in the graph and the full chunk id list
+    """
+    record = await chunks_storage.get_by_id(key)
+    chunk_ids, counts = merge_chunk_provenance(
+        record, fallback_source_id, new_chunk_ids, keep_chunk_ids
+    )
+    await chunks_storage.upsert({key: make_chunk_provenance_record(chunk_ids, counts)})
+    method = global_config.get(
+        "source_ids_limit_method", DEFAULT_SOURCE_IDS_LIMIT_METHOD
+    )
+    source_id = GRAPH_FIELD_SEP.join(
+        apply_source_ids_limit(chunk_ids, counts, limit, method)
+    )
+    return source_id, chunk_ids
+
+
 async def _merge_nodes_then_upsert(
     entity_name: str,
     nodes_data: list[dict],
@@ -1296,8 +1573,13 @@ async def _merge_nodes_then_upsert(
     pipeline_status: dict = None,
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
+    entity_chunks_storage: BaseKVStorage | None = None,
 ):
-    """Get existing nodes from knowledge graph use name,if exists, merge data, else create, then upsert."""
+    """Get existing nodes from knowledge graph use name,if exists, merge data, else create, then upsert.
+
+    With entity_chunks_storage, the full chunk list is kept there and source_id is
+    capped to max_source_ids_per_entity chunk ids.
+    """
     already_entity_types = []
     already_source_ids = []
     already_description = []
@@ -1344,6 +1626,7 @@ async def _merge_nodes_then_upsert(
         dd_message = ""
     if num_fragment > 0:
         # Get summary and LLM usage status
+        summary_stats = {}
         description, llm_was_used = await _handle_entity_relation_summary(
             "Entity",
             entity_name,
@@ -1351,11 +1634,12 @@ async def _merge_nodes_then_upsert(
             GRAPH_FIELD_SEP,
             global_config,
             llm_response_cache,
+            summary_stats=summary_stats,
         )
 
         # Log based on actual LLM usage
         if llm_was_used:
-            status_message = f"LLMmrg: `{entity_name}` | {already_fragment}+{num_fragment - already_fragment}{dd_message}"
+            status_message = f"LLMmrg: `{entity_name}` | {already_fragment}+{num_fragment - already_fragment}{dd_message}{_format_summary_stats(summary_stats)}"
         else:
             status_message = f"Merged: `{entity_name}` | {already_fragment}+{num_fragment - already_fragment}{dd_message}"
 
@@ -1365,6 +1649,8 @@ async def _merge_nodes_then_upsert(
                 async with pipeline_status_lock:
                     pipeline_status["latest_message"] = status_message
                     pipeline_status["history_messages"].append(status_message)
+                    if llm_was_used:
+                        _accumulate_summary_stats(pipeline_status, summary_stats)
         else:
             logger.debug(status_message)
 
@@ -1372,9 +1658,22 @@ async def _merge_nodes_then_upsert(
         logger.error(f"Entity {entity_name} has no description")
         description = "(no description)"
 
-    source_id = GRAPH_FIELD_SEP.join(
-        set([dp["source_id"] for dp in nodes_data] + already_source_ids)
-    )
+    new_chunk_ids = [dp["source_id"] for dp in nodes_data if dp.get("source_id")]
+    if entity_chunks_storage is not None:
+        source_id, _ = await _update_chunk_provenance(
+            entity_chunks_storage,
+            entity_name,
+            already_node.get("source_id") if already_node else None,
+            new_chunk_ids,
+            global_config.get(
+                "max_source_ids_per_entity", DEFAULT_MAX_SOURCE_IDS_PER_ENTITY
+            ),
+            global_config,
+        )
+    else:
+        source_id = GRAPH_FIELD_SEP.join(
+            dict.fromkeys(already_source_ids + new_chunk_ids)
+        )
     file_path = build_file_path(already_file_paths, nodes_data, entity_name)
 
     node_data = dict(
@@ -1403,6 +1702,8 @@ async def _merge_edges_then_upsert(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     added_entities: list = None,  # New parameter to track entities added during edge processing
+    entity_chunks_storage: BaseKVStorage | None = None,
+    relation_chunks_storage: BaseKVStorage | None = None,
 ):
     if src_id == tgt_id:
         return None
@@ -1413,6 +1714,7 @@ async def _merge_edges_then_upsert(
     already_keywords = []
     already_file_paths = []
 
+    already_edge = None
     if await knowledge_graph_inst.has_edge(src_id, tgt_id):
         already_edge = await knowledge_graph_inst.get_edge(src_id, tgt_id)
         # Handle the case where get_edge returns None or missing fields
@@ -1476,6 +1778,7 @@ async def _merge_edges_then_upsert(
         dd_message = ""
     if num_fragment > 0:
         # Get summary and LLM usage status
+        summary_stats = {}
         description, llm_was_used = await _handle_entity_relation_summary(
             "Relation",
             f"({src_id}, {tgt_id})",
@@ -1483,11 +1786,12 @@ async def _merge_edges_then_upsert(
             GRAPH_FIELD_SEP,
             global_config,
             llm_response_cache,
+            summary_stats=summary_stats,
         )
 
         # Log based on actual LLM usage
         if llm_was_used:
-            status_message = f"LLMmrg: `{src_id}`~`{tgt_id}` | {already_fragment}+{num_fragment - already_fragment}{dd_message}"
+            status_message = f"LLMmrg: `{src_id}`~`{tgt_id}` | {already_fragment}+{num_fragment - already_fragment}{dd_message}{_format_summary_stats(summary_stats)}"
         else:
             status_message = f"Merged: `{src_id}`~`{tgt_id}` | {already_fragment}+{num_fragment - already_fragment}{dd_message}"
 
@@ -1497,6 +1801,8 @@ async def _merge_edges_then_upsert(
                 async with pipeline_status_lock:
                     pipeline_status["latest_message"] = status_message
                     pipeline_status["history_messages"].append(status_message)
+                    if llm_was_used:
+                        _accumulate_summary_stats(pipeline_status, summary_stats)
         else:
             logger.debug(status_message)
 
@@ -1519,16 +1825,36 @@ async def _merge_edges_then_upsert(
     # Join all unique keywords with commas
     keywords = ",".join(sorted(all_keywords))
 
-    source_id = GRAPH_FIELD_SEP.join(
-        set(
-            [dp["source_id"] for dp in edges_data if dp.get("source_id")]
-            + already_source_ids
+    new_chunk_ids = [dp["source_id"] for dp in edges_data if dp.get("source_id")]
+    if relation_chunks_storage is not None:
+        source_id, full_chunk_ids = await _update_chunk_provenance(
+            relation_chunks_storage,
+            make_relation_chunk_key(src_id, tgt_id),
+            already_edge.get("source_id") if already_edge else None,
+            new_chunk_ids,
+            global_config.get(
+                "max_source_ids_per_relation", DEFAULT_MAX_SOURCE_IDS_PER_RELATION
+            ),
+            global_config,
         )
-    )
+    else:
+        source_id = GRAPH_FIELD_SEP.join(
+            dict.fromkeys(already_source_ids + new_chunk_ids)
+        )
+        full_chunk_ids = source_id.split(GRAPH_FIELD_SEP)
     file_path = build_file_path(already_file_paths, edges_data, f"{src_id}-{tgt_id}")
 
     for need_insert_id in [src_id, tgt_id]:
         if not (await knowledge_graph_inst.has_node(need_insert_id)):
+            if entity_chunks_storage is not None:
+                # Placeholder entities are sourced from the relation's chunks
+                await entity_chunks_storage.upsert(
+                    {
+                        need_insert_id: make_chunk_provenance_record(
+                            full_chunk_ids, [1] * len(full_chunk_ids)
+                        )
+                    }
+                )
             node_data = {
                 "entity_id": need_insert_id,
                 "source_id": source_id,
@@ -1577,47 +1903,10 @@ async def _merge_edges_then_upsert(
     return edge_data
 
 
-async def merge_nodes_and_edges(
+def _collect_nodes_and_edges(
     chunk_results: list,
-    knowledge_graph_inst: BaseGraphStorage,
-    entity_vdb: BaseVectorStorage,
-    relationships_vdb: BaseVectorStorage,
-    global_config: dict[str, str],
-    full_entities_storage: BaseKVStorage = None,
-    full_relations_storage: BaseKVStorage = None,
-    doc_id: str = None,
-    pipeline_status: dict = None,
-    pipeline_status_lock=None,
-    llm_response_cache: BaseKVStorage | None = None,
-    current_file_number: int = 0,
-    total_files: int = 0,
-    file_path: str = "unknown_source",
-) -> None:
-    """Two-phase merge: process all entities first, then all relationships
-
-    This approach ensures data consistency by:
-    1. Phase 1: Process all entities concurrently
-    2. Phase 2: Process all relationships concurrently (may add missing entities)
-    3. Phase 3: Update full_entities and full_relations storage with final results
-
-    Args:
-        chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
-        knowledge_graph_inst: Knowledge graph storage
-        entity_vdb: Entity vector database
-        relationships_vdb: Relationship vector database
-        global_config: Global configuration
-        full_entities_storage: Storage for document entity lists
-        full_relations_storage: Storage for document relation lists
-        doc_id: Document ID for storage indexing
-        pipeline_status: Pipeline status dictionary
-        pipeline_status_lock: Lock for pipeline status
-        llm_response_cache: LLM response cache
-        current_file_number: Current file number for logging
-        total_files: Total files for logging
-        file_path: File path for logging
-    """
-
-    # Collect all nodes and edges from all chunks
+) -> tuple[dict[str, list], dict[tuple, list]]:
+    """Group extracted entities by name and relations by sorted endpoint pair"""
     all_nodes = defaultdict(list)
     all_edges = defaultdict(list)
 
@@ -1631,34 +1920,85 @@ async def merge_nodes_and_edges(
             sorted_edge_key = tuple(sorted(edge_key))
             all_edges[sorted_edge_key].extend(edges)
 
-    total_entities_count = len(all_nodes)
-    total_relations_count = len(all_edges)
+    return all_nodes, all_edges
 
-    log_message = f"Merging stage {current_file_number}/{total_files}: {file_path}"
-    logger.info(log_message)
-    async with pipeline_status_lock:
-        pipeline_status["latest_message"] = log_message
-        pipeline_status["history_messages"].append(log_message)
 
+async def _merge_graph_elements(
+    all_nodes: dict[str, list],
+    all_edges: dict[tuple, list],
+    knowledge_graph_inst: BaseGraphStorage,
+    entity_vdb: BaseVectorStorage,
+    relationships_vdb: BaseVectorStorage,
+    global_config: dict[str, str],
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+    entity_chunks_storage: BaseKVStorage | None = None,
+    relation_chunks_storage: BaseKVStorage | None = None,
+    source_label: str | None = None,
+    vdb_buffer: dict[str, dict] | None = None,
+    task_scheduler: FairTaskScheduler | None = None,
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Phase 1 and 2 of the merge: upsert all entities, then all relationships
+
+    Each entity and relationship is merged once under its keyed lock. Vector
+    upserts go through a write-behind VectorUpsertBuffer, so concurrent tasks are
+    embedded together in batches of embedding_batch_num; each task waits for its
+    batch (still holding its keyed lock, but not the semaphore) before returning.
+    With vdb_buffer ({"entities": {}, "relationships": {}}), vector payloads are
+    instead collected there for the caller to upsert in bulk. With task_scheduler,
+    the graph merges share the pipeline-wide scheduler (fair across documents)
+    instead of a semaphore of their own.
+
+    Returns:
+        Tuple of (processed entities, processed edges, entities added during edge processing)
+    """
     # Get max async tasks limit from global_config for semaphore control
-    graph_max_async = global_config.get("llm_model_max_async", 4) * 2
-    semaphore = asyncio.Semaphore(graph_max_async)
+    if task_scheduler is not None:
+        graph_max_async = task_scheduler.max_concurrency
+
+        def merge_slot():
+            return task_scheduler.slot(source_label or "")
+
+    else:
+        graph_max_async = global_config.get("llm_model_max_async", 4) * 2
+        semaphore = asyncio.Semaphore(graph_max_async)
+
+        def merge_slot():
+            return semaphore
+
+    total_entities_count = len(all_nodes)
+    total_relations_count = len(all_edges)
+
+    if vdb_buffer is None:
+        upsert_batch_size = global_config.get(
+            "embedding_batch_num", DEFAULT_EMBEDDING_BATCH_NUM
+        )
+        flush_interval = global_config.get(
+            "vdb_upsert_flush_interval", DEFAULT_VDB_UPSERT_FLUSH_INTERVAL
+        )
+        entity_upserts = VectorUpsertBuffer(
+            entity_vdb, upsert_batch_size, flush_interval, "entity_upsert"
+        )
+        relationship_upserts = VectorUpsertBuffer(
+            relationships_vdb, upsert_batch_size, flush_interval, "relationship_upsert"
+        )
 
     # ===== Phase 1: Process all entities concurrently =====
-    log_message = f"Phase 1: Processing {total_entities_count} entities from {doc_id} (async: {graph_max_async})"
+    log_message = f"Phase 1: Processing {total_entities_count} entities from {source_label} (async: {graph_max_async})"
     logger.info(log_message)
     async with pipeline_status_lock:
         pipeline_status["latest_message"] = log_message
         pipeline_status["history_messages"].append(log_message)
 
     async def _locked_process_entity_name(entity_name, entities):
-        async with semaphore:
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            async with get_storage_keyed_lock(
-                [entity_name], namespace=namespace, enable_logging=False
-            ):
-                try:
+        workspace = global_config.get("workspace", "")
+        namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+        async with get_storage_keyed_lock(
+            [entity_name], namespace=namespace, enable_logging=False
+        ):
+            try:
+                async with merge_slot():
                     # Graph database operation (critical path, must succeed)
                     entity_data = await _merge_nodes_then_upsert(
                         entity_name,
@@ -1668,61 +2008,49 @@ async def merge_nodes_and_edges(
                         pipeline_status,
                         pipeline_status_lock,
                         llm_response_cache,
+                        entity_chunks_storage,
                     )
 
-                    # Vector database operation (equally critical, must succeed)
-                    if entity_vdb is not None and entity_data:
-                        data_for_vdb = {
-                            compute_mdhash_id(
-                                entity_data["entity_name"], prefix="ent-"
-                            ): {
-                                "entity_name": entity_data["entity_name"],
-                                "entity_type": entity_data["entity_type"],
-                                "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
-                                "source_id": entity_data["source_id"],
-                                "file_path": entity_data.get(
-                                    "file_path", "unknown_source"
-                                ),
-                            }
+                # Vector database operation (equally critical, must succeed)
+                if entity_vdb is not None and entity_data:
+                    data_for_vdb = {
+                        compute_mdhash_id(entity_data["entity_name"], prefix="ent-"): {
+                            "entity_name": entity_data["entity_name"],
+                            "entity_type": entity_data["entity_type"],
+                            "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
+                            "source_id": entity_data["source_id"],
+                            "file_path": entity_data.get("file_path", "unknown_source"),
                         }
+                    }
 
-                        # Use safe operation wrapper - VDB failure must throw exception
-                        await safe_vdb_operation_with_exception(
-                            operation=lambda: entity_vdb.upsert(data_for_vdb),
-                            operation_name="entity_upsert",
-                            entity_name=entity_name,
-                            max_retries=3,
-                            retry_delay=0.1,
-                        )
+                    if vdb_buffer is not None:
+                        vdb_buffer["entities"].update(data_for_vdb)
+                    else:
+                        # Write-behind upsert: raises if the batch fails after retries.
+                        # Waited for outside the semaphore so other tasks can fill the batch
+                        await entity_upserts.upsert(data_for_vdb)
 
-                    return entity_data
+                return entity_data
 
-                except Exception as e:
-                    # Any database operation failure is critical
-                    error_msg = (
-                        f"Critical error in entity processing for `{entity_name}`: {e}"
-                    )
-                    logger.error(error_msg)
-
-                    # Try to update pipeline status, but don't let status update failure affect main exception
-                    try:
-                        if (
-                            pipeline_status is not None
-                            and pipeline_status_lock is not None
-                        ):
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(error_msg)
-                    except Exception as status_error:
-                        logger.error(
-                            f"Failed to update pipeline status: {status_error}"
-                        )
+            except Exception as e:
+                # Any database operation failure is critical
+                error_msg = (
+                    f"Critical error in entity processing for `{entity_name}`: {e}"
+                )
+                logger.error(error_msg)
 
-                    # Re-raise the original exception with a prefix
-                    prefixed_exception = create_prefixed_exception(
-                        e, f"`{entity_name}`"
-                    )
-                    raise prefixed_exception from e
+                # Try to update pipeline status, but don't let status update failure affect main exception
+                try:
+                    if pipeline_status is not None and pipeline_status_lock is not None:
+                        async with pipeline_status_lock:
+                            pipeline_status["latest_message"] = error_msg
+                            pipeline_status["history_messages"].append(error_msg)
+                except Exception as status_error:
+                    logger.error(f"Failed to update pipeline status: {status_error}")
+
+                # Re-raise the original exception with a prefix
+                prefixed_exception = create_prefixed_exception(e, f"`{entity_name}`")
+                raise prefixed_exception from e
 
     # Create entity processing tasks
     entity_tasks = []
@@ -1761,6 +2089,10 @@ async def merge_nodes_and_edges(
             # Wait for cancellation to complete
             if pending:
                 await asyncio.wait(pending)
+            # Don't leave vector batches of the cancelled tasks running
+            if vdb_buffer is None:
+                await entity_upserts.drain()
+                await relationship_upserts.drain()
             # Re-raise the first exception to notify the caller
             raise first_exception
 
@@ -1768,26 +2100,26 @@ async def merge_nodes_and_edges(
         processed_entities = [task.result() for task in entity_tasks]
 
     # ===== Phase 2: Process all relationships concurrently =====
-    log_message = f"Phase 2: Processing {total_relations_count} relations from {doc_id} (async: {graph_max_async})"
+    log_message = f"Phase 2: Processing {total_relations_count} relations from {source_label} (async: {graph_max_async})"
     logger.info(log_message)
     async with pipeline_status_lock:
         pipeline_status["latest_message"] = log_message
         pipeline_status["history_messages"].append(log_message)
 
     async def _locked_process_edges(edge_key, edges):
-        async with semaphore:
-            workspace = global_config.get("workspace", "")
-            namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
-            sorted_edge_key = sorted([edge_key[0], edge_key[1]])
-
-            async with get_storage_keyed_lock(
-                sorted_edge_key,
-                namespace=namespace,
-                enable_logging=False,
-            ):
-                try:
-                    added_entities = []  # Track entities added during edge processing
+        workspace = global_config.get("workspace", "")
+        namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+        sorted_edge_key = sorted([edge_key[0], edge_key[1]])
+
+        async with get_storage_keyed_lock(
+            sorted_edge_key,
+            namespace=namespace,
+            enable_logging=False,
+        ):
+            try:
+                added_entities = []  # Track entities added during edge processing
 
+                async with merge_slot():
                     # Graph database operation (critical path, must succeed)
                     edge_data = await _merge_edges_then_upsert(
                         edge_key[0],
@@ -1799,93 +2131,75 @@ async def merge_nodes_and_edges(
                         pipeline_status_lock,
                         llm_response_cache,
                         added_entities,  # Pass list to collect added entities
+                        entity_chunks_storage,
+                        relation_chunks_storage,
                     )
 
-                    if edge_data is None:
-                        return None, []
-
-                    # Vector database operation (equally critical, must succeed)
-                    if relationships_vdb is not None:
-                        data_for_vdb = {
-                            compute_mdhash_id(
-                                edge_data["src_id"] + edge_data["tgt_id"], prefix="rel-"
-                            ): {
-                                "src_id": edge_data["src_id"],
-                                "tgt_id": edge_data["tgt_id"],
-                                "keywords": edge_data["keywords"],
-                                "content": f"{edge_data['src_id']}\t{edge_data['tgt_id']}\n{edge_data['keywords']}\n{edge_data['description']}",
-                                "source_id": edge_data["source_id"],
-                                "file_path": edge_data.get(
-                                    "file_path", "unknown_source"
-                                ),
-                                "weight": edge_data.get("weight", 1.0),
-                            }
+                if edge_data is None:
+                    return None, []
+
+                # Vector database operation (equally critical, must succeed)
+                relationship_vdb_data = {}
+                if relationships_vdb is not None:
+                    relationship_vdb_data = {
+                        compute_mdhash_id(
+                            edge_data["src_id"] + edge_data["tgt_id"], prefix="rel-"
+                        ): {
+                            "src_id": edge_data["src_id"],
+                            "tgt_id": edge_data["tgt_id"],
+                            "keywords": edge_data["keywords"],
+                            "content": f"{edge_data['src_id']}\t{edge_data['tgt_id']}\n{edge_data['keywords']}\n{edge_data['description']}",
+                            "source_id": edge_data["source_id"],
+                            "file_path": edge_data.get("file_path", "unknown_source"),
+                            "weight": edge_data.get("weight", 1.0),
                         }
+                    }
 
-                        # Use safe operation wrapper - VDB failure must throw exception
-                        await safe_vdb_operation_with_exception(
-                            operation=lambda: relationships_vdb.upsert(data_for_vdb),
-                            operation_name="relationship_upsert",
-                            entity_name=f"{edge_data['src_id']}-{edge_data['tgt_id']}",
-                            max_retries=3,
-                            retry_delay=0.1,
+                # Entities added during edge processing also go to the entity vector database
+                entity_vdb_data = {}
+                if added_entities and entity_vdb is not None:
+                    for entity_data in added_entities:
+                        entity_vdb_id = compute_mdhash_id(
+                            entity_data["entity_name"], prefix="ent-"
                         )
+                        entity_vdb_data[entity_vdb_id] = {
+                            "content": f"{entity_data['entity_name']}\n{entity_data['description']}",
+                            "entity_name": entity_data["entity_name"],
+                            "source_id": entity_data["source_id"],
+                            "entity_type": entity_data["entity_type"],
+                            "file_path": entity_data.get("file_path", "unknown_source"),
+                        }
 
-                    # Update added_entities to entity vector database using safe operation wrapper
-                    if added_entities and entity_vdb is not None:
-                        for entity_data in added_entities:
-                            entity_vdb_id = compute_mdhash_id(
-                                entity_data["entity_name"], prefix="ent-"
-                            )
-                            entity_content = f"{entity_data['entity_name']}\n{entity_data['description']}"
-
-                            vdb_data = {
-                                entity_vdb_id: {
-                                    "content": entity_content,
-                                    "entity_name": entity_data["entity_name"],
-                                    "source_id": entity_data["source_id"],
-                                    "entity_type": entity_data["entity_type"],
-                                    "file_path": entity_data.get(
-                                        "file_path", "unknown_source"
-                                    ),
-                                }
-                            }
-
-                            # Use safe operation wrapper - VDB failure must throw exception
-                            await safe_vdb_operation_with_exception(
-                                operation=lambda data=vdb_data: entity_vdb.upsert(data),
-                                operation_name="added_entity_upsert",
-                                entity_name=entity_data["entity_name"],
-                                max_retries=3,
-                                retry_delay=0.1,
-                            )
+                if vdb_buffer is not None:
+                    vdb_buffer["relationships"].update(relationship_vdb_data)
+                    vdb_buffer["entities"].update(entity_vdb_data)
+                else:
+                    # Write-behind upserts: raise if their batch fails after retries.
+                    # Waited for outside the semaphore so other tasks can fill the batches
+                    await asyncio.gather(
+                        relationship_upserts.upsert(relationship_vdb_data),
+                        entity_upserts.upsert(entity_vdb_data),
+                    )
 
-                    return edge_data, added_entities
+                return edge_data, added_entities
 
-                except Exception as e:
-                    # Any database operation failure is critical
-                    error_msg = f"Critical error in relationship processing for `{sorted_edge_key}`: {e}"
-                    logger.error(error_msg)
-
-                    # Try to update pipeline status, but don't let status update failure affect main exception
-                    try:
-                        if (
-                            pipeline_status is not None
-                            and pipeline_status_lock is not None
-                        ):
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(error_msg)
-                    except Exception as status_error:
-                        logger.error(
-                            f"Failed to update pipeline status: {status_error}"
-                        )
+            except Exception as e:
+                # Any database operation failure is critical
+                error_msg = f"Critical error in relationship processing for `{sorted_edge_key}`: {e}"
+                logger.error(error_msg)
 
-                    # Re-raise the original exception with a prefix
-                    prefixed_exception = create_prefixed_exception(
-                        e, f"{sorted_edge_key}"
-                    )
-                    raise prefixed_exception from e
+                # Try to update pipeline status, but don't let status update failure affect main exception
+                try:
+                    if pipeline_status is not None and pipeline_status_lock is not None:
+                        async with pipeline_status_lock:
+                            pipeline_status["latest_message"] = error_msg
+                            pipeline_status["history_messages"].append(error_msg)
+                except Exception as status_error:
+                    logger.error(f"Failed to update pipeline status: {status_error}")
+
+                # Re-raise the original exception with a prefix
+                prefixed_exception = create_prefixed_exception(e, f"{sorted_edge_key}")
+                raise prefixed_exception from e
 
     # Create relationship processing tasks
     edge_tasks = []
@@ -1926,6 +2240,10 @@ async def merge_nodes_and_edges(
             # Wait for cancellation to complete
             if pending:
                 await asyncio.wait(pending)
+            # Don't leave vector batches of the cancelled tasks running
+            if vdb_buffer is None:
+                await entity_upserts.drain()
+                await relationship_upserts.drain()
             # Re-raise the first exception to notify the caller
             raise first_exception
 
@@ -1936,6 +2254,84 @@ async def merge_nodes_and_edges(
                 processed_edges.append(edge_data)
             all_added_entities.extend(added_entities)
 
+    return processed_entities, processed_edges, all_added_entities
+
+
+async def merge_nodes_and_edges(
+    chunk_results: list,
+    knowledge_graph_inst: BaseGraphStorage,
+    entity_vdb: BaseVectorStorage,
+    relationships_vdb: BaseVectorStorage,
+    global_config: dict[str, str],
+    full_entities_storage: BaseKVStorage = None,
+    full_relations_storage: BaseKVStorage = None,
+    doc_id: str = None,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+    entity_chunks_storage: BaseKVStorage | None = None,
+    relation_chunks_storage: BaseKVStorage | None = None,
+    current_file_number: int = 0,
+    total_files: int = 0,
+    file_path: str = "unknown_source",
+    task_scheduler: FairTaskScheduler | None = None,
+) -> None:
+    """Two-phase merge: process all entities first, then all relationships
+
+    This approach ensures data consistency by:
+    1. Phase 1: Process all entities concurrently
+    2. Phase 2: Process all relationships concurrently (may add missing entities)
+    3. Phase 3: Update full_entities and full_relations storage with final results
+
+    Args:
+        chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
+        knowledge_graph_inst: Knowledge graph storage
+        entity_vdb: Entity vector database
+        relationships_vdb: Relationship vector database
+        global_config: Global configuration
+        full_entities_storage: Storage for document entity lists
+        full_relations_storage: Storage for document relation lists
+        doc_id: Document ID for storage indexing
+        pipeline_status: Pipeline status dictionary
+        pipeline_status_lock: Lock for pipeline status
+        llm_response_cache: LLM response cache
+        entity_chunks_storage: Full chunk lists of entities (source_id is capped)
+        relation_chunks_storage: Full chunk lists of relations (source_id is capped)
+        current_file_number: Current file number for logging
+        total_files: Total files for logging
+        file_path: File path for logging
+        task_scheduler: Pipeline-wide scheduler shared by the graph merges of all documents
+    """
+
+    # Collect all nodes and edges from all chunks
+    all_nodes, all_edges = _collect_nodes_and_edges(chunk_results)
+
+    log_message = f"Merging stage {current_file_number}/{total_files}: {file_path}"
+    logger.info(log_message)
+    async with pipeline_status_lock:
+        pipeline_status["latest_message"] = log_message
+        pipeline_status["history_messages"].append(log_message)
+
+    (
+        processed_entities,
+        processed_edges,
+        all_added_entities,
+    ) = await _merge_graph_elements(
+        all_nodes,
+        all_edges,
+        knowledge_graph_inst,
+        entity_vdb,
+        relationships_vdb,
+        global_config,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+        entity_chunks_storage,
+        relation_chunks_storage,
+        source_label=doc_id,
+        task_scheduler=task_scheduler,
+    )
+
     # ===== Phase 3: Update full_entities and full_relations storage =====
     if full_entities_storage and full_relations_storage and doc_id:
         try:
@@ -2008,6 +2404,253 @@ async def merge_nodes_and_edges(
         pipeline_status["history_messages"].append(log_message)
 
 
+class _GraphWriteBuffer:
+    """Graph storage view that defers node and edge upserts of a batched merge
+
+    Reads see the buffered writes first. flush() writes all buffered nodes with
+    upsert_nodes_batch, then all edges with upsert_edges_batch, so the endpoints
+    of every edge exist before it is written. Only safe when no other merge
+    touches the same entities before the flush.
+    """
+
+    def __init__(self, graph: BaseGraphStorage):
+        self._graph = graph
+        self._nodes: dict[str, dict] = {}
+        self._edges: dict[tuple[str, str], tuple[str, str, dict]] = {}
+
+    def __getattr__(self, name):
+        return getattr(self._graph, name)
+
+    async def has_node(self, node_id: str) -> bool:
+        return node_id in self._nodes or await self._graph.has_node(node_id)
+
+    async def get_node(self, node_id: str) -> dict | None:
+        if node_id in self._nodes:
+            return dict(self._nodes[node_id])
+        return await self._graph.get_node(node_id)
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        # Attributes are merged into a buffered node, as the backends do
+        self._nodes[node_id] = {**self._nodes.get(node_id, {}), **node_data}
+
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        key = tuple(sorted((source_node_id, target_node_id)))
+        return key in self._edges or await self._graph.has_edge(
+            source_node_id, target_node_id
+        )
+
+    async def get_edge(self, source_node_id: str, target_node_id: str) -> dict | None:
+        key = tuple(sorted((source_node_id, target_node_id)))
+        if key in self._edges:
+            return dict(self._edges[key][2])
+        return await self._graph.get_edge(source_node_id, target_node_id)
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        key = tuple(sorted((source_node_id, target_node_id)))
+        src, tgt, data = self._edges.get(key, (source_node_id, target_node_id, {}))
+        self._edges[key] = (src, tgt, {**data, **edge_data})
+
+    async def flush(self) -> None:
+        nodes, self._nodes = list(self._nodes.items()), {}
+        edges, self._edges = list(self._edges.values()), {}
+        if nodes:
+            await self._graph.upsert_nodes_batch(nodes)
+        if edges:
+            await self._graph.upsert_edges_batch(edges)
+
+
+class _KVWriteBuffer:
+    """KV storage view that defers upserts of a batched merge until flush()
+
+    Used for the entity_chunks / relation_chunks provenance tables, which are
+    flushed after the graph so a failed graph write leaves them untouched.
+    """
+
+    def __init__(self, storage: BaseKVStorage):
+        self._storage = storage
+        self._data: dict[str, dict] = {}
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+    async def get_by_id(self, id: str) -> dict | None:
+        if id in self._data:
+            return dict(self._data[id])
+        return await self._storage.get_by_id(id)
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict | None]:
+        # Fetched per id: batch get_by_ids results are not aligned with the
+        # requested ids on every backend (PG returns only the rows found)
+        return list(await asyncio.gather(*(self.get_by_id(id) for id in ids)))
+
+    async def upsert(self, data: dict[str, dict]) -> None:
+        self._data.update(data)
+
+    async def flush(self) -> None:
+        data, self._data = self._data, {}
+        if data:
+            await self._storage.upsert(data)
+
+
+async def merge_nodes_and_edges_batch(
+    doc_chunk_results: dict[str, list],
+    knowledge_graph_inst: BaseGraphStorage,
+    entity_vdb: BaseVectorStorage,
+    relationships_vdb: BaseVectorStorage,
+    global_config: dict[str, str],
+    full_entities_storage: BaseKVStorage = None,
+    full_relations_storage: BaseKVStorage = None,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+    entity_chunks_storage: BaseKVStorage | None = None,
+    relation_chunks_storage: BaseKVStorage | None = None,
+    task_scheduler: FairTaskScheduler | None = None,
+) -> None:
+    """Merge the extraction results of several documents in one pass
+
+    An entity or relationship that appears in many documents of the batch is
+    fetched, summarized and upserted once instead of once per document. Graph
+    writes are issued with upsert_nodes_batch / upsert_edges_batch, and vector
+    payloads of all changed entities and relationships are upserted in a single
+    call per vector storage, so they are embedded in full batches. The
+    full_entities and full_relations records are still written per document.
+
+    Args:
+        doc_chunk_results: Mapping of doc_id to the chunk results of extract_entities
+        (other arguments as in merge_nodes_and_edges)
+    """
+    all_nodes, all_edges = _collect_nodes_and_edges(
+        [
+            chunk_result
+            for chunk_results in doc_chunk_results.values()
+            for chunk_result in chunk_results
+        ]
+    )
+
+    log_message = f"Merging stage: {len(doc_chunk_results)} documents, {len(all_nodes)} entities, {len(all_edges)} relations"
+    logger.info(log_message)
+    async with pipeline_status_lock:
+        pipeline_status["latest_message"] = log_message
+        pipeline_status["history_messages"].append(log_message)
+
+    # Batch merges run one at a time, so graph, provenance and vector writes can
+    # be deferred to bulk upserts at the end of the batch
+    graph_buffer = _GraphWriteBuffer(knowledge_graph_inst)
+    entity_chunks_buffer = (
+        _KVWriteBuffer(entity_chunks_storage)
+        if entity_chunks_storage is not None
+        else None
+    )
+    relation_chunks_buffer = (
+        _KVWriteBuffer(relation_chunks_storage)
+        if relation_chunks_storage is not None
+        else None
+    )
+    vdb_buffer = {"entities": {}, "relationships": {}}
+    (
+        processed_entities,
+        processed_edges,
+        all_added_entities,
+    ) = await _merge_graph_elements(
+        all_nodes,
+        all_edges,
+        graph_buffer,
+        entity_vdb,
+        relationships_vdb,
+        global_config,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+        entity_chunks_buffer,
+        relation_chunks_buffer,
+        source_label=f"{len(doc_chunk_results)} documents",
+        vdb_buffer=vdb_buffer,
+        task_scheduler=task_scheduler,
+    )
+
+    # Bulk graph upserts (nodes first), then the provenance side tables, so a failed
+    # graph write does not leave them ahead of the graph for the retry to count twice.
+    # Vector upserts of everything the batch changed come last.
+    await graph_buffer.flush()
+    for provenance_buffer in (entity_chunks_buffer, relation_chunks_buffer):
+        if provenance_buffer is not None:
+            await provenance_buffer.flush()
+
+    if entity_vdb is not None and vdb_buffer["entities"]:
+        await safe_vdb_operation_with_exception(
+            operation=lambda: entity_vdb.upsert(vdb_buffer["entities"]),
+            operation_name="entity_batch_upsert",
+            entity_name=f"{len(vdb_buffer['entities'])} entities",
+            max_retries=3,
+            retry_delay=0.1,
+        )
+    if relationships_vdb is not None and vdb_buffer["relationships"]:
+        await safe_vdb_operation_with_exception(
+            operation=lambda: relationships_vdb.upsert(vdb_buffer["relationships"]),
+            operation_name="relationship_batch_upsert",
+            entity_name=f"{len(vdb_buffer['relationships'])} relations",
+            max_retries=3,
+            retry_delay=0.1,
+        )
+
+    # ===== Phase 3: Update full_entities and full_relations storage per document =====
+    if full_entities_storage and full_relations_storage:
+        try:
+            added_entity_names = {
+                entity["entity_name"]
+                for entity in all_added_entities
+                if entity and entity.get("entity_name")
+            }
+            doc_entities = {}
+            doc_relations = {}
+            for doc_id, chunk_results in doc_chunk_results.items():
+                nodes, edges = _collect_nodes_and_edges(chunk_results)
+                entity_names = set(nodes)
+                relation_pairs = set()
+                for src_id, tgt_id in edges:
+                    if src_id == tgt_id:
+                        continue  # Self loops are never stored
+                    relation_pairs.add((src_id, tgt_id))
+                    # Placeholder entities created for this document's relations
+                    entity_names.update(
+                        name for name in (src_id, tgt_id) if name in added_entity_names
+                    )
+                if entity_names:
+                    doc_entities[doc_id] = {
+                        "entity_names": list(entity_names),
+                        "count": len(entity_names),
+                    }
+                if relation_pairs:
+                    doc_relations[doc_id] = {
+                        "relation_pairs": [list(pair) for pair in relation_pairs],
+                        "count": len(relation_pairs),
+                    }
+
+            log_message = f"Phase 3: Updating entity-relation index of {len(doc_chunk_results)} documents"
+            logger.info(log_message)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+            if doc_entities:
+                await full_entities_storage.upsert(doc_entities)
+            if doc_relations:
+                await full_relations_storage.upsert(doc_relations)
+
+        except Exception as e:
+            logger.error(f"Failed to update entity-relation index for batch: {e}")
+            # Don't raise exception to avoid affecting main flow
+
+    log_message = f"Completed merging: {len(processed_entities)} entities, {len(all_added_entities)} extra entities, {len(processed_edges)} relations from {len(doc_chunk_results)} documents"
+    logger.info(log_message)
+    async with pipeline_status_lock:
+        pipeline_status["latest_message"] = log_message
+        pipeline_status["history_messages"].append(log_message)
+
+
 async def extract_entities(
     chunks: dict[str, TextChunkSchema],
     global_config: dict[str, str],
@@ -2015,6 +2658,7 @@ async def extract_entities(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     text_chunks_storage: BaseKVStorage | None = None,
+    task_scheduler: FairTaskScheduler | None = None,
 ) -> list:
     use_llm_func: callable = global_config["llm_model_func"]
     entity_extract_max_gleaning = global_config["entity_extract_max_gleaning"]
@@ -2177,12 +2821,19 @@ async def extract_entities(
         # Return the extracted nodes and edges for centralized processing
         return maybe_nodes, maybe_edges
 
-    # Get max async tasks limit from global_config
-    chunk_max_async = global_config.get("llm_model_max_async", 4)
-    semaphore = asyncio.Semaphore(chunk_max_async)
+    # Chunks of all documents share the pipeline-wide scheduler when one is given,
+    # otherwise the chunks of this call are limited to llm_model_max_async
+    if task_scheduler is None:
+        chunk_max_async = global_config.get("llm_model_max_async", 4)
+        semaphore = asyncio.Semaphore(chunk_max_async)
+
+    def chunk_slot(chunk):
+        if task_scheduler is None:
+            return semaphore
+        return task_scheduler.slot(chunk[1].get("full_doc_id", ""))
 
     async def _process_with_semaphore(chunk):
-        async with semaphore:
+        async with chunk_slot(chunk):
             try:
                 return await _process_single_content(chunk)
             except Exception as e:
@@ -2354,10 +3005,13 @@ async def kg_query(
 
     # Call LLM
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
-    logger.debug(
-        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        query_tokens, sys_prompt_tokens = await tokenizer.acount_tokens_batch(
+            [query, sys_prompt]
+        )
+        logger.debug(
+            f"[kg_query] Sending to LLM: {query_tokens + sys_prompt_tokens:,} tokens (Query: {query_tokens}, System: {sys_prompt_tokens})"
+        )
 
     # Handle cache
     args_hash = compute_args_hash(
@@ -2521,10 +3175,11 @@ async def extract_keywords_only(
     )
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(kw_prompt))
-    logger.debug(
-        f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        len_of_prompts = await tokenizer.acount_tokens(kw_prompt)
+        logger.debug(
+            f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
+        )
 
     # 4. Call the LLM for keyword extraction
     if param.model_func:
@@ -2642,6 +3297,39 @@ async def _get_vector_context(
         return []
 
 
+async def _run_retrieval_branch(
+    name: str,
+    coro,
+    timeout: float | None,
+    default: Any,
+) -> tuple[Any, dict[str, Any]]:
+    """
+    Await one retrieval branch under an optional deadline and time it.
+
+    A branch that misses its deadline is cancelled and yields `default`, so a
+    slow storage backend does not hold up the other branches of the query.
+
+    Returns:
+        Tuple of (branch result, timing dict with elapsed_ms and status)
+    """
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        if timeout:
+            result = await asyncio.wait_for(coro, timeout=timeout)
+        else:
+            result = await coro
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Retrieval branch '{name}' exceeded {timeout}s deadline, skipping its results"
+        )
+        result = default
+        status = "timeout"
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+    logger.debug(f"Retrieval branch '{name}' finished in {elapsed_ms}ms ({status})")
+    return result, {"elapsed_ms": elapsed_ms, "status": status}
+
+
 async def _perform_kg_search(
     query: str,
     ll_keywords: str,
@@ -2675,72 +3363,126 @@ async def _perform_kg_search(
     kg_chunk_pick_method = text_chunks_db.global_config.get(
         "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
     )
-    query_embedding = None
+    # Mirrors the branch selection below: local/global mode fall back to hybrid
+    # retrieval when their own keywords are empty
+    use_local = len(ll_keywords) > 0 and not (
+        query_param.mode == "global" and len(hl_keywords) > 0
+    )
+    use_global = len(hl_keywords) > 0 and not (
+        query_param.mode == "local" and len(ll_keywords) > 0
+    )
+
+    # Embed the raw query, ll_keywords and hl_keywords in one embedding call
+    texts_to_embed = {}
     if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
+        texts_to_embed["query"] = query
+    if use_local:
+        texts_to_embed["ll_keywords"] = ll_keywords
+    if use_global:
+        texts_to_embed["hl_keywords"] = hl_keywords
+
+    retrieval_timing: dict[str, dict[str, Any]] = {}
+    precomputed_embeddings = {}
+    if texts_to_embed:
+        embedding_start = time.perf_counter()
         embedding_func_config = text_chunks_db.embedding_func
         if embedding_func_config and embedding_func_config.func:
             try:
-                query_embedding = await embedding_func_config.func([query])
-                query_embedding = query_embedding[
-                    0
-                ]  # Extract first embedding from batch result
-                logger.debug("Pre-computed query embedding for all vector operations")
+                embeddings = await embedding_func_config.func(
+                    list(texts_to_embed.values())
+                )
+                precomputed_embeddings = dict(zip(texts_to_embed.keys(), embeddings))
+                logger.debug(
+                    f"Pre-computed {len(precomputed_embeddings)} query embeddings in one call"
+                )
             except Exception as e:
-                logger.warning(f"Failed to pre-compute query embedding: {e}")
-                query_embedding = None
+                logger.warning(f"Failed to pre-compute query embeddings: {e}")
+                precomputed_embeddings = {}
+        retrieval_timing["embedding"] = {
+            "elapsed_ms": round((time.perf_counter() - embedding_start) * 1000, 2),
+            "status": "ok" if precomputed_embeddings else "error",
+        }
+    query_embedding = precomputed_embeddings.get("query")
+    ll_embedding = precomputed_embeddings.get("ll_keywords")
+    hl_embedding = precomputed_embeddings.get("hl_keywords")
 
-    # Handle local and global modes
+    # Local, global and vector retrieval are independent: fan them out concurrently
+    branches = {}
     if query_param.mode == "local" and len(ll_keywords) > 0:
-        local_entities, local_relations = await _get_node_data(
+        branches["local"] = _get_node_data(
             ll_keywords,
             knowledge_graph_inst,
             entities_vdb,
             query_param,
+            ll_embedding,
         )
-
     elif query_param.mode == "global" and len(hl_keywords) > 0:
-        global_relations, global_entities = await _get_edge_data(
+        branches["global"] = _get_edge_data(
             hl_keywords,
             knowledge_graph_inst,
             relationships_vdb,
             query_param,
+            hl_embedding,
         )
-
     else:  # hybrid or mix mode
         if len(ll_keywords) > 0:
-            local_entities, local_relations = await _get_node_data(
+            branches["local"] = _get_node_data(
                 ll_keywords,
                 knowledge_graph_inst,
                 entities_vdb,
                 query_param,
+                ll_embedding,
             )
         if len(hl_keywords) > 0:
-            global_relations, global_entities = await _get_edge_data(
+            branches["global"] = _get_edge_data(
                 hl_keywords,
                 knowledge_graph_inst,
                 relationships_vdb,
                 query_param,
+                hl_embedding,
             )
-
         # Get vector chunks for mix mode
         if query_param.mode == "mix" and chunks_vdb:
-            vector_chunks = await _get_vector_context(
+            branches["vector"] = _get_vector_context(
                 query,
                 chunks_vdb,
                 query_param,
                 query_embedding,
             )
-            # Track vector chunks with source metadata
-            for i, chunk in enumerate(vector_chunks):
-                chunk_id = chunk.get("chunk_id") or chunk.get("id")
-                if chunk_id:
-                    chunk_tracking[chunk_id] = {
-                        "source": "C",
-                        "frequency": 1,  # Vector chunks always have frequency 1
-                        "order": i + 1,  # 1-based order in vector search results
-                    }
-                else:
-                    logger.warning(f"Vector chunk missing chunk_id: {chunk}")
+
+    branch_outputs = await asyncio.gather(
+        *[
+            _run_retrieval_branch(
+                name,
+                coro,
+                query_param.retrieval_branch_timeout,
+                [] if name == "vector" else ([], []),
+            )
+            for name, coro in branches.items()
+        ]
+    )
+    branch_results = {}
+    for name, (result, timing) in zip(branches.keys(), branch_outputs):
+        branch_results[name] = result
+        retrieval_timing[name] = timing
+
+    if "local" in branch_results:
+        local_entities, local_relations = branch_results["local"]
+    if "global" in branch_results:
+        global_relations, global_entities = branch_results["global"]
+    if "vector" in branch_results:
+        vector_chunks = branch_results["vector"]
+        # Track vector chunks with source metadata
+        for i, chunk in enumerate(vector_chunks):
+            chunk_id = chunk.get("chunk_id") or chunk.get("id")
+            if chunk_id:
+                chunk_tracking[chunk_id] = {
+                    "source": "C",
+                    "frequency": 1,  # Vector chunks always have frequency 1
+                    "order": i + 1,  # 1-based order in vector search results
+                }
+            else:
+                logger.warning(f"Vector chunk missing chunk_id: {chunk}")
 
     # Round-robin merge entities
     final_entities = []
@@ -2808,6 +3550,7 @@ async def _perform_kg_search(
         "vector_chunks": vector_chunks,
         "chunk_tracking": chunk_tracking,
         "query_embedding": query_embedding,
+        "retrieval_timing": retrieval_timing,
     }
 
 
@@ -2912,7 +3655,7 @@ async def _apply_token_truncation(
             entity_copy.pop("created_at", None)
             entities_context_for_truncation.append(entity_copy)
 
-        entities_context = truncate_list_by_token_size(
+        entities_context = await atruncate_list_by_token_size(
             entities_context_for_truncation,
             key=lambda x: "\n".join(
                 json.dumps(item, ensure_ascii=False) for item in [x]
@@ -2930,7 +3673,7 @@ async def _apply_token_truncation(
             relation_copy.pop("created_at", None)
             relations_context_for_truncation.append(relation_copy)
 
-        relations_context = truncate_list_by_token_size(
+        relations_context = await atruncate_list_by_token_size(
             relations_context_for_truncation,
             key=lambda x: "\n".join(
                 json.dumps(item, ensure_ascii=False) for item in [x]
@@ -2982,6 +3725,18 @@ async def _apply_token_truncation(
     }
 
 
+def _build_merged_chunk(chunk: dict, chunk_id: str) -> dict:
+    merged_chunk = {
+        "content": chunk["content"],
+        "file_path": chunk.get("file_path", "unknown_source"),
+        "chunk_id": chunk_id,
+    }
+    # Token count of this exact dict, stored on the chunk record at write time
+    if chunk.get("context_tokens") is not None:
+        merged_chunk["context_tokens"] = chunk["context_tokens"]
+    return merged_chunk
+
+
 async def _merge_all_chunks(
     filtered_entities: list[dict],
     filtered_relations: list[dict],
@@ -3041,13 +3796,7 @@ async def _merge_all_chunks(
             chunk_id = chunk.get("chunk_id") or chunk.get("id")
             if chunk_id and chunk_id not in seen_chunk_ids:
                 seen_chunk_ids.add(chunk_id)
-                merged_chunks.append(
-                    {
-                        "content": chunk["content"],
-                        "file_path": chunk.get("file_path", "unknown_source"),
-                        "chunk_id": chunk_id,
-                    }
-                )
+                merged_chunks.append(_build_merged_chunk(chunk, chunk_id))
 
         # Add from entity chunks (Local mode)
         if i < len(entity_chunks):
@@ -3055,13 +3804,7 @@ async def _merge_all_chunks(
             chunk_id = chunk.get("chunk_id") or chunk.get("id")
             if chunk_id and chunk_id not in seen_chunk_ids:
                 seen_chunk_ids.add(chunk_id)
-                merged_chunks.append(
-                    {
-                        "content": chunk["content"],
-                        "file_path": chunk.get("file_path", "unknown_source"),
-                        "chunk_id": chunk_id,
-                    }
-                )
+                merged_chunks.append(_build_merged_chunk(chunk, chunk_id))
 
         # Add from relation chunks (Global mode)
         if i < len(relation_chunks):
@@ -3069,13 +3812,7 @@ async def _merge_all_chunks(
             chunk_id = chunk.get("chunk_id") or chunk.get("id")
             if chunk_id and chunk_id not in seen_chunk_ids:
                 seen_chunk_ids.add(chunk_id)
-                merged_chunks.append(
-                    {
-                        "content": chunk["content"],
-                        "file_path": chunk.get("file_path", "unknown_source"),
-                        "chunk_id": chunk_id,
-                    }
-                )
+                merged_chunks.append(_build_merged_chunk(chunk, chunk_id))
 
     logger.info(
         f"Round-robin merged chunks: {origin_len} -> {len(merged_chunks)} (deduplicated {origin_len - len(merged_chunks)})"
@@ -3148,7 +3885,6 @@ async def _build_llm_context(
         text_chunks_str="",
         reference_list_str="",
     )
-    kg_context_tokens = len(tokenizer.encode(pre_kg_context))
 
     # Calculate preliminary system prompt tokens
     pre_sys_prompt = sys_prompt_template.format(
@@ -3156,10 +3892,15 @@ async def _build_llm_context(
         response_type=response_type,
         user_prompt=user_prompt,
     )
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
+
+    # Count kg context, system prompt and query tokens in one batch
+    (
+        kg_context_tokens,
+        sys_prompt_tokens,
+        query_tokens,
+    ) = await tokenizer.acount_tokens_batch([pre_kg_context, pre_sys_prompt, query])
 
     # Calculate available tokens for text chunks
-    query_tokens = len(tokenizer.encode(query))
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + kg_context_tokens + query_tokens + buffer_tokens
@@ -3360,6 +4101,7 @@ async def _build_query_context(
         "high_level": hl_keywords_list,
         "low_level": ll_keywords_list,
     }
+    raw_data["metadata"]["retrieval_timing"] = search_result.get("retrieval_timing", {})
     raw_data["metadata"]["processing_info"] = {
         "total_entities_found": len(search_result.get("final_entities", [])),
         "total_relations_found": len(search_result.get("final_relations", [])),
@@ -3388,13 +4130,16 @@ async def _get_node_data(
     knowledge_graph_inst: BaseGraphStorage,
     entities_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] = None,
 ):
     # get similar entities
     logger.info(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    results = await entities_vdb.query(
+        query, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -3523,9 +4268,8 @@ async def _find_related_text_unit_from_entities(
     entities_with_chunks = []
     for entity in node_datas:
         if entity.get("source_id"):
-            chunks = split_string_by_multi_markers(
-                entity["source_id"], [GRAPH_FIELD_SEP]
-            )
+            # source_id is capped at ingestion, so it is cheap to split here
+            chunks = [c for c in entity["source_id"].split(GRAPH_FIELD_SEP) if c]
             if chunks:
                 entities_with_chunks.append(
                     {
@@ -3665,12 +4409,15 @@ async def _get_edge_data(
     knowledge_graph_inst: BaseGraphStorage,
     relationships_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    query_embedding: list[float] = None,
 ):
     logger.info(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    results = await relationships_vdb.query(
+        keywords, top_k=query_param.top_k, query_embedding=query_embedding
+    )
 
     if not len(results):
         return [], []
@@ -3775,9 +4522,7 @@ async def _find_related_text_unit_from_relations(
     relations_with_chunks = []
     for relation in edge_datas:
         if relation.get("source_id"):
-            chunks = split_string_by_multi_markers(
-                relation["source_id"], [GRAPH_FIELD_SEP]
-            )
+            chunks = [c for c in relation["source_id"].split(GRAPH_FIELD_SEP) if c]
             if chunks:
                 # Build relation identifier
                 if "src_tgt" in relation:
@@ -4063,8 +4808,9 @@ async def naive_query(
     )
 
     # Calculate available tokens for chunks
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
-    query_tokens = len(tokenizer.encode(query))
+    sys_prompt_tokens, query_tokens = await tokenizer.acount_tokens_batch(
+        [pre_sys_prompt, query]
+    )
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + query_tokens + buffer_tokens
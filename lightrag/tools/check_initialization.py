@@ -57,6 +57,8 @@ async def check_lightrag_setup(rag_instance: LightRAG, verbose: bool = False) ->
         ("llm_response_cache", "LLM response cache"),
         ("full_entities", "Entity storage"),
         ("full_relations", "Relation storage"),
+        ("entity_chunks", "Entity chunk list storage"),
+        ("relation_chunks", "Relation chunk list storage"),
         ("chunk_entity_relation_graph", "Graph storage"),
     ]
 
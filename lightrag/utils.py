@@ -4,13 +4,19 @@ import weakref
 import asyncio
 import html
 import csv
+import hashlib
 import json
 import logging
 import logging.handlers
+import contextvars
 import os
 import re
+import threading
 import time
 import uuid
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
@@ -26,6 +32,11 @@ from lightrag.constants import (
     GRAPH_FIELD_SEP,
     DEFAULT_MAX_TOTAL_TOKENS,
     DEFAULT_MAX_FILE_PATH_LENGTH,
+    DEFAULT_TOKENIZER_OFFLOAD_MIN_CHARS,
+    DEFAULT_TOKENIZER_MAX_WORKERS,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+    SOURCE_IDS_LIMIT_METHOD_FREQUENT,
+    SOURCE_IDS_LIMIT_METHOD_KEEP,
 )
 
 # Initialize logger with basic configuration
@@ -102,6 +113,92 @@ async def safe_vdb_operation_with_exception(
                     await asyncio.sleep(retry_delay)
 
 
+class VectorUpsertBuffer:
+    """
+    Write-behind buffer that coalesces concurrent upserts into one vector storage.
+
+    Every upsert() call joins the pending batch and waits for it to be committed.
+    The batch is written with a single storage upsert (one embedding call) once it
+    holds batch_size items, or flush_interval seconds after its first item arrived.
+    Each caller then returns, or raises the batch's exception, so callers keep the
+    must-succeed semantics of safe_vdb_operation_with_exception.
+
+    Args:
+        storage: Vector storage receiving the batches
+        batch_size: Number of pending items that triggers an immediate flush
+        flush_interval: Max seconds a partially filled batch waits for more items
+        operation_name: Operation name for logging purposes
+    """
+
+    def __init__(
+        self,
+        storage,
+        batch_size: int,
+        flush_interval: float,
+        operation_name: str = "upsert",
+    ):
+        self._storage = storage
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = max(0.0, flush_interval)
+        self._operation_name = operation_name
+        self._pending: dict[str, dict] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._commit_tasks: set[asyncio.Task] = set()
+
+    async def upsert(self, data: dict[str, dict]) -> None:
+        if not data:
+            return
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._pending.update(data)
+        self._waiters.append(waiter)
+
+        if len(self._pending) >= self._batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._flush_interval, self._flush)
+
+        await waiter
+
+    async def drain(self) -> None:
+        """Commit the pending items and wait for every batch still being written"""
+        self._flush()
+        if self._commit_tasks:
+            await asyncio.gather(*self._commit_tasks, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, waiters = self._pending, self._waiters
+        self._pending, self._waiters = {}, []
+        task = asyncio.create_task(self._commit(batch, waiters))
+        self._commit_tasks.add(task)
+        task.add_done_callback(self._commit_tasks.discard)
+
+    async def _commit(self, batch: dict[str, dict], waiters: list[asyncio.Future]):
+        try:
+            await safe_vdb_operation_with_exception(
+                operation=lambda: self._storage.upsert(batch),
+                operation_name=self._operation_name,
+                entity_name=f"batch of {len(batch)} items",
+                max_retries=3,
+                retry_delay=0.1,
+            )
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+
 def get_env_value(
     env_key: str, default: any, value_type: type = str, special_none: bool = False
 ) -> any:
@@ -314,6 +411,187 @@ def setup_logger(
         logger_instance.addFilter(path_filter)
 
 
+def is_rate_limit_error(error: BaseException | None) -> bool:
+    """Whether an exception, or an exception it was raised from, reports HTTP 429"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if (
+            getattr(error, "status_code", None) == 429
+            or getattr(error, "status", None) == 429
+            or "RateLimit" in type(error).__name__
+        ):
+            return True
+        # tenacity.RetryError keeps the exception of its last attempt
+        last_attempt = getattr(error, "last_attempt", None)
+        if last_attempt is not None and last_attempt.failed:
+            error = last_attempt.exception()
+            continue
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class FairTaskScheduler:
+    """
+    Concurrency limit shared by the tasks of many documents, served round-robin.
+
+    A task waits in the queue of its owner (the document it belongs to) until a
+    slot is free; free slots are handed to the waiting owners in turn, so one
+    large document cannot starve the others. With adaptive=True the limit backs
+    off multiplicatively when a task fails with a rate-limit error (HTTP 429) or a
+    timeout, and grows back by about one slot per round of completions while the
+    observed task latency stays within latency_tolerance times its baseline. The
+    limit never exceeds max_concurrency.
+
+    Args:
+        max_concurrency: Maximum number of tasks running at once
+        name: Name used in log messages
+        adaptive: Adjust the limit to rate-limit errors, timeouts and latency
+        min_concurrency: Lower bound of the adaptive limit
+        latency_tolerance: Latency increase over the baseline that stops growth
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        name: str = "task_scheduler",
+        adaptive: bool = False,
+        min_concurrency: int = 1,
+        latency_tolerance: float = 2.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.name = name
+        self.adaptive = adaptive
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._waiting: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._latency = None  # EWMA of task durations
+        self._baseline_latency = None  # Slowly tracks the lowest EWMA seen
+        self._last_backoff = 0.0
+        self._backoffs = 0
+        self._completed = 0
+
+    @asynccontextmanager
+    async def slot(self, owner: str = ""):
+        """Hold one of the scheduler's slots for the duration of the block"""
+        await self.acquire(owner)
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(time.monotonic() - start, e)
+            raise
+        self.release(time.monotonic() - start, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self._in_flight,
+            "waiting": sum(len(queue) for queue in self._waiting.values()),
+            "waiting_owners": len(self._waiting),
+            "completed": self._completed,
+            "backoffs": self._backoffs,
+            "latency": self._latency,
+        }
+
+    async def acquire(self, owner: str = "") -> None:
+        """Wait for a free slot, in turn with the other owners waiting"""
+        if not self._waiting and self._in_flight < int(self.limit):
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(owner, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted right before the cancellation, pass it on
+                self._in_flight -= 1
+                self._dispatch()
+            else:
+                queue = self._waiting.get(owner)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._waiting[owner]
+            raise
+
+    def release(
+        self, duration: float | None = None, error: BaseException | None = None
+    ) -> None:
+        """Free a slot, reporting how long its task ran and how it ended
+
+        A duration of None frees the slot without an outcome (no task ran).
+        """
+        self._in_flight -= 1
+        if duration is not None:
+            if error is None:
+                self._completed += 1
+            if self.adaptive:
+                self._adapt(duration, error)
+        self._dispatch()
+
+    def backoff(self, error: BaseException) -> None:
+        """Halve the adaptive limit after a rate-limit error or a timeout
+
+        Backs off at most once per task latency: the tasks already running when
+        the provider became overloaded report the same overload.
+        """
+        if not self.adaptive:
+            return
+        now = time.monotonic()
+        if now - self._last_backoff < (self._latency or 1.0):
+            return
+        self._last_backoff = now
+        previous = int(self.limit)
+        self.limit = max(float(self.min_concurrency), self.limit / 2)
+        if int(self.limit) < previous:
+            self._backoffs += 1
+            logger.warning(
+                f"{self.name}: {type(error).__name__}, concurrency {previous} -> {int(self.limit)}"
+            )
+
+    def _dispatch(self) -> None:
+        while self._waiting and self._in_flight < int(self.limit):
+            owner, queue = next(iter(self._waiting.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._waiting.move_to_end(owner)
+            else:
+                del self._waiting[owner]
+            if not waiter.done():
+                waiter.set_result(None)
+                self._in_flight += 1
+
+    def _adapt(self, duration: float, error: BaseException | None) -> None:
+        if error is not None:
+            if is_rate_limit_error(error) or isinstance(
+                error, (TimeoutError, asyncio.TimeoutError)
+            ):
+                self.backoff(error)
+            return
+
+        self._latency = (
+            duration if self._latency is None else 0.8 * self._latency + 0.2 * duration
+        )
+        if self._baseline_latency is None or self._latency < self._baseline_latency:
+            self._baseline_latency = self._latency
+        else:
+            self._baseline_latency += 0.01 * (self._latency - self._baseline_latency)
+
+        if (
+            self.limit < self.max_concurrency
+            and self._latency <= self.latency_tolerance * self._baseline_latency
+        ):
+            previous = int(self.limit)
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            if int(self.limit) > previous:
+                logger.info(f"{self.name}: concurrency {previous} -> {int(self.limit)}")
+
+
 class UnlimitedSemaphore:
     """A context manager that allows unlimited access."""
 
@@ -341,11 +619,146 @@ class EmbeddingFunc:
     embedding_dim: int
     func: callable
     max_token_size: int | None = None  # deprecated keep it for compatible only
+    model_name: str | None = None  # part of the embedding cache key
 
     async def __call__(self, *args, **kwargs) -> np.ndarray:
         return await self.func(*args, **kwargs)
 
 
+class EmbeddingCache:
+    """
+    Persistent LRU cache of embedding results in front of an embedding function.
+
+    Vectors are keyed by md5(model, dim, text) and stored as float32 bytes. The
+    texts of a call missing from the cache are embedded with one call to the
+    wrapped function (keyword arguments such as _priority are passed through);
+    the least recently used vectors are evicted beyond max_size_mb. With a
+    file_path, load() and save() persist the cache as a compact .npz file.
+
+    Args:
+        embedding_func: Function being cached, must expose embedding_dim
+        model_name: Embedding model name used in the cache key
+        max_size_mb: Max size of the cached vectors in MB
+        file_path: Optional .npz file the cache is loaded from and saved to
+    """
+
+    def __init__(
+        self,
+        embedding_func,
+        model_name: str,
+        max_size_mb: float,
+        file_path: str | None = None,
+    ):
+        self.func = embedding_func
+        self.embedding_dim = embedding_func.embedding_dim
+        self.max_token_size = getattr(embedding_func, "max_token_size", None)
+        self.model_name = model_name
+        self.file_path = file_path
+        self._vector_bytes = self.embedding_dim * 4
+        self._max_entries = max(
+            1, int(max_size_mb * 1024 * 1024) // (self._vector_bytes + 16)
+        )
+        self._cache: OrderedDict[bytes, bytes] = OrderedDict()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __deepcopy__(self, memo):
+        # asdict(LightRAG) deep-copies its fields, share the cache instead of copying it
+        return self
+
+    def _key(self, text: str) -> bytes:
+        key_str = f"{self.model_name}:{self.embedding_dim}:{text}"
+        return md5(key_str.encode("utf-8", errors="replace")).digest()
+
+    async def __call__(self, texts: list[str], **kwargs) -> np.ndarray:
+        keys = [self._key(text) for text in texts]
+        found: dict[bytes, bytes] = {}
+        missing: dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                found[key] = vector
+                self.hits += 1
+            else:
+                missing[key] = text
+                self.misses += 1
+
+        if missing:
+            computed = np.asarray(
+                await self.func(list(missing.values()), **kwargs), dtype=np.float32
+            )
+            for key, vector in zip(missing, computed):
+                found[key] = self._cache[key] = vector.tobytes()
+            self._dirty = True
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+
+        return (
+            np.frombuffer(b"".join(found[key] for key in keys), dtype=np.float32)
+            .reshape(len(keys), self.embedding_dim)
+            .copy()
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "size_mb": round(
+                len(self._cache) * (self._vector_bytes + 16) / 1024 / 1024, 2
+            ),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def load(self) -> None:
+        if not self.file_path or not os.path.exists(self.file_path):
+            return
+        try:
+            with np.load(self.file_path) as data:
+                keys, vectors = data["keys"], data["vectors"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache {self.file_path}: {e}")
+            return
+        if vectors.ndim != 2 or vectors.shape[1] != self.embedding_dim:
+            logger.info(
+                f"Ignoring embedding cache {self.file_path}: dimension {vectors.shape[-1]} != {self.embedding_dim}"
+            )
+            return
+        # Saved from least to most recently used, keep the most recent ones
+        start = max(0, len(keys) - self._max_entries)
+        for key, vector in zip(keys[start:], vectors[start:]):
+            self._cache[key.tobytes()] = vector.astype(np.float32).tobytes()
+        logger.info(
+            f"Loaded {len(self._cache)} cached embeddings from {self.file_path}"
+        )
+
+    async def save(self) -> None:
+        if not self.file_path or not self._dirty:
+            return
+        # Snapshot on the event loop, write the file in a worker thread
+        keys = np.frombuffer(b"".join(self._cache.keys()), dtype=np.uint8)
+        vectors = np.frombuffer(b"".join(self._cache.values()), dtype=np.float32)
+        self._dirty = False
+        await asyncio.to_thread(
+            self._write,
+            keys.reshape(-1, 16),
+            vectors.reshape(-1, self.embedding_dim),
+        )
+
+    def _write(self, keys: np.ndarray, vectors: np.ndarray) -> None:
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, keys=keys, vectors=vectors)
+        os.replace(tmp_path, self.file_path)
+
+
 def compute_args_hash(*args: Any) -> str:
     """Compute a hash for the given arguments with safe Unicode handling.
 
@@ -432,6 +845,90 @@ class HealthCheckTimeoutError(Exception):
         )
 
 
+class TokenBucket:
+    """Allows rate_per_minute units per minute, with bursts of up to one minute's worth"""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self._rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # A request larger than the bucket waits for a full bucket instead of forever
+        amount = min(float(amount), self.capacity)
+        async with self._lock:  # Callers are served in arrival order
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self._rate)
+
+
+def get_retry_after(error: BaseException | None) -> float | None:
+    """Seconds to wait before retrying, from an exception or its HTTP response headers"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        retry_after = getattr(error, "retry_after", None)
+        if isinstance(retry_after, (int, float)) and retry_after > 0:
+            return float(retry_after)
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is not None:
+            try:
+                if headers.get("retry-after-ms"):
+                    return float(headers["retry-after-ms"]) / 1000
+                if headers.get("retry-after"):
+                    return float(headers["retry-after"])
+            except (TypeError, ValueError):
+                pass  # HTTP-date values are not supported
+        error = error.__cause__ or error.__context__
+    return None
+
+
+# Called with the rate-limit errors of the function a limiter worker is running
+_rate_limit_listener: contextvars.ContextVar[Callable[[BaseException], None] | None] = (
+    contextvars.ContextVar("rate_limit_listener", default=None)
+)
+
+
+def report_rate_limit_error(error: BaseException) -> None:
+    """Tell the enclosing priority_limit_async_func_call queue that a call was rate limited
+
+    Bindings call this for every rate-limit response, including the ones their own
+    retries recover from, so the queue can pause for Retry-After and back off at
+    once. Does nothing outside a limited call.
+    """
+    listener = _rate_limit_listener.get()
+    if listener is not None:
+        listener(error)
+
+
+def _estimate_request_tokens(*values: Any) -> int:
+    """Rough token count of the text in call arguments (about 4 characters per token)"""
+    chars = 0
+    stack = list(values)
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            chars += len(value)
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return max(1, chars // 4)
+
+
+def _percentile(values, q: float) -> float | None:
+    return round(float(np.percentile(values, q)), 3) if values else None
+
+
 def priority_limit_async_func_call(
     max_size: int,
     llm_timeout: float = None,
@@ -440,6 +937,9 @@ def priority_limit_async_func_call(
     max_queue_size: int = 1000,
     cleanup_timeout: float = 2.0,
     queue_name: str = "limit_async",
+    adaptive: bool = False,
+    max_requests_per_minute: int = 0,
+    max_tokens_per_minute: int = 0,
 ):
     """
     Enhanced priority-limited asynchronous function call decorator with robust timeout handling
@@ -449,6 +949,11 @@ def priority_limit_async_func_call(
     - Task state tracking to prevent race conditions
     - Enhanced health check system with stuck task detection
     - Proper resource cleanup and error recovery
+    - Optional AIMD concurrency: halved on rate-limit errors and timeouts, grown
+      back one slot at a time while latency stays normal (never above max_size)
+    - Optional requests/tokens per minute budgets and a shared Retry-After pause
+      (see report_rate_limit_error)
+    - Per-queue metrics: limit, queue depth and wait/execution percentiles (get_stats)
 
     Args:
         max_size: Maximum number of concurrent calls
@@ -458,6 +963,9 @@ def priority_limit_async_func_call(
         max_task_duration: Maximum time before health check intervenes (defaults to llm_timeout + 60s)
         cleanup_timeout: Maximum time to wait for cleanup operations (defaults to 2.0s)
         queue_name: Optional queue name for logging identification (defaults to "limit_async")
+        adaptive: Adapt the number of concurrent calls to rate-limit errors, timeouts and latency
+        max_requests_per_minute: Calls started per minute (0 for no limit)
+        max_tokens_per_minute: Estimated prompt tokens sent per minute (0 for no limit)
 
     Returns:
         Decorator function
@@ -494,11 +1002,67 @@ def priority_limit_async_func_call(
         active_futures = weakref.WeakSet()
         reinit_count = 0
 
+        # Workers hold a slot of the (adaptive) gate while taking and running a task
+        gate = FairTaskScheduler(max_size, name=queue_name, adaptive=adaptive)
+        request_bucket = (
+            TokenBucket(max_requests_per_minute)
+            if max_requests_per_minute > 0
+            else None
+        )
+        token_bucket = (
+            TokenBucket(max_tokens_per_minute) if max_tokens_per_minute > 0 else None
+        )
+        paused_until = 0.0  # Shared Retry-After pause (time.monotonic)
+        running = 0
+        rate_limited = 0
+        wait_times = deque(maxlen=1000)
+        execution_times = deque(maxlen=1000)
+
+        def on_rate_limit(error: BaseException) -> None:
+            nonlocal paused_until, rate_limited
+            rate_limited += 1
+            retry_after = get_retry_after(error)
+            if retry_after:
+                paused_until = max(paused_until, time.monotonic() + retry_after)
+                logger.warning(
+                    f"{queue_name}: Rate limited, pausing new calls for {retry_after:.1f}s"
+                )
+            gate.backoff(error)
+
+        async def wait_for_capacity(args, kwargs) -> None:
+            while (delay := paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            if request_bucket is not None:
+                await request_bucket.acquire(1)
+            if token_bucket is not None:
+                await token_bucket.acquire(_estimate_request_tokens(args, kwargs))
+
+        def get_stats() -> dict[str, Any]:
+            return {
+                "limit": int(gate.limit),
+                "max_size": max_size,
+                "running": running,
+                "queue_depth": queue.qsize(),
+                "wait_p50": _percentile(wait_times, 50),
+                "wait_p95": _percentile(wait_times, 95),
+                "execution_p50": _percentile(execution_times, 50),
+                "execution_p95": _percentile(execution_times, 95),
+                "rate_limited": rate_limited,
+                "paused_for": round(max(0.0, paused_until - time.monotonic()), 3),
+            }
+
         async def worker():
             """Enhanced worker that processes tasks with proper timeout and state management"""
+            nonlocal running
             try:
                 while not shutdown_event.is_set():
+                    slot_held = False
                     try:
+                        # Take the slot first, so that tasks waiting for a slot stay
+                        # in the queue in priority order
+                        await gate.acquire()
+                        slot_held = True
+
                         # Get task from queue with timeout for shutdown checking
                         try:
                             (
@@ -511,6 +1075,14 @@ def priority_limit_async_func_call(
                         except asyncio.TimeoutError:
                             continue
 
+                        # Wait out a Retry-After pause and the per-minute budgets
+                        # before the task counts as started
+                        try:
+                            await wait_for_capacity(args, kwargs)
+                        except BaseException:
+                            queue.task_done()
+                            raise
+
                         # Get task state and mark worker as started
                         async with task_states_lock:
                             if task_id not in task_states:
@@ -533,6 +1105,12 @@ def priority_limit_async_func_call(
                             queue.task_done()
                             continue
 
+                        wait_times.append(
+                            task_state.execution_start_time - task_state.start_time
+                        )
+                        error = None
+                        running += 1
+                        listener_token = _rate_limit_listener.set(on_rate_limit)
                         try:
                             # Execute function with timeout protection
                             if max_execution_timeout is not None:
@@ -551,12 +1129,12 @@ def priority_limit_async_func_call(
                             logger.warning(
                                 f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
                             )
+                            error = WorkerTimeoutError(
+                                max_execution_timeout, "execution"
+                            )
+                            gate.backoff(error)
                             if not task_state.future.done():
-                                task_state.future.set_exception(
-                                    WorkerTimeoutError(
-                                        max_execution_timeout, "execution"
-                                    )
-                                )
+                                task_state.future.set_exception(error)
                         except asyncio.CancelledError:
                             # Task was cancelled during execution
                             if not task_state.future.done():
@@ -569,9 +1147,21 @@ def priority_limit_async_func_call(
                             logger.error(
                                 f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
                             )
+                            error = e
+                            if is_rate_limit_error(e):
+                                on_rate_limit(e)
                             if not task_state.future.done():
                                 task_state.future.set_exception(e)
                         finally:
+                            _rate_limit_listener.reset(listener_token)
+                            running -= 1
+                            duration = (
+                                asyncio.get_event_loop().time()
+                                - task_state.execution_start_time
+                            )
+                            execution_times.append(duration)
+                            gate.release(duration, error)
+                            slot_held = False
                             # Clean up task state
                             async with task_states_lock:
                                 task_states.pop(task_id, None)
@@ -583,6 +1173,9 @@ def priority_limit_async_func_call(
                             f"{queue_name}: Critical error in worker: {str(e)}"
                         )
                         await asyncio.sleep(0.1)
+                    finally:
+                        if slot_held:
+                            gate.release()
             finally:
                 logger.debug(f"{queue_name}: Worker exiting")
 
@@ -869,8 +1462,9 @@ def priority_limit_async_func_call(
                 async with task_states_lock:
                     task_states.pop(task_id, None)
 
-        # Add shutdown method to decorated function
+        # Add shutdown and metrics methods to decorated function
         wait_func.shutdown = shutdown
+        wait_func.get_stats = get_stats
 
         return wait_func
 
@@ -899,6 +1493,36 @@ def write_json(json_obj, file_name):
         json.dump(json_obj, f, indent=2, ensure_ascii=False)
 
 
+# Inputs shorter than this (in characters) are tokenized inline on the event loop
+TOKENIZER_OFFLOAD_MIN_CHARS = get_env_value(
+    "TOKENIZER_OFFLOAD_MIN_CHARS", DEFAULT_TOKENIZER_OFFLOAD_MIN_CHARS, int
+)
+
+# Maximum number of token counts memoized per tokenizer (0 disables the cache)
+TOKEN_COUNT_CACHE_SIZE = get_env_value(
+    "TOKEN_COUNT_CACHE_SIZE", DEFAULT_TOKEN_COUNT_CACHE_SIZE, int
+)
+
+_tokenizer_executor: ThreadPoolExecutor | None = None
+
+
+def get_tokenizer_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for tokenization.
+
+    tiktoken releases the GIL while encoding, so tokenizing in worker threads keeps
+    the event loop free for other requests.
+    """
+    global _tokenizer_executor
+    if _tokenizer_executor is None:
+        _tokenizer_executor = ThreadPoolExecutor(
+            max_workers=get_env_value(
+                "TOKENIZER_MAX_WORKERS", DEFAULT_TOKENIZER_MAX_WORKERS, int
+            ),
+            thread_name_prefix="lightrag-tokenizer",
+        )
+    return _tokenizer_executor
+
+
 class TokenizerInterface(Protocol):
     """
     Defines the interface for a tokenizer, requiring encode and decode methods.
@@ -928,6 +1552,27 @@ class Tokenizer:
         """
         self.model_name: str = model_name
         self.tokenizer: TokenizerInterface = tokenizer
+        # Bounded LRU of content hash -> token count, shared by worker threads
+        self._token_count_cache: OrderedDict[bytes, int] = OrderedDict()
+        self._token_count_cache_size: int = TOKEN_COUNT_CACHE_SIZE
+        self._token_count_cache_lock = threading.Lock()
+        self._token_count_cache_hits = 0
+        self._token_count_cache_misses = 0
+
+    def __deepcopy__(self, memo):
+        # asdict(LightRAG) deep-copies its fields, share the tokenizer and its cache
+        return self
+
+    def __getstate__(self):
+        # The lock cannot be pickled, a copy in another process starts with an empty cache
+        state = self.__dict__.copy()
+        state["_token_count_cache"] = OrderedDict()
+        del state["_token_count_cache_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._token_count_cache_lock = threading.Lock()
 
     def encode(self, content: str) -> List[int]:
         """
@@ -953,6 +1598,161 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def count_tokens(self, content: str) -> int:
+        """
+        Counts the tokens of a string.
+
+        Counts are memoized in a bounded LRU cache keyed by the hash of the content,
+        so descriptions and context lines that are measured repeatedly are only
+        tokenized once.
+
+        Args:
+            content: The string to measure.
+
+        Returns:
+            The number of tokens.
+        """
+        if self._token_count_cache_size <= 0:
+            return len(self.encode(content))
+
+        key = hashlib.blake2b(
+            content.encode("utf-8", errors="surrogatepass"), digest_size=16
+        ).digest()
+        with self._token_count_cache_lock:
+            count = self._token_count_cache.get(key)
+            if count is not None:
+                self._token_count_cache.move_to_end(key)
+                self._token_count_cache_hits += 1
+                return count
+            self._token_count_cache_misses += 1
+
+        count = len(self.encode(content))
+        with self._token_count_cache_lock:
+            self._token_count_cache[key] = count
+            if len(self._token_count_cache) > self._token_count_cache_size:
+                self._token_count_cache.popitem(last=False)
+        return count
+
+    def token_cache_info(self) -> dict[str, Any]:
+        """
+        Returns statistics of the token count cache.
+
+        Returns:
+            A dict with hits, misses, hit_rate, size and max_size.
+        """
+        with self._token_count_cache_lock:
+            hits = self._token_count_cache_hits
+            misses = self._token_count_cache_misses
+            size = len(self._token_count_cache)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "size": size,
+            "max_size": self._token_count_cache_size,
+        }
+
+    def encode_batch(self, contents: List[str]) -> List[List[int]]:
+        """
+        Encodes a list of strings.
+
+        Args:
+            contents: The strings to encode.
+
+        Returns:
+            A list of token lists, in the same order as contents.
+        """
+        return [self.encode(content) for content in contents]
+
+    def count_tokens_batch(self, contents: List[str]) -> List[int]:
+        """
+        Counts the tokens of a list of strings.
+
+        Args:
+            contents: The strings to measure.
+
+        Returns:
+            A list of token counts, in the same order as contents.
+        """
+        return [self.count_tokens(content) for content in contents]
+
+    async def aencode_batch(self, contents: List[str]) -> List[List[int]]:
+        """
+        Async version of `encode_batch` that runs on the shared tokenizer executor.
+
+        Small inputs are encoded inline, since handing them to a worker thread
+        costs more than encoding them.
+        """
+        if sum(len(content) for content in contents) < TOKENIZER_OFFLOAD_MIN_CHARS:
+            return self.encode_batch(contents)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_tokenizer_executor(), self.encode_batch, contents
+        )
+
+    async def acount_tokens_batch(self, contents: List[str]) -> List[int]:
+        """
+        Async version of `count_tokens_batch` that runs on the shared tokenizer executor.
+
+        Small inputs are counted inline, since handing them to a worker thread
+        costs more than counting them.
+        """
+        if sum(len(content) for content in contents) < TOKENIZER_OFFLOAD_MIN_CHARS:
+            return self.count_tokens_batch(contents)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_tokenizer_executor(), self.count_tokens_batch, contents
+        )
+
+    async def acount_tokens(self, content: str) -> int:
+        """Async version of `count_tokens`"""
+        return (await self.acount_tokens_batch([content]))[0]
+
+    def token_byte_offsets(self, tokens: List[int]) -> np.ndarray | None:
+        """
+        Returns the UTF-8 byte offset where each token starts.
+
+        Offsets allow callers to cut the original text by token windows without
+        decoding every window through the tokenizer. They are only available when
+        the underlying tokenizer exposes `n_vocab` and `decode_single_token_bytes`
+        (e.g. tiktoken); the per-token byte lengths are looked up in a table that
+        is built once per tokenizer.
+
+        Args:
+            tokens: A list of integer tokens produced by `encode`.
+
+        Returns:
+            An array of len(tokens) + 1 offsets (the last one is the total byte
+            length), or None if unavailable.
+        """
+        table = self._get_token_byte_length_table()
+        if table is None:
+            return None
+        token_array = np.asarray(tokens, dtype=np.int64)
+        if token_array.size and token_array.max() >= len(table):
+            return None
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum(table[token_array], out=offsets[1:])
+        return offsets
+
+    def _get_token_byte_length_table(self) -> np.ndarray | None:
+        table = getattr(self, "_token_byte_length_table", None)
+        if table is not None:
+            return table
+        n_vocab = getattr(self.tokenizer, "n_vocab", None)
+        decode_single = getattr(self.tokenizer, "decode_single_token_bytes", None)
+        if not isinstance(n_vocab, int) or decode_single is None:
+            return None
+        table = np.zeros(n_vocab, dtype=np.int64)
+        for token in range(n_vocab):
+            try:
+                table[token] = len(decode_single(token))
+            except Exception:
+                continue  # unused token ids never appear in encoded output
+        self._token_byte_length_table = table
+        return table
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -1009,18 +1809,77 @@ def truncate_list_by_token_size(
     key: Callable[[Any], str],
     max_token_size: int,
     tokenizer: Tokenizer,
+    token_count_key: Callable[[Any], int | None] | None = None,
 ) -> list[int]:
-    """Truncate a list of data by token size"""
+    """Truncate a list of data by token size
+
+    `token_count_key` may return a token count stored on the item at write time;
+    items for which it returns None are measured with the tokenizer.
+    """
     if max_token_size <= 0:
         return []
     tokens = 0
     for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
+        count = token_count_key(data) if token_count_key else None
+        tokens += count if count is not None else tokenizer.count_tokens(key(data))
         if tokens > max_token_size:
             return list_data[:i]
     return list_data
 
 
+async def atruncate_list_by_token_size(
+    list_data: list[Any],
+    key: Callable[[Any], str],
+    max_token_size: int,
+    tokenizer: Tokenizer,
+    token_count_key: Callable[[Any], int | None] | None = None,
+    batch_size: int = 64,
+) -> list[Any]:
+    """Async version of `truncate_list_by_token_size`.
+
+    Items are counted in batches on the tokenizer executor, and counting stops at
+    the first batch that crosses the limit. Items with a known token count (see
+    `token_count_key`) are not tokenized at all.
+    """
+    if max_token_size <= 0:
+        return []
+    tokens = 0
+    for batch_start in range(0, len(list_data), batch_size):
+        batch = list_data[batch_start : batch_start + batch_size]
+        counts = [token_count_key(data) if token_count_key else None for data in batch]
+        unknown = [i for i, count in enumerate(counts) if count is None]
+        if unknown:
+            measured = await tokenizer.acount_tokens_batch(
+                [key(batch[i]) for i in unknown]
+            )
+            for i, count in zip(unknown, measured):
+                counts[i] = count
+        for offset, count in enumerate(counts):
+            tokens += count
+            if tokens > max_token_size:
+                return list_data[: batch_start + offset]
+    return list_data
+
+
+def chunk_context_json(content: str, file_path: str, chunk_id: str) -> str:
+    """Serialize a chunk the way query-time token truncation measures it.
+
+    Storing the token count of this string on chunk records at write time lets
+    `process_chunks_unified` truncate known chunks without calling the tokenizer.
+    """
+    return json.dumps(
+        {"content": content, "file_path": file_path, "chunk_id": chunk_id},
+        ensure_ascii=False,
+    )
+
+
+def _stored_chunk_context_tokens(chunk: dict) -> int | None:
+    """Return the write-time token count of a chunk if it still matches its shape"""
+    if chunk.keys() == {"content", "file_path", "chunk_id", "context_tokens"}:
+        return chunk["context_tokens"]
+    return None
+
+
 def cosine_similarity(v1, v2):
     """Calculate cosine similarity between two vectors"""
     dot_product = np.dot(v1, v2)
@@ -2159,46 +3018,42 @@ async def pick_by_vector_similarity(
                 "Using pre-computed query embedding for vector similarity chunk selection"
             )
 
-        # Get chunk embeddings from vector database
-        chunk_vectors = await chunks_vdb.get_vectors_by_ids(all_chunk_ids)
+        # Get chunk embeddings from vector database as one float32 matrix
+        found_ids, chunk_matrix = await chunks_vdb.get_vectors_matrix(all_chunk_ids)
         logger.debug(
-            f"Vector similarity chunk selection: {len(chunk_vectors)} chunk vectors Retrieved"
+            f"Vector similarity chunk selection: {len(found_ids)} chunk vectors Retrieved"
         )
 
-        if not chunk_vectors or len(chunk_vectors) != len(all_chunk_ids):
-            if not chunk_vectors:
-                logger.warning(
-                    "Vector similarity chunk selection: no vectors retrieved from chunks_vdb"
-                )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection: found {len(chunk_vectors)} but expecting {len(all_chunk_ids)}"
-                )
+        if not found_ids:
+            logger.warning(
+                "Vector similarity chunk selection: no vectors retrieved from chunks_vdb"
+            )
             return []
+        if len(found_ids) != len(all_chunk_ids):
+            # Rank the chunks that have vectors instead of discarding the whole result
+            logger.warning(
+                f"Vector similarity chunk selection: found {len(found_ids)} but expecting {len(all_chunk_ids)}, ranking the found ones"
+            )
 
-        # Calculate cosine similarities
-        similarities = []
-        valid_vectors = 0
-        for chunk_id in all_chunk_ids:
-            if chunk_id in chunk_vectors:
-                chunk_embedding = chunk_vectors[chunk_id]
-                try:
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    similarities.append((chunk_id, similarity))
-                    valid_vectors += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Vector similarity chunk selection: failed to calculate similarity for chunk {chunk_id}: {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection:  no vector found for chunk {chunk_id}"
-                )
+        # Cosine similarities of all candidates with one matrix-vector product
+        query_vector = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norms = np.linalg.norm(chunk_matrix, axis=1) * np.linalg.norm(query_vector)
+        similarities = chunk_matrix @ query_vector
+        similarities = np.divide(
+            similarities,
+            norms,
+            out=np.full_like(similarities, -np.inf),
+            where=norms > 0,
+        )
 
-        # Sort by similarity (highest first) and select top num_of_chunks
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        selected_chunks = [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+        # Partial top-k selection, then sort only the selected chunks (highest first)
+        top_k = min(num_of_chunks, len(found_ids))
+        if top_k < len(found_ids):
+            top_indices = np.argpartition(-similarities, top_k - 1)[:top_k]
+        else:
+            top_indices = np.arange(len(found_ids))
+        top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
+        selected_chunks = [found_ids[i] for i in top_indices]
 
         logger.debug(
             f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates"
@@ -2442,13 +3297,18 @@ async def process_chunks_unified(
 
         original_count = len(unique_chunks)
 
-        unique_chunks = truncate_list_by_token_size(
+        unique_chunks = await atruncate_list_by_token_size(
             unique_chunks,
             key=lambda x: "\n".join(
-                json.dumps(item, ensure_ascii=False) for item in [x]
+                json.dumps(
+                    {k: v for k, v in item.items() if k != "context_tokens"},
+                    ensure_ascii=False,
+                )
+                for item in [x]
             ),
             max_token_size=chunk_token_limit,
             tokenizer=tokenizer,
+            token_count_key=_stored_chunk_context_tokens,
         )
 
         logger.debug(
@@ -2460,12 +3320,94 @@ async def process_chunks_unified(
     final_chunks = []
     for i, chunk in enumerate(unique_chunks):
         chunk_with_id = chunk.copy()
+        chunk_with_id.pop("context_tokens", None)
         chunk_with_id["id"] = f"DC{i + 1}"
         final_chunks.append(chunk_with_id)
 
     return final_chunks
 
 
+def make_relation_chunk_key(src: str, tgt: str) -> str:
+    """Key of a relation in the relation_chunks storage, independent of edge direction"""
+    return GRAPH_FIELD_SEP.join(sorted((src, tgt)))
+
+
+def merge_chunk_provenance(
+    record: dict | None,
+    fallback_source_id: str | None,
+    new_chunk_ids: list[str],
+    keep_chunk_ids: set[str] | None = None,
+) -> tuple[list[str], list[int]]:
+    """Merge chunk mentions into the full chunk list of an entity or relation
+
+    Args:
+        record: entity_chunks / relation_chunks value ({"chunk_ids", "chunk_counts", "count"})
+        fallback_source_id: source_id used when there is no record yet (data created
+            before the chunk storages existed), each chunk counted once
+        new_chunk_ids: Chunk ids of new mentions, repeated ids count repeated mentions
+        keep_chunk_ids: If given, existing chunk ids not in this set are dropped
+
+    Returns:
+        Chunk ids in first-seen order and their mention counts
+    """
+    if record and record.get("chunk_ids"):
+        chunk_ids = list(record["chunk_ids"])
+        counts = list(record.get("chunk_counts") or [1] * len(chunk_ids))
+    else:
+        chunk_ids = [c for c in (fallback_source_id or "").split(GRAPH_FIELD_SEP) if c]
+        counts = [1] * len(chunk_ids)
+
+    if keep_chunk_ids is not None:
+        kept = [
+            (chunk_id, count)
+            for chunk_id, count in zip(chunk_ids, counts)
+            if chunk_id in keep_chunk_ids
+        ]
+        chunk_ids = [chunk_id for chunk_id, _ in kept]
+        counts = [count for _, count in kept]
+
+    position = {chunk_id: i for i, chunk_id in enumerate(chunk_ids)}
+    for chunk_id in new_chunk_ids:
+        i = position.get(chunk_id)
+        if i is None:
+            position[chunk_id] = len(chunk_ids)
+            chunk_ids.append(chunk_id)
+            counts.append(1)
+        else:
+            counts[i] += 1
+    return chunk_ids, counts
+
+
+def make_chunk_provenance_record(chunk_ids: list[str], counts: list[int]) -> dict:
+    """Value stored in the entity_chunks / relation_chunks storages"""
+    return {"chunk_ids": chunk_ids, "chunk_counts": counts, "count": len(chunk_ids)}
+
+
+def apply_source_ids_limit(
+    chunk_ids: list[str], counts: list[int], limit: int, method: str
+) -> list[str]:
+    """Select the chunk ids kept in a capped source_id
+
+    Args:
+        chunk_ids: Full chunk list in first-seen order
+        counts: Mention count of each chunk id
+        limit: Maximum number of chunk ids, 0 or less means unlimited
+        method: FIFO (most recent), KEEP (first) or FREQUENT (most mentions)
+
+    Returns:
+        Selected chunk ids, still in first-seen order
+    """
+    if limit <= 0 or len(chunk_ids) <= limit:
+        return list(chunk_ids)
+    if method == SOURCE_IDS_LIMIT_METHOD_KEEP:
+        return chunk_ids[:limit]
+    if method == SOURCE_IDS_LIMIT_METHOD_FREQUENT:
+        # Ties are broken in favour of more recent chunks
+        top = sorted(range(len(chunk_ids)), key=lambda i: (counts[i], i))[-limit:]
+        return [chunk_ids[i] for i in sorted(top)]
+    return chunk_ids[-limit:]
+
+
 def build_file_path(already_file_paths, data_list, target):
     """Build file path string with UTF-8 byte length limit and deduplication
 
@@ -7,12 +7,63 @@ from typing import Any, cast
 from .base import DeletionResult
 from .kg.shared_storage import get_graph_db_lock
 from .constants import GRAPH_FIELD_SEP
-from .utils import compute_mdhash_id, logger
+from .utils import (
+    compute_mdhash_id,
+    logger,
+    make_chunk_provenance_record,
+    make_relation_chunk_key,
+    merge_chunk_provenance,
+)
 from .base import StorageNameSpace
 
 
+async def _merge_chunk_records(
+    storage, old_keys: list[str], new_key: str, source_ids: dict[str, str | None]
+) -> None:
+    """Union the entity_chunks / relation_chunks records of old_keys into new_key
+
+    Mention counts of a chunk listed under several keys are added up, and a key
+    without a record contributes its graph source_id. Only keys in source_ids
+    (elements present in the graph before the edit) are read, so a stale record
+    left under new_key is replaced rather than revived. Old keys are deleted.
+    """
+    merged: dict[str, int] = {}
+    for key in dict.fromkeys([new_key, *old_keys]):
+        if key not in source_ids:
+            continue
+        record = await storage.get_by_id(key)
+        chunk_ids, counts = merge_chunk_provenance(record, source_ids[key], [])
+        for chunk_id, count in zip(chunk_ids, counts):
+            merged[chunk_id] = merged.get(chunk_id, 0) + count
+
+    stale_keys = [key for key in dict.fromkeys(old_keys) if key != new_key]
+    if merged:
+        await storage.upsert(
+            {new_key: make_chunk_provenance_record(list(merged), list(merged.values()))}
+        )
+    else:
+        stale_keys.append(new_key)
+    await storage.delete(stale_keys)
+
+
+async def _persist_storages(*storages) -> None:
+    """Commit the given storages, skipping the optional ones not provided"""
+    await asyncio.gather(
+        *[
+            cast(StorageNameSpace, storage_inst).index_done_callback()
+            for storage_inst in storages
+            if storage_inst is not None
+        ]
+    )
+
+
 async def adelete_by_entity(
-    chunk_entity_relation_graph, entities_vdb, relationships_vdb, entity_name: str
+    chunk_entity_relation_graph,
+    entities_vdb,
+    relationships_vdb,
+    entity_name: str,
+    entity_chunks_storage=None,
+    relation_chunks_storage=None,
 ) -> DeletionResult:
     """Asynchronously delete an entity and all its relationships.
 
@@ -21,6 +72,8 @@ async def adelete_by_entity(
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
         entity_name: Name of the entity to delete
+        entity_chunks_storage: Full chunk lists of entities, the entity's record is deleted
+        relation_chunks_storage: Full chunk lists of relations, its relations' records are deleted
     """
     graph_db_lock = get_graph_db_lock(enable_logging=False)
     # Use graph database lock to ensure atomic graph and vector db operations
@@ -43,10 +96,22 @@ async def adelete_by_entity(
             await relationships_vdb.delete_entity_relation(entity_name)
             await chunk_entity_relation_graph.delete_node(entity_name)
 
+            # A stale chunk list would be picked up if the entity is extracted again
+            if entity_chunks_storage is not None:
+                await entity_chunks_storage.delete([entity_name])
+            if relation_chunks_storage is not None and edges:
+                await relation_chunks_storage.delete(
+                    [make_relation_chunk_key(src, tgt) for src, tgt in edges]
+                )
+
             message = f"Entity '{entity_name}' and its {related_relations_count} relationships have been deleted."
             logger.info(message)
             await _delete_by_entity_done(
-                entities_vdb, relationships_vdb, chunk_entity_relation_graph
+                entities_vdb,
+                relationships_vdb,
+                chunk_entity_relation_graph,
+                entity_chunks_storage,
+                relation_chunks_storage,
             )
             return DeletionResult(
                 status="success",
@@ -66,18 +131,19 @@ async def adelete_by_entity(
 
 
 async def _delete_by_entity_done(
-    entities_vdb, relationships_vdb, chunk_entity_relation_graph
+    entities_vdb,
+    relationships_vdb,
+    chunk_entity_relation_graph,
+    entity_chunks_storage=None,
+    relation_chunks_storage=None,
 ) -> None:
     """Callback after entity deletion is complete, ensures updates are persisted"""
-    await asyncio.gather(
-        *[
-            cast(StorageNameSpace, storage_inst).index_done_callback()
-            for storage_inst in [  # type: ignore
-                entities_vdb,
-                relationships_vdb,
-                chunk_entity_relation_graph,
-            ]
-        ]
+    await _persist_storages(
+        entities_vdb,
+        relationships_vdb,
+        chunk_entity_relation_graph,
+        entity_chunks_storage,
+        relation_chunks_storage,
     )
 
 
@@ -86,6 +152,7 @@ async def adelete_by_relation(
     relationships_vdb,
     source_entity: str,
     target_entity: str,
+    relation_chunks_storage=None,
 ) -> DeletionResult:
     """Asynchronously delete a relation between two entities.
 
@@ -94,6 +161,7 @@ async def adelete_by_relation(
         relationships_vdb: Vector database storage for relationships
         source_entity: Name of the source entity
         target_entity: Name of the target entity
+        relation_chunks_storage: Full chunk lists of relations, the relation's record is deleted
     """
     relation_str = f"{source_entity} -> {target_entity}"
     graph_db_lock = get_graph_db_lock(enable_logging=False)
@@ -126,10 +194,16 @@ async def adelete_by_relation(
             await chunk_entity_relation_graph.remove_edges(
                 [(source_entity, target_entity)]
             )
+            if relation_chunks_storage is not None:
+                await relation_chunks_storage.delete(
+                    [make_relation_chunk_key(source_entity, target_entity)]
+                )
 
             message = f"Successfully deleted relation from '{source_entity}' to '{target_entity}'"
             logger.info(message)
-            await _delete_relation_done(relationships_vdb, chunk_entity_relation_graph)
+            await _delete_relation_done(
+                relationships_vdb, chunk_entity_relation_graph, relation_chunks_storage
+            )
             return DeletionResult(
                 status="success",
                 doc_id=relation_str,
@@ -147,16 +221,12 @@ async def adelete_by_relation(
             )
 
 
-async def _delete_relation_done(relationships_vdb, chunk_entity_relation_graph) -> None:
+async def _delete_relation_done(
+    relationships_vdb, chunk_entity_relation_graph, relation_chunks_storage=None
+) -> None:
     """Callback after relation deletion is complete, ensures updates are persisted"""
-    await asyncio.gather(
-        *[
-            cast(StorageNameSpace, storage_inst).index_done_callback()
-            for storage_inst in [  # type: ignore
-                relationships_vdb,
-                chunk_entity_relation_graph,
-            ]
-        ]
+    await _persist_storages(
+        relationships_vdb, chunk_entity_relation_graph, relation_chunks_storage
     )
 
 
@@ -167,6 +237,8 @@ async def aedit_entity(
     entity_name: str,
     updated_data: dict[str, str],
     allow_rename: bool = True,
+    entity_chunks_storage=None,
+    relation_chunks_storage=None,
 ) -> dict[str, Any]:
     """Asynchronously edit entity information.
 
@@ -179,6 +251,8 @@ async def aedit_entity(
         entity_name: Name of the entity to edit
         updated_data: Dictionary containing updated attributes, e.g. {"description": "new description", "entity_type": "new type"}
         allow_rename: Whether to allow entity renaming, defaults to True
+        entity_chunks_storage: Full chunk lists of entities, moved to the new name on rename
+        relation_chunks_storage: Full chunk lists of relations, moved to the renamed edges
 
     Returns:
         Dictionary containing updated entity information
@@ -233,6 +307,8 @@ async def aedit_entity(
                 # Store relationships that need to be updated
                 relations_to_update = []
                 relations_to_delete = []
+                # Chunk list records to move: (old key, new key, old source_id)
+                relation_chunk_moves = []
                 # Get all edges related to the original entity
                 edges = await chunk_entity_relation_graph.get_node_edges(entity_name)
                 if edges:
@@ -248,6 +324,19 @@ async def aedit_entity(
                             relations_to_delete.append(
                                 compute_mdhash_id(target + source, prefix="rel-")
                             )
+                            new_source = (
+                                new_entity_name if source == entity_name else source
+                            )
+                            new_target = (
+                                new_entity_name if target == entity_name else target
+                            )
+                            relation_chunk_moves.append(
+                                (
+                                    make_relation_chunk_key(source, target),
+                                    make_relation_chunk_key(new_source, new_target),
+                                    edge_data.get("source_id"),
+                                )
+                            )
                             if source == entity_name:
                                 await chunk_entity_relation_graph.upsert_edge(
                                     new_entity_name, target, edge_data
@@ -266,6 +355,23 @@ async def aedit_entity(
                 # Delete old entity
                 await chunk_entity_relation_graph.delete_node(entity_name)
 
+                # Move the full chunk lists to the new names
+                if entity_chunks_storage is not None:
+                    await _merge_chunk_records(
+                        entity_chunks_storage,
+                        [entity_name],
+                        new_entity_name,
+                        {entity_name: node_data.get("source_id")},
+                    )
+                if relation_chunks_storage is not None:
+                    for old_key, new_key, source_id in relation_chunk_moves:
+                        await _merge_chunk_records(
+                            relation_chunks_storage,
+                            [old_key],
+                            new_key,
+                            {old_key: source_id},
+                        )
+
                 # Delete old entity record from vector database
                 old_entity_id = compute_mdhash_id(entity_name, prefix="ent-")
                 await entities_vdb.delete([old_entity_id])
@@ -341,7 +447,11 @@ async def aedit_entity(
 
             # 4. Save changes
             await _edit_entity_done(
-                entities_vdb, relationships_vdb, chunk_entity_relation_graph
+                entities_vdb,
+                relationships_vdb,
+                chunk_entity_relation_graph,
+                entity_chunks_storage,
+                relation_chunks_storage,
             )
 
             logger.info(f"Entity '{entity_name}' successfully updated")
@@ -357,18 +467,19 @@ async def aedit_entity(
 
 
 async def _edit_entity_done(
-    entities_vdb, relationships_vdb, chunk_entity_relation_graph
+    entities_vdb,
+    relationships_vdb,
+    chunk_entity_relation_graph,
+    entity_chunks_storage=None,
+    relation_chunks_storage=None,
 ) -> None:
     """Callback after entity editing is complete, ensures updates are persisted"""
-    await asyncio.gather(
-        *[
-            cast(StorageNameSpace, storage_inst).index_done_callback()
-            for storage_inst in [  # type: ignore
-                entities_vdb,
-                relationships_vdb,
-                chunk_entity_relation_graph,
-            ]
-        ]
+    await _persist_storages(
+        entities_vdb,
+        relationships_vdb,
+        chunk_entity_relation_graph,
+        entity_chunks_storage,
+        relation_chunks_storage,
     )
 
 
@@ -691,6 +802,8 @@ async def amerge_entities(
     target_entity: str,
     merge_strategy: dict[str, str] = None,
     target_entity_data: dict[str, Any] = None,
+    entity_chunks_storage=None,
+    relation_chunks_storage=None,
 ) -> dict[str, Any]:
     """Asynchronously merge multiple entities into one entity.
 
@@ -711,6 +824,8 @@ async def amerge_entities(
             - "join_unique": Join all unique values (for fields separated by delimiter)
         target_entity_data: Dictionary of specific values to set for the target entity,
             overriding any merged values, e.g. {"description": "custom description", "entity_type": "PERSON"}
+        entity_chunks_storage: Full chunk lists of entities, the sources' lists are merged into the target's
+        relation_chunks_storage: Full chunk lists of relations, merged into the redirected relations
 
     Returns:
         Dictionary containing the merged entity information
@@ -833,7 +948,24 @@ async def amerge_entities(
                         "src": new_src,
                         "tgt": new_tgt,
                         "data": edge_data.copy(),
+                        "old_edges": [],
                     }
+                relation_updates[relation_key]["old_edges"].append(
+                    (src, tgt, edge_data.get("source_id"))
+                )
+
+            # Chunk lists of relations the redirected ones are merged into, read
+            # before their graph edges are overwritten
+            existing_relation_sources = {}
+            if relation_chunks_storage is not None:
+                for rel_data in relation_updates.values():
+                    existing_edge = await chunk_entity_relation_graph.get_edge(
+                        rel_data["src"], rel_data["tgt"]
+                    )
+                    if existing_edge:
+                        existing_relation_sources[
+                            make_relation_chunk_key(rel_data["src"], rel_data["tgt"])
+                        ] = existing_edge.get("source_id")
 
             # Apply relationship updates
             for rel_data in relation_updates.values():
@@ -916,9 +1048,58 @@ async def amerge_entities(
                     f"Deleted source entity '{entity_name}' and its vector embedding from database"
                 )
 
-            # 10. Save changes
+            # 10. Merge the full chunk lists into the target entity and relations
+            if entity_chunks_storage is not None:
+                entity_sources = {
+                    entity_name: node_data.get("source_id")
+                    for entity_name, node_data in source_entities_data.items()
+                }
+                if target_exists:
+                    entity_sources[target_entity] = existing_target_entity_data.get(
+                        "source_id"
+                    )
+                await _merge_chunk_records(
+                    entity_chunks_storage,
+                    list(source_entities_data),
+                    target_entity,
+                    entity_sources,
+                )
+            if relation_chunks_storage is not None:
+                merged_relation_keys = set()
+                for rel_data in relation_updates.values():
+                    new_key = make_relation_chunk_key(rel_data["src"], rel_data["tgt"])
+                    relation_sources = dict(existing_relation_sources)
+                    old_keys = []
+                    for src, tgt, source_id in rel_data["old_edges"]:
+                        old_key = make_relation_chunk_key(src, tgt)
+                        old_keys.append(old_key)
+                        relation_sources.setdefault(old_key, source_id)
+                    await _merge_chunk_records(
+                        relation_chunks_storage,
+                        old_keys,
+                        new_key,
+                        {
+                            key: relation_sources[key]
+                            for key in [new_key, *old_keys]
+                            if key in relation_sources
+                        },
+                    )
+                    merged_relation_keys.update(old_keys)
+                    merged_relation_keys.add(new_key)
+                # Relations between source entities were dropped to avoid self-loops
+                dropped_relation_keys = {
+                    make_relation_chunk_key(src, tgt) for src, tgt, _ in all_relations
+                } - merged_relation_keys
+                if dropped_relation_keys:
+                    await relation_chunks_storage.delete(list(dropped_relation_keys))
+
+            # 11. Save changes
             await _merge_entities_done(
-                entities_vdb, relationships_vdb, chunk_entity_relation_graph
+                entities_vdb,
+                relationships_vdb,
+                chunk_entity_relation_graph,
+                entity_chunks_storage,
+                relation_chunks_storage,
             )
 
             logger.info(
@@ -1045,18 +1226,19 @@ def _merge_relation_attributes(
 
 
 async def _merge_entities_done(
-    entities_vdb, relationships_vdb, chunk_entity_relation_graph
+    entities_vdb,
+    relationships_vdb,
+    chunk_entity_relation_graph,
+    entity_chunks_storage=None,
+    relation_chunks_storage=None,
 ) -> None:
     """Callback after entity merging is complete, ensures updates are persisted"""
-    await asyncio.gather(
-        *[
-            cast(StorageNameSpace, storage_inst).index_done_callback()
-            for storage_inst in [  # type: ignore
-                entities_vdb,
-                relationships_vdb,
-                chunk_entity_relation_graph,
-            ]
-        ]
+    await _persist_storages(
+        entities_vdb,
+        relationships_vdb,
+        chunk_entity_relation_graph,
+        entity_chunks_storage,
+        relation_chunks_storage,
     )
 
 
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+"""
+Streamed document regression tests (apipeline_enqueue_document_stream)
+
+Runs LightRAG with its default JSON storages in a temporary working directory,
+with a mock LLM, embedding function and whitespace tokenizer:
+- A streamed document is stored in segments, processed batch by batch and deleted
+- The document ID matches the one apipeline_enqueue_documents gives the same text
+- A duplicate or failed stream leaves no segments behind
+- Segments orphaned by a crash mid-stream are swept once stale
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+from ascii_colors import ASCIIColors
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lightrag.lightrag as lightrag_module
+from lightrag import LightRAG
+from lightrag.base import DocStatus
+from lightrag.constants import PENDING_SEGMENTS_KEY
+from lightrag.kg.shared_storage import (
+    finalize_share_data,
+    initialize_pipeline_status,
+)
+from lightrag.utils import EmbeddingFunc, Tokenizer, compute_mdhash_id
+
+DELIMITER = "<|#|>"
+
+
+async def mock_llm_func(prompt, system_prompt=None, history_messages=[], **kwargs):
+    return "\n".join(
+        [
+            f"entity{DELIMITER}Stream{DELIMITER}concept{DELIMITER}A streamed document",
+            "<|COMPLETE|>",
+        ]
+    )
+
+
+async def mock_embedding_func(texts, **kwargs):
+    return np.random.rand(len(texts), 8)
+
+
+class WhitespaceTokenizer:
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+async def create_rag(working_dir: str) -> LightRAG:
+    finalize_share_data()
+    rag = LightRAG(
+        working_dir=working_dir,
+        llm_model_func=mock_llm_func,
+        tokenizer=Tokenizer("whitespace", WhitespaceTokenizer()),
+        embedding_func=EmbeddingFunc(
+            embedding_dim=8, max_token_size=100, func=mock_embedding_func
+        ),
+        chunk_token_size=20,
+        chunk_overlap_token_size=0,
+        document_segment_size=200,
+        stream_chunk_batch_size=4,
+        enable_llm_cache=False,
+    )
+    await rag.initialize_storages()
+    await initialize_pipeline_status()
+    return rag
+
+
+PAGES = [f"page {i} " + " ".join(f"word{i}_{j}" for j in range(30)) for i in range(8)]
+
+
+async def stream(pages, fail_after: int | None = None):
+    for i, page in enumerate(pages):
+        if fail_after is not None and i == fail_after:
+            raise RuntimeError("simulated extraction failure")
+        yield page
+
+
+def segment_keys(rag: LightRAG) -> list[str]:
+    return [
+        key
+        for key in rag.full_docs._data
+        if key.startswith("docseg-") and key != PENDING_SEGMENTS_KEY
+    ]
+
+
+async def pending_prefixes(rag: LightRAG) -> list[str]:
+    record = await rag.full_docs.get_by_id(PENDING_SEGMENTS_KEY)
+    return (record or {}).get("segments") or []
+
+
+async def test_stream_process_and_delete(working_dir: str):
+    """
+    1. Stream a document: it is stored in several segments
+    2. Process it: all chunks are stored and the document is PROCESSED
+    3. Delete it: the document record and its segments are removed
+    """
+    rag = await create_rag(working_dir)
+    try:
+        assert await rag.apipeline_enqueue_document_stream(stream(PAGES), "a.txt")
+        doc_id = compute_mdhash_id("\n".join(PAGES), prefix="doc-")
+        record = await rag.full_docs.get_by_id(doc_id)
+        assert record and len(record["segments"]) > 1, record
+        assert sorted(record["segments"]) == sorted(segment_keys(rag))
+        assert await pending_prefixes(rag) == [], "finished stream still registered"
+
+        await rag.apipeline_process_enqueue_documents()
+        status = await rag.doc_status.get_by_id(doc_id)
+        assert status["status"] == DocStatus.PROCESSED, status
+        assert status["chunks_count"] == len(status["chunks_list"]) > 4
+        assert await rag.text_chunks.filter_keys(set(status["chunks_list"])) == set()
+
+        result = await rag.adelete_by_doc_id(doc_id)
+        assert result.status == "success", result
+        assert await rag.full_docs.get_by_id(doc_id) is None
+        assert segment_keys(rag) == [], "segments survived document deletion"
+    finally:
+        await rag.finalize_storages()
+    print("Stream process and delete test passed")
+
+
+async def test_stream_duplicate_and_failure(working_dir: str):
+    """
+    1. Streaming the same text twice keeps only the first document's segments
+    2. A stream that raises midway removes the segments it wrote
+    """
+    rag = await create_rag(working_dir)
+    try:
+        assert await rag.apipeline_enqueue_document_stream(stream(PAGES), "a.txt")
+        segments = sorted(segment_keys(rag))
+        assert (
+            await rag.apipeline_enqueue_document_stream(stream(PAGES), "b.txt") is None
+        )
+        assert sorted(segment_keys(rag)) == segments, "duplicate left segments"
+
+        try:
+            await rag.apipeline_enqueue_document_stream(
+                stream([page + " more" for page in PAGES], fail_after=5), "c.txt"
+            )
+            assert False, "stream error was swallowed"
+        except RuntimeError:
+            pass
+        assert sorted(segment_keys(rag)) == segments, "failed stream left segments"
+        assert await pending_prefixes(rag) == []
+    finally:
+        await rag.finalize_storages()
+    print("Stream duplicate and failure test passed")
+
+
+async def test_orphan_segment_sweep(working_dir: str):
+    """
+    Segments of a stream interrupted by a crash stay registered; they are kept
+    while recent and swept once older than the orphan age
+    """
+    rag = await create_rag(working_dir)
+    try:
+        # A crash skips both the rollback and the unregistration
+        update_pending_segments = rag._update_pending_segments
+        delete = rag.full_docs.delete
+
+        async def crash_update(add=None, remove=None, data=None):
+            if add:
+                await update_pending_segments(add=add)
+
+        async def crash_delete(ids):
+            pass
+
+        rag._update_pending_segments = crash_update
+        rag.full_docs.delete = crash_delete
+        try:
+            await rag.apipeline_enqueue_document_stream(
+                stream(PAGES, fail_after=6), "crash.txt"
+            )
+        except RuntimeError:
+            pass
+        rag._update_pending_segments = update_pending_segments
+        rag.full_docs.delete = delete
+
+        orphans = segment_keys(rag)
+        assert orphans and len(await pending_prefixes(rag)) == 1
+        assert await rag._sweep_orphan_segments() == 0, "recent stream was swept"
+
+        max_age = lightrag_module.DEFAULT_ORPHAN_SEGMENT_MAX_AGE
+        lightrag_module.DEFAULT_ORPHAN_SEGMENT_MAX_AGE = 0
+        try:
+            assert await rag._sweep_orphan_segments() == len(orphans)
+        finally:
+            lightrag_module.DEFAULT_ORPHAN_SEGMENT_MAX_AGE = max_age
+        assert segment_keys(rag) == []
+        assert await pending_prefixes(rag) == []
+    finally:
+        await rag.finalize_storages()
+    print("Orphan segment sweep test passed")
+
+
+async def main():
+    """Run every test in its own temporary working directory"""
+    ASCIIColors.cyan("\n=== Streamed document regression tests ===")
+    failed = 0
+    for test in (
+        test_stream_process_and_delete,
+        test_stream_duplicate_and_failure,
+        test_orphan_segment_sweep,
+    ):
+        working_dir = tempfile.mkdtemp()
+        try:
+            await test(working_dir)
+        except Exception as e:
+            failed += 1
+            ASCIIColors.red(f"{test.__name__} failed: {e!r}")
+        finally:
+            shutil.rmtree(working_dir, ignore_errors=True)
+
+    if failed:
+        ASCIIColors.red(f"\n{failed} test(s) failed")
+        sys.exit(1)
+    ASCIIColors.green("\nAll tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+JsonKVStorage snapshot + journal regression tests
+
+Runs against a temporary working directory, no .env or external service needed:
+- Commits append changed records to the journal and reload on top of the snapshot
+- A torn journal tail left by an interrupted write is dropped and truncated
+- A large journal is compacted into a new snapshot
+- A snapshot written before the journal existed loads and keeps working
+- A legacy nested LLM cache is migrated and the journal folded into the snapshot
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+from ascii_colors import ASCIIColors
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lightrag.kg.json_kv_impl as json_kv_impl
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import initialize_share_data, finalize_share_data
+
+
+async def open_storage(working_dir: str, namespace: str = "full_docs") -> JsonKVStorage:
+    """Open a namespace as a freshly started process would"""
+    finalize_share_data()
+    initialize_share_data()
+    storage = JsonKVStorage(
+        namespace=namespace,
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def read_journal(storage: JsonKVStorage) -> list[dict]:
+    with open(storage._journal_file_name, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+async def test_journal_basic(working_dir: str):
+    """
+    1. The first commit writes the snapshot
+    2. Later commits append only the changed keys to the journal
+    3. A reload applies the journal on top of the snapshot
+    """
+    storage = await open_storage(working_dir)
+    await storage.upsert({"a": {"content": "A"}, "b": {"content": "B"}})
+    await storage.index_done_callback()
+    assert os.path.exists(storage._file_name), "first commit did not write a snapshot"
+    assert not os.path.exists(storage._journal_file_name)
+
+    await storage.upsert({"c": {"content": "C"}, "b": {"content": "B2"}})
+    await storage.delete(["a"])
+    await storage.index_done_callback()
+    journal = read_journal(storage)
+    assert sorted(record["k"] for record in journal) == ["a", "b", "c"]
+    assert "v" not in next(record for record in journal if record["k"] == "a")
+
+    storage = await open_storage(working_dir)
+    assert await storage.get_by_id("a") is None, "journaled delete was not replayed"
+    assert (await storage.get_by_id("b"))["content"] == "B2"
+    assert (await storage.get_by_id("c"))["content"] == "C"
+    print("Journal basic test passed")
+
+
+async def test_journal_torn_tail(working_dir: str):
+    """
+    1. Append half a record, as a crash during a journal write would
+    2. Reload: the complete records are applied, the torn tail is truncated away
+    3. The next commit appends after the valid records
+    """
+    storage = await open_storage(working_dir)
+    await storage.upsert({"a": {"content": "A"}})
+    await storage.index_done_callback()
+    await storage.upsert({"b": {"content": "B"}})
+    await storage.index_done_callback()
+    valid_size = os.path.getsize(storage._journal_file_name)
+    with open(storage._journal_file_name, "a", encoding="utf-8") as f:
+        f.write('{"k": "torn", "v": {"content": "T')
+
+    storage = await open_storage(working_dir)
+    assert (await storage.get_by_id("b"))["content"] == "B"
+    assert await storage.get_by_id("torn") is None, "torn record was applied"
+    assert (
+        os.path.getsize(storage._journal_file_name) == valid_size
+    ), "torn tail was not truncated"
+
+    await storage.upsert({"c": {"content": "C"}})
+    await storage.index_done_callback()
+    assert [record["k"] for record in read_journal(storage)] == ["b", "c"]
+
+    storage = await open_storage(working_dir)
+    assert await storage.filter_keys({"a", "b", "c"}) == set()
+    print("Journal torn tail test passed")
+
+
+async def test_journal_compaction(working_dir: str):
+    """
+    A journal above the compaction threshold is folded into a new snapshot
+    """
+    storage = await open_storage(working_dir)
+    await storage.upsert({"a": {"content": "A"}})
+    await storage.index_done_callback()
+
+    min_compact_bytes = json_kv_impl.KV_JOURNAL_MIN_COMPACT_BYTES
+    json_kv_impl.KV_JOURNAL_MIN_COMPACT_BYTES = 0
+    try:
+        await storage.upsert({f"k{i}": {"content": "x" * 100} for i in range(50)})
+        await storage.index_done_callback()
+    finally:
+        json_kv_impl.KV_JOURNAL_MIN_COMPACT_BYTES = min_compact_bytes
+
+    assert not os.path.exists(storage._journal_file_name), "journal was not compacted"
+    with open(storage._file_name, encoding="utf-8") as f:
+        assert len(json.load(f)) == 51
+
+    storage = await open_storage(working_dir)
+    assert (await storage.get_by_id("k49"))["content"] == "x" * 100
+    print("Journal compaction test passed")
+
+
+async def test_legacy_snapshot(working_dir: str):
+    """
+    A kv_store file written before journaling existed loads unchanged,
+    and later commits journal on top of it
+    """
+    with open(
+        os.path.join(working_dir, "kv_store_full_docs.json"), "w", encoding="utf-8"
+    ) as f:
+        json.dump({"old": {"content": "O", "create_time": 1, "update_time": 1}}, f)
+
+    storage = await open_storage(working_dir)
+    assert (await storage.get_by_id("old"))["content"] == "O"
+    await storage.upsert({"new": {"content": "N"}})
+    await storage.index_done_callback()
+    assert [record["k"] for record in read_journal(storage)] == ["new"]
+
+    storage = await open_storage(working_dir)
+    assert await storage.filter_keys({"old", "new"}) == set()
+    print("Legacy snapshot test passed")
+
+
+async def test_legacy_cache_migration(working_dir: str):
+    """
+    A nested LLM cache is flattened on load; records from the journal are
+    kept and the journal is folded into the rewritten snapshot
+    """
+    with open(
+        os.path.join(working_dir, "kv_store_llm_response_cache.json"),
+        "w",
+        encoding="utf-8",
+    ) as f:
+        json.dump(
+            {"default": {"hash1": {"return": "cached", "cache_type": "extract"}}}, f
+        )
+    with open(
+        os.path.join(working_dir, "kv_store_llm_response_cache.journal.jsonl"),
+        "w",
+        encoding="utf-8",
+    ) as f:
+        record = {"k": "default:extract:hash2", "v": {"return": "journaled"}}
+        f.write(json.dumps(record) + "\n")
+
+    storage = await open_storage(working_dir, "llm_response_cache")
+    assert (await storage.get_by_id("default:extract:hash1"))["return"] == "cached"
+    assert (await storage.get_by_id("default:extract:hash2"))["return"] == "journaled"
+    assert not os.path.exists(
+        storage._journal_file_name
+    ), "journal was not folded into the migrated snapshot"
+
+    storage = await open_storage(working_dir, "llm_response_cache")
+    assert await storage.get_by_id("default") is None, "legacy entry survived reload"
+    assert (await storage.get_by_id("default:extract:hash2"))["return"] == "journaled"
+    print("Legacy cache migration test passed")
+
+
+async def main():
+    """Run every test in its own temporary working directory"""
+    ASCIIColors.cyan("\n=== JsonKVStorage journal regression tests ===")
+    failed = 0
+    for test in (
+        test_journal_basic,
+        test_journal_torn_tail,
+        test_journal_compaction,
+        test_legacy_snapshot,
+        test_legacy_cache_migration,
+    ):
+        working_dir = tempfile.mkdtemp()
+        try:
+            await test(working_dir)
+        except Exception as e:
+            failed += 1
+            ASCIIColors.red(f"{test.__name__} failed: {e!r}")
+        finally:
+            shutil.rmtree(working_dir, ignore_errors=True)
+
+    if failed:
+        ASCIIColors.red(f"\n{failed} test(s) failed")
+        sys.exit(1)
+    ASCIIColors.green("\nAll tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+"""
+MmapVectorDBStorage regression tests
+
+Runs against a temporary working directory, no .env or external service needed:
+- Upsert, query, delete and reload
+- A compaction that crashes before its manifest is published
+- Migration of the pre-generation file layout
+- Migration of a NanoVectorDB vdb_<namespace>.json file
+"""
+
+import asyncio
+import base64
+import json
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+from ascii_colors import ASCIIColors
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.kg.mmap_vector_db_impl import MmapVectorDBStorage
+from lightrag.kg.shared_storage import initialize_share_data, finalize_share_data
+from lightrag.utils import EmbeddingFunc
+
+EMBEDDING_DIM = 8
+
+# Fixed random vector per text, so a query for a stored text finds that text first
+_rng = np.random.default_rng(0)
+_vectors: dict[str, np.ndarray] = {}
+
+
+async def mock_embedding_func(texts, **kwargs):
+    return np.stack(
+        [_vectors.setdefault(text, _rng.normal(size=EMBEDDING_DIM)) for text in texts]
+    )
+
+
+async def open_storage(working_dir: str) -> MmapVectorDBStorage:
+    """Open the chunks namespace as a freshly started process would"""
+    finalize_share_data()
+    initialize_share_data()
+    storage = MmapVectorDBStorage(
+        namespace="chunks",
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": 16,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": -1},
+        },
+        embedding_func=EmbeddingFunc(
+            embedding_dim=EMBEDDING_DIM, max_token_size=10, func=mock_embedding_func
+        ),
+        meta_fields={"content"},
+    )
+    await storage.initialize()
+    return storage
+
+
+def records(start: int, end: int) -> dict:
+    return {f"id{i}": {"content": f"text {i}"} for i in range(start, end)}
+
+
+async def assert_found(storage: MmapVectorDBStorage, i: int):
+    record = await storage.get_by_id(f"id{i}")
+    assert record and record["content"] == f"text {i}", f"id{i} not found: {record}"
+    results = await storage.query(f"text {i}", top_k=1)
+    assert results[0]["id"] == f"id{i}", f"query for text {i} returned {results}"
+
+
+async def test_mmap_basic(working_dir: str):
+    """
+    Basic operations:
+    1. Upsert and commit records
+    2. Query and read them back
+    3. Delete some and reload from disk
+    """
+    storage = await open_storage(working_dir)
+    await storage.upsert(records(0, 200))
+    assert await storage.index_done_callback()
+    await assert_found(storage, 42)
+
+    await storage.delete(["id0", "id1"])
+    assert await storage.index_done_callback()
+
+    storage = await open_storage(working_dir)
+    assert await storage.get_by_id("id0") is None, "deleted record was reloaded"
+    assert len(storage._id_to_row) == 198
+    await assert_found(storage, 199)
+    print("Basic test passed")
+
+
+async def test_mmap_compaction_crash(working_dir: str):
+    """
+    Compaction crash recovery:
+    1. Delete most rows so the next commit compacts
+    2. Fail the manifest write of the compaction
+    3. Reload: the previous generation is intact and still answers queries
+    4. Compact again: the files of the crashed compaction are swept
+    """
+    storage = await open_storage(working_dir)
+    await storage.upsert(records(0, 2000))
+    assert await storage.index_done_callback()
+    generation = storage._generation
+
+    await storage.delete([f"id{i}" for i in range(1500)])
+
+    def crash():
+        raise OSError("simulated crash before the manifest is published")
+
+    storage._write_manifest = crash
+    assert not await storage.index_done_callback(), "crashed commit reported success"
+
+    storage = await open_storage(working_dir)
+    assert storage._generation == generation, "unpublished generation was loaded"
+    assert len(storage._id_to_row) == 2000, "uncommitted deletes were applied"
+    await assert_found(storage, 10)
+    await assert_found(storage, 1999)
+
+    await storage.delete([f"id{i}" for i in range(1500)])
+    assert await storage.index_done_callback()
+    assert storage._generation == generation + 1
+
+    manifest = storage._read_manifest()
+    live_files = {
+        manifest["matrix_file"],
+        manifest["snapshot_file"],
+        manifest["log_file"],
+        os.path.basename(storage._manifest_file),
+    }
+    leftover = set(os.listdir(working_dir)) - live_files
+    assert not leftover, f"files of the crashed compaction were not swept: {leftover}"
+
+    storage = await open_storage(working_dir)
+    assert len(storage._id_to_row) == 500
+    await assert_found(storage, 1700)
+    print("Compaction crash recovery test passed")
+
+
+async def test_mmap_legacy_layout(working_dir: str):
+    """
+    Migration of the pre-generation layout (vdb_chunks.npy / vdb_chunks.meta.log
+    and a manifest without file names), then growth and compaction on top of it
+    """
+    storage = await open_storage(working_dir)
+    await storage.upsert(records(0, 100))
+    assert await storage.index_done_callback()
+
+    manifest_file = storage._manifest_file
+    with open(manifest_file, encoding="utf-8") as f:
+        manifest = json.load(f)
+    os.rename(
+        os.path.join(working_dir, manifest.pop("matrix_file")),
+        os.path.join(working_dir, "vdb_chunks.npy"),
+    )
+    os.rename(
+        os.path.join(working_dir, manifest.pop("log_file")),
+        os.path.join(working_dir, "vdb_chunks.meta.log"),
+    )
+    manifest.pop("snapshot_file", None)
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    storage = await open_storage(working_dir)
+    assert len(storage._id_to_row) == 100, "legacy layout was not loaded"
+    await assert_found(storage, 7)
+
+    await storage.upsert(records(100, 1500))
+    assert await storage.index_done_callback()
+    await storage.delete([f"id{i}" for i in range(1000)])
+    assert await storage.index_done_callback()
+
+    storage = await open_storage(working_dir)
+    assert len(storage._id_to_row) == 500
+    await assert_found(storage, 1234)
+    assert "vdb_chunks.npy" not in os.listdir(working_dir), "legacy matrix left behind"
+    print("Legacy layout migration test passed")
+
+
+async def test_mmap_nano_vectordb_migration(working_dir: str):
+    """
+    Import of a NanoVectorDB vdb_chunks.json file on first start
+    """
+    ids = [f"id{i}" for i in range(20)]
+    vectors = await mock_embedding_func([f"text {i}" for i in range(20)])
+    legacy = {
+        "embedding_dim": EMBEDDING_DIM,
+        "data": [
+            {"__id__": row_id, "__created_at__": 1700000000, "content": f"text {i}"}
+            for i, row_id in enumerate(ids)
+        ],
+        "matrix": base64.b64encode(vectors.astype(np.float32).tobytes()).decode(),
+    }
+    with open(os.path.join(working_dir, "vdb_chunks.json"), "w") as f:
+        json.dump(legacy, f)
+
+    storage = await open_storage(working_dir)
+    assert len(storage._id_to_row) == 20, "NanoVectorDB records were not imported"
+    await assert_found(storage, 13)
+
+    storage = await open_storage(working_dir)
+    assert len(storage._id_to_row) == 20, "imported records were not persisted"
+    print("NanoVectorDB migration test passed")
+
+
+async def main():
+    """Run every test in its own temporary working directory"""
+    ASCIIColors.cyan("\n=== MmapVectorDBStorage regression tests ===")
+    failed = 0
+    for test in (
+        test_mmap_basic,
+        test_mmap_compaction_crash,
+        test_mmap_legacy_layout,
+        test_mmap_nano_vectordb_migration,
+    ):
+        working_dir = tempfile.mkdtemp()
+        try:
+            await test(working_dir)
+        except Exception as e:
+            failed += 1
+            ASCIIColors.red(f"{test.__name__} failed: {e!r}")
+        finally:
+            shutil.rmtree(working_dir, ignore_errors=True)
+
+    if failed:
+        ASCIIColors.red(f"\n{failed} test(s) failed")
+        sys.exit(1)
+    ASCIIColors.green("\nAll tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+"""
+SQLite storage regression tests
+
+Runs against a temporary working directory, no .env or external service needed:
+- SQLiteKVStorage: CRUD, import of a JsonKVStorage snapshot and journal,
+  concurrent writers in several processes
+- SQLiteDocStatusStorage: status counts, pagination, track_id and file_path lookups
+- SQLiteGraphStorage: nodes, edges, degrees, chunk lookups, deletion and
+  import of a NetworkX GraphML file
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import networkx as nx
+from ascii_colors import ASCIIColors
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.base import DocStatus
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.kg.sqlite_impl import (
+    SQLiteDocStatusStorage,
+    SQLiteGraphStorage,
+    SQLiteKVStorage,
+)
+
+
+def global_config(working_dir: str) -> dict:
+    return {"working_dir": working_dir, "max_graph_nodes": 1000}
+
+
+async def open_kv(working_dir: str) -> SQLiteKVStorage:
+    storage = SQLiteKVStorage(
+        namespace="full_docs",
+        workspace="",
+        global_config=global_config(working_dir),
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def kv_writer(working_dir: str, worker: int):
+    """Upsert 50 records one call at a time from a separate process"""
+
+    async def run():
+        storage = await open_kv(working_dir)
+        for i in range(50):
+            await storage.upsert({f"w{worker}-{i}": {"content": "x"}})
+        await storage.finalize()
+
+    asyncio.run(run())
+
+
+async def test_sqlite_kv(working_dir: str):
+    """
+    1. Import a JsonKVStorage snapshot together with its journal
+    2. Upsert, read, filter and delete records
+    3. Write from four processes at once
+    """
+    with open(os.path.join(working_dir, "kv_store_full_docs.json"), "w") as f:
+        json.dump(
+            {
+                "old": {"content": "O", "create_time": 5, "update_time": 6},
+                "gone": {"content": "G", "create_time": 5, "update_time": 6},
+            },
+            f,
+        )
+    with open(os.path.join(working_dir, "kv_store_full_docs.journal.jsonl"), "w") as f:
+        f.write(json.dumps({"k": "gone"}) + "\n")
+        f.write(json.dumps({"k": "journaled", "v": {"content": "J"}}) + "\n")
+
+    storage = await open_kv(working_dir)
+    old = await storage.get_by_id("old")
+    assert old["content"] == "O" and old["create_time"] == 5, old
+    assert await storage.get_by_id("gone") is None, "journaled delete was not imported"
+    assert (await storage.get_by_id("journaled"))["content"] == "J"
+
+    await storage.upsert({"a": {"content": "A"}})
+    records = await storage.get_by_ids(["a", "missing", "old"])
+    assert records[0]["content"] == "A" and records[1] is None
+    assert await storage.filter_keys({"a", "b"}) == {"b"}
+    await storage.delete(["a"])
+    assert await storage.get_by_id("a") is None
+    await storage.finalize()
+
+    processes = [
+        multiprocessing.Process(target=kv_writer, args=(working_dir, worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    storage = await open_kv(working_dir)
+    assert len(await storage.get_all()) == 2 + 4 * 50
+    await storage.finalize()
+    print("SQLite KV test passed")
+
+
+async def test_sqlite_doc_status(working_dir: str):
+    """
+    Status counts, pagination and lookups by track_id and file_path
+    """
+    storage = SQLiteDocStatusStorage(
+        namespace="doc_status",
+        workspace="ws",
+        global_config=global_config(working_dir),
+        embedding_func=None,
+    )
+    await storage.initialize()
+    await storage.upsert(
+        {
+            f"d{i}": {
+                "status": DocStatus.PROCESSED if i % 2 else DocStatus.PENDING,
+                "content_summary": "summary",
+                "content_length": 1,
+                "file_path": f"f{i}.txt",
+                "created_at": f"2024-01-{i + 1:02d}",
+                "updated_at": f"2024-02-{i + 1:02d}",
+                "track_id": "track",
+            }
+            for i in range(25)
+        }
+    )
+
+    counts = await storage.get_all_status_counts()
+    assert counts["processed"] == 12 and counts["pending"] == 13, counts
+
+    docs, total = await storage.get_docs_paginated(
+        DocStatus.PROCESSED,
+        page=2,
+        page_size=10,
+        sort_field="created_at",
+        sort_direction="asc",
+    )
+    assert total == 12
+    assert [doc_id for doc_id, _ in docs] == ["d21", "d23"], docs
+
+    assert len(await storage.get_docs_by_track_id("track")) == 25
+    assert (await storage.get_doc_by_file_path("f3.txt"))["status"] == "processed"
+
+    await storage.delete(["d3"])
+    assert await storage.get_doc_by_file_path("f3.txt") is None
+    await storage.finalize()
+    print("SQLite doc status test passed")
+
+
+async def test_sqlite_graph(working_dir: str):
+    """
+    1. Import a NetworkX GraphML file into an empty database
+    2. Add nodes and edges, read edges from both ends
+    3. Degrees (a self-loop counts twice) and chunk lookups
+    4. Delete a node together with its edges
+    """
+    graph = nx.Graph()
+    graph.add_node("A", source_id=f"c1{GRAPH_FIELD_SEP}c2", entity_type="X")
+    graph.add_node("B", source_id="c2")
+    graph.add_edge("A", "B", source_id="c1", weight=1.0)
+    nx.write_graphml(
+        graph, os.path.join(working_dir, "graph_chunk_entity_relation.graphml")
+    )
+
+    storage = SQLiteGraphStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config=global_config(working_dir),
+        embedding_func=None,
+    )
+    await storage.initialize()
+    assert (await storage.get_node("A"))["entity_type"] == "X", "GraphML not imported"
+
+    await storage.upsert_node("C", {"source_id": "c3"})
+    await storage.upsert_edge("C", "A", {"source_id": "c3", "weight": 2.0})
+    await storage.upsert_edge("C", "C", {"source_id": "c3", "weight": 1.0})
+    assert (await storage.get_edge("A", "C"))["weight"] == 2.0
+    assert await storage.get_edge("A", "C") == await storage.get_edge("C", "A")
+
+    degrees = await storage.node_degrees_batch(["A", "B", "C", "Z"])
+    assert degrees == {"A": 2, "B": 1, "C": 3, "Z": 0}, degrees
+    assert await storage.node_degree("C") == 3
+    assert await storage.edge_degree("A", "B") == 3
+    # Popular labels rank by the same degree, the self-loop counting twice
+    assert await storage.get_popular_labels(2) == ["C", "A"]
+
+    nodes = await storage.get_nodes_by_chunk_ids(["c2"])
+    assert sorted(node["id"] for node in nodes) == ["A", "B"]
+    edges = await storage.get_edges_by_chunk_ids(["c1"])
+    assert len(edges) == 1 and {edges[0]["source"], edges[0]["target"]} == {"A", "B"}
+
+    await storage.delete_node("A")
+    assert not await storage.has_node("A")
+    assert not await storage.has_edge("B", "A"), "edges of a deleted node remain"
+    assert await storage.get_nodes_by_chunk_ids(["c1"]) == []
+
+    await storage.drop()
+    assert await storage.get_all_labels() == []
+    await storage.finalize()
+    print("SQLite graph test passed")
+
+
+async def main():
+    """Run every test in its own temporary working directory"""
+    ASCIIColors.cyan("\n=== SQLite storage regression tests ===")
+    failed = 0
+    for test in (test_sqlite_kv, test_sqlite_doc_status, test_sqlite_graph):
+        working_dir = tempfile.mkdtemp()
+        try:
+            await test(working_dir)
+        except Exception as e:
+            failed += 1
+            ASCIIColors.red(f"{test.__name__} failed: {e!r}")
+        finally:
+            shutil.rmtree(working_dir, ignore_errors=True)
+
+    if failed:
+        ASCIIColors.red(f"\n{failed} test(s) failed")
+        sys.exit(1)
+    ASCIIColors.green("\nAll tests passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())